@@ -0,0 +1,113 @@
+"""Add stored search_tsv column with GIN index for BM25 search
+
+Revision ID: 0015
+Revises: 0014
+Create Date: 2025-12-05 00:00:00.000000
+
+Both BM25 paths (HybridSearchEngine and SearchDAO) used to evaluate
+to_tsvector('english', ...) per candidate row on every query, which
+re-parses every chunk and cannot use an index. This migration persists the
+weighted document vector instead:
+
+- chunks.search_tsv: setweight(title, 'A') || setweight(text, 'B')
+- idx_chunks_search_tsv: GIN index on search_tsv
+- trg_chunks_search_tsv: keeps search_tsv current on chunk INSERT/UPDATE
+- trg_documents_title_search_tsv: refreshes chunk vectors on title change
+
+A GENERATED column cannot reference documents.title, so the column is
+maintained by triggers. Existing rows are backfilled.
+
+PostgreSQL only; SQLite keeps using its chunks_fts virtual table.
+"""
+from alembic import op
+
+revision = '0015'
+down_revision = '0014'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        print("SQLite detected - search_tsv is PostgreSQL only, skipping")
+        return
+
+    op.execute("ALTER TABLE chunks ADD COLUMN IF NOT EXISTS search_tsv tsvector")
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION chunks_search_tsv_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_tsv :=
+                setweight(to_tsvector('english', COALESCE(
+                    (SELECT d.title FROM documents d WHERE d.doc_id = NEW.doc_id), ''
+                )), 'A')
+                || setweight(to_tsvector('english', COALESCE(NEW.text, '')), 'B');
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql;
+    """)
+
+    op.execute("DROP TRIGGER IF EXISTS trg_chunks_search_tsv ON chunks")
+    op.execute("""
+        CREATE TRIGGER trg_chunks_search_tsv
+        BEFORE INSERT OR UPDATE OF text, doc_id ON chunks
+        FOR EACH ROW EXECUTE FUNCTION chunks_search_tsv_update();
+    """)
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION documents_title_search_tsv_update() RETURNS trigger AS $$
+        BEGIN
+            UPDATE chunks
+            SET search_tsv =
+                setweight(to_tsvector('english', COALESCE(NEW.title, '')), 'A')
+                || setweight(to_tsvector('english', COALESCE(chunks.text, '')), 'B')
+            WHERE chunks.doc_id = NEW.doc_id;
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql;
+    """)
+
+    op.execute("DROP TRIGGER IF EXISTS trg_documents_title_search_tsv ON documents")
+    op.execute("""
+        CREATE TRIGGER trg_documents_title_search_tsv
+        AFTER UPDATE OF title ON documents
+        FOR EACH ROW
+        WHEN (OLD.title IS DISTINCT FROM NEW.title)
+        EXECUTE FUNCTION documents_title_search_tsv_update();
+    """)
+
+    # Backfill existing chunks in one set-based pass
+    op.execute("""
+        UPDATE chunks c
+        SET search_tsv =
+            setweight(to_tsvector('english', COALESCE(d.title, '')), 'A')
+            || setweight(to_tsvector('english', COALESCE(c.text, '')), 'B')
+        FROM documents d
+        WHERE c.doc_id = d.doc_id
+    """)
+
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_chunks_search_tsv ON chunks USING GIN (search_tsv)"
+    )
+
+    # The expression index on to_tsvector(text) is never used by the queries
+    op.execute("DROP INDEX IF EXISTS idx_chunks_text_fts")
+
+    op.execute("ANALYZE chunks")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    op.execute("DROP TRIGGER IF EXISTS trg_documents_title_search_tsv ON documents")
+    op.execute("DROP FUNCTION IF EXISTS documents_title_search_tsv_update()")
+    op.execute("DROP TRIGGER IF EXISTS trg_chunks_search_tsv ON chunks")
+    op.execute("DROP FUNCTION IF EXISTS chunks_search_tsv_update()")
+    op.execute("DROP INDEX IF EXISTS idx_chunks_search_tsv")
+    op.execute("ALTER TABLE chunks DROP COLUMN IF EXISTS search_tsv")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_chunks_text_fts ON chunks USING GIN (to_tsvector('english', text))"
+    )
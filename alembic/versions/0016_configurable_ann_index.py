@@ -0,0 +1,118 @@
+"""Configurable ANN index (HNSW or IVFFlat) on embeddings.vec
+
+Revision ID: 0016
+Revises: 0015
+Create Date: 2025-12-08 00:00:00.000000
+
+Replaces the assorted legacy vector indexes (idx_embeddings_vec_hnsw,
+_cosine, _ivf, _ivfflat) with a single ANN index whose type and opclass
+match the operator the search code orders by:
+
+- VECTOR_INDEX_TYPE: hnsw (default) | ivfflat
+- VECTOR_DISTANCE_METRIC: cosine (default, <=>) | l2 (<->)
+- VECTOR_HNSW_M / VECTOR_HNSW_EF_CONSTRUCTION: HNSW build parameters
+- VECTOR_IVFFLAT_LISTS: IVFFlat lists (default derived from row count)
+
+The runtime reads VECTOR_DISTANCE_METRIC as well, so set it identically for
+the migration and the API. Query-time recall is tuned per request with
+hnsw.ef_search / ivfflat.probes (see apps.api.database.utils.vector_index).
+
+PostgreSQL with pgvector only.
+"""
+import math
+import os
+
+from alembic import op
+from sqlalchemy import text
+
+revision = '0016'
+down_revision = '0015'
+branch_labels = None
+depends_on = None
+
+OPCLASSES = {
+    'cosine': 'vector_cosine_ops',
+    'l2': 'vector_l2_ops',
+}
+
+LEGACY_INDEXES = (
+    'idx_embeddings_vec_hnsw',
+    'idx_embeddings_vec_cosine',
+    'idx_embeddings_vec_ivf',
+    'idx_embeddings_vec_ivfflat',
+)
+
+
+def _ivfflat_lists(bind) -> int:
+    """pgvector guidance: rows / 1000 up to 1M rows, sqrt(rows) beyond."""
+    configured = os.getenv('VECTOR_IVFFLAT_LISTS')
+    if configured:
+        return int(configured)
+    rows = bind.execute(text("SELECT count(*) FROM embeddings")).scalar() or 0
+    if rows <= 1_000_000:
+        return max(10, rows // 1000)
+    return int(math.sqrt(rows))
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        print("SQLite detected - ANN index is PostgreSQL only, skipping")
+        return
+
+    has_vector = bind.execute(
+        text("SELECT 1 FROM pg_extension WHERE extname = 'vector'")
+    ).scalar()
+    if not has_vector:
+        print("pgvector extension not installed, skipping ANN index")
+        return
+
+    index_type = os.getenv('VECTOR_INDEX_TYPE', 'hnsw').lower()
+    metric = os.getenv('VECTOR_DISTANCE_METRIC', 'cosine').lower()
+    if index_type not in ('hnsw', 'ivfflat'):
+        raise ValueError(f"VECTOR_INDEX_TYPE must be hnsw or ivfflat, got {index_type!r}")
+    if metric not in OPCLASSES:
+        raise ValueError(f"VECTOR_DISTANCE_METRIC must be one of {sorted(OPCLASSES)}, got {metric!r}")
+
+    for index_name in LEGACY_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {index_name}")
+
+    opclass = OPCLASSES[metric]
+    if index_type == 'hnsw':
+        m = int(os.getenv('VECTOR_HNSW_M', '16'))
+        ef_construction = int(os.getenv('VECTOR_HNSW_EF_CONSTRUCTION', '64'))
+        op.execute(f"""
+            CREATE INDEX idx_embeddings_vec_hnsw ON embeddings
+            USING hnsw (vec {opclass})
+            WITH (m = {m}, ef_construction = {ef_construction})
+        """)
+    else:
+        lists = _ivfflat_lists(bind)
+        op.execute(f"""
+            CREATE INDEX idx_embeddings_vec_ivfflat ON embeddings
+            USING ivfflat (vec {opclass})
+            WITH (lists = {lists})
+        """)
+
+    op.execute("ANALYZE embeddings")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    has_vector = bind.execute(
+        text("SELECT 1 FROM pg_extension WHERE extname = 'vector'")
+    ).scalar()
+    if not has_vector:
+        return
+
+    op.execute("DROP INDEX IF EXISTS idx_embeddings_vec_ivfflat")
+    op.execute("DROP INDEX IF EXISTS idx_embeddings_vec_hnsw")
+    # Restore the index created by 0005
+    op.execute("""
+        CREATE INDEX idx_embeddings_vec_hnsw ON embeddings
+        USING hnsw (vec vector_cosine_ops)
+        WITH (m = 16, ef_construction = 64)
+    """)
@@ -0,0 +1,81 @@
+"""Content hashes and tombstones for incremental re-ingestion
+
+Revision ID: 0017
+Revises: 0016
+Create Date: 2025-12-12 00:00:00.000000
+
+Re-uploading a document used to create a new doc_id and re-embed every
+chunk. Ingestion now matches the upload against the stored document and
+only embeds chunks whose normalized text changed:
+
+- chunks.content_hash: SHA-256 of the normalized chunk text, also used to
+  reuse embeddings across documents
+- chunks.deleted_at: tombstone for chunks dropped by a re-upload
+- idx_chunks_content_hash: lookup of live chunks by hash
+- idx_documents_source_url: lookup of the stored version of a document
+- documents_title_search_tsv_update() (from 0015) no longer rebuilds
+  search_tsv for tombstoned chunks when a document's title changes
+
+Search queries also filter chunks.deleted_at IS NULL themselves.
+
+Existing chunks keep a NULL hash; it is computed from their text the next
+time their document is re-ingested.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0017'
+down_revision = '0016'
+branch_labels = None
+depends_on = None
+
+
+def _title_trigger_function(live_only: bool) -> str:
+    live_filter = "AND chunks.deleted_at IS NULL" if live_only else ""
+    return f"""
+        CREATE OR REPLACE FUNCTION documents_title_search_tsv_update() RETURNS trigger AS $$
+        BEGIN
+            UPDATE chunks
+            SET search_tsv =
+                setweight(to_tsvector('english', COALESCE(NEW.title, '')), 'A')
+                || setweight(to_tsvector('english', COALESCE(chunks.text, '')), 'B')
+            WHERE chunks.doc_id = NEW.doc_id
+            {live_filter};
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql;
+    """
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    existing_columns = [col['name'] for col in inspector.get_columns('chunks')]
+
+    if 'content_hash' not in existing_columns:
+        op.add_column('chunks', sa.Column('content_hash', sa.String(64), nullable=True))
+    if 'deleted_at' not in existing_columns:
+        op.add_column('chunks', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+
+    if bind.dialect.name == 'postgresql':
+        op.execute("""
+            CREATE INDEX IF NOT EXISTS idx_chunks_content_hash
+            ON chunks (content_hash) WHERE deleted_at IS NULL
+        """)
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS idx_documents_source_url ON documents (source_url)"
+        )
+        # A re-upload can rename the document; keep its tombstones out of BM25
+        op.execute(_title_trigger_function(live_only=True))
+    else:
+        op.create_index('idx_chunks_content_hash', 'chunks', ['content_hash'])
+        op.create_index('idx_documents_source_url', 'documents', ['source_url'])
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute(_title_trigger_function(live_only=False))
+    op.execute("DROP INDEX IF EXISTS idx_documents_source_url")
+    op.execute("DROP INDEX IF EXISTS idx_chunks_content_hash")
+    op.drop_column('chunks', 'deleted_at')
+    op.drop_column('chunks', 'content_hash')
@@ -0,0 +1,67 @@
+"""Materialized taxonomy ancestors for subtree filtering
+
+Revision ID: 0018
+Revises: 0017
+Create Date: 2025-12-19 00:00:00.000000
+
+Search used to filter taxonomy with exact `dt.path = :p::text[]` per path,
+OR-ed together, so a filter on ["AI"] missed documents at ["AI", "RAG"]
+and every extra path added an unindexable branch. Each doc_taxonomy row
+now carries the keys of all its ancestor paths:
+
+- taxonomy_path_prefixes(path): lower-cased keys of path[1:1] .. path[1:n],
+  segments joined by chr(31)
+- doc_taxonomy.path_prefixes: GENERATED from path, so no writer has to
+  maintain it
+- idx_doc_taxonomy_path_prefixes: GIN index; a subtree filter over any
+  number of paths is one `path_prefixes && ARRAY[...]` predicate
+
+The key format is shared with apps/api/database/utils/taxonomy_filter.py.
+PostgreSQL only; SQLite matches prefixes of its JSON path text instead.
+"""
+from alembic import op
+
+revision = '0018'
+down_revision = '0017'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        print("SQLite detected - path_prefixes is PostgreSQL only, skipping")
+        return
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION taxonomy_path_prefixes(path text[]) RETURNS text[]
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+            SELECT COALESCE(
+                array_agg(lower(array_to_string(path[1:i], chr(31))) ORDER BY i),
+                '{}'::text[]
+            )
+            FROM generate_series(1, COALESCE(array_length(path, 1), 0)) AS i
+        $$;
+    """)
+
+    # Stored generated column: backfills existing rows in the same rewrite
+    op.execute("""
+        ALTER TABLE doc_taxonomy
+        ADD COLUMN IF NOT EXISTS path_prefixes text[]
+        GENERATED ALWAYS AS (taxonomy_path_prefixes(path)) STORED
+    """)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_doc_taxonomy_path_prefixes
+        ON doc_taxonomy USING gin (path_prefixes)
+    """)
+    op.execute("ANALYZE doc_taxonomy")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    op.execute("DROP INDEX IF EXISTS idx_doc_taxonomy_path_prefixes")
+    op.execute("ALTER TABLE doc_taxonomy DROP COLUMN IF EXISTS path_prefixes")
+    op.execute("DROP FUNCTION IF EXISTS taxonomy_path_prefixes(text[])")
@@ -0,0 +1,129 @@
+"""Optional half-precision ANN index on embeddings.vec
+
+Revision ID: 0019
+Revises: 0018
+Create Date: 2026-01-08 00:00:00.000000
+
+With VECTOR_QUANTIZATION=halfvec the full-precision ANN index from 0016 is
+replaced by an expression index over vec::halfvec(1536): same index type,
+metric and build parameters, half the index size, so more of it stays in
+shared buffers. embeddings.vec itself keeps full precision; the search code
+takes k * VECTOR_RESCORE_OVERSAMPLE candidates through the halfvec index
+and re-ranks them by the exact distance (see
+apps/api/database/utils/vector_index.py). Set VECTOR_QUANTIZATION
+identically for the migration and the API.
+
+VECTOR_QUANTIZATION=none (default) leaves the 0016 index alone. Requires
+pgvector 0.7+ (halfvec); PostgreSQL only.
+"""
+import math
+import os
+
+from alembic import op
+from sqlalchemy import text
+
+revision = '0019'
+down_revision = '0018'
+branch_labels = None
+depends_on = None
+
+OPCLASSES = {
+    'cosine': 'vector_cosine_ops',
+    'l2': 'vector_l2_ops',
+}
+
+DIMENSIONS = 1536
+
+
+def _pgvector_version(bind):
+    version = bind.execute(
+        text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+    ).scalar()
+    if not version:
+        return None
+    return tuple(int(part) for part in version.split('.')[:2])
+
+
+def _ivfflat_lists(bind) -> int:
+    """Same sizing as 0016: rows / 1000 up to 1M rows, sqrt(rows) beyond."""
+    configured = os.getenv('VECTOR_IVFFLAT_LISTS')
+    if configured:
+        return int(configured)
+    rows = bind.execute(text("SELECT count(*) FROM embeddings")).scalar() or 0
+    if rows <= 1_000_000:
+        return max(10, rows // 1000)
+    return int(math.sqrt(rows))
+
+
+def _index_settings(bind):
+    index_type = os.getenv('VECTOR_INDEX_TYPE', 'hnsw').lower()
+    metric = os.getenv('VECTOR_DISTANCE_METRIC', 'cosine').lower()
+    if index_type not in ('hnsw', 'ivfflat'):
+        raise ValueError(f"VECTOR_INDEX_TYPE must be hnsw or ivfflat, got {index_type!r}")
+    if metric not in OPCLASSES:
+        raise ValueError(f"VECTOR_DISTANCE_METRIC must be one of {sorted(OPCLASSES)}, got {metric!r}")
+    if index_type == 'hnsw':
+        m = int(os.getenv('VECTOR_HNSW_M', '16'))
+        ef_construction = int(os.getenv('VECTOR_HNSW_EF_CONSTRUCTION', '64'))
+        options = f"m = {m}, ef_construction = {ef_construction}"
+    else:
+        options = f"lists = {_ivfflat_lists(bind)}"
+    return index_type, OPCLASSES[metric], options
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        print("SQLite detected - ANN index is PostgreSQL only, skipping")
+        return
+
+    quantization = os.getenv('VECTOR_QUANTIZATION', 'none').lower()
+    if quantization not in ('none', 'halfvec'):
+        raise ValueError(f"VECTOR_QUANTIZATION must be none or halfvec, got {quantization!r}")
+    if quantization == 'none':
+        return
+
+    version = _pgvector_version(bind)
+    if version is None:
+        print("pgvector extension not installed, skipping halfvec ANN index")
+        return
+    if version < (0, 7):
+        raise RuntimeError(
+            f"VECTOR_QUANTIZATION=halfvec needs pgvector 0.7 or later, found {version}"
+        )
+
+    index_type, opclass, options = _index_settings(bind)
+    halfvec_opclass = opclass.replace('vector_', 'halfvec_', 1)
+    op.execute(f"""
+        CREATE INDEX IF NOT EXISTS idx_embeddings_vec_halfvec_{index_type} ON embeddings
+        USING {index_type} ((CAST(vec AS halfvec({DIMENSIONS}))) {halfvec_opclass})
+        WITH ({options})
+    """)
+    op.execute("DROP INDEX IF EXISTS idx_embeddings_vec_hnsw")
+    op.execute("DROP INDEX IF EXISTS idx_embeddings_vec_ivfflat")
+    op.execute("ANALYZE embeddings")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    has_halfvec_index = bind.execute(
+        text(
+            "SELECT 1 FROM pg_indexes WHERE tablename = 'embeddings' "
+            "AND indexname LIKE 'idx_embeddings_vec_halfvec_%'"
+        )
+    ).scalar()
+    if not has_halfvec_index:
+        return
+
+    # Restore the full-precision index of 0016
+    index_type, opclass, options = _index_settings(bind)
+    op.execute(f"""
+        CREATE INDEX IF NOT EXISTS idx_embeddings_vec_{index_type} ON embeddings
+        USING {index_type} (vec {opclass})
+        WITH ({options})
+    """)
+    op.execute("DROP INDEX IF EXISTS idx_embeddings_vec_halfvec_hnsw")
+    op.execute("DROP INDEX IF EXISTS idx_embeddings_vec_halfvec_ivfflat")
@@ -0,0 +1,124 @@
+"""ANN indexes over embedding prefixes for two-stage retrieval
+
+Revision ID: 0020
+Revises: 0019
+Create Date: 2026-01-15 00:00:00.000000
+
+For each size in VECTOR_PREFIX_INDEX_DIMS (comma separated, e.g. "256" or
+"128,256"; defaults to VECTOR_PREFIX_DIMS) an expression index over
+subvector(vec, 1, d)::vector(d) is built next to the full ANN index.
+Two-stage queries (VECTOR_PREFIX_DIMS, or vector_prefix_dims in an agent's
+retrieval_config) take their candidates through it and re-rank them with
+the full vector (see apps/api/database/utils/vector_index.py). The prefix is
+not stored separately: the index is the only copy, a 256-d one about a
+sixth of the full 1536-d index.
+
+Nothing is created when no prefix size is configured. Requires pgvector
+0.7+ (subvector); PostgreSQL only.
+"""
+import math
+import os
+
+from alembic import op
+from sqlalchemy import text
+
+revision = '0020'
+down_revision = '0019'
+branch_labels = None
+depends_on = None
+
+OPCLASSES = {
+    'cosine': 'vector_cosine_ops',
+    'l2': 'vector_l2_ops',
+}
+
+DIMENSIONS = 1536
+
+
+def _pgvector_version(bind):
+    version = bind.execute(
+        text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+    ).scalar()
+    if not version:
+        return None
+    return tuple(int(part) for part in version.split('.')[:2])
+
+
+def _ivfflat_lists(bind) -> int:
+    """Same sizing as 0016: rows / 1000 up to 1M rows, sqrt(rows) beyond."""
+    configured = os.getenv('VECTOR_IVFFLAT_LISTS')
+    if configured:
+        return int(configured)
+    rows = bind.execute(text("SELECT count(*) FROM embeddings")).scalar() or 0
+    if rows <= 1_000_000:
+        return max(10, rows // 1000)
+    return int(math.sqrt(rows))
+
+
+def _index_settings(bind):
+    index_type = os.getenv('VECTOR_INDEX_TYPE', 'hnsw').lower()
+    metric = os.getenv('VECTOR_DISTANCE_METRIC', 'cosine').lower()
+    if index_type not in ('hnsw', 'ivfflat'):
+        raise ValueError(f"VECTOR_INDEX_TYPE must be hnsw or ivfflat, got {index_type!r}")
+    if metric not in OPCLASSES:
+        raise ValueError(f"VECTOR_DISTANCE_METRIC must be one of {sorted(OPCLASSES)}, got {metric!r}")
+    if index_type == 'hnsw':
+        m = int(os.getenv('VECTOR_HNSW_M', '16'))
+        ef_construction = int(os.getenv('VECTOR_HNSW_EF_CONSTRUCTION', '64'))
+        options = f"m = {m}, ef_construction = {ef_construction}"
+    else:
+        options = f"lists = {_ivfflat_lists(bind)}"
+    return index_type, OPCLASSES[metric], options
+
+
+def _prefix_dims():
+    configured = os.getenv('VECTOR_PREFIX_INDEX_DIMS') or os.getenv('VECTOR_PREFIX_DIMS', '')
+    dims = sorted({int(part) for part in configured.split(',') if part.strip()})
+    for prefix_dims in dims:
+        if not 0 < prefix_dims < DIMENSIONS:
+            raise ValueError(f"Prefix dimensions must be between 1 and {DIMENSIONS - 1}, got {prefix_dims}")
+    return dims
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        print("SQLite detected - ANN index is PostgreSQL only, skipping")
+        return
+
+    dims = _prefix_dims()
+    if not dims:
+        return
+
+    version = _pgvector_version(bind)
+    if version is None:
+        print("pgvector extension not installed, skipping prefix ANN indexes")
+        return
+    if version < (0, 7):
+        raise RuntimeError(
+            f"Prefix ANN indexes need pgvector 0.7 or later (subvector), found {version}"
+        )
+
+    index_type, opclass, options = _index_settings(bind)
+    for prefix_dims in dims:
+        op.execute(f"""
+            CREATE INDEX IF NOT EXISTS idx_embeddings_vec_prefix{prefix_dims}_{index_type} ON embeddings
+            USING {index_type} ((CAST(subvector(vec, 1, {prefix_dims}) AS vector({prefix_dims}))) {opclass})
+            WITH ({options})
+        """)
+    op.execute("ANALYZE embeddings")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    prefix_indexes = bind.execute(
+        text(
+            "SELECT indexname FROM pg_indexes WHERE tablename = 'embeddings' "
+            "AND indexname LIKE 'idx_embeddings_vec_prefix%'"
+        )
+    ).scalars().all()
+    for index_name in prefix_indexes:
+        op.execute(f"DROP INDEX IF EXISTS {index_name}")
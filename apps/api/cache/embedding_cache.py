@@ -0,0 +1,267 @@
+"""
+Two-tier embedding cache shared by every embedding entry point.
+
+- L1: process-local LRU of float32 vectors (OrderedDict, O(1) operations)
+- L2: Redis, vectors stored as packed little-endian float32 bytes
+
+Keys are (model, SHA-256 of the normalized text), so the same text embedded
+by the API EmbeddingService, the database EmbeddingService or the CBR system
+is computed once per model. Packed float32 is 4 bytes per dimension (6 KB
+for 1536 dimensions) instead of a pickled/JSON list of Python floats, and
+decodes with a single ``np.frombuffer``.
+
+Configuration (environment):
+- EMBEDDING_CACHE_L1_SIZE: L1 entries (default 10000)
+- EMBEDDING_CACHE_REDIS: enable the Redis tier (default true)
+- EMBEDDING_CACHE_REDIS_TTL: L2 TTL in seconds (default 7 days)
+
+@CODE:API-001
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional, Sequence, cast
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "EmbeddingCache",
+    "EmbeddingCacheMetrics",
+    "get_embedding_cache",
+    "EMBEDDING_KEY_PREFIX",
+]
+
+EMBEDDING_KEY_PREFIX = "embeddings:f32:"
+
+# Little-endian float32, independent of the host byte order
+_VECTOR_DTYPE = np.dtype("<f4")
+
+# Seconds between Redis reconnection attempts when L2 is unavailable
+_REDIS_RETRY_INTERVAL = 30.0
+
+
+@dataclass
+class EmbeddingCacheMetrics:
+    """Per-layer embedding cache counters."""
+
+    l1_hits: int = 0
+    l1_misses: int = 0
+    l2_hits: int = 0
+    l2_misses: int = 0
+    l2_errors: int = 0
+    sets: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = asdict(self)
+        data["l1_hit_rate"] = self.l1_hits / max(1, self.l1_hits + self.l1_misses)
+        data["l2_hit_rate"] = self.l2_hits / max(1, self.l2_hits + self.l2_misses)
+        lookups = self.l1_hits + self.l1_misses
+        data["overall_hit_rate"] = (self.l1_hits + self.l2_hits) / max(1, lookups)
+        return data
+
+
+class EmbeddingCache:
+    """L1 in-process LRU in front of an L2 Redis tier."""
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        redis_ttl_seconds: Optional[int] = None,
+        redis_enabled: Optional[bool] = None,
+    ) -> None:
+        self.local: "OrderedDict[str, Any]" = OrderedDict()
+        self.max_entries = max_entries or int(os.getenv("EMBEDDING_CACHE_L1_SIZE", "10000"))
+        self.redis_ttl_seconds = redis_ttl_seconds or int(
+            os.getenv("EMBEDDING_CACHE_REDIS_TTL", str(86400 * 7))
+        )
+        if redis_enabled is None:
+            redis_enabled = os.getenv("EMBEDDING_CACHE_REDIS", "true").lower() == "true"
+        self.redis_enabled = redis_enabled
+        self.metrics = EmbeddingCacheMetrics()
+
+        self._redis_manager: Any = None
+        self._last_redis_attempt = 0.0
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """Unicode NFC with whitespace runs collapsed and ends stripped."""
+        return " ".join(unicodedata.normalize("NFC", text).split())
+
+    def make_key(self, model: str, text: str) -> str:
+        digest = hashlib.sha256(self.normalize_text(text).encode("utf-8")).hexdigest()
+        return f"{EMBEDDING_KEY_PREFIX}{model}:{digest}"
+
+    @staticmethod
+    def pack(vector: Sequence[float]) -> bytes:
+        return cast(bytes, np.asarray(vector, dtype=_VECTOR_DTYPE).tobytes())
+
+    @staticmethod
+    def unpack(data: bytes) -> np.ndarray:
+        return np.frombuffer(data, dtype=_VECTOR_DTYPE)
+
+    # L1
+
+    def _get_local(self, key: str) -> Optional[List[float]]:
+        vector = self.local.get(key)
+        if vector is None:
+            self.metrics.l1_misses += 1
+            return None
+        self.local.move_to_end(key)
+        self.metrics.l1_hits += 1
+        return cast(List[float], np.asarray(vector).tolist())
+
+    def _put_local(self, key: str, vector: np.ndarray) -> None:
+        vector.setflags(write=False)
+        self.local[key] = vector
+        self.local.move_to_end(key)
+        while len(self.local) > self.max_entries:
+            self.local.popitem(last=False)
+
+    def clear_local(self) -> int:
+        """Drop all L1 entries and return how many were removed."""
+        count = len(self.local)
+        self.local.clear()
+        return count
+
+    # L2
+
+    async def _get_redis_client(self) -> Optional[Any]:
+        if not self.redis_enabled:
+            return None
+
+        if self._redis_manager is None:
+            now = time.monotonic()
+            if now - self._last_redis_attempt < _REDIS_RETRY_INTERVAL:
+                return None
+            self._last_redis_attempt = now
+            try:
+                from .redis_manager import REDIS_AVAILABLE, get_redis_manager
+
+                if not REDIS_AVAILABLE:
+                    self.redis_enabled = False
+                    return None
+                self._redis_manager = await get_redis_manager()
+            except Exception as e:
+                logger.warning(f"Embedding cache L2 unavailable: {e}")
+                return None
+
+        manager = self._redis_manager
+        if not manager.is_connected:
+            now = time.monotonic()
+            if now - self._last_redis_attempt < _REDIS_RETRY_INTERVAL:
+                return None
+            self._last_redis_attempt = now
+            if not await manager.initialize():
+                return None
+        return manager.client
+
+    def _l2_failed(self) -> None:
+        # Back off: the next attempt reconnects after the retry interval
+        self.metrics.l2_errors += 1
+        if self._redis_manager is not None:
+            self._redis_manager.is_connected = False
+        self._last_redis_attempt = time.monotonic()
+
+    async def _redis_mget(self, keys: List[str]) -> List[Optional[bytes]]:
+        client = await self._get_redis_client()
+        if client is None:
+            return [None] * len(keys)
+        try:
+            return list(await client.mget(keys))
+        except Exception as e:
+            self._l2_failed()
+            logger.warning(f"Embedding cache L2 read failed: {e}")
+            return [None] * len(keys)
+
+    async def _redis_set_many(self, items: Dict[str, bytes]) -> None:
+        client = await self._get_redis_client()
+        if client is None:
+            return
+        try:
+            async with client.pipeline(transaction=False) as pipe:
+                for key, payload in items.items():
+                    pipe.setex(key, self.redis_ttl_seconds, payload)
+                await pipe.execute()
+        except Exception as e:
+            self._l2_failed()
+            logger.warning(f"Embedding cache L2 write failed: {e}")
+
+    # Public API
+
+    async def get(self, model: str, text: str) -> Optional[List[float]]:
+        return (await self.get_many(model, [text]))[0]
+
+    async def get_many(
+        self, model: str, texts: Sequence[str]
+    ) -> List[Optional[List[float]]]:
+        """Look up texts in L1, then fetch all L1 misses with one MGET."""
+        keys = [self.make_key(model, text) for text in texts]
+        found: List[Optional[List[float]]] = [self._get_local(key) for key in keys]
+
+        missing = [i for i, vector in enumerate(found) if vector is None]
+        if not missing:
+            return found
+
+        payloads = await self._redis_mget([keys[i] for i in missing])
+        for i, payload in zip(missing, payloads):
+            if payload is None:
+                self.metrics.l2_misses += 1
+                continue
+            self.metrics.l2_hits += 1
+            vector = self.unpack(payload)
+            # Promote to L1 (frombuffer arrays are already read-only)
+            self._put_local(keys[i], vector)
+            found[i] = vector.tolist()
+
+        return found
+
+    async def set(self, model: str, text: str, vector: Sequence[float]) -> None:
+        await self.set_many(model, [text], [vector])
+
+    async def set_many(
+        self, model: str, texts: Sequence[str], vectors: Sequence[Sequence[float]]
+    ) -> None:
+        """Store vectors in L1 and write them to L2 in one pipeline."""
+        items: Dict[str, bytes] = {}
+        for text, vector in zip(texts, vectors):
+            key = self.make_key(model, text)
+            array = np.array(vector, dtype=_VECTOR_DTYPE)
+            self._put_local(key, array)
+            items[key] = array.tobytes()
+        self.metrics.sets += len(items)
+        if items:
+            await self._redis_set_many(items)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "l1_entries": len(self.local),
+            "l1_max_entries": self.max_entries,
+            "l1_bytes": sum(getattr(v, "nbytes", 0) for v in self.local.values()),
+            "l2_enabled": self.redis_enabled,
+            "l2_connected": bool(
+                self._redis_manager is not None and self._redis_manager.is_connected
+            ),
+            "l2_ttl_seconds": self.redis_ttl_seconds,
+            **self.metrics.to_dict(),
+        }
+
+
+# Global embedding cache instance
+_embedding_cache: Optional[EmbeddingCache] = None
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Get the process-wide embedding cache."""
+    global _embedding_cache
+    if _embedding_cache is None:
+        _embedding_cache = EmbeddingCache()
+    return _embedding_cache
@@ -3,6 +3,7 @@
 Redis 연결 관리 및 최적화 시스템
 """
 
+import asyncio
 import logging
 import pickle
 import gzip
@@ -582,6 +583,22 @@ async def get_redis_manager() -> RedisManager:
     return _redis_manager
 
 
+async def get_redis_client(timeout: float = 3.0) -> Optional[Any]:
+    """전역 매니저의 raw 클라이언트 조회 (Redis 연결 불가 시 None)
+
+    RedisManager가 감싸지 않는 명령(INCR, PUBLISH, Streams 등)용.
+    """
+    if not REDIS_AVAILABLE:
+        return None
+    try:
+        manager = await asyncio.wait_for(get_redis_manager(), timeout=timeout)
+        if await manager.ensure_connection():
+            return manager.client
+    except Exception as e:
+        logger.debug(f"Redis client unavailable: {e}")
+    return None
+
+
 async def initialize_redis_manager(config: Optional[RedisConfig] = None) -> RedisManager:
     """Redis 매니저 초기화"""
     global _redis_manager
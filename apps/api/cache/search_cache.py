@@ -13,6 +13,8 @@ from typing import List, Dict, Any, Optional, cast
 from dataclasses import dataclass
 import logging
 
+from .embedding_cache import get_embedding_cache
+
 logger = logging.getLogger(__name__)
 
 # Redis 호환 인터페이스 (실제 Redis 또는 메모리 폴백)
@@ -311,29 +313,14 @@ class HybridSearchCache:
     async def get_embedding(
         self, text: str, model: str = "openai"
     ) -> Optional[List[float]]:
-        """임베딩 캐시 조회"""
-        cache_key = self._generate_cache_key(
-            self.config.embedding_prefix, text=text, model=model
-        )
-
-        # 임베딩은 L2(Redis)만 사용 (크기가 크고 재사용 빈도 높음)
-        result = await self.redis_cache.get(cache_key)
-        if result is not None:
-            self.stats["l2_hits"] += 1
-            return cast(Optional[List[float]], result)
-
-        self.stats["l2_misses"] += 1
-        return None
+        """임베딩 캐시 조회 (공유 임베딩 캐시에 위임)"""
+        return await get_embedding_cache().get(model, text)
 
     async def set_embedding(
         self, text: str, embedding: List[float], model: str = "openai"
     ) -> None:
-        """임베딩 캐시 저장"""
-        cache_key = self._generate_cache_key(
-            self.config.embedding_prefix, text=text, model=model
-        )
-
-        await self.redis_cache.set(cache_key, embedding)
+        """임베딩 캐시 저장 (공유 임베딩 캐시에 위임)"""
+        await get_embedding_cache().set(model, text, embedding)
         self.stats["sets"] += 1
 
     async def get_query_suggestions(self, partial_query: str) -> Optional[List[str]]:
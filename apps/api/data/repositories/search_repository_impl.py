@@ -34,6 +34,8 @@ from ...database import (
 )
 # Import CaseBank models for mentor memory system
 from ...database.daos.casebank_dao import CaseBankDAO
+from ...database.utils import ANNSearchParams
+from ...optimization.concurrency_control import ConcurrencyLimitExceeded
 import json
 
 logger = logging.getLogger(__name__)
@@ -62,6 +64,7 @@ class SearchRepositoryImpl(ISearchRepository):
                 bm25_topk=params.bm25_topk,
                 vector_topk=params.vector_topk,
                 rerank_candidates=params.rerank_candidates,
+                ann_params=self._ann_params(params),
             )
 
             # Apply reranking if enabled
@@ -71,6 +74,8 @@ class SearchRepositoryImpl(ISearchRepository):
                 )
 
             return self._convert_to_search_results(raw_results, params.include_metadata)
+        except ConcurrencyLimitExceeded:
+            raise
         except Exception as e:
             logger.error(f"Hybrid search failed: {e}")
             return []
@@ -101,6 +106,7 @@ class SearchRepositoryImpl(ISearchRepository):
                 query_embedding,
                 params.top_k,
                 params.filters,
+                self._ann_params(params),
             )
 
             return self._convert_to_search_results(raw_results, params.include_metadata)
@@ -330,6 +336,22 @@ class SearchRepositoryImpl(ISearchRepository):
 
     # Helper Methods
 
+    @staticmethod
+    def _ann_params(params: SearchParams) -> Optional[ANNSearchParams]:
+        """ANN tuning of the search, if any; invalid values fall back to defaults"""
+        try:
+            return ANNSearchParams.from_retrieval_config(
+                {
+                    "ef_search": params.ef_search,
+                    "probes": params.probes,
+                    "vector_prefix_dims": params.vector_prefix_dims,
+                    "rescore_oversample": params.rescore_oversample,
+                }
+            )
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Ignoring invalid ANN settings in search params: {e}")
+            return None
+
     def _convert_to_search_results(
         self,
         raw_results: List[Dict[str, Any]],
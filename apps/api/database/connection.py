@@ -35,6 +35,7 @@ __all__ = [
     "get_json_type",
     "get_array_type",
     "get_vector_type",
+    "get_tsvector_type",
     "get_uuid_type",
     "PGVECTOR_AVAILABLE",
 ]
@@ -117,6 +118,15 @@ def get_vector_type(dimensions: int = 1536) -> Any:
     return get_array_type(Float)
 
 
+def get_tsvector_type() -> Any:
+    """Get appropriate full-text search vector type based on database."""
+    if "postgresql" in DATABASE_URL:
+        from sqlalchemy.dialects.postgresql import TSVECTOR
+        return TSVECTOR
+    # SQLite fallback - full-text search uses the chunks_fts virtual table
+    return TEXT
+
+
 def get_uuid_type() -> Any:
     """Get appropriate UUID type based on database."""
     if "sqlite" in DATABASE_URL:
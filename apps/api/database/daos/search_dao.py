@@ -6,17 +6,29 @@ Search Data Access Object for hybrid search operations.
 
 from __future__ import annotations
 
-import json
 import logging
 from datetime import datetime
-from typing import Dict, Any, List, Optional, cast
+from typing import Dict, Any, List, Optional, Tuple
 
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ...optimization.concurrency_control import ConcurrencyLimitExceeded
 from ..connection import DATABASE_URL
 from ..utils.embedding_service import EmbeddingService
 from ..utils.reranker import CrossEncoderReranker, BM25_WEIGHT, VECTOR_WEIGHT
+from ..utils.taxonomy_filter import taxonomy_subtree_condition
+from ..utils.vector_index import (
+    ANNSearchParams,
+    ann_index_sql,
+    apply_ann_params,
+    candidate_ann_params,
+    candidate_distance_sql,
+    get_prefix_index_dims,
+    get_vector_metric,
+    query_vector_param,
+    rescore_candidates,
+)
 from .database_manager import db_manager
 
 logger = logging.getLogger(__name__)
@@ -35,14 +47,14 @@ class SearchDAO:
         bm25_topk: int = 12,
         vector_topk: int = 12,
         rerank_candidates: int = 50,
+        ann_params: Optional[ANNSearchParams] = None,
     ) -> List[Dict[str, Any]]:
         """Optimized hybrid search (BM25 + Vector parallel processing)."""
         # Try async optimization engine
         try:
-            # Future implementations - not yet available
-            from apps.api.optimization.async_executor import get_async_optimizer  # type: ignore[import-not-found]
-            from apps.api.optimization.memory_optimizer import get_gc_optimizer  # type: ignore[import-not-found]
-            from apps.api.optimization.concurrency_control import get_concurrency_controller  # type: ignore[import-not-found]
+            from apps.api.optimization.async_executor import get_async_optimizer
+            from apps.api.optimization.memory_optimizer import get_gc_optimizer
+            from apps.api.optimization.concurrency_control import get_concurrency_controller
 
             optimizer = await get_async_optimizer()
             gc_optimizer = get_gc_optimizer()
@@ -58,14 +70,24 @@ class SearchDAO:
                         vector_topk,
                         rerank_candidates,
                         optimizer,
+                        ann_params,
                     )
 
         except ImportError:
             # Fallback: legacy method
             logger.warning("Optimization modules not available, using legacy search")
             return await SearchDAO._execute_legacy_hybrid_search(
-                query, filters or {}, topk, bm25_topk, vector_topk, rerank_candidates
+                query,
+                filters or {},
+                topk,
+                bm25_topk,
+                vector_topk,
+                rerank_candidates,
+                ann_params,
             )
+        except ConcurrencyLimitExceeded:
+            # Overload is retryable; callers must see it, not fallback results
+            raise
         except Exception as e:
             logger.error(f"Optimized hybrid search failed: {e}")
             return await SearchDAO._get_fallback_search(query)
@@ -79,6 +101,7 @@ class SearchDAO:
         vector_topk: int,
         rerank_candidates: int,
         optimizer: Any,
+        ann_params: Optional[ANNSearchParams] = None,
     ) -> List[Dict[str, Any]]:
         """Execute optimized hybrid search."""
         async with db_manager.async_session() as session:
@@ -91,6 +114,7 @@ class SearchDAO:
                     "bm25_topk": bm25_topk,
                     "vector_topk": vector_topk,
                     "filters": filters,
+                    "ann_params": ann_params,
                 }
 
                 bm25_results, vector_results, execution_metrics = (
@@ -112,9 +136,12 @@ class SearchDAO:
                     )
                 )
 
-                # 4. Cross-encoder reranking (CPU-intensive)
-                final_results = await optimizer.execute_cpu_intensive_task(
-                    CrossEncoderReranker.rerank_results, query, combined_results, topk
+                # 4. Cross-encoder reranking (CPU-intensive, off the event loop)
+                final_results = await CrossEncoderReranker.rerank_results_async(
+                    query,
+                    combined_results,
+                    topk,
+                    heuristic_runner=optimizer.execute_cpu_intensive_task,
                 )
 
                 # 5. Add performance metrics
@@ -127,14 +154,21 @@ class SearchDAO:
                         "memory_usage": execution_metrics.memory_usage,
                         "optimization_enabled": True,
                     }
+                    result["metadata"]["optimization_enabled"] = True
 
-                return cast(List[Dict[str, Any]], final_results)
+                return final_results
 
             except Exception as e:
                 logger.error(f"Optimized search execution failed: {e}")
                 # Fallback: legacy method
                 return await SearchDAO._execute_legacy_hybrid_search(
-                    query, filters, topk, bm25_topk, vector_topk, rerank_candidates
+                    query,
+                    filters,
+                    topk,
+                    bm25_topk,
+                    vector_topk,
+                    rerank_candidates,
+                    ann_params,
                 )
 
     @staticmethod
@@ -145,6 +179,7 @@ class SearchDAO:
         bm25_topk: int,
         vector_topk: int,
         rerank_candidates: int,
+        ann_params: Optional[ANNSearchParams] = None,
     ) -> List[Dict[str, Any]]:
         """Legacy hybrid search (sequential execution)."""
         async with db_manager.async_session() as session:
@@ -159,7 +194,7 @@ class SearchDAO:
 
                 # 3. Perform Vector search
                 vector_results = await SearchDAO._perform_vector_search(
-                    session, query_embedding, vector_topk, filters
+                    session, query_embedding, vector_topk, filters, ann_params
                 )
 
                 # 4. Combine results and remove duplicates
@@ -168,7 +203,7 @@ class SearchDAO:
                 )
 
                 # 5. Cross-encoder reranking
-                final_results = CrossEncoderReranker.rerank_results(
+                final_results = await CrossEncoderReranker.rerank_results_async(
                     query, combined_results, topk
                 )
 
@@ -190,7 +225,7 @@ class SearchDAO:
     ) -> List[Dict[str, Any]]:
         """Perform BM25 search (SQLite/PostgreSQL compatible)."""
         try:
-            filter_clause = SearchDAO._build_filter_clause(filters)
+            filter_clause, filter_params = SearchDAO._build_filter_clause(filters)
 
             if "sqlite" in DATABASE_URL:
                 # SQLite simple text matching
@@ -205,33 +240,35 @@ class SearchDAO:
                     JOIN documents d ON c.doc_id = d.doc_id
                     LEFT JOIN doc_taxonomy dt ON d.doc_id = dt.doc_id
                     WHERE c.text LIKE '%' || :query || '%'
+                    AND c.deleted_at IS NULL
                     {filter_clause}
                     ORDER BY bm25_score DESC
                     LIMIT :topk
                 """
                 )
             else:
-                # PostgreSQL full-text search
+                # PostgreSQL full-text search on the stored, GIN-indexed
+                # search_tsv column (title weighted A, text weighted B)
                 bm25_query = text(
                     f"""
                     SELECT c.chunk_id, c.text, d.title, d.source_url,
                            dt.path,
-                           ts_rank_cd(
-                               to_tsvector('english', c.text || ' ' || COALESCE(d.title, '')),
-                               websearch_to_tsquery('english', :query),
-                               32
-                           ) as bm25_score
+                           ts_rank_cd(c.search_tsv, q, 32) as bm25_score
                     FROM chunks c
                     JOIN documents d ON c.doc_id = d.doc_id
                     LEFT JOIN doc_taxonomy dt ON d.doc_id = dt.doc_id
-                    WHERE to_tsvector('english', c.text || ' ' || COALESCE(d.title, '')) @@ websearch_to_tsquery('english', :query)
+                    CROSS JOIN websearch_to_tsquery('english', :query) AS q
+                    WHERE c.search_tsv @@ q
+                    AND c.deleted_at IS NULL
                     {filter_clause}
                     ORDER BY bm25_score DESC
                     LIMIT :topk
                 """
                 )
 
-            result = await session.execute(bm25_query, {"query": query, "topk": topk})
+            result = await session.execute(
+                bm25_query, {"query": query, "topk": topk, **filter_params}
+            )
             rows = result.fetchall()
 
             results = []
@@ -263,10 +300,17 @@ class SearchDAO:
         query_embedding: List[float],
         topk: int,
         filters: Optional[Dict] = None,
+        ann_params: Optional[ANNSearchParams] = None,
     ) -> List[Dict[str, Any]]:
-        """Perform Vector similarity search (SQLite/PostgreSQL compatible)."""
+        """Perform Vector similarity search (SQLite/PostgreSQL compatible).
+
+        The query embedding is bound as a vector parameter so the statement
+        text stays constant across queries, and ``ann_params`` tunes the ANN
+        index (ef_search/probes, two-stage prefix_dims) for this transaction
+        only.
+        """
         try:
-            filter_clause = SearchDAO._build_filter_clause(filters)
+            filter_clause, filter_params = SearchDAO._build_filter_clause(filters)
 
             if "sqlite" in DATABASE_URL:
                 # SQLite fallback
@@ -278,37 +322,70 @@ class SearchDAO:
                     JOIN documents d ON c.doc_id = d.doc_id
                     LEFT JOIN doc_taxonomy dt ON d.doc_id = dt.doc_id
                     JOIN embeddings e ON c.chunk_id = e.chunk_id
-                    WHERE e.vec IS NOT NULL
+                    WHERE e.vec IS NOT NULL AND c.deleted_at IS NULL
                     {filter_clause}
                     ORDER BY c.chunk_id
                     LIMIT :topk
                 """
                 )
 
-                result = await session.execute(vector_query, {"topk": topk})
+                result = await session.execute(
+                    vector_query, {"topk": topk, **filter_params}
+                )
             else:
                 # PostgreSQL pgvector search
                 try:
-                    vector_query = text(
-                        f"""
-                        SELECT c.chunk_id, c.text, d.title, d.source_url,
-                               dt.path,
-                               1.0 - (e.vec <-> :query_vector::vector) as vector_score
-                        FROM chunks c
-                        JOIN documents d ON c.doc_id = d.doc_id
-                        JOIN embeddings e ON c.chunk_id = e.chunk_id
-                        LEFT JOIN doc_taxonomy dt ON d.doc_id = dt.doc_id
-                        WHERE e.vec IS NOT NULL
-                        {filter_clause}
-                        ORDER BY e.vec <-> :query_vector::vector
-                        LIMIT :topk
-                    """
-                    )
-
-                    vector_str = "[" + ",".join(map(str, query_embedding)) + "]"
-
+                    metric = get_vector_metric()
+                    candidate_order = candidate_distance_sql(metric, ann_params)
+                    if candidate_order:
+                        # Candidates through the prefix or halfvec index,
+                        # re-ranked by full-precision distance
+                        candidates = rescore_candidates(
+                            topk, ANNSearchParams.resolve(ann_params).rescore_oversample
+                        )
+                        vector_query = text(
+                            f"""
+                            SELECT chunk_id, text, title, source_url, path,
+                                   {metric.similarity_sql("vec")} as vector_score
+                            FROM (
+                                SELECT c.chunk_id, c.text, d.title, d.source_url,
+                                       dt.path, e.vec
+                                FROM chunks c
+                                JOIN documents d ON c.doc_id = d.doc_id
+                                JOIN embeddings e ON c.chunk_id = e.chunk_id
+                                LEFT JOIN doc_taxonomy dt ON d.doc_id = dt.doc_id
+                                WHERE e.vec IS NOT NULL AND c.deleted_at IS NULL
+                                {filter_clause}
+                                ORDER BY {candidate_order}
+                                LIMIT :rescore_candidates
+                            ) rescored_candidates
+                            ORDER BY {metric.distance_sql("vec")}
+                            LIMIT :topk
+                        """
+                        ).bindparams(query_vector_param(len(query_embedding)))
+                        ann_params = candidate_ann_params(ann_params, candidates)
+                        filter_params = {**filter_params, "rescore_candidates": candidates}
+                    else:
+                        vector_query = text(
+                            f"""
+                            SELECT c.chunk_id, c.text, d.title, d.source_url,
+                                   dt.path,
+                                   {metric.similarity_sql("e.vec")} as vector_score
+                            FROM chunks c
+                            JOIN documents d ON c.doc_id = d.doc_id
+                            JOIN embeddings e ON c.chunk_id = e.chunk_id
+                            LEFT JOIN doc_taxonomy dt ON d.doc_id = dt.doc_id
+                            WHERE e.vec IS NOT NULL AND c.deleted_at IS NULL
+                            {filter_clause}
+                            ORDER BY {metric.distance_sql("e.vec")}
+                            LIMIT :topk
+                        """
+                        ).bindparams(query_vector_param(len(query_embedding)))
+
+                    await apply_ann_params(session, ann_params)
                     result = await session.execute(
-                        vector_query, {"query_vector": vector_str, "topk": topk}
+                        vector_query,
+                        {"query_vector": query_embedding, "topk": topk, **filter_params},
                     )
                 except Exception as vector_error:
                     # Fallback to Python calculation
@@ -323,14 +400,16 @@ class SearchDAO:
                         JOIN documents d ON c.doc_id = d.doc_id
                         LEFT JOIN doc_taxonomy dt ON d.doc_id = dt.doc_id
                         JOIN embeddings e ON c.chunk_id = e.chunk_id
-                        WHERE e.vec IS NOT NULL
+                        WHERE e.vec IS NOT NULL AND c.deleted_at IS NULL
                         {filter_clause}
                         ORDER BY c.chunk_id
                         LIMIT :topk
                     """
                     )
 
-                    result = await session.execute(vector_query, {"topk": topk})
+                    result = await session.execute(
+                        vector_query, {"topk": topk, **filter_params}
+                    )
 
             rows = result.fetchall()
 
@@ -358,47 +437,51 @@ class SearchDAO:
             return []
 
     @staticmethod
-    def _build_filter_clause(filters: Optional[Dict] = None) -> str:
-        """Build filter condition SQL clause (SQLite/PostgreSQL compatible)."""
+    def _build_filter_clause(
+        filters: Optional[Dict] = None,
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Build filter condition SQL clause and its bound parameters
+        (SQLite/PostgreSQL compatible)."""
         if not filters:
-            return ""
+            return "", {}
 
         conditions = []
+        params: Dict[str, Any] = {}
 
-        # canonical_in filter (classification path filtering)
+        # canonical_in filter (classification subtree filtering)
         if "canonical_in" in filters:
             canonical_paths = filters["canonical_in"]
             if canonical_paths:
-                path_conditions = []
-                for path in canonical_paths:
-                    if isinstance(path, list) and path:
-                        if "sqlite" in DATABASE_URL:
-                            path_str = json.dumps(path)
-                            path_conditions.append(f"dt.path = '{path_str}'")
-                        else:
-                            path_str = "{" + ",".join(f"'{p}'" for p in path) + "}"
-                            path_conditions.append(f"dt.path = '{path_str}'::text[]")
-
-                if path_conditions:
-                    conditions.append(f"({' OR '.join(path_conditions)})")
+                path_condition, path_params = taxonomy_subtree_condition(
+                    [path for path in canonical_paths if isinstance(path, list)],
+                    postgresql="sqlite" not in DATABASE_URL,
+                )
+                if path_condition:
+                    conditions.append(path_condition)
+                    params.update(path_params)
 
         # doc_type filter
         if "doc_type" in filters:
             doc_types = filters["doc_type"]
             if isinstance(doc_types, list) and doc_types:
-                type_conditions = [f"d.content_type = '{dt}'" for dt in doc_types]
+                type_conditions = []
+                for idx, doc_type in enumerate(doc_types):
+                    params[f"doc_type_{idx}"] = str(doc_type)
+                    type_conditions.append(f"d.content_type = :doc_type_{idx}")
                 conditions.append(f"({' OR '.join(type_conditions)})")
 
         if conditions:
-            return " AND " + " AND ".join(conditions)
+            return " AND " + " AND ".join(conditions), params
 
-        return ""
+        return "", {}
 
     @staticmethod
     def _combine_search_results(
         bm25_results: List[Dict[str, Any]],
         vector_results: List[Dict[str, Any]],
         max_candidates: int,
+        bm25_weight: float = BM25_WEIGHT,
+        vector_weight: float = VECTOR_WEIGHT,
     ) -> List[Dict[str, Any]]:
         """Combine BM25 and Vector search results."""
         combined = {}
@@ -418,7 +501,7 @@ class SearchDAO:
                 bm25_score = combined[chunk_id]["metadata"]["bm25_score"]
                 vector_score = result["metadata"]["vector_score"]
                 combined[chunk_id]["score"] = (
-                    BM25_WEIGHT * bm25_score + VECTOR_WEIGHT * vector_score
+                    bm25_weight * bm25_score + vector_weight * vector_score
                 )
                 combined[chunk_id]["metadata"]["source"] = "hybrid"
             else:
@@ -445,8 +528,9 @@ class SearchDAO:
                 ]
             else:
                 optimization_queries = [
-                    "CREATE INDEX IF NOT EXISTS idx_chunks_text_fts ON chunks USING GIN (to_tsvector('english', text))",
-                    "CREATE INDEX IF NOT EXISTS idx_embeddings_vec_cosine ON embeddings USING ivfflat (vec vector_cosine_ops) WITH (lists = 100)",
+                    "CREATE INDEX IF NOT EXISTS idx_chunks_search_tsv ON chunks USING GIN (search_tsv)",
+                    ann_index_sql(),
+                    *(ann_index_sql(prefix_dims=dims) for dims in get_prefix_index_dims()),
                     "CREATE INDEX IF NOT EXISTS idx_chunks_doc_id ON chunks (doc_id)",
                     "CREATE INDEX IF NOT EXISTS idx_embeddings_chunk_id ON embeddings (chunk_id)",
                     "CREATE INDEX IF NOT EXISTS idx_doc_taxonomy_doc_id ON doc_taxonomy (doc_id)",
@@ -487,7 +571,7 @@ class SearchDAO:
         try:
             stats_queries = {
                 "total_docs": "SELECT COUNT(*) FROM documents",
-                "total_chunks": "SELECT COUNT(*) FROM chunks",
+                "total_chunks": "SELECT COUNT(*) FROM chunks WHERE deleted_at IS NULL",
                 "embedded_chunks": "SELECT COUNT(*) FROM embeddings",
                 "taxonomy_mappings": "SELECT COUNT(*) FROM doc_taxonomy",
             }
@@ -13,7 +13,14 @@ from typing import Dict, Any, List, Optional
 from sqlalchemy import String, Integer, Float, DateTime, Boolean, Text, ForeignKey, text
 from sqlalchemy.orm import Mapped, mapped_column
 
-from ..connection import Base, get_json_type, get_array_type, get_uuid_type, get_vector_type
+from ..connection import (
+    Base,
+    get_json_type,
+    get_array_type,
+    get_uuid_type,
+    get_vector_type,
+    get_tsvector_type,
+)
 
 __all__ = ["Document", "DocumentChunk", "Embedding", "DocTaxonomy"]
 
@@ -70,6 +77,14 @@ class DocumentChunk(Base):
     pii_types: Mapped[Optional[List[str]]] = mapped_column(
         get_array_type(String), default=list
     )
+    # Weighted title/text tsvector maintained by DB triggers (migration 0015)
+    search_tsv: Mapped[Optional[Any]] = mapped_column(
+        get_tsvector_type(), nullable=True, deferred=True
+    )
+    # SHA-256 of the normalized text; reused chunks keep their embedding (0017)
+    content_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    # Set when re-ingestion drops the chunk; its embedding row is deleted
+    deleted_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
 
 
 class Embedding(Base):
@@ -5,11 +5,51 @@ Utility modules for the database package.
 """
 
 from .bm25_scorer import BM25Scorer
+from .bulk_write import (
+    bulk_insert_chunks,
+    bulk_insert_documents,
+    bulk_upsert_embeddings,
+)
 from .embedding_service import EmbeddingService
+from .filtered_ann import FilteredANNPlan, FilteredANNPlanner, get_filtered_ann_planner
+from .local_vector_index import (
+    LocalVectorIndex,
+    get_local_vector_index,
+    vector_search_backend,
+)
 from .reranker import CrossEncoderReranker
+from .taxonomy_filter import taxonomy_path_key, taxonomy_subtree_condition
+from .cross_encoder import CrossEncoderStage, get_cross_encoder_stage
+from .vector_index import (
+    ANNSearchParams,
+    VectorMetric,
+    apply_ann_params,
+    get_vector_metric,
+    get_vector_quantization,
+    query_vector_param,
+)
 
 __all__ = [
     "BM25Scorer",
+    "bulk_insert_chunks",
+    "bulk_insert_documents",
+    "bulk_upsert_embeddings",
     "EmbeddingService",
+    "FilteredANNPlan",
+    "FilteredANNPlanner",
+    "get_filtered_ann_planner",
+    "LocalVectorIndex",
+    "get_local_vector_index",
+    "vector_search_backend",
     "CrossEncoderReranker",
+    "taxonomy_path_key",
+    "taxonomy_subtree_condition",
+    "CrossEncoderStage",
+    "get_cross_encoder_stage",
+    "ANNSearchParams",
+    "VectorMetric",
+    "apply_ann_params",
+    "get_vector_metric",
+    "get_vector_quantization",
+    "query_vector_param",
 ]
@@ -0,0 +1,148 @@
+"""
+Bulk persistence helpers for ingestion and embedding backfills.
+
+On PostgreSQL + asyncpg embedding rows are streamed with binary ``COPY``
+into a transaction-local staging table and merged into ``embeddings`` with
+one ``INSERT ... SELECT ... ON CONFLICT`` statement. Other dialects fall
+back to a single ``executemany`` of the same upsert. Document and chunk rows
+go through Core ``insert()`` executemany, which SQLAlchemy sends as
+multi-row ``VALUES`` statements without ORM unit-of-work bookkeeping.
+Either way one batch costs a constant number of round trips instead of one
+per chunk.
+
+@CODE:DATABASE-PKG-020
+"""
+
+from __future__ import annotations
+
+import logging
+import uuid
+from typing import Any, List, Mapping, Sequence, Tuple
+
+from sqlalchemy import bindparam, insert, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..connection import get_vector_type
+from ..models.document import Document, DocumentChunk
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["bulk_insert_chunks", "bulk_insert_documents", "bulk_upsert_embeddings"]
+
+EMBEDDING_STAGING_TABLE = "embeddings_staging"
+
+_CREATE_STAGING_SQL = f"""
+    CREATE TEMP TABLE IF NOT EXISTS {EMBEDDING_STAGING_TABLE} (
+        embedding_id UUID,
+        chunk_id UUID,
+        vec REAL[],
+        model_name TEXT
+    ) ON COMMIT DELETE ROWS
+"""
+
+# DISTINCT ON: ON CONFLICT cannot update the same row twice in one statement
+_MERGE_STAGING_SQL = f"""
+    INSERT INTO embeddings (embedding_id, chunk_id, vec, model_name, created_at)
+    SELECT DISTINCT ON (chunk_id) embedding_id, chunk_id, vec::vector, model_name, NOW()
+    FROM {EMBEDDING_STAGING_TABLE}
+    ON CONFLICT (chunk_id) DO UPDATE SET
+        vec = EXCLUDED.vec,
+        model_name = EXCLUDED.model_name,
+        created_at = EXCLUDED.created_at
+"""
+
+_UPSERT_SQL = """
+    INSERT INTO embeddings (embedding_id, chunk_id, vec, model_name, created_at)
+    VALUES (:embedding_id, :chunk_id, :vec, :model_name, CURRENT_TIMESTAMP)
+    ON CONFLICT (chunk_id) DO UPDATE SET
+        vec = EXCLUDED.vec,
+        model_name = EXCLUDED.model_name,
+        created_at = EXCLUDED.created_at
+"""
+
+
+async def _driver_connection(session: AsyncSession) -> Any:
+    """Return the asyncpg connection behind the session, or None."""
+    connection = await session.connection()
+    if connection.dialect.name != "postgresql" or connection.dialect.driver != "asyncpg":
+        return None
+    raw = await connection.get_raw_connection()
+    return raw.driver_connection
+
+
+async def _insert_many(
+    session: AsyncSession, table: Any, rows: Sequence[Mapping[str, Any]]
+) -> int:
+    if not rows:
+        return 0
+    # Core insert on the Table: no identity map, no per-object flush events
+    await session.execute(insert(table), list(rows))
+    return len(rows)
+
+
+async def bulk_insert_documents(
+    session: AsyncSession, rows: Sequence[Mapping[str, Any]]
+) -> int:
+    """Insert ``documents`` rows in bulk; every row must have the same keys.
+
+    Runs inside the caller's transaction; the caller commits.
+    """
+    return await _insert_many(session, Document.__table__, rows)
+
+
+async def bulk_insert_chunks(
+    session: AsyncSession, rows: Sequence[Mapping[str, Any]]
+) -> int:
+    """Insert ``chunks`` rows in bulk; every row must have the same keys.
+
+    Runs inside the caller's transaction; the caller commits.
+    """
+    return await _insert_many(session, DocumentChunk.__table__, rows)
+
+
+async def bulk_upsert_embeddings(
+    session: AsyncSession,
+    rows: Sequence[Tuple[Any, Sequence[float]]],
+    model_name: str,
+) -> int:
+    """Upsert ``(chunk_id, vector)`` rows into ``embeddings`` in bulk.
+
+    Runs inside the caller's transaction; the caller commits.
+    Returns the number of rows written.
+    """
+    if not rows:
+        return 0
+
+    driver = await _driver_connection(session)
+    if driver is not None:
+        records: List[Tuple[Any, ...]] = [
+            (uuid.uuid4(), chunk_id, [float(x) for x in vec], model_name)
+            for chunk_id, vec in rows
+        ]
+        await session.execute(text(_CREATE_STAGING_SQL))
+        await session.execute(text(f"TRUNCATE {EMBEDDING_STAGING_TABLE}"))
+        await driver.copy_records_to_table(
+            EMBEDDING_STAGING_TABLE,
+            records=records,
+            columns=["embedding_id", "chunk_id", "vec", "model_name"],
+        )
+        await session.execute(text(_MERGE_STAGING_SQL))
+        return len(records)
+
+    dimensions = len(rows[0][1])
+    statement = text(_UPSERT_SQL).bindparams(
+        bindparam("vec", type_=get_vector_type(dimensions))
+    )
+    await session.execute(
+        statement,
+        [
+            {
+                "embedding_id": str(uuid.uuid4()),
+                "chunk_id": str(chunk_id),
+                "vec": list(vec),
+                "model_name": model_name,
+            }
+            for chunk_id, vec in rows
+        ],
+    )
+    return len(rows)
@@ -0,0 +1,381 @@
+"""
+Cross-encoder reranking stage with pluggable CPU backends.
+
+All (query, chunk) pairs of a request are scored in a single batched
+forward pass on a dedicated single-purpose thread pool, so model inference
+never blocks the event loop and never competes with the search fusion pool.
+Scores are cached per (query hash, chunk_id, model). A latency budget bounds
+the stage: when inference does not finish in time the caller falls back to
+heuristic reranking, and the late scores still land in the cache.
+
+Backends:
+- sentence_transformers: ``sentence_transformers.CrossEncoder`` on CPU
+- onnx: ONNX Runtime session + Hugging Face tokenizer
+
+Configuration (environment):
+- SEARCH_RERANKER_BACKEND: heuristic (default) | sentence_transformers | onnx
+- SEARCH_CROSS_ENCODER_MODEL: model name or path
+- SEARCH_CROSS_ENCODER_ONNX_PATH: ONNX model file (onnx backend)
+- SEARCH_RERANK_BUDGET_MS, SEARCH_RERANK_CACHE_SIZE, SEARCH_RERANK_MAX_BATCH
+
+@CODE:DATABASE-PKG-019
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import inspect
+import logging
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from sentence_transformers import CrossEncoder
+
+    SENTENCE_TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    SENTENCE_TRANSFORMERS_AVAILABLE = False
+    CrossEncoder = None
+
+try:
+    import onnxruntime
+    from transformers import AutoTokenizer
+
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+    onnxruntime = None
+    AutoTokenizer = None
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "RerankerBackend",
+    "SentenceTransformersBackend",
+    "ONNXCrossEncoderBackend",
+    "RerankScoreCache",
+    "CrossEncoderMetrics",
+    "CrossEncoderStage",
+    "relevance_from_logits",
+    "get_cross_encoder_stage",
+    "shutdown_cross_encoder_stage",
+    "SENTENCE_TRANSFORMERS_AVAILABLE",
+    "ONNX_AVAILABLE",
+]
+
+DEFAULT_CROSS_ENCODER_MODEL = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+
+
+def relevance_from_logits(scores: np.ndarray) -> np.ndarray:
+    """Map cross-encoder logits to (0, 1) relevance with a sigmoid."""
+    return 1.0 / (1.0 + np.exp(-scores.astype(np.float64)))
+
+
+def _identity_activation(logits: Any) -> Any:
+    return logits
+
+
+class RerankerBackend:
+    """Synchronous CPU scorer for (query, text) pairs.
+
+    ``predict`` receives every pair of a request at once and must return one
+    raw logit per pair (higher is better); callers map logits to relevance
+    with :func:`relevance_from_logits`, so every backend scores alike. It
+    runs on the stage's executor thread, never on the event loop.
+    """
+
+    model_name: str = "unknown"
+
+    def predict(self, pairs: Sequence[Tuple[str, str]]) -> np.ndarray:
+        raise NotImplementedError
+
+
+class SentenceTransformersBackend(RerankerBackend):
+    """sentence-transformers CrossEncoder on CPU (loaded on first use)."""
+
+    def __init__(self, model_name: str = DEFAULT_CROSS_ENCODER_MODEL, max_length: int = 512) -> None:
+        if not SENTENCE_TRANSFORMERS_AVAILABLE:
+            raise ImportError("sentence-transformers is not installed")
+        self.model_name = model_name
+        self.max_length = max_length
+        self._model: Optional[Any] = None
+        self._activation_arg = "activation_fct"
+
+    def predict(self, pairs: Sequence[Tuple[str, str]]) -> np.ndarray:
+        if self._model is None:
+            self._model = CrossEncoder(self.model_name, max_length=self.max_length, device="cpu")
+            # Renamed activation_fn in sentence-transformers 4
+            if "activation_fn" in inspect.signature(self._model.predict).parameters:
+                self._activation_arg = "activation_fn"
+        # CrossEncoder applies a sigmoid to single-label models by default;
+        # return raw logits like the ONNX backend. batch_size = all pairs:
+        # one forward pass per request
+        scores = self._model.predict(
+            list(pairs),
+            batch_size=max(1, len(pairs)),
+            convert_to_numpy=True,
+            apply_softmax=False,
+            **{self._activation_arg: _identity_activation},
+        )
+        return np.asarray(scores, dtype=np.float32).reshape(-1)
+
+
+class ONNXCrossEncoderBackend(RerankerBackend):
+    """Cross-encoder exported to ONNX, run with ONNX Runtime on CPU."""
+
+    def __init__(
+        self,
+        model_path: str,
+        tokenizer_name: str = DEFAULT_CROSS_ENCODER_MODEL,
+        max_length: int = 512,
+        intra_op_threads: Optional[int] = None,
+    ) -> None:
+        if not ONNX_AVAILABLE:
+            raise ImportError("onnxruntime and transformers are required for the ONNX backend")
+        self.model_name = f"onnx:{tokenizer_name}"
+        self.max_length = max_length
+
+        options = onnxruntime.SessionOptions()
+        if intra_op_threads:
+            options.intra_op_num_threads = intra_op_threads
+        self._session = onnxruntime.InferenceSession(
+            model_path, sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self._input_names = {i.name for i in self._session.get_inputs()}
+        self._tokenizer = AutoTokenizer.from_pretrained(tokenizer_name)
+
+    def predict(self, pairs: Sequence[Tuple[str, str]]) -> np.ndarray:
+        encoded = self._tokenizer(
+            [query for query, _ in pairs],
+            [text for _, text in pairs],
+            padding=True,
+            truncation=True,
+            max_length=self.max_length,
+            return_tensors="np",
+        )
+        feeds = {
+            name: np.asarray(value, dtype=np.int64)
+            for name, value in encoded.items()
+            if name in self._input_names
+        }
+        logits = self._session.run(None, feeds)[0]
+        return np.asarray(logits, dtype=np.float32).reshape(len(pairs), -1)[:, 0]
+
+
+class RerankScoreCache:
+    """LRU cache of cross-encoder scores keyed by (query hash, chunk_id, model)."""
+
+    def __init__(self, max_entries: int = 10000) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str, str], float]" = OrderedDict()
+
+    @staticmethod
+    def query_hash(query: str) -> str:
+        return hashlib.sha1(query.strip().lower().encode("utf-8")).hexdigest()
+
+    def get(self, key: Tuple[str, str, str]) -> Optional[float]:
+        score = self._entries.get(key)
+        if score is not None:
+            self._entries.move_to_end(key)
+        return score
+
+    def put(self, key: Tuple[str, str, str], score: float) -> None:
+        self._entries[key] = score
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+@dataclass
+class CrossEncoderMetrics:
+    """Cross-encoder stage counters."""
+
+    requests: int = 0
+    pairs_scored: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    budget_exceeded: int = 0
+    errors: int = 0
+    total_inference_time: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class CrossEncoderStage:
+    """Batched, cached, latency-bounded cross-encoder scoring."""
+
+    def __init__(
+        self,
+        backend: RerankerBackend,
+        latency_budget_ms: Optional[float] = None,
+        cache_size: Optional[int] = None,
+        max_batch: Optional[int] = None,
+    ) -> None:
+        self.backend = backend
+        self.latency_budget_ms = latency_budget_ms or float(
+            os.getenv("SEARCH_RERANK_BUDGET_MS", "150")
+        )
+        self.max_batch = max_batch or int(os.getenv("SEARCH_RERANK_MAX_BATCH", "64"))
+        self.cache = RerankScoreCache(
+            cache_size or int(os.getenv("SEARCH_RERANK_CACHE_SIZE", "10000"))
+        )
+        self.metrics = CrossEncoderMetrics()
+
+        # One worker: requests queue behind each other instead of
+        # oversubscribing the CPU with concurrent forward passes
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="cross-encoder"
+        )
+
+    @property
+    def model_name(self) -> str:
+        return self.backend.model_name
+
+    def _timed_predict(self, pairs: List[Tuple[str, str]]) -> np.ndarray:
+        start_time = time.perf_counter()
+        try:
+            return self.backend.predict(pairs)
+        finally:
+            self.metrics.total_inference_time += time.perf_counter() - start_time
+
+    async def score(
+        self,
+        query: str,
+        candidates: Sequence[Tuple[str, str]],
+        latency_budget_ms: Optional[float] = None,
+    ) -> Optional[np.ndarray]:
+        """Score (chunk_id, text) candidates against the query.
+
+        Callers pass at most ``max_batch`` candidates (their best by hybrid
+        score). Returns one score per candidate, or None when the latency
+        budget is exceeded or inference fails (the caller should use its
+        heuristic).
+        """
+        self.metrics.requests += 1
+        if not candidates:
+            return np.empty(0, dtype=np.float32)
+
+        query_key = self.cache.query_hash(query)
+        model_name = self.model_name
+        scores = np.empty(len(candidates), dtype=np.float32)
+
+        missing: List[int] = []
+        for i, (chunk_id, _) in enumerate(candidates):
+            cached = self.cache.get((query_key, str(chunk_id), model_name))
+            if cached is None:
+                missing.append(i)
+            else:
+                scores[i] = cached
+
+        self.metrics.cache_hits += len(candidates) - len(missing)
+        self.metrics.cache_misses += len(missing)
+        if not missing:
+            return scores
+
+        pairs = [(query, candidates[i][1]) for i in missing]
+        missing_ids = [str(candidates[i][0]) for i in missing]
+
+        def store(future: "asyncio.Future[np.ndarray]") -> None:
+            # Also runs for late results after a budget timeout
+            if future.cancelled() or future.exception() is not None:
+                return
+            for chunk_id, value in zip(missing_ids, future.result().tolist()):
+                self.cache.put((query_key, chunk_id, model_name), float(value))
+            self.metrics.pairs_scored += len(missing_ids)
+
+        loop = asyncio.get_running_loop()
+        inference = loop.run_in_executor(self._executor, self._timed_predict, pairs)
+        inference.add_done_callback(store)
+
+        budget = latency_budget_ms if latency_budget_ms is not None else self.latency_budget_ms
+        try:
+            predicted = await asyncio.wait_for(asyncio.shield(inference), budget / 1000.0)
+        except asyncio.TimeoutError:
+            self.metrics.budget_exceeded += 1
+            logger.warning(
+                f"Cross-encoder exceeded {budget:.0f}ms budget for {len(pairs)} pairs, "
+                "falling back to heuristic reranking"
+            )
+            return None
+        except Exception as e:
+            self.metrics.errors += 1
+            logger.error(f"Cross-encoder inference failed: {e}")
+            return None
+
+        scores[missing] = predicted
+        return scores
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "backend": type(self.backend).__name__,
+            "model": self.model_name,
+            "latency_budget_ms": self.latency_budget_ms,
+            "cache_entries": len(self.cache),
+            **self.metrics.to_dict(),
+        }
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._executor.shutdown(wait=wait)
+
+
+def _create_backend(backend_name: str) -> RerankerBackend:
+    model_name = os.getenv("SEARCH_CROSS_ENCODER_MODEL", DEFAULT_CROSS_ENCODER_MODEL)
+    if backend_name == "sentence_transformers":
+        return SentenceTransformersBackend(model_name)
+    if backend_name == "onnx":
+        model_path = os.getenv("SEARCH_CROSS_ENCODER_ONNX_PATH")
+        if not model_path:
+            raise ValueError("SEARCH_CROSS_ENCODER_ONNX_PATH is required for the onnx backend")
+        return ONNXCrossEncoderBackend(model_path, tokenizer_name=model_name)
+    raise ValueError(f"Unknown reranker backend: {backend_name}")
+
+
+# Global cross-encoder stage (None when reranking is heuristic-only)
+_cross_encoder_stage: Optional[CrossEncoderStage] = None
+_cross_encoder_initialized = False
+
+
+def get_cross_encoder_stage() -> Optional[CrossEncoderStage]:
+    """Get the global cross-encoder stage, or None if not configured/available."""
+    global _cross_encoder_stage, _cross_encoder_initialized
+    if _cross_encoder_initialized:
+        return _cross_encoder_stage
+
+    _cross_encoder_initialized = True
+    backend_name = os.getenv("SEARCH_RERANKER_BACKEND", "heuristic").lower()
+    if backend_name == "heuristic":
+        return None
+
+    try:
+        _cross_encoder_stage = CrossEncoderStage(_create_backend(backend_name))
+        logger.info(
+            f"Cross-encoder reranking enabled: {backend_name} ({_cross_encoder_stage.model_name})"
+        )
+    except Exception as e:
+        logger.warning(f"Cross-encoder backend '{backend_name}' unavailable, using heuristic: {e}")
+        _cross_encoder_stage = None
+
+    return _cross_encoder_stage
+
+
+def shutdown_cross_encoder_stage() -> None:
+    """Shut down the global stage executor (used on application shutdown)."""
+    global _cross_encoder_stage, _cross_encoder_initialized
+    if _cross_encoder_stage is not None:
+        _cross_encoder_stage.shutdown(wait=False)
+    _cross_encoder_stage = None
+    _cross_encoder_initialized = False
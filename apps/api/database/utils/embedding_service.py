@@ -14,6 +14,8 @@ from typing import List, cast
 import httpx
 import numpy as np
 
+from ...cache.embedding_cache import get_embedding_cache
+
 logger = logging.getLogger(__name__)
 
 # OpenAI API settings
@@ -52,6 +54,12 @@ class EmbeddingService:
             logger.info("Using dummy embedding")
             return EmbeddingService._get_dummy_embedding(text)
 
+        # Shared two-tier embedding cache (dummy vectors are never cached)
+        cache = get_embedding_cache()
+        cached = await cache.get(OPENAI_EMBEDDING_MODEL, text)
+        if cached is not None:
+            return cached
+
         try:
             async with httpx.AsyncClient() as client:
                 response = await client.post(
@@ -72,7 +80,9 @@ class EmbeddingService:
                     return EmbeddingService._get_dummy_embedding(text)
 
                 result = response.json()
-                return cast(List[float], result["data"][0]["embedding"])
+                embedding = cast(List[float], result["data"][0]["embedding"])
+                await cache.set(OPENAI_EMBEDDING_MODEL, text, embedding)
+                return embedding
 
         except Exception as e:
             logger.error(f"Embedding generation failed: {e}")
@@ -0,0 +1,297 @@
+"""
+Filtered ANN search: keep top-k under selective filters.
+
+An HNSW scan hands back its ef_search nearest neighbours before the WHERE
+clause runs, so a taxonomy or date filter matching 2% of the corpus keeps
+about 2% of them and ``ORDER BY distance LIMIT k`` returns far fewer than k
+rows (IVFFlat loses rows the same way per probed list). FilteredANNPlanner
+sizes the filtered subset before the vector query and picks a strategy:
+
+- ``ann``: no filter, or one broad enough that ef_search still yields k rows
+- ``iterative``: ANN with ef_search/probes scaled by 1 / selectivity, doubled
+  each round while the query comes back short
+- ``exact``: brute force over the filtered subset, when it is small or so
+  selective that ef_search would have to exceed its cap. Ordering by
+  ``distance + 0`` keeps the planner off the ANN index; the filter's own
+  indexes (GIN on doc_taxonomy.path_prefixes) select the rows.
+
+A plan that still comes back short ends in an exact scan, so a filtered
+vector search returns min(k, subset size) rows whatever was estimated. The
+subset size is a COUNT capped at FILTERED_ANN_COUNT_CAP rows and cached
+per filter for FILTERED_ANN_STATS_TTL_S seconds; for a taxonomy filter it
+is the chunk count of the filtered nodes.
+
+@CODE:DATABASE-PKG-023
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+import random
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+
+from .vector_index import (
+    DEFAULT_EF_SEARCH,
+    DEFAULT_PROBES,
+    MAX_EF_SEARCH,
+    MAX_PROBES,
+    ANNSearchParams,
+)
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "FILTERED_ANN_STRATEGIES",
+    "FilteredANNPlan",
+    "FilteredANNPlanner",
+    "get_filtered_ann_planner",
+    "recall_at_k",
+]
+
+FILTERED_ANN_STRATEGIES = ("ann", "iterative", "exact")
+
+MAX_CACHED_FILTERS = 1024
+
+# Capped size of the filtered subset; the joins and aliases match the
+# filter clauses built by HybridSearchEngine._build_filter_clause
+FILTERED_COUNT_SQL = """
+    SELECT COUNT(*) FROM (
+        SELECT 1
+        FROM embeddings e
+        JOIN chunks c ON e.chunk_id = c.chunk_id
+        JOIN documents d ON c.doc_id = d.doc_id
+        LEFT JOIN doc_taxonomy dt ON d.doc_id = dt.doc_id
+        WHERE e.vec IS NOT NULL
+        {filter_clause}
+        LIMIT :count_cap
+    ) filtered
+"""
+
+# Planner statistics; -1 until the table is first analyzed
+TOTAL_ROWS_SQL = "SELECT reltuples::bigint FROM pg_class WHERE oid = 'embeddings'::regclass"
+
+
+@dataclass
+class FilteredANNPlan:
+    """How one vector query runs.
+
+    ``filtered_rows`` is ``None`` for an unfiltered query; ``capped`` means
+    the count stopped at the cap, so it is a lower bound.
+    """
+
+    strategy: str
+    ann_params: Optional[ANNSearchParams] = None
+    filtered_rows: Optional[int] = None
+    total_rows: int = 0
+    capped: bool = False
+    rounds: int = 1
+
+    @property
+    def exact(self) -> bool:
+        return self.strategy == "exact"
+
+    @property
+    def selectivity(self) -> Optional[float]:
+        if self.filtered_rows is None:
+            return None
+        if self.total_rows <= 0:
+            return 1.0
+        return min(1.0, self.filtered_rows / self.total_rows)
+
+    def expected_rows(self, k: int) -> int:
+        """Rows a complete top-k has: fewer only if the subset is smaller."""
+        if self.filtered_rows is None or self.capped:
+            return k
+        return min(k, self.filtered_rows)
+
+
+class FilteredANNPlanner:
+    """Chooses and widens FilteredANNPlans from filtered subset sizes."""
+
+    def __init__(
+        self,
+        exact_max_rows: Optional[int] = None,
+        oversample: Optional[float] = None,
+        max_rounds: Optional[int] = None,
+        count_cap: Optional[int] = None,
+        stats_ttl: Optional[float] = None,
+        recall_sample_rate: Optional[float] = None,
+    ) -> None:
+        self.exact_max_rows = (
+            exact_max_rows
+            if exact_max_rows is not None
+            else int(os.getenv("FILTERED_ANN_EXACT_MAX_ROWS", "20000"))
+        )
+        self.oversample = (
+            oversample
+            if oversample is not None
+            else float(os.getenv("FILTERED_ANN_OVERSAMPLE", "2.0"))
+        )
+        self.max_rounds = (
+            max_rounds
+            if max_rounds is not None
+            else int(os.getenv("FILTERED_ANN_MAX_ROUNDS", "3"))
+        )
+        self.count_cap = (
+            count_cap
+            if count_cap is not None
+            else int(os.getenv("FILTERED_ANN_COUNT_CAP", "200000"))
+        )
+        self.stats_ttl = (
+            stats_ttl
+            if stats_ttl is not None
+            else float(os.getenv("FILTERED_ANN_STATS_TTL_S", "300"))
+        )
+        # Fraction of approximate searches re-run exactly to measure recall
+        self.recall_sample_rate = (
+            recall_sample_rate
+            if recall_sample_rate is not None
+            else float(os.getenv("FILTERED_ANN_RECALL_SAMPLE_RATE", "0"))
+        )
+        if self.count_cap <= self.exact_max_rows:
+            raise ValueError("FILTERED_ANN_COUNT_CAP must exceed FILTERED_ANN_EXACT_MAX_ROWS")
+        self._counts: "OrderedDict[str, Tuple[float, int, int]]" = OrderedDict()
+
+    def choose(
+        self,
+        k: int,
+        filtered_rows: Optional[int] = None,
+        total_rows: int = 0,
+        ann_params: Optional[ANNSearchParams] = None,
+        capped: bool = False,
+    ) -> FilteredANNPlan:
+        """Plan a top-``k`` query over ``filtered_rows`` of ``total_rows``."""
+        resolved = ANNSearchParams.resolve(ann_params)
+        ef_search = resolved.ef_search or DEFAULT_EF_SEARCH
+        probes = resolved.probes or DEFAULT_PROBES
+        plan = FilteredANNPlan(
+            "ann", ann_params, filtered_rows, max(total_rows, filtered_rows or 0), capped
+        )
+
+        if filtered_rows is not None and not capped and filtered_rows <= self.exact_max_rows:
+            return replace(plan, strategy="exact", ann_params=None)
+
+        selectivity = plan.selectivity or 1.0
+        needed = k if filtered_rows is None else math.ceil(k * self.oversample / selectivity)
+        if needed <= ef_search:
+            return plan
+        if filtered_rows is not None and needed > MAX_EF_SEARCH and not capped:
+            return replace(plan, strategy="exact", ann_params=None)
+
+        # A capped count only bounds selectivity from below: widen as far as
+        # it allows, the subset is too large to scan exactly
+        ef_search_needed = min(needed, MAX_EF_SEARCH)
+        scaled = replace(
+            ann_params or ANNSearchParams(),
+            ef_search=ef_search_needed,
+            probes=min(MAX_PROBES, math.ceil(probes * ef_search_needed / ef_search)),
+        )
+        strategy = "ann" if filtered_rows is None else "iterative"
+        return replace(plan, strategy=strategy, ann_params=scaled)
+
+    def widen(self, plan: FilteredANNPlan) -> FilteredANNPlan:
+        """Next plan after ``plan`` came back short: double ef_search/probes,
+        then fall back to an exact scan."""
+        if plan.exact:
+            return plan
+        resolved = ANNSearchParams.resolve(plan.ann_params)
+        ef_search = resolved.ef_search or DEFAULT_EF_SEARCH
+        probes = resolved.probes or DEFAULT_PROBES
+        if plan.rounds >= self.max_rounds or (
+            ef_search >= MAX_EF_SEARCH and probes >= MAX_PROBES
+        ):
+            if plan.capped:
+                logger.warning(
+                    f"Filtered ANN still short after {plan.rounds} rounds, "
+                    f"scanning more than {plan.filtered_rows} rows exactly"
+                )
+            return self.exact(plan)
+        return replace(
+            plan,
+            strategy="iterative",
+            ann_params=replace(
+                plan.ann_params or ANNSearchParams(),
+                ef_search=min(MAX_EF_SEARCH, ef_search * 2),
+                probes=min(MAX_PROBES, probes * 2),
+            ),
+            rounds=plan.rounds + 1,
+        )
+
+    @staticmethod
+    def exact(plan: FilteredANNPlan) -> FilteredANNPlan:
+        return replace(plan, strategy="exact", ann_params=None, rounds=plan.rounds + 1)
+
+    def should_sample_recall(self) -> bool:
+        return self.recall_sample_rate > 0 and random.random() < self.recall_sample_rate
+
+    async def plan(
+        self,
+        session: Any,
+        k: int,
+        filter_clause: str,
+        filter_params: Dict[str, Any],
+        ann_params: Optional[ANNSearchParams] = None,
+    ) -> FilteredANNPlan:
+        """Plan a top-``k`` vector query restricted by ``filter_clause``."""
+        if not filter_clause:
+            return self.choose(k, ann_params=ann_params)
+        filtered_rows, total_rows = await self.filtered_rows(
+            session, filter_clause, filter_params
+        )
+        return self.choose(
+            k, filtered_rows, total_rows, ann_params, capped=filtered_rows >= self.count_cap
+        )
+
+    async def filtered_rows(
+        self, session: Any, filter_clause: str, filter_params: Dict[str, Any]
+    ) -> Tuple[int, int]:
+        """(capped filtered subset size, total embeddings), cached per filter."""
+        key = json.dumps([filter_clause, filter_params], sort_keys=True, default=str)
+        now = time.monotonic()
+        cached = self._counts.get(key)
+        if cached is not None and cached[0] > now:
+            self._counts.move_to_end(key)
+            return cached[1], cached[2]
+
+        result = await session.execute(
+            text(FILTERED_COUNT_SQL.format(filter_clause=filter_clause)),
+            {**filter_params, "count_cap": self.count_cap},
+        )
+        filtered_rows = int(result.scalar() or 0)
+        result = await session.execute(text(TOTAL_ROWS_SQL))
+        total_rows = max(int(result.scalar() or 0), filtered_rows)
+
+        self._counts[key] = (now + self.stats_ttl, filtered_rows, total_rows)
+        self._counts.move_to_end(key)
+        while len(self._counts) > MAX_CACHED_FILTERS:
+            self._counts.popitem(last=False)
+        return filtered_rows, total_rows
+
+    def clear(self) -> None:
+        self._counts.clear()
+
+
+def recall_at_k(found: Sequence[str], expected: Sequence[str]) -> float:
+    """Share of the exact top-k (``expected``) that ``found`` contains."""
+    if not expected:
+        return 1.0
+    return len(set(found) & set(expected)) / len(expected)
+
+
+_planner: Optional[FilteredANNPlanner] = None
+
+
+def get_filtered_ann_planner() -> FilteredANNPlanner:
+    """Process-wide planner (its subset counts are shared across requests)."""
+    global _planner
+    if _planner is None:
+        _planner = FilteredANNPlanner()
+    return _planner
@@ -0,0 +1,908 @@
+"""
+In-process exact vector index for deployments without pgvector.
+
+SQLite (development, edge and small single-node installs) has no vector
+operators, so vector search used to return chunks in id order with a
+constant score. The local index keeps the embeddings in a memory-mapped
+matrix next to the database and answers top-k exactly with blocked matrix
+products and argpartition.
+
+Layout under LOCAL_VECTOR_INDEX_DIR:
+- meta.json: dimensions, storage dtype, metric and the current generation
+- <generation>/vectors.bin: one row per embedding, float32, float16 or int8
+  (LOCAL_VECTOR_INDEX_DTYPE); int8 rows carry a scale in scales.bin
+- <generation>/chunk_ids.txt: chunk_id of each row, one per line
+- <generation>/tombstones.bin: int64 numbers of removed rows
+
+Rows are only appended: re-adding a chunk supersedes its earlier row and
+removing one appends a tombstone, so ingestion writes while searches read,
+and other processes pick new rows up on their next search. Compaction and
+rebuilds write a new generation and switch meta.json to it atomically.
+Cosine vectors are stored normalized. The index loads on first use (or in
+the background at startup) and is rebuilt from the embeddings table when
+their row counts disagree.
+
+With LOCAL_VECTOR_INDEX_QUANTIZATION a compact code per row is scanned
+first and only the best k * VECTOR_RESCORE_OVERSAMPLE rows are re-scored
+against the full-precision matrix, so a search reads the codes plus a few
+hundred full rows:
+- int8: <generation>/codes.bin, one byte per dimension with a row scale in
+  code_scales.bin (a quarter of float32)
+- pq: product quantization, one byte per LOCAL_VECTOR_INDEX_PQ_SUBVECTOR_DIMS
+  dimensions (1/16 of float32 at 4). The k-means codebook
+  (<generation>/pq_codebook.npy) is trained on a sample when the index is
+  compacted or grows to LOCAL_VECTOR_INDEX_PQ_TRAIN_ROWS rows; searches are
+  exact until then. PQ needs a larger oversample than int8 for the same
+  recall; search_benchmark.py --quantization measures both.
+
+@CODE:DATABASE-PKG-021
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import text
+
+from ..connection import DATABASE_URL, PGVECTOR_AVAILABLE
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "STORAGE_DTYPES",
+    "LOCAL_QUANTIZATIONS",
+    "VECTOR_SEARCH_BACKENDS",
+    "LocalVectorIndex",
+    "pq_encode",
+    "train_pq_codebook",
+    "vector_search_backend",
+    "get_local_vector_index",
+    "load_local_vector_index",
+    "rebuild_local_vector_index",
+]
+
+STORAGE_DTYPES: Dict[str, Any] = {
+    "float32": np.float32,
+    "float16": np.float16,
+    "int8": np.int8,
+}
+
+# "auto": pgvector on PostgreSQL, the local index everywhere else
+VECTOR_SEARCH_BACKENDS = ("auto", "pgvector", "local")
+
+LOCAL_METRICS = ("cosine", "l2")
+
+# Codes scanned for candidates before full-precision re-scoring
+LOCAL_QUANTIZATIONS = ("none", "int8", "pq")
+
+META_FILE = "meta.json"
+VECTORS_FILE = "vectors.bin"
+SCALES_FILE = "scales.bin"
+IDS_FILE = "chunk_ids.txt"
+TOMBSTONES_FILE = "tombstones.bin"
+CODES_FILE = "codes.bin"
+CODE_SCALES_FILE = "code_scales.bin"
+CODEBOOK_FILE = "pq_codebook.npy"
+
+REBUILD_BATCH_ROWS = 2000
+
+# Values decoded to float32 per block: the scratch block stays in cache
+DECODE_BLOCK_VALUES = 2**19
+
+PQ_CENTROIDS = 256
+PQ_MIN_TRAIN_ROWS = 1024
+PQ_TRAIN_ITERATIONS = 12
+
+
+def vector_search_backend(database_url: Optional[str] = None) -> str:
+    """Vector search backend for ``database_url`` (VECTOR_SEARCH_BACKEND)."""
+    backend = os.getenv("VECTOR_SEARCH_BACKEND", "auto").lower()
+    if backend not in VECTOR_SEARCH_BACKENDS:
+        raise ValueError(
+            f"Unsupported vector search backend '{backend}', "
+            f"expected one of {VECTOR_SEARCH_BACKENDS}"
+        )
+    if backend != "auto":
+        return backend
+    database_url = database_url or DATABASE_URL
+    return "pgvector" if "postgresql" in database_url and PGVECTOR_AVAILABLE else "local"
+
+
+def _normalize(vectors: np.ndarray, metric: str) -> np.ndarray:
+    if metric == "cosine":
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1.0, norms)
+    return vectors
+
+
+def _int8_encode(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Symmetric int8 codes with one scale per row."""
+    scales = np.abs(vectors).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    codes = np.rint(vectors / scales[:, None]).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+def _encode(vectors: np.ndarray, dtype_name: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """Storage rows (and int8 row scales) for float32 ``vectors``."""
+    if dtype_name == "int8":
+        return _int8_encode(vectors)
+    return vectors.astype(STORAGE_DTYPES[dtype_name]), None
+
+
+def _decode(matrix: np.ndarray, scales: Optional[np.ndarray], selection: Any) -> np.ndarray:
+    block = np.asarray(matrix[selection], dtype=np.float32)
+    if scales is not None:
+        block = block * np.asarray(scales[selection])[:, None]
+    return block
+
+
+def _subvector_dims(dimensions: int, preferred: int) -> int:
+    """Largest divisor of ``dimensions`` not above ``preferred``."""
+    for dims in range(max(1, min(preferred, dimensions)), 1, -1):
+        if dimensions % dims == 0:
+            return dims
+    return 1
+
+
+def _nearest(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    distances = (centroids * centroids).sum(axis=1) - 2.0 * (vectors @ centroids.T)
+    return np.argmin(distances, axis=1)
+
+
+def train_pq_codebook(
+    vectors: np.ndarray,
+    subvector_dims: int,
+    iterations: int = PQ_TRAIN_ITERATIONS,
+    seed: int = 0,
+) -> np.ndarray:
+    """k-means codebook of shape (subvectors, 256, subvector_dims)."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    rows, dimensions = vectors.shape
+    if dimensions % subvector_dims:
+        raise ValueError(f"{subvector_dims} does not divide {dimensions} dimensions")
+    if rows < PQ_CENTROIDS:
+        raise ValueError(f"Product quantization needs at least {PQ_CENTROIDS} training rows")
+    rng = np.random.default_rng(seed)
+    subvectors = dimensions // subvector_dims
+    codebook = np.empty((subvectors, PQ_CENTROIDS, subvector_dims), dtype=np.float32)
+    for m in range(subvectors):
+        x = vectors[:, m * subvector_dims : (m + 1) * subvector_dims]
+        centroids = x[rng.choice(rows, PQ_CENTROIDS, replace=False)].copy()
+        for _ in range(iterations):
+            assignment = _nearest(x, centroids)
+            counts = np.bincount(assignment, minlength=PQ_CENTROIDS)
+            sums = np.stack(
+                [
+                    np.bincount(assignment, weights=x[:, d], minlength=PQ_CENTROIDS)
+                    for d in range(subvector_dims)
+                ],
+                axis=1,
+            )
+            used = counts > 0
+            centroids[used] = sums[used] / counts[used, None]
+            # Re-seed empty clusters from random rows
+            centroids[~used] = x[rng.choice(rows, int((~used).sum()))]
+        codebook[m] = centroids
+    return codebook
+
+
+def pq_encode(vectors: np.ndarray, codebook: np.ndarray) -> np.ndarray:
+    """uint8 centroid number of each subvector of ``vectors``."""
+    subvectors, _, subvector_dims = codebook.shape
+    codes = np.empty((len(vectors), subvectors), dtype=np.uint8)
+    for m in range(subvectors):
+        x = vectors[:, m * subvector_dims : (m + 1) * subvector_dims]
+        codes[:, m] = _nearest(x, codebook[m])
+    return codes
+
+
+def _pq_table(query: np.ndarray, codebook: np.ndarray, metric: str) -> np.ndarray:
+    """Flattened score of every centroid against its slice of ``query``; a
+    row's approximate score is the sum of the entries its codes select."""
+    subvectors, _, subvector_dims = codebook.shape
+    parts = query.reshape(subvectors, subvector_dims)
+    if metric == "l2":
+        table = -((codebook - parts[:, None, :]) ** 2).sum(axis=2)
+    else:
+        table = np.einsum("mkd,md->mk", codebook, parts)
+    return table.astype(np.float32).ravel()
+
+
+class _GenerationWriter:
+    """Appends rows to the files of one generation directory."""
+
+    def __init__(
+        self,
+        directory: Path,
+        dtype_name: str,
+        metric: str,
+        quantization: str = "none",
+        codebook: Optional[np.ndarray] = None,
+    ) -> None:
+        self.directory = directory
+        self.dtype_name = dtype_name
+        self.metric = metric
+        self.quantization = quantization
+        self.codebook = codebook
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def append(self, chunk_ids: Sequence[str], vectors: np.ndarray) -> None:
+        vectors = _normalize(vectors, self.metric)
+        rows, scales = _encode(vectors, self.dtype_name)
+        codes, code_scales = self.encode_codes(vectors)
+        self.append_encoded(chunk_ids, rows, scales, codes, code_scales)
+
+    def encode_codes(
+        self, vectors: np.ndarray
+    ) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        """Candidate codes (and int8 code scales) for normalized ``vectors``."""
+        if self.quantization == "int8":
+            return _int8_encode(vectors)
+        if self.quantization == "pq" and self.codebook is not None:
+            return pq_encode(vectors, self.codebook), None
+        return None, None
+
+    def write_codebook(self, codebook: np.ndarray) -> None:
+        self.codebook = codebook
+        np.save(self.directory / CODEBOOK_FILE, codebook)
+
+    def append_encoded(
+        self,
+        chunk_ids: Sequence[str],
+        rows: np.ndarray,
+        scales: Optional[np.ndarray],
+        codes: Optional[np.ndarray] = None,
+        code_scales: Optional[np.ndarray] = None,
+    ) -> None:
+        # Vectors and codes first: a row is visible once its chunk_id line
+        # is complete
+        for name, data in (
+            (VECTORS_FILE, rows),
+            (SCALES_FILE, scales),
+            (CODES_FILE, codes),
+            (CODE_SCALES_FILE, code_scales),
+        ):
+            if data is not None:
+                with open(self.directory / name, "ab") as f:
+                    f.write(np.ascontiguousarray(data).tobytes())
+        with open(self.directory / IDS_FILE, "ab") as f:
+            f.write(("\n".join(chunk_ids) + "\n").encode("utf-8"))
+
+    def tombstone(self, rows: Sequence[int]) -> None:
+        with open(self.directory / TOMBSTONES_FILE, "ab") as f:
+            f.write(np.asarray(rows, dtype=np.int64).tobytes())
+
+
+class LocalVectorIndex:
+    """Memory-mapped embedding matrix with exact (or re-scored) top-k search.
+
+    Thread-safe; one process should write (ingestion), any number may read.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        dtype: Optional[str] = None,
+        metric: Optional[str] = None,
+        block_rows: Optional[int] = None,
+        quantization: Optional[str] = None,
+        oversample: Optional[int] = None,
+        pq_subvector_dims: Optional[int] = None,
+        pq_train_rows: Optional[int] = None,
+    ) -> None:
+        self.path = Path(path or os.getenv("LOCAL_VECTOR_INDEX_DIR") or "data/vector_index")
+        self.dtype_name = (dtype or os.getenv("LOCAL_VECTOR_INDEX_DTYPE") or "float32").lower()
+        if self.dtype_name not in STORAGE_DTYPES:
+            raise ValueError(
+                f"Unsupported local index dtype '{self.dtype_name}', "
+                f"expected one of {sorted(STORAGE_DTYPES)}"
+            )
+        self.metric = (metric or os.getenv("VECTOR_DISTANCE_METRIC") or "cosine").lower()
+        if self.metric not in LOCAL_METRICS:
+            raise ValueError(f"Unsupported local index metric '{self.metric}'")
+        self.block_rows = block_rows or int(os.getenv("LOCAL_VECTOR_INDEX_BLOCK_ROWS", "65536"))
+        self.quantization = (
+            quantization or os.getenv("LOCAL_VECTOR_INDEX_QUANTIZATION") or "none"
+        ).lower()
+        if self.quantization not in LOCAL_QUANTIZATIONS:
+            raise ValueError(
+                f"Unsupported local index quantization '{self.quantization}', "
+                f"expected one of {LOCAL_QUANTIZATIONS}"
+            )
+        self.oversample = max(
+            1, oversample or int(os.getenv("VECTOR_RESCORE_OVERSAMPLE", "4"))
+        )
+        self.pq_subvector_dims = pq_subvector_dims or int(
+            os.getenv("LOCAL_VECTOR_INDEX_PQ_SUBVECTOR_DIMS", "4")
+        )
+        self.pq_train_rows = max(
+            PQ_MIN_TRAIN_ROWS,
+            pq_train_rows or int(os.getenv("LOCAL_VECTOR_INDEX_PQ_TRAIN_ROWS", "10000")),
+        )
+        # Set once the index has been checked against the embeddings table
+        self.synced = False
+        self._lock = threading.RLock()
+        self._async_lock: Optional[asyncio.Lock] = None
+        self._loaded = False
+        self._reset_state()
+
+    def _reset_state(self) -> None:
+        self.dimensions: Optional[int] = None
+        self._generation = 0
+        self._meta_mtime: Optional[int] = None
+        self._rows = 0
+        self._ids: List[str] = []
+        self._row_of: Dict[str, int] = {}
+        self._live = np.zeros(0, dtype=bool)
+        self._sq_norms = np.zeros(0, dtype=np.float32)
+        self._ids_offset = 0
+        self._tombstones_offset = 0
+        self._matrix: Optional[np.ndarray] = None
+        self._scales: Optional[np.ndarray] = None
+        self._codes: Optional[np.ndarray] = None
+        self._code_scales: Optional[np.ndarray] = None
+        self._codebook: Optional[np.ndarray] = None
+
+    # Files
+
+    @property
+    def _directory(self) -> Path:
+        return self.path / str(self._generation)
+
+    def _writer(
+        self, generation: Optional[int] = None, codebook: Optional[np.ndarray] = None
+    ) -> _GenerationWriter:
+        """Writer for the current generation, or a new one using ``codebook``."""
+        if generation is None:
+            generation, codebook = self._generation, self._codebook
+        return _GenerationWriter(
+            self.path / str(generation), self.dtype_name, self.metric, self.quantization, codebook
+        )
+
+    def _read_meta(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.path / META_FILE, encoding="utf-8") as f:
+                return dict(json.load(f))
+        except (OSError, ValueError):
+            return None
+
+    def _publish(self, generation: int, dimensions: Optional[int]) -> None:
+        """Switch readers to ``generation`` and drop the older ones."""
+        self.path.mkdir(parents=True, exist_ok=True)
+        meta = {
+            "generation": generation,
+            "dimensions": dimensions,
+            "dtype": self.dtype_name,
+            "metric": self.metric,
+            "quantization": self.quantization,
+        }
+        tmp = self.path / f"{META_FILE}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp, self.path / META_FILE)
+        for entry in self.path.iterdir():
+            if entry.is_dir() and entry.name.isdigit() and int(entry.name) != generation:
+                # Other processes may still map old files; POSIX keeps them alive
+                shutil.rmtree(entry, ignore_errors=True)
+        self._load()
+
+    # Loading
+
+    def load(self) -> None:
+        """Load (or reload) the index files."""
+        with self._lock:
+            self._load()
+
+    def _load(self) -> None:
+        self._reset_state()
+        self._loaded = True
+        meta = self._read_meta()
+        if meta is None:
+            return
+        built = (meta.get("dtype"), meta.get("metric"), meta.get("quantization", "none"))
+        if built != (self.dtype_name, self.metric, self.quantization):
+            logger.info(
+                f"Local vector index at {self.path} was built as "
+                f"{'/'.join(map(str, built))}, starting a new one"
+            )
+            self._publish(int(meta.get("generation", 0)) + 1, None)
+            return
+        self.dimensions = meta.get("dimensions")
+        self._generation = int(meta.get("generation", 0))
+        self._meta_mtime = os.stat(self.path / META_FILE).st_mtime_ns
+        codebook_path = self._directory / CODEBOOK_FILE
+        if self.quantization == "pq" and codebook_path.exists():
+            self._codebook = np.load(codebook_path)
+        self._read_new_rows()
+
+    def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            self._load()
+
+    def refresh(self) -> None:
+        """Pick up rows and tombstones written since the last call."""
+        with self._lock:
+            self._ensure_loaded()
+            try:
+                meta_mtime: Optional[int] = os.stat(self.path / META_FILE).st_mtime_ns
+            except OSError:
+                meta_mtime = None
+            if meta_mtime != self._meta_mtime:
+                self._load()
+            else:
+                self._read_new_rows()
+
+    def _read_new_rows(self) -> None:
+        directory = self._directory
+        # Tombstones before ids: every tombstone read refers to a row whose
+        # id is already on disk, so it is applied after the ids below
+        tombstones = np.zeros(0, dtype=np.int64)
+        tombstones_path = directory / TOMBSTONES_FILE
+        if tombstones_path.exists():
+            with open(tombstones_path, "rb") as f:
+                f.seek(self._tombstones_offset)
+                data = f.read()
+            data = data[: len(data) - len(data) % 8]
+            self._tombstones_offset += len(data)
+            tombstones = np.frombuffer(data, dtype=np.int64)
+
+        ids_path = directory / IDS_FILE
+        if ids_path.exists() and ids_path.stat().st_size > self._ids_offset:
+            with open(ids_path, "rb") as f:
+                f.seek(self._ids_offset)
+                data = f.read()
+            complete = data[: data.rfind(b"\n") + 1]
+            self._ids_offset += len(complete)
+            new_ids = complete.decode("utf-8").splitlines()
+            if new_ids:
+                self._append_rows(new_ids)
+
+        for row in tombstones:
+            if row < self._rows:
+                self._live[row] = False
+                chunk_id = self._ids[row]
+                if self._row_of.get(chunk_id) == row:
+                    del self._row_of[chunk_id]
+
+    def _append_rows(self, new_ids: List[str]) -> None:
+        start = self._rows
+        live = np.ones(len(new_ids), dtype=bool)
+        for offset, chunk_id in enumerate(new_ids):
+            previous = self._row_of.get(chunk_id)
+            if previous is not None:
+                if previous >= start:
+                    live[previous - start] = False
+                else:
+                    self._live[previous] = False
+            self._row_of[chunk_id] = start + offset
+        self._ids.extend(new_ids)
+        self._live = np.concatenate([self._live, live])
+        self._rows += len(new_ids)
+        self._matrix = None
+        self._codes = None
+        if self.dimensions is None:
+            meta = self._read_meta() or {}
+            self.dimensions = meta.get("dimensions")
+        if self.metric == "l2":
+            matrix, scales = self._mapped()
+            new_norms = []
+            for selection in self._selections(slice(start, self._rows), matrix.shape[1]):
+                block = _decode(matrix, scales, selection)
+                new_norms.append(np.einsum("ij,ij->i", block, block))
+            self._sq_norms = np.concatenate([self._sq_norms, *new_norms])
+
+    def _mapped(self) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """The vector matrix (and int8 scales) mapped at the current size."""
+        if self._matrix is None or len(self._matrix) != self._rows:
+            dimensions = self.dimensions or 0
+            if self._rows == 0 or dimensions == 0:
+                self._matrix = np.zeros((0, dimensions), dtype=STORAGE_DTYPES[self.dtype_name])
+                self._scales = np.zeros(0, dtype=np.float32) if self.dtype_name == "int8" else None
+            else:
+                self._matrix = np.memmap(
+                    self._directory / VECTORS_FILE,
+                    dtype=STORAGE_DTYPES[self.dtype_name],
+                    mode="r",
+                    shape=(self._rows, dimensions),
+                )
+                self._scales = (
+                    np.memmap(
+                        self._directory / SCALES_FILE,
+                        dtype=np.float32,
+                        mode="r",
+                        shape=(self._rows,),
+                    )
+                    if self.dtype_name == "int8"
+                    else None
+                )
+        return self._matrix, self._scales
+
+    def _mapped_codes(self) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        """Candidate codes (and int8 code scales), or ``None`` while some
+        row has no code (no quantization, or no PQ codebook yet)."""
+        if self.quantization == "none" or self._rows == 0 or not self.dimensions:
+            return None, None
+        if self.quantization == "pq":
+            if self._codebook is None:
+                return None, None
+            width, dtype = len(self._codebook), np.uint8
+        else:
+            width, dtype = self.dimensions, np.int8
+        if self._codes is None or len(self._codes) != self._rows:
+            codes_path = self._directory / CODES_FILE
+            if not codes_path.exists() or codes_path.stat().st_size < self._rows * width:
+                return None, None
+            self._codes = np.memmap(codes_path, dtype=dtype, mode="r", shape=(self._rows, width))
+            self._code_scales = (
+                np.memmap(
+                    self._directory / CODE_SCALES_FILE,
+                    dtype=np.float32,
+                    mode="r",
+                    shape=(self._rows,),
+                )
+                if self.quantization == "int8"
+                else None
+            )
+        return self._codes, self._code_scales
+
+    def _selections(self, rows: Any, width: int = 0) -> Iterable[Any]:
+        """Blocks of ``rows`` (a slice or an index array), of at most
+        DECODE_BLOCK_VALUES values when rows are ``width`` wide."""
+        block_rows = self.block_rows
+        if width:
+            block_rows = min(block_rows, max(256, DECODE_BLOCK_VALUES // width))
+        if isinstance(rows, slice):
+            for start in range(rows.start, rows.stop, block_rows):
+                yield slice(start, min(start + block_rows, rows.stop))
+        else:
+            for start in range(0, len(rows), block_rows):
+                yield rows[start : start + block_rows]
+
+    def memory_bytes(self) -> Dict[str, int]:
+        """Sizes of the full-precision rows and of the candidate codes.
+
+        ``scanned`` is what a search reads in full: the codes when the
+        index is quantized, the rows otherwise.
+        """
+        with self._lock:
+            self.refresh()
+            matrix, scales = self._mapped()
+            codes, code_scales = self._mapped_codes()
+            vectors = int(matrix.nbytes) + (int(scales.nbytes) if scales is not None else 0)
+            code_bytes = 0
+            if codes is not None:
+                code_bytes = int(codes.nbytes) + (
+                    int(code_scales.nbytes) if code_scales is not None else 0
+                )
+            return {"vectors": vectors, "codes": code_bytes, "scanned": code_bytes or vectors}
+
+    # Writes
+
+    def __len__(self) -> int:
+        """Number of live rows."""
+        with self._lock:
+            self.refresh()
+            return len(self._row_of)
+
+    def add(self, chunk_ids: Sequence[Any], vectors: Sequence[Sequence[float]]) -> int:
+        """Append (or replace) the vectors of ``chunk_ids``."""
+        if not chunk_ids:
+            return 0
+        matrix = np.asarray(vectors, dtype=np.float32)
+        if matrix.ndim != 2 or len(matrix) != len(chunk_ids):
+            raise ValueError("vectors must be one row per chunk_id")
+        with self._lock:
+            self.refresh()
+            if self.dimensions is None:
+                self._publish(self._generation, int(matrix.shape[1]))
+            elif matrix.shape[1] != self.dimensions:
+                raise ValueError(
+                    f"Vector dimension {matrix.shape[1]} does not match the "
+                    f"local index ({self.dimensions})"
+                )
+            self._writer().append([str(chunk_id) for chunk_id in chunk_ids], matrix)
+            self._read_new_rows()
+            self._maybe_train()
+        return len(chunk_ids)
+
+    def _maybe_train(self) -> None:
+        """Train the PQ codebook (by compacting) once enough rows exist."""
+        if (
+            self.quantization == "pq"
+            and self._codebook is None
+            and len(self._row_of) >= self.pq_train_rows
+        ):
+            self.compact()
+
+    def remove(self, chunk_ids: Sequence[Any]) -> int:
+        """Tombstone ``chunk_ids``; compacts once most rows are dead."""
+        with self._lock:
+            self.refresh()
+            rows = [
+                self._row_of[str(chunk_id)]
+                for chunk_id in chunk_ids
+                if str(chunk_id) in self._row_of
+            ]
+            if rows:
+                self._writer().tombstone(rows)
+                self._read_new_rows()
+                dead = self._rows - len(self._row_of)
+                if dead > max(1024, len(self._row_of)):
+                    self.compact()
+            return len(rows)
+
+    def apply(
+        self, upserts: Sequence[Tuple[Any, Sequence[float]]], removed: Sequence[Any] = ()
+    ) -> None:
+        """Mirror one committed ingestion batch."""
+        self.remove(removed)
+        if upserts:
+            self.add([chunk_id for chunk_id, _ in upserts], [vec for _, vec in upserts])
+
+    def compact(self) -> None:
+        """Rewrite the live rows into a new generation.
+
+        A PQ index without a codebook trains one here when it has
+        PQ_MIN_TRAIN_ROWS live rows.
+        """
+        with self._lock:
+            self.refresh()
+            matrix, scales = self._mapped()
+            live_rows = np.flatnonzero(self._live)
+            generation = self._generation + 1
+            writer = self._writer(generation, self._codebook)
+            if self._codebook is not None:
+                writer.write_codebook(self._codebook)
+            elif self.quantization == "pq" and len(live_rows) >= PQ_MIN_TRAIN_ROWS:
+                writer.write_codebook(self._train_codebook(matrix, scales, live_rows))
+            for rows in self._selections(live_rows, matrix.shape[1]):
+                codes, code_scales = writer.encode_codes(_decode(matrix, scales, rows))
+                writer.append_encoded(
+                    [self._ids[row] for row in rows],
+                    np.asarray(matrix[rows]),
+                    None if scales is None else np.asarray(scales[rows]),
+                    codes,
+                    code_scales,
+                )
+            logger.info(
+                f"Compacted local vector index: {self._rows} rows -> {len(live_rows)}"
+            )
+            self._publish(generation, self.dimensions)
+
+    def _train_codebook(
+        self, matrix: np.ndarray, scales: Optional[np.ndarray], live_rows: np.ndarray
+    ) -> np.ndarray:
+        rng = np.random.default_rng(0)
+        sample = np.sort(
+            rng.choice(live_rows, min(len(live_rows), self.pq_train_rows), replace=False)
+        )
+        dimensions = int(matrix.shape[1])
+        logger.info(f"Training local vector index PQ codebook on {len(sample)} rows")
+        return train_pq_codebook(
+            _decode(matrix, scales, sample), _subvector_dims(dimensions, self.pq_subvector_dims)
+        )
+
+    def reset(self) -> int:
+        """Publish a new, empty generation and return its number."""
+        with self._lock:
+            self.refresh()
+            generation = self._generation + 1
+            self._writer(generation)
+            self._publish(generation, None)
+            return generation
+
+    # Search
+
+    def search(
+        self,
+        query: Sequence[float],
+        k: int,
+        chunk_ids: Optional[Iterable[Any]] = None,
+        oversample: Optional[int] = None,
+    ) -> List[Tuple[str, float]]:
+        """Top-``k`` ``(chunk_id, similarity)``, best first.
+
+        ``chunk_ids`` restricts the search to those chunks (a filtered
+        subset). Similarity matches pgvector's ``1 - distance``. A quantized
+        index takes ``k * oversample`` candidates from its codes and
+        re-scores them exactly, so only candidate recall is approximate.
+        """
+        self.refresh()
+        with self._lock:
+            if k <= 0 or not self._row_of:
+                return []
+            matrix, scales = self._mapped()
+            codes, code_scales = self._mapped_codes()
+            codebook = self._codebook
+            live = self._live
+            ids = self._ids
+            sq_norms = self._sq_norms
+            if chunk_ids is None:
+                rows: Any = slice(0, self._rows)
+                selected = self._rows
+            else:
+                rows = np.array(
+                    sorted(
+                        {
+                            self._row_of[str(chunk_id)]
+                            for chunk_id in chunk_ids
+                            if str(chunk_id) in self._row_of
+                        }
+                    ),
+                    dtype=np.int64,
+                )
+                selected = len(rows)
+                if not selected:
+                    return []
+
+        q = np.asarray(query, dtype=np.float32)
+        if q.shape != (matrix.shape[1],):
+            raise ValueError(
+                f"Query dimension {q.shape} does not match the local index "
+                f"({matrix.shape[1]})"
+            )
+        if self.metric == "cosine":
+            norm = float(np.linalg.norm(q))
+            q = q / norm if norm else q
+        qq = float(q @ q)
+
+        def exact_scores(selection: Any, block_rows: np.ndarray) -> np.ndarray:
+            # Scale the dot products, not the block
+            scores = np.asarray(matrix[selection], dtype=np.float32) @ q
+            if scales is not None:
+                scores *= scales[selection]
+            if self.metric == "l2":
+                distances = sq_norms[block_rows] - 2.0 * scores + qq
+                scores = 1.0 - np.sqrt(np.maximum(distances, 0.0))
+            return scores
+
+        candidates = k * (oversample or self.oversample)
+        if codes is not None and candidates < selected:
+            if codebook is not None:
+                table = _pq_table(q, codebook, self.metric)
+                offsets = np.arange(len(codebook), dtype=np.intp) * PQ_CENTROIDS
+
+                def code_scores(selection: Any, block_rows: np.ndarray) -> np.ndarray:
+                    entries = np.asarray(codes[selection], dtype=np.intp) + offsets
+                    return np.take(table, entries).sum(axis=1)
+
+            else:
+                assert code_scales is not None  # int8 codes always carry scales
+
+                def code_scores(selection: Any, block_rows: np.ndarray) -> np.ndarray:
+                    scores = np.asarray(codes[selection], dtype=np.float32) @ q
+                    scores *= code_scales[selection]
+                    if self.metric == "l2":
+                        # Rank by -(|x|^2 - 2 x.q): the |q|^2 term is constant
+                        scores = 2.0 * scores - sq_norms[block_rows]
+                    return scores
+
+            candidate_rows, _ = self._top_k(
+                rows, candidates, live, code_scores, codes.shape[1]
+            )
+            rows = np.sort(candidate_rows)
+
+        # float32 rows are scored in place: no decode, no need for small blocks
+        decoded_width = 0 if matrix.dtype == np.float32 else matrix.shape[1]
+        best_rows, best_scores = self._top_k(rows, k, live, exact_scores, decoded_width)
+        order = np.argsort(-best_scores, kind="stable")
+        return [
+            (ids[row], float(score))
+            for row, score in zip(best_rows[order], best_scores[order])
+            if np.isfinite(score)
+        ]
+
+    def _top_k(
+        self,
+        rows: Any,
+        k: int,
+        live: np.ndarray,
+        score: Callable[[Any, np.ndarray], np.ndarray],
+        width: int,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Best ``k`` (rows, scores) of ``score`` over ``rows``, in blocks."""
+        best_rows = np.zeros(0, dtype=np.int64)
+        best_scores = np.zeros(0, dtype=np.float32)
+        for selection in self._selections(rows, width):
+            if isinstance(selection, slice):
+                block_rows = np.arange(selection.start, selection.stop, dtype=np.int64)
+            else:
+                block_rows = selection
+            scores = np.where(live[block_rows], score(selection, block_rows), -np.inf)
+
+            best_rows = np.concatenate([best_rows, block_rows])
+            best_scores = np.concatenate([best_scores, scores.astype(np.float32)])
+            if len(best_scores) > k:
+                top = np.argpartition(-best_scores, k - 1)[:k]
+                best_rows, best_scores = best_rows[top], best_scores[top]
+        return best_rows, best_scores
+
+
+async def rebuild_local_vector_index(session: Any, index: LocalVectorIndex) -> int:
+    """Rebuild ``index`` from the embeddings table; returns the row count.
+
+    Rows stream into a new generation that replaces the old one when
+    complete, so searches keep using the old rows meanwhile.
+    """
+    generation = index._generation + 1
+    writer = index._writer(generation)
+    dimensions: Optional[int] = None
+    total = 0
+    after: Optional[Any] = None
+    while True:
+        # Keyset pagination over the unique chunk_id index
+        params: Dict[str, Any] = {"batch_rows": REBUILD_BATCH_ROWS}
+        if after is not None:
+            params["after"] = after
+        result = await session.execute(
+            text(
+                "SELECT chunk_id, vec FROM embeddings WHERE vec IS NOT NULL "
+                + ("AND chunk_id > :after " if after is not None else "")
+                + "ORDER BY chunk_id LIMIT :batch_rows"
+            ),
+            params,
+        )
+        rows = result.fetchall()
+        if not rows:
+            break
+        chunk_ids = [str(row[0]) for row in rows]
+        vectors = np.asarray(
+            [json.loads(row[1]) if isinstance(row[1], str) else row[1] for row in rows],
+            dtype=np.float32,
+        )
+        dimensions = dimensions or int(vectors.shape[1])
+        await asyncio.to_thread(writer.append, chunk_ids, vectors)
+        total += len(rows)
+        after = rows[-1][0]
+
+    with index._lock:
+        index._publish(generation, dimensions)
+        index._maybe_train()
+    logger.info(f"Rebuilt local vector index from {total} embeddings")
+    return total
+
+
+async def load_local_vector_index(
+    session: Any, index: Optional[LocalVectorIndex] = None
+) -> LocalVectorIndex:
+    """The index, loaded and checked against the embeddings table once."""
+    index = index or get_local_vector_index()
+    if index.synced:
+        return index
+    if index._async_lock is None:
+        index._async_lock = asyncio.Lock()
+    async with index._async_lock:
+        if not index.synced:
+            await asyncio.to_thread(index.load)
+            result = await session.execute(
+                text("SELECT COUNT(*) FROM embeddings WHERE vec IS NOT NULL")
+            )
+            stored = int(result.scalar() or 0)
+            if stored != len(index):
+                logger.info(
+                    f"Local vector index has {len(index)} rows, embeddings has "
+                    f"{stored}: rebuilding"
+                )
+                await rebuild_local_vector_index(session, index)
+            index.synced = True
+    return index
+
+
+_index: Optional[LocalVectorIndex] = None
+
+
+def get_local_vector_index() -> LocalVectorIndex:
+    """Process-wide local vector index (not loaded until first used)."""
+    global _index
+    if _index is None:
+        _index = LocalVectorIndex()
+    return _index
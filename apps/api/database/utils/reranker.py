@@ -6,7 +6,9 @@ Cross-encoder reranking implementation.
 
 from __future__ import annotations
 
-from typing import Dict, Any, List
+from typing import Any, Awaitable, Callable, Dict, List, Optional, cast
+
+from .cross_encoder import get_cross_encoder_stage, relevance_from_logits
 
 __all__ = ["CrossEncoderReranker", "BM25_WEIGHT", "VECTOR_WEIGHT"]
 
@@ -18,6 +20,44 @@ VECTOR_WEIGHT = 0.5
 class CrossEncoderReranker:
     """Cross-encoder based reranking."""
 
+    @staticmethod
+    async def rerank_results_async(
+        query: str,
+        search_results: List[Dict[str, Any]],
+        top_k: int = 5,
+        heuristic_runner: Optional[Callable[..., Awaitable[Any]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Rerank with the configured cross-encoder, else the heuristic.
+
+        The heuristic also runs when the cross-encoder misses its latency
+        budget. ``heuristic_runner`` (e.g. the optimizer's
+        execute_cpu_intensive_task) moves it off the event loop.
+        """
+        stage = get_cross_encoder_stage()
+        if stage is not None and search_results:
+            candidates = search_results[: stage.max_batch]
+            scores = await stage.score(
+                query,
+                [(str(r.get("chunk_id")), r.get("text", "")) for r in candidates],
+            )
+            if scores is not None:
+                for result, relevance in zip(
+                    candidates, relevance_from_logits(scores).tolist()
+                ):
+                    result["score"] = relevance
+                    result.setdefault("metadata", {})["rerank_model"] = stage.model_name
+                reranked = sorted(candidates, key=lambda x: x["score"], reverse=True)
+                return reranked[:top_k]
+
+        if heuristic_runner is not None:
+            return cast(
+                List[Dict[str, Any]],
+                await heuristic_runner(
+                    CrossEncoderReranker.rerank_results, query, search_results, top_k
+                ),
+            )
+        return CrossEncoderReranker.rerank_results(query, search_results, top_k)
+
     @staticmethod
     def rerank_results(
         query: str, search_results: List[Dict[str, Any]], top_k: int = 5
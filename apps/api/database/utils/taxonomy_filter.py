@@ -0,0 +1,72 @@
+"""
+Taxonomy subtree filters for search queries.
+
+A filter path such as ["AI"] matches documents classified anywhere under
+it (["AI"], ["AI", "RAG"], ...), compared case-insensitively like
+CategoryFilter. On PostgreSQL every doc_taxonomy row carries the keys of
+all its ancestor paths in the generated, GIN-indexed path_prefixes column
+(migration 0018), so any number of filter paths becomes one indexed
+overlap predicate. SQLite stores paths as JSON text and matches prefixes
+with LIKE.
+
+@CODE:DATABASE-PKG-022
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List, Sequence, Tuple
+
+__all__ = [
+    "PATH_KEY_SEPARATOR",
+    "taxonomy_path_key",
+    "taxonomy_subtree_condition",
+]
+
+# Joins path segments into path_prefixes keys (ASCII unit separator, which
+# cannot appear in a segment typed by a user)
+PATH_KEY_SEPARATOR = "\x1f"
+
+
+def taxonomy_path_key(path: Sequence[str]) -> str:
+    """Key of a path as stored in doc_taxonomy.path_prefixes."""
+    return PATH_KEY_SEPARATOR.join(str(segment).lower() for segment in path)
+
+
+def _like_escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def taxonomy_subtree_condition(
+    paths: Sequence[Sequence[str]],
+    postgresql: bool,
+    column: str = "dt",
+    param_prefix: str = "taxonomy_path",
+) -> Tuple[str, Dict[str, Any]]:
+    """SQL condition matching rows of ``column`` (a doc_taxonomy alias) in
+    any of the subtrees rooted at ``paths``, and its bound parameters.
+
+    Returns ``("", {})`` when there is no non-empty path.
+    """
+    params: Dict[str, Any] = {}
+    if postgresql:
+        keys: List[str] = []
+        for idx, path in enumerate(paths):
+            if path:
+                params[f"{param_prefix}_{idx}"] = taxonomy_path_key(path)
+                keys.append(f"CAST(:{param_prefix}_{idx} AS text)")
+        if not keys:
+            return "", {}
+        return f"{column}.path_prefixes && ARRAY[{', '.join(keys)}]", params
+
+    conditions = []
+    for idx, path in enumerate(paths):
+        if path:
+            # '["AI"%' matches '["AI"]' and '["AI", "RAG"]' but not
+            # '["AIOps"]': a segment's closing quote is followed by , or ]
+            pattern = json.dumps([str(segment) for segment in path])[:-1]
+            params[f"{param_prefix}_{idx}"] = _like_escape(pattern) + "%"
+            conditions.append(f"{column}.path LIKE :{param_prefix}_{idx} ESCAPE '\\'")
+    if not conditions:
+        return "", {}
+    return f"({' OR '.join(conditions)})", params
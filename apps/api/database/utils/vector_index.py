@@ -0,0 +1,344 @@
+"""
+pgvector query helpers: distance metric, bound query vectors, ANN tuning.
+
+The distance metric is shared by SearchDAO and HybridSearchEngine so both
+order by the operator that matches the opclass of the ANN index created by
+migration 0016. Query vectors are bound as parameters (never formatted into
+the SQL text) so the statement text is constant and asyncpg can reuse its
+prepared plan.
+
+VECTOR_QUANTIZATION=halfvec keeps embeddings.vec at full precision but
+builds the ANN index over vec::halfvec (migration 0019, half the index
+memory). Queries then take k * VECTOR_RESCORE_OVERSAMPLE candidates by
+halfvec distance through that index and re-rank them by the exact
+full-precision distance.
+
+Two-stage (Matryoshka) retrieval works the same way over a prefix:
+with ``prefix_dims`` set (VECTOR_PREFIX_DIMS, or per agent in
+retrieval_config), candidates come from an ANN index over
+subvector(vec, 1, prefix_dims) (migration 0020) and are re-ranked with
+the full vector. A 256-d prefix index is a sixth of the full index;
+how much recall the prefix keeps depends on the embedding model (models
+trained for truncation, like text-embedding-3-*, keep most of it), so
+measure it with ``search_benchmark.py --matryoshka`` before enabling it.
+
+@CODE:DATABASE-PKG-018
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from dataclasses import dataclass, fields, replace
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..connection import get_vector_type
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "VectorMetric",
+    "VECTOR_METRICS",
+    "VECTOR_QUANTIZATIONS",
+    "ANNSearchParams",
+    "get_vector_metric",
+    "get_vector_quantization",
+    "get_prefix_index_dims",
+    "rescore_candidates",
+    "candidate_ann_params",
+    "candidate_distance_sql",
+    "is_rescored",
+    "query_vector_param",
+    "apply_ann_params",
+    "ann_index_sql",
+]
+
+
+@dataclass(frozen=True)
+class VectorMetric:
+    """pgvector distance operator and the matching index opclass."""
+
+    name: str
+    operator: str
+    opclass: str
+
+    def distance_sql(self, column: str, param: str = "query_vector") -> str:
+        return f"({column} {self.operator} CAST(:{param} AS vector))"
+
+    def similarity_sql(self, column: str, param: str = "query_vector") -> str:
+        return f"1.0 - {self.distance_sql(column, param)}"
+
+    def halfvec_distance_sql(
+        self, column: str, param: str = "query_vector", dimensions: Optional[int] = None
+    ) -> str:
+        """Distance over half-precision casts; matches the 0019 expression index."""
+        halfvec = f"halfvec({dimensions or VECTOR_DIMENSIONS})"
+        return f"(CAST({column} AS {halfvec}) {self.operator} CAST(:{param} AS {halfvec}))"
+
+    @property
+    def halfvec_opclass(self) -> str:
+        return self.opclass.replace("vector_", "halfvec_", 1)
+
+    def prefix_distance_sql(
+        self, column: str, prefix_dims: int, param: str = "query_vector"
+    ) -> str:
+        """Distance over the leading ``prefix_dims`` dimensions; matches the
+        0020 expression index."""
+        prefix = f"vector({int(prefix_dims)})"
+        return (
+            f"(CAST(subvector({column}, 1, {int(prefix_dims)}) AS {prefix}) {self.operator} "
+            f"CAST(subvector(CAST(:{param} AS vector), 1, {int(prefix_dims)}) AS {prefix}))"
+        )
+
+
+VECTOR_METRICS: Dict[str, VectorMetric] = {
+    "cosine": VectorMetric("cosine", "<=>", "vector_cosine_ops"),
+    "l2": VectorMetric("l2", "<->", "vector_l2_ops"),
+}
+
+# Upper bounds accepted for per-request tuning (pgvector limits)
+MAX_EF_SEARCH = 1000
+MAX_PROBES = 32768
+
+# pgvector defaults, used when neither the request nor the environment
+# sets ef_search/probes
+DEFAULT_EF_SEARCH = 40
+DEFAULT_PROBES = 1
+
+# embeddings.vec is vector(1536) (migration 0005)
+VECTOR_DIMENSIONS = 1536
+
+# How the ANN index stores vectors; the table always keeps full precision
+VECTOR_QUANTIZATIONS = ("none", "halfvec")
+
+MAX_RESCORE_OVERSAMPLE = 100
+
+
+def get_vector_metric(name: Optional[str] = None) -> VectorMetric:
+    """Resolve the distance metric (VECTOR_DISTANCE_METRIC, default cosine)."""
+    metric_name = (name or os.getenv("VECTOR_DISTANCE_METRIC") or "cosine").lower()
+    if metric_name not in VECTOR_METRICS:
+        raise ValueError(
+            f"Unsupported vector metric '{metric_name}', expected one of {sorted(VECTOR_METRICS)}"
+        )
+    return VECTOR_METRICS[metric_name]
+
+
+def get_vector_quantization(name: Optional[str] = None) -> str:
+    """Resolve the ANN index quantization (VECTOR_QUANTIZATION, default none)."""
+    quantization = (name or os.getenv("VECTOR_QUANTIZATION") or "none").lower()
+    if quantization not in VECTOR_QUANTIZATIONS:
+        raise ValueError(
+            f"Unsupported vector quantization '{quantization}', "
+            f"expected one of {VECTOR_QUANTIZATIONS}"
+        )
+    return quantization
+
+
+def get_prefix_index_dims() -> List[int]:
+    """Prefix sizes with an ANN index (VECTOR_PREFIX_INDEX_DIMS, see 0020)."""
+    configured = os.getenv("VECTOR_PREFIX_INDEX_DIMS") or os.getenv("VECTOR_PREFIX_DIMS") or ""
+    return sorted({int(dims) for dims in configured.split(",") if dims.strip()})
+
+
+def rescore_candidates(k: int, oversample: Optional[int] = None) -> int:
+    """Quantized candidates fetched for an exactly re-scored top-``k``."""
+    if oversample is None:
+        oversample = int(os.getenv("VECTOR_RESCORE_OVERSAMPLE", "4"))
+    return k * max(1, oversample)
+
+
+def ann_index_sql(
+    index_type: Optional[str] = None,
+    metric: Optional[str] = None,
+    quantization: Optional[str] = None,
+    prefix_dims: Optional[int] = None,
+) -> str:
+    """CREATE INDEX statement for the configured ANN index, or for the
+    index over a ``prefix_dims`` prefix (see migrations 0016, 0019, 0020)."""
+    index_type = (index_type or os.getenv("VECTOR_INDEX_TYPE") or "hnsw").lower()
+    vector_metric = get_vector_metric(metric)
+    if prefix_dims:
+        name = f"idx_embeddings_vec_prefix{int(prefix_dims)}_{index_type}"
+        column = (
+            f"(CAST(subvector(vec, 1, {int(prefix_dims)}) AS vector({int(prefix_dims)}))) "
+            f"{vector_metric.opclass}"
+        )
+    elif get_vector_quantization(quantization) == "halfvec":
+        name = f"idx_embeddings_vec_halfvec_{index_type}"
+        column = (
+            f"(CAST(vec AS halfvec({VECTOR_DIMENSIONS}))) {vector_metric.halfvec_opclass}"
+        )
+    else:
+        name = f"idx_embeddings_vec_{index_type}"
+        column = f"vec {vector_metric.opclass}"
+
+    if index_type == "hnsw":
+        m = int(os.getenv("VECTOR_HNSW_M", "16"))
+        ef_construction = int(os.getenv("VECTOR_HNSW_EF_CONSTRUCTION", "64"))
+        return (
+            f"CREATE INDEX IF NOT EXISTS {name} ON embeddings "
+            f"USING hnsw ({column}) WITH (m = {m}, ef_construction = {ef_construction})"
+        )
+    if index_type == "ivfflat":
+        lists = int(os.getenv("VECTOR_IVFFLAT_LISTS", "100"))
+        return (
+            f"CREATE INDEX IF NOT EXISTS {name} ON embeddings "
+            f"USING ivfflat ({column}) WITH (lists = {lists})"
+        )
+    raise ValueError(f"Unsupported ANN index type '{index_type}', expected hnsw or ivfflat")
+
+
+def query_vector_param(dimensions: int, name: str = "query_vector") -> Any:
+    """Typed bind parameter for a query embedding."""
+    return bindparam(name, type_=get_vector_type(dimensions))
+
+
+def _env_int(name: str) -> Optional[int]:
+    value = os.getenv(name)
+    return int(value) if value else None
+
+
+@dataclass
+class ANNSearchParams:
+    """Per-request recall/latency knobs for the ANN index.
+
+    ``ef_search`` applies to HNSW indexes and ``probes`` to IVFFlat indexes;
+    ``prefix_dims`` runs the ANN stage over a vector prefix and
+    ``rescore_oversample`` sets how many candidates (k times it) a
+    two-stage or halfvec query re-ranks. ``None`` keeps the server default
+    (or the VECTOR_HNSW_EF_SEARCH / VECTOR_IVFFLAT_PROBES /
+    VECTOR_PREFIX_DIMS / VECTOR_RESCORE_OVERSAMPLE environment defaults);
+    ``prefix_dims=0`` turns two-stage retrieval off.
+    """
+
+    ef_search: Optional[int] = None
+    probes: Optional[int] = None
+    prefix_dims: Optional[int] = None
+    rescore_oversample: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        if self.ef_search is not None and not 1 <= int(self.ef_search) <= MAX_EF_SEARCH:
+            raise ValueError(f"ef_search must be between 1 and {MAX_EF_SEARCH}")
+        if self.probes is not None and not 1 <= int(self.probes) <= MAX_PROBES:
+            raise ValueError(f"probes must be between 1 and {MAX_PROBES}")
+        if self.prefix_dims is not None and not 0 <= int(self.prefix_dims) < VECTOR_DIMENSIONS:
+            raise ValueError(f"prefix_dims must be between 0 and {VECTOR_DIMENSIONS - 1}")
+        if self.rescore_oversample is not None and not (
+            1 <= int(self.rescore_oversample) <= MAX_RESCORE_OVERSAMPLE
+        ):
+            raise ValueError(
+                f"rescore_oversample must be between 1 and {MAX_RESCORE_OVERSAMPLE}"
+            )
+
+    @classmethod
+    def from_env(cls) -> "ANNSearchParams":
+        return cls(
+            ef_search=_env_int("VECTOR_HNSW_EF_SEARCH"),
+            probes=_env_int("VECTOR_IVFFLAT_PROBES"),
+            prefix_dims=_env_int("VECTOR_PREFIX_DIMS"),
+            rescore_oversample=_env_int("VECTOR_RESCORE_OVERSAMPLE"),
+        )
+
+    @classmethod
+    def from_retrieval_config(
+        cls, config: Optional[Dict[str, Any]]
+    ) -> Optional["ANNSearchParams"]:
+        """Per-agent overrides from an agent's ``retrieval_config``.
+
+        Recognized keys: ef_search, probes, vector_prefix_dims and
+        rescore_oversample; ``None`` when the agent sets none of them.
+        """
+        config = config or {}
+        values = {
+            "ef_search": config.get("ef_search"),
+            "probes": config.get("probes"),
+            "prefix_dims": config.get("vector_prefix_dims"),
+            "rescore_oversample": config.get("rescore_oversample"),
+        }
+        if all(value is None for value in values.values()):
+            return None
+        return cls(
+            **{key: int(value) if value is not None else None for key, value in values.items()}
+        )
+
+    @classmethod
+    def resolve(cls, params: Optional["ANNSearchParams"]) -> "ANNSearchParams":
+        """Fill unset fields from the environment defaults."""
+        defaults = cls.from_env()
+        if params is None:
+            return defaults
+        return cls(
+            **{
+                field.name: (
+                    getattr(params, field.name)
+                    if getattr(params, field.name) is not None
+                    else getattr(defaults, field.name)
+                )
+                for field in fields(cls)
+            }
+        )
+
+
+def candidate_ann_params(
+    params: Optional[ANNSearchParams], candidates: int
+) -> Optional[ANNSearchParams]:
+    """``params`` with ef_search raised so an HNSW scan yields ``candidates``.
+
+    HNSW returns at most ef_search rows, so a candidate query with a larger
+    LIMIT would come back short.
+    """
+    resolved = ANNSearchParams.resolve(params)
+    if (resolved.ef_search or DEFAULT_EF_SEARCH) >= candidates:
+        return params
+    return replace(params or ANNSearchParams(), ef_search=min(MAX_EF_SEARCH, candidates))
+
+
+def candidate_distance_sql(
+    metric: VectorMetric, params: Optional[ANNSearchParams] = None, column: str = "e.vec"
+) -> Optional[str]:
+    """ORDER BY expression of the ANN candidate stage of a re-scored query:
+    the vector prefix for two-stage retrieval, the halfvec cast with a
+    halfvec index, ``None`` for a single-stage query."""
+    prefix_dims = ANNSearchParams.resolve(params).prefix_dims
+    if prefix_dims:
+        if prefix_dims not in get_prefix_index_dims() and prefix_dims not in _unindexed_prefixes:
+            _unindexed_prefixes.add(prefix_dims)
+            logger.warning(
+                f"No ANN index over a {prefix_dims}-d vector prefix "
+                f"(VECTOR_PREFIX_INDEX_DIMS); two-stage candidates are scanned"
+            )
+        return metric.prefix_distance_sql(column, prefix_dims)
+    if get_vector_quantization() == "halfvec":
+        return metric.halfvec_distance_sql(column)
+    return None
+
+
+def is_rescored(params: Optional[ANNSearchParams] = None) -> bool:
+    """Whether ANN queries take candidates for an exact re-scoring pass."""
+    return bool(ANNSearchParams.resolve(params).prefix_dims) or (
+        get_vector_quantization() == "halfvec"
+    )
+
+
+_unindexed_prefixes: set = set()
+
+
+async def apply_ann_params(
+    session: AsyncSession, params: Optional[ANNSearchParams] = None
+) -> None:
+    """Apply ANN tuning to the current transaction with SET LOCAL.
+
+    SET LOCAL only lasts until the transaction ends, so pooled connections
+    never leak one request's settings into the next. The values are
+    validated integers, which is why they can be inlined (SET does not take
+    bind parameters).
+    """
+    resolved = ANNSearchParams.resolve(params)
+    if resolved.ef_search is not None:
+        await session.execute(text(f"SET LOCAL hnsw.ef_search = {int(resolved.ef_search)}"))
+    if resolved.probes is not None:
+        await session.execute(text(f"SET LOCAL ivfflat.probes = {int(resolved.probes)}"))
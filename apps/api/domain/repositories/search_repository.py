@@ -32,6 +32,13 @@ class SearchParams:
     enable_reranking: bool = True
     filters: Dict[str, Any] = field(default_factory=dict)
     include_metadata: bool = True
+    # ANN index tuning (HNSW ef_search / IVFFlat probes)
+    ef_search: Optional[int] = None
+    probes: Optional[int] = None
+    # Two-stage vector retrieval: ANN over this many leading dimensions,
+    # then rescore_oversample * top_k candidates re-ranked at full size
+    vector_prefix_dims: Optional[int] = None
+    rescore_oversample: Optional[int] = None
 
 
 @dataclass
@@ -110,6 +110,10 @@ class QueryAgentUseCase:
                 "version": agent.taxonomy_version,
             },
             include_metadata=input_data.include_metadata,
+            ef_search=agent.config.retrieval_config.get("ef_search"),
+            probes=agent.config.retrieval_config.get("probes"),
+            vector_prefix_dims=agent.config.retrieval_config.get("vector_prefix_dims"),
+            rescore_oversample=agent.config.retrieval_config.get("rescore_oversample"),
         )
 
         # Execute search
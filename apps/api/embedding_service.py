@@ -9,9 +9,23 @@ import os
 import asyncio
 import logging
 import hashlib
-from typing import List, Optional, Dict, Any, cast, TYPE_CHECKING
+import random
+import time
+from typing import (
+    Awaitable,
+    Callable,
+    List,
+    Optional,
+    Dict,
+    Any,
+    Set,
+    cast,
+    TYPE_CHECKING,
+)
 import numpy as np
 
+from .cache.embedding_cache import EmbeddingCache, get_embedding_cache
+
 # Import for type hints only (not at runtime)
 if TYPE_CHECKING:
     from sentence_transformers import SentenceTransformer
@@ -48,6 +62,170 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
+def _consume_exception(future: "asyncio.Future[Any]") -> None:
+    # Waiters may all have been cancelled; never leave an exception unretrieved
+    if not future.cancelled():
+        future.exception()
+
+
+class EmbeddingMicroBatcher:
+    """Coalesce concurrent single-text embedding requests into batch calls.
+
+    Requests are collected for up to ``max_wait_ms`` (or until
+    ``max_batch_size`` texts are pending) and sent as one batch; results are
+    fanned back to the waiting callers. A text that is already pending or
+    in flight is not sent twice: later callers await the same future.
+    """
+
+    def __init__(
+        self,
+        embed_batch: Callable[[List[str]], Awaitable[List[List[float]]]],
+        max_batch_size: Optional[int] = None,
+        max_wait_ms: Optional[float] = None,
+    ) -> None:
+        self._embed_batch = embed_batch
+        self.max_batch_size = max_batch_size or int(
+            os.getenv("EMBEDDING_BATCH_MAX_SIZE", "64")
+        )
+        self.max_wait_ms = (
+            max_wait_ms
+            if max_wait_ms is not None
+            else float(os.getenv("EMBEDDING_BATCH_MAX_WAIT_MS", "5"))
+        )
+        self.stats = {"requests": 0, "batches": 0, "texts": 0, "deduplicated": 0}
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: Dict[str, "asyncio.Future[List[float]]"] = {}
+        self._in_flight: Dict[str, "asyncio.Future[List[float]]"] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set["asyncio.Task[None]"] = set()
+
+    def _bind_loop(self) -> asyncio.AbstractEventLoop:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Futures belong to one loop; state from a previous loop is stale
+            self._loop = loop
+            self._pending = {}
+            self._in_flight = {}
+            self._flush_handle = None
+            self._tasks = set()
+        return loop
+
+    async def embed(self, text: str) -> List[float]:
+        """Embed one text as part of the next batch"""
+        loop = self._bind_loop()
+        self.stats["requests"] += 1
+
+        future = self._pending.get(text) or self._in_flight.get(text)
+        if future is not None:
+            self.stats["deduplicated"] += 1
+        else:
+            future = loop.create_future()
+            future.add_done_callback(_consume_exception)
+            self._pending[text] = future
+            if len(self._pending) >= self.max_batch_size:
+                self._flush()
+            elif self._flush_handle is None:
+                self._flush_handle = loop.call_later(self.max_wait_ms / 1000.0, self._flush)
+
+        # shield: a cancelled caller must not cancel the shared result
+        return list(await asyncio.shield(future))
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, {}
+        self._in_flight.update(batch)
+        assert self._loop is not None
+        task = self._loop.create_task(self._run_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: Dict[str, "asyncio.Future[List[float]]"]) -> None:
+        texts = list(batch)
+        self.stats["batches"] += 1
+        self.stats["texts"] += len(texts)
+        try:
+            vectors = await self._embed_batch(texts)
+            if len(vectors) != len(texts):
+                raise RuntimeError(
+                    f"Embedding batch returned {len(vectors)} vectors for {len(texts)} texts"
+                )
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for future, vector in zip(batch.values(), vectors):
+                if not future.done():
+                    future.set_result(vector)
+        finally:
+            for text, future in batch.items():
+                if self._in_flight.get(text) is future:
+                    del self._in_flight[text]
+
+
+class TokenBucket:
+    """Async token bucket refilled continuously at ``rate_per_minute``."""
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None) -> None:
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        """Wait until ``amount`` tokens are available and take them"""
+        # A request larger than the bucket would otherwise wait forever
+        amount = min(amount, self.capacity)
+        # The lock keeps waiters FIFO so large requests are not starved
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                await asyncio.sleep((amount - self._tokens) / self.rate)
+
+
+class ProviderRateLimiter:
+    """Requests-per-minute and tokens-per-minute limits of an embedding API"""
+
+    def __init__(self, rpm: Optional[int] = None, tpm: Optional[int] = None) -> None:
+        self.requests = TokenBucket(rpm or int(os.getenv("EMBEDDING_RPM_LIMIT", "3000")))
+        self.tokens = TokenBucket(tpm or int(os.getenv("EMBEDDING_TPM_LIMIT", "1000000")))
+
+    @staticmethod
+    def estimate_tokens(texts: List[str]) -> int:
+        # ~4 characters per token for English BPE; a rough estimate, so
+        # configure EMBEDDING_TPM_LIMIT with some headroom
+        return sum(len(text) // 4 + 1 for text in texts)
+
+    async def acquire(self, texts: List[str]) -> None:
+        await self.requests.acquire(1)
+        await self.tokens.acquire(self.estimate_tokens(texts))
+
+
+def _is_retryable(error: Exception) -> bool:
+    """429, 5xx and transport errors are retried; other 4xx are not"""
+    status: Optional[int] = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    if status is None:
+        return True
+    return status == 429 or status >= 500
+
+
 class EmbeddingService:
     """OpenAI 기반 실제 임베딩 서비스 (1536차원)"""
 
@@ -86,7 +264,19 @@ class EmbeddingService:
         self._openai_client: Optional[Any] = None
         self._sentence_transformer: Optional[Any] = None
         self._model_loaded = False
-        self.embedding_cache: Dict[str, List[float]] = {}
+        # Shared two-tier cache (process-local LRU + Redis)
+        self.cache: EmbeddingCache = get_embedding_cache()
+        # Concurrent single-text requests are coalesced into batch calls
+        self.batcher: Optional[EmbeddingMicroBatcher] = (
+            EmbeddingMicroBatcher(self._embed_batch)
+            if os.getenv("EMBEDDING_MICRO_BATCHING", "true").lower() == "true"
+            else None
+        )
+        # Backfills dispatch batches concurrently within provider limits
+        self.rate_limiter = ProviderRateLimiter()
+        self.max_concurrency = int(os.getenv("EMBEDDING_MAX_CONCURRENCY", "4"))
+        self.max_retries = int(os.getenv("EMBEDDING_MAX_RETRIES", "5"))
+        self.retry_base_delay = float(os.getenv("EMBEDDING_RETRY_BASE_DELAY", "0.5"))
 
         if not self.model_config:
             logger.warning(f"지원되지 않는 모델: {model_name}, 기본 모델로 변경")
@@ -150,28 +340,28 @@ class EmbeddingService:
             return self._generate_zero_vector()
 
         if use_cache:
-            cache_key = self._get_cache_key(text)
-            if cache_key in self.embedding_cache:
+            cached = await self.cache.get(self.model_name, text)
+            if cached is not None:
                 logger.debug(f"캐시에서 임베딩 반환: {text[:50]}...")
-                return self.embedding_cache[cache_key]
+                return cached
 
         try:
             processed_text = self._preprocess_text(text)
 
-            if self._openai_client:
-                embedding = await self._generate_openai_embedding(processed_text)
+            if self.batcher is not None:
+                # _embed_batch already normalizes
+                final_embedding = await self.batcher.embed(processed_text)
             else:
-                embedding = await self._generate_sentence_transformer_embedding(
-                    processed_text
-                )
-
-            final_embedding = self._normalize_vector(embedding)
+                if self._openai_client:
+                    embedding = await self._generate_openai_embedding(processed_text)
+                else:
+                    embedding = await self._generate_sentence_transformer_embedding(
+                        processed_text
+                    )
+                final_embedding = self._normalize_vector(embedding)
 
             if use_cache:
-                self.embedding_cache[cache_key] = final_embedding
-                if len(self.embedding_cache) > 1000:
-                    oldest_key = next(iter(self.embedding_cache))
-                    del self.embedding_cache[oldest_key]
+                await self.cache.set(self.model_name, text, final_embedding)
 
             logger.info(
                 f"임베딩 생성 완료 - 텍스트: {len(text)}자, 벡터: {len(final_embedding)}차원"
@@ -227,64 +417,101 @@ class EmbeddingService:
     async def batch_generate_embeddings(
         self, texts: List[str], batch_size: int = 100, show_progress: bool = True
     ) -> List[List[float]]:
-        """배치로 임베딩 생성 (Langfuse cost tracking enabled)"""
+        """배치로 임베딩 생성 (Langfuse cost tracking enabled)
+
+        Texts already in the shared embedding cache are not re-embedded.
+        """
         if not texts:
             return []
 
-        embeddings = []
-        total_batches = (len(texts) + batch_size - 1) // batch_size
+        cached = await self.cache.get_many(self.model_name, texts)
+        embeddings: List[Optional[List[float]]] = list(cached)
+        missing = [i for i, emb in enumerate(cached) if emb is None]
+        if len(missing) < len(texts):
+            logger.info(f"임베딩 캐시 적중: {len(texts) - len(missing)}/{len(texts)}개")
+
+        batches = [missing[i : i + batch_size] for i in range(0, len(missing), batch_size)]
+        total_batches = len(batches)
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+        completed = 0
+
+        async def run_batch(batch_num: int, batch_indices: List[int]) -> None:
+            nonlocal completed
+            batch_texts = [texts[j] for j in batch_indices]
+            async with semaphore:
+                try:
+                    normalized_embeddings = await self._embed_batch_with_retry(
+                        batch_texts
+                    )
+                    await self.cache.set_many(
+                        self.model_name, batch_texts, normalized_embeddings
+                    )
+                    for j, emb in zip(batch_indices, normalized_embeddings):
+                        embeddings[j] = emb
 
-        for i in range(0, len(texts), batch_size):
-            batch_texts = texts[i : i + batch_size]
-            batch_num = i // batch_size + 1
+                except Exception as e:
+                    logger.error(f"배치 {batch_num} 처리 실패: {e}")
+                    for j, text in zip(batch_indices, batch_texts):
+                        embeddings[j] = await self._generate_dummy_embedding(text)
 
+            completed += 1
             if show_progress:
-                logger.info(f"배치 처리 중: {batch_num}/{total_batches}")
+                logger.info(f"배치 처리 완료: {completed}/{total_batches}")
 
-            try:
-                processed_texts = [self._preprocess_text(text) for text in batch_texts]
-
-                if self._openai_client:
-                    response = await self._openai_client.embeddings.create(
-                        model=self.model_name,
-                        input=processed_texts,
-                        encoding_format="float",
-                    )
-                    batch_embeddings = [item.embedding for item in response.data]
-                else:
-                    model = self._load_sentence_transformer()
-                    if model is None:
-                        batch_embeddings = []
-                        for text in batch_texts:
-                            dummy_emb = await self._generate_dummy_embedding(text)
-                            batch_embeddings.append(dummy_emb)
-                    else:
-                        loop = asyncio.get_event_loop()
-                        raw_embeddings = await loop.run_in_executor(
-                            None,
-                            lambda: model.encode(
-                                processed_texts, convert_to_numpy=True
-                            ),
-                        )
-                        batch_embeddings = [
-                            self._pad_or_truncate_vector(emb) for emb in raw_embeddings
-                        ]
-
-                normalized_embeddings = [
-                    self._normalize_vector(emb) for emb in batch_embeddings
-                ]
-                embeddings.extend(normalized_embeddings)
+        await asyncio.gather(
+            *(run_batch(num, indices) for num, indices in enumerate(batches, start=1))
+        )
 
-                await asyncio.sleep(0.01)
+        logger.info(f"배치 임베딩 생성 완료: {len(texts)}개 텍스트")
+        return cast(List[List[float]], embeddings)
 
+    async def _embed_batch_with_retry(self, batch_texts: List[str]) -> List[List[float]]:
+        """_embed_batch with exponential backoff on rate-limit and transient errors"""
+        attempt = 0
+        while True:
+            try:
+                return await self._embed_batch(batch_texts)
             except Exception as e:
-                logger.error(f"배치 {batch_num} 처리 실패: {e}")
+                if attempt >= self.max_retries or not _is_retryable(e):
+                    raise
+                delay = self.retry_base_delay * (2**attempt) * random.uniform(0.5, 1.5)
+                attempt += 1
+                logger.warning(
+                    f"임베딩 배치 재시도 {attempt}/{self.max_retries} ({delay:.2f}s 후): {e}"
+                )
+                await asyncio.sleep(delay)
+
+    async def _embed_batch(self, batch_texts: List[str]) -> List[List[float]]:
+        """한 배치의 임베딩 생성 (캐시 미사용)"""
+        processed_texts = [self._preprocess_text(text) for text in batch_texts]
+
+        if self._openai_client:
+            await self.rate_limiter.acquire(processed_texts)
+            response = await self._openai_client.embeddings.create(
+                model=self.model_name,
+                input=processed_texts,
+                encoding_format="float",
+                dimensions=self.TARGET_DIMENSIONS,
+            )
+            batch_embeddings = [item.embedding for item in response.data]
+        else:
+            model = self._load_sentence_transformer()
+            if model is None:
+                batch_embeddings = []
                 for text in batch_texts:
                     dummy_emb = await self._generate_dummy_embedding(text)
-                    embeddings.append(dummy_emb)
+                    batch_embeddings.append(dummy_emb)
+            else:
+                loop = asyncio.get_event_loop()
+                raw_embeddings = await loop.run_in_executor(
+                    None,
+                    lambda: model.encode(processed_texts, convert_to_numpy=True),
+                )
+                batch_embeddings = [
+                    self._pad_or_truncate_vector(emb) for emb in raw_embeddings
+                ]
 
-        logger.info(f"배치 임베딩 생성 완료: {len(texts)}개 텍스트")
-        return embeddings
+        return [self._normalize_vector(emb) for emb in batch_embeddings]
 
     def calculate_similarity(
         self, embedding1: List[float], embedding2: List[float]
@@ -324,9 +551,14 @@ class EmbeddingService:
 
         return processed
 
+    @property
+    def embedding_cache(self) -> Dict[str, Any]:
+        """L1 (process-local) tier of the shared embedding cache"""
+        return self.cache.local
+
     def _get_cache_key(self, text: str) -> str:
-        """캐시 키 생성"""
-        return hashlib.md5(text.encode("utf-8")).hexdigest()
+        """캐시 키 생성 (model, 정규화 텍스트 해시)"""
+        return self.cache.make_key(self.model_name, text)
 
     def _normalize_vector(self, vector: List[float]) -> List[float]:
         """L2 정규화"""
@@ -426,9 +658,8 @@ class EmbeddingService:
             }
 
     def clear_cache(self) -> int:
-        """캐시 클리어"""
-        cache_size = len(self.embedding_cache)
-        self.embedding_cache.clear()
+        """캐시 클리어 (L1; Redis 항목은 TTL로 만료)"""
+        cache_size = self.cache.clear_local()
         logger.info(f"임베딩 캐시 클리어: {cache_size}개 항목 제거")
         return cache_size
 
@@ -440,102 +671,106 @@ class DocumentEmbeddingService:
         self.embedding_service = embedding_service
 
     async def update_document_embeddings(
-        self, document_ids: Optional[List[str]] = None, batch_size: int = 100
+        self,
+        document_ids: Optional[List[str]] = None,
+        batch_size: int = 100,
+        resume_after: Optional[str] = None,
     ) -> Dict[str, Any]:
-        """문서들의 임베딩 업데이트"""
-        from .database import db_manager, text
-
-        try:
-            async with db_manager.async_session() as session:
-                if document_ids:
-                    doc_ids_str = "', '".join(document_ids)
-                    query = text(
-                        f"""
-                        SELECT c.chunk_id, c.text, c.doc_id
-                        FROM chunks c
-                        LEFT JOIN embeddings e ON c.chunk_id = e.chunk_id
-                        WHERE c.doc_id IN ('{doc_ids_str}') AND e.chunk_id IS NULL
-                        ORDER BY c.chunk_id
-                    """
-                    )
-                else:
-                    query = text(
-                        """
-                        SELECT c.chunk_id, c.text, c.doc_id
-                        FROM chunks c
-                        LEFT JOIN embeddings e ON c.chunk_id = e.chunk_id
-                        WHERE e.chunk_id IS NULL
-                        ORDER BY c.chunk_id
-                    """
-                    )
+        """문서들의 임베딩 업데이트
 
-                result = await session.execute(query)
-                chunks = result.fetchall()
+        Chunks are walked in chunk_id order one page at a time; each page is
+        embedded with bounded concurrency, bulk-written and committed, so the
+        returned ``last_chunk_id`` is a durable checkpoint. Pass it back as
+        ``resume_after`` to continue an interrupted backfill (re-running
+        without it also works, since embedded chunks are skipped).
+        """
+        from sqlalchemy import bindparam
 
-                if not chunks:
-                    return {
-                        "success": True,
-                        "message": "모든 청크에 임베딩이 이미 존재합니다",
-                        "updated_count": 0,
-                        "total_chunks": 0,
-                    }
-
-                logger.info(f"임베딩 업데이트 대상: {len(chunks)}개 청크")
+        from .database import db_manager, text
+        from .database.utils.bulk_write import bulk_upsert_embeddings
+
+        def page_query(after: Optional[str]) -> Any:
+            filters = ["e.chunk_id IS NULL"]
+            if after is not None:
+                filters.append("c.chunk_id > :after")
+            if document_ids:
+                filters.append("c.doc_id IN :doc_ids")
+            query = text(
+                f"""
+                SELECT c.chunk_id, c.text
+                FROM chunks c
+                LEFT JOIN embeddings e ON c.chunk_id = e.chunk_id
+                WHERE {" AND ".join(filters)}
+                ORDER BY c.chunk_id
+                LIMIT :page_size
+            """
+            )
+            if document_ids:
+                query = query.bindparams(bindparam("doc_ids", expanding=True))
+            return query
 
-                updated_count = 0
-                total_chunks = len(chunks)
+        page_size = batch_size * max(1, self.embedding_service.max_concurrency)
+        model_name = self.embedding_service.model_name
+        updated_count = 0
+        last_chunk_id = resume_after
 
-                for i in range(0, len(chunks), batch_size):
-                    batch_chunks = chunks[i : i + batch_size]
-                    batch_texts = [chunk[1] for chunk in batch_chunks]
+        try:
+            async with db_manager.async_session() as session:
+                while True:
+                    params: Dict[str, Any] = {"page_size": page_size}
+                    if last_chunk_id is not None:
+                        params["after"] = last_chunk_id
+                    if document_ids:
+                        params["doc_ids"] = list(document_ids)
+                    result = await session.execute(page_query(last_chunk_id), params)
+                    chunks = result.fetchall()
+                    if not chunks:
+                        break
 
                     embeddings = await self.embedding_service.batch_generate_embeddings(
-                        batch_texts, batch_size=batch_size
+                        [chunk[1] for chunk in chunks], batch_size=batch_size
+                    )
+                    updated_count += await bulk_upsert_embeddings(
+                        session,
+                        [(chunk[0], emb) for chunk, emb in zip(chunks, embeddings)],
+                        model_name,
                     )
-
-                    for j, (chunk_id, text_content, doc_id) in enumerate(batch_chunks):
-                        if j < len(embeddings):
-                            embedding = embeddings[j]
-
-                            insert_query = text(
-                                """
-                                INSERT INTO embeddings (chunk_id, vec, model_name)
-                                VALUES (:chunk_id, :vec, :model_name)
-                                ON CONFLICT (chunk_id) DO UPDATE SET
-                                    vec = EXCLUDED.vec,
-                                    model_name = EXCLUDED.model_name,
-                                    created_at = NOW()
-                            """
-                            )
-
-                            await session.execute(
-                                insert_query,
-                                {
-                                    "chunk_id": chunk_id,
-                                    "vec": embedding,
-                                    "model_name": self.embedding_service.model_name,
-                                },
-                            )
-
-                            updated_count += 1
-
                     await session.commit()
 
+                    last_chunk_id = str(chunks[-1][0])
                     logger.info(
-                        f"배치 {i//batch_size + 1} 완료: {updated_count}/{total_chunks} 청크 처리"
+                        f"임베딩 체크포인트: {updated_count}개 청크 처리, last_chunk_id={last_chunk_id}"
                     )
 
+                    if len(chunks) < page_size:
+                        break
+
+            if updated_count == 0:
                 return {
                     "success": True,
-                    "message": "임베딩 업데이트 완료",
-                    "updated_count": updated_count,
-                    "total_chunks": total_chunks,
-                    "model_name": self.embedding_service.model_name,
+                    "message": "모든 청크에 임베딩이 이미 존재합니다",
+                    "updated_count": 0,
+                    "total_chunks": 0,
+                    "last_chunk_id": last_chunk_id,
                 }
 
+            return {
+                "success": True,
+                "message": "임베딩 업데이트 완료",
+                "updated_count": updated_count,
+                "total_chunks": updated_count,
+                "model_name": model_name,
+                "last_chunk_id": last_chunk_id,
+            }
+
         except Exception as e:
             logger.error(f"문서 임베딩 업데이트 실패: {e}")
-            return {"success": False, "error": str(e), "updated_count": 0}
+            return {
+                "success": False,
+                "error": str(e),
+                "updated_count": updated_count,
+                "last_chunk_id": last_chunk_id,
+            }
 
     async def get_embedding_status(self) -> Dict[str, Any]:
         """임베딩 상태 조회"""
@@ -621,11 +856,13 @@ def calculate_similarity(emb1: List[float], emb2: List[float]) -> float:
 
 
 async def update_document_embeddings(
-    document_ids: Optional[List[str]] = None, batch_size: int = 100
+    document_ids: Optional[List[str]] = None,
+    batch_size: int = 100,
+    resume_after: Optional[str] = None,
 ) -> Dict[str, Any]:
     """문서 임베딩 업데이트 함수"""
     return await document_embedding_service.update_document_embeddings(
-        document_ids, batch_size
+        document_ids, batch_size, resume_after
     )
 
 
@@ -23,7 +23,7 @@ import logging
 import os
 import time
 from contextlib import asynccontextmanager
-from typing import Any, Dict, cast
+from typing import Any, Dict, Optional, cast
 
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
@@ -32,6 +32,8 @@ from fastapi.responses import JSONResponse
 from fastapi.openapi.docs import get_swagger_ui_html, get_redoc_html
 from fastapi.openapi.utils import get_openapi
 
+from apps.security.middleware.json_stream import skip_response_sanitization
+
 # slowapi removed - using custom Redis-based rate limiter
 
 
@@ -124,6 +126,70 @@ logger = logging.getLogger(__name__)
 config = get_config()
 
 
+async def _load_local_vector_index() -> None:
+    """Load the local vector index and sync it with the embeddings table"""
+    from apps.core.db_session import async_session
+    from apps.api.database.utils.local_vector_index import load_local_vector_index
+
+    try:
+        async with async_session() as session:
+            index = await load_local_vector_index(session)
+        logger.info(f"✅ Local vector index loaded ({len(index)} vectors)")
+    except Exception as e:
+        logger.warning(f"⚠️ Local vector index load failed: {e}")
+
+
+def _start_local_vector_index(db_connected: bool) -> Optional["asyncio.Task[None]"]:
+    """Start loading the local vector index (no pgvector) in the background.
+
+    Startup does not wait; the first search awaits the same load.
+    """
+    if not db_connected:
+        return None
+    try:
+        from apps.api.database.utils.local_vector_index import vector_search_backend
+
+        if vector_search_backend() != "local":
+            return None
+        task = asyncio.create_task(_load_local_vector_index())
+        logger.info("ℹ️ Loading local vector index in the background")
+        return task
+    except Exception as e:
+        logger.warning(f"⚠️ Local vector index load failed: {e}")
+        return None
+
+
+def _stop_local_vector_index(task: Optional["asyncio.Task[None]"]) -> None:
+    if task is not None and not task.done():
+        task.cancel()
+
+
+async def _flush_api_key_usage() -> None:
+    """Write buffered API key usage and stop the key invalidation listener"""
+    try:
+        from apps.api.security.api_key_cache import get_verified_key_cache
+        from apps.api.security.api_key_usage import get_usage_log_writer
+
+        await get_usage_log_writer().flush()
+        await get_verified_key_cache().stop_listener()
+    except Exception as e:
+        logger.warning(f"⚠️ API key usage flush failed: {e}")
+
+
+async def _shutdown_search_services() -> None:
+    """Stop the search optimization thread pools and cache listener"""
+    try:
+        from apps.api.optimization import shutdown_async_optimizer
+        from apps.api.database.utils.cross_encoder import shutdown_cross_encoder_stage
+        from apps.search.hybrid_search_engine import stop_cache_invalidation_listener
+
+        shutdown_async_optimizer()
+        shutdown_cross_encoder_stage()
+        await stop_cache_invalidation_listener()
+    except Exception as e:
+        logger.warning(f"⚠️ Search optimizer cleanup failed: {e}")
+
+
 # Application lifespan context manager
 # @CODE:MYPY-CONSOLIDATION-002 | Phase 3: no-untyped-def resolution
 # @CODE:MYPY-CONSOLIDATION-002 | Phase 14: unused-ignore (Fix 32 - decorator type stubs now available)
@@ -248,6 +314,8 @@ async def lifespan(app: FastAPI) -> Any:
     except Exception as e:
         logger.warning(f"⚠️ Rate limiter initialization failed: {e}")
 
+    local_index_task = _start_local_vector_index(db_connected)
+
     # RAILWAY OPTIMIZATION: Skip JobOrchestrator pre-warming at startup
     # Pre-warming was causing cumulative startup delay exceeding Railway health check timeout
     # JobOrchestrator will initialize lazily on first /ingestion/upload request
@@ -260,6 +328,8 @@ async def lifespan(app: FastAPI) -> Any:
     # Shutdown
     logger.info("🔥 Shutting down Norade API")
 
+    _stop_local_vector_index(local_index_task)
+
     # Close rate limiter
     try:
         await rate_limiter.close()
@@ -267,6 +337,9 @@ async def lifespan(app: FastAPI) -> Any:
     except Exception as e:
         logger.warning(f"⚠️ Rate limiter cleanup failed: {e}")
 
+    await _flush_api_key_usage()
+    await _shutdown_search_services()
+
     # Cleanup monitoring resources
     if MONITORING_AVAILABLE:
         try:
@@ -462,6 +535,7 @@ async def general_exception_handler(request: Request, exc: Exception) -> JSONRes
 # Health check endpoint
 # @CODE:MYPY-CONSOLIDATION-002 | Phase 3: no-untyped-def resolution
 @app.get("/health", tags=["Health"])  # Decorator lacks type stubs
+@skip_response_sanitization
 async def health_check() -> Dict[str, Any]:
     """Basic health check endpoint with database and Redis status
 
@@ -642,6 +716,7 @@ app.include_router(
 # API versioning support
 # @CODE:MYPY-CONSOLIDATION-002 | Phase 3: no-untyped-def resolution
 @app.get("/api/versions", tags=["Versioning"])  # Decorator lacks type stubs
+@skip_response_sanitization
 async def list_api_versions() -> Dict[str, Any]:
     """List available API versions"""
     return {
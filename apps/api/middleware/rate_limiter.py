@@ -5,15 +5,32 @@ Rate Limiting Middleware for DT-RAG API
 Implements tiered rate limiting with Redis backend:
 - Read operations (GET): 100 requests/minute
 - Write operations (POST/PUT/DELETE): 50 requests/minute
-- Admin operations: 200 requests/minute
-
-Uses Fixed Window algorithm with Redis for distributed rate limiting.
+- Per API key scope overrides (RATE_LIMIT_SCOPES, e.g. "admin=200,write=120")
+
+Uses GCRA (generic cell rate algorithm) in an atomic Redis Lua script: one
+round trip per check, one key per client and limit, no fixed-window edge
+bursts. Tiers with different limits never share state: a write denial does
+not block reads, and leases taken at one tier's rate are not spent at
+another's.
+Each process leases a few requests at a time from Redis into a local token
+bucket and serves them without Redis until they run out or
+RATE_LIMIT_SYNC_MS passes; denials are cached locally until the client may
+retry. Idle clients are evicted from the local table.
+
+Without Redis, limits are enforced per process with the same algorithm when
+the caller asks for it (RATE_LIMIT_LOCAL_FALLBACK for this middleware).
+
+@CODE:RATE-LIMIT-002
 """
 
+import asyncio
+import math
 import os
 import time
 import logging
-from typing import Callable, Optional
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
 from fastapi import Request, Response, HTTPException
 from starlette.middleware.base import BaseHTTPMiddleware
 import redis.asyncio as aioredis
@@ -36,25 +53,110 @@ REDIS_HOST = os.getenv("REDIS_HOST", "redis")
 REDIS_PORT = int(os.getenv("REDIS_PORT", "6379"))
 REDIS_DB = int(os.getenv("REDIS_DB_RATE_LIMIT", "1"))
 
+# Local token bucket: at most this many requests are leased per Redis call
+# (and never more than 5% of the limit); unused leases expire after SYNC_MS
+RATE_LIMIT_LOCAL_BURST = int(os.getenv("RATE_LIMIT_LOCAL_BURST", "10"))
+RATE_LIMIT_SYNC_MS = int(os.getenv("RATE_LIMIT_SYNC_MS", "1000"))
+RATE_LIMIT_MAX_CLIENTS = int(os.getenv("RATE_LIMIT_MAX_CLIENTS", "100000"))
+# Enforce limits per process when Redis is unavailable (else allow all)
+RATE_LIMIT_LOCAL_FALLBACK = (
+    os.getenv("RATE_LIMIT_LOCAL_FALLBACK", "false").lower() == "true"
+)
+
+
+def _parse_scope_limits(value: str) -> Dict[str, int]:
+    limits = {}
+    for item in value.split(","):
+        scope, _, limit = item.partition("=")
+        if scope.strip() and limit.strip():
+            limits[scope.strip()] = int(limit)
+    return limits
+
+
+# API key scope -> requests per window, overriding the method tiers
+SCOPE_RATE_LIMITS = _parse_scope_limits(
+    os.getenv("RATE_LIMIT_SCOPES", f"admin={RATE_LIMIT_ADMIN}")
+)
+
+# GCRA with leases. Stores the theoretical arrival time (TAT, ms) of the
+# next request; every granted request pushes it one emission interval
+# (window / limit) forward, and a request fits while TAT - now <= window.
+# Grants up to ARGV[3] requests at once. Uses the Redis clock so hosts with
+# skewed clocks agree.
+#
+# Returns {granted, remaining, retry_after_ms, reset_after_ms}
+GCRA_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local emission = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local wanted = tonumber(ARGV[3])
+local tat = tonumber(redis.call('GET', KEYS[1]))
+if not tat or tat < now then
+  tat = now
+end
+local available = math.floor((now + window - tat) / emission)
+if available < 1 then
+  return {0, 0, tat - window + emission - now, tat - now}
+end
+local granted = math.min(wanted, available)
+tat = tat + granted * emission
+redis.call('SET', KEYS[1], tat, 'PX', tat - now)
+return {granted, available - granted, 0, tat - now}
+"""
+
+
+@dataclass
+class RateLimitDecision:
+    """Outcome of one rate limit check"""
+
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float = 0.0  # seconds until a request would be allowed
+    reset_after: float = 0.0  # seconds until the client is back to a full limit
+
+
+class _LocalState:
+    """Per-client state kept in process memory"""
+
+    __slots__ = ("tokens", "remaining", "lease_expires", "denied_until", "tat")
+
+    def __init__(self) -> None:
+        self.tokens = 0  # leased requests not yet used
+        self.remaining = 0  # what Redis had left after the lease
+        self.lease_expires = 0.0
+        self.denied_until = 0.0
+        self.tat = 0.0  # GCRA state when limiting without Redis
+
+    def idle(self, now: float) -> bool:
+        return now >= max(self.lease_expires, self.denied_until, self.tat)
+
 
 class RedisRateLimiter:
     """
-    Redis-based rate limiter using Fixed Window algorithm
+    Redis-based rate limiter using GCRA with locally leased tokens
     """
 
-    def __init__(self) -> None:
-        self.redis_client: Optional[aioredis.Redis] = None
+    def __init__(self, redis_client: Optional[aioredis.Redis] = None) -> None:
+        self.redis_client: Optional[aioredis.Redis] = redis_client
         self.enabled = REDIS_RATE_LIMIT_ENABLED
+        self.local_burst = RATE_LIMIT_LOCAL_BURST
+        self.sync_interval = RATE_LIMIT_SYNC_MS / 1000.0
+        self.max_clients = RATE_LIMIT_MAX_CLIENTS
+        self.stats = {"local": 0, "redis": 0, "denied": 0, "evicted": 0}
+
+        self._script: Any = None
+        # Least recently seen first
+        self._local: "OrderedDict[str, _LocalState]" = OrderedDict()
 
     async def initialize(self) -> None:
         """Initialize Redis connection with timeout"""
         if not self.enabled:
-            logger.info("Rate limiting disabled (REDIS_RATE_LIMIT_ENABLED=false)")
+            logger.info("Redis rate limiting disabled (REDIS_RATE_LIMIT_ENABLED=false)")
             return
 
         try:
-            import asyncio
-
             # Use REDIS_URL if available (Railway), otherwise fall back to individual components
             redis_url = REDIS_URL or f"redis://{REDIS_HOST}:{REDIS_PORT}/{REDIS_DB}"
 
@@ -75,20 +177,44 @@ class RedisRateLimiter:
                 f"Rate limiter initialized with Redis at {redis_source}"
             )
         except asyncio.TimeoutError:
-            logger.warning("Redis connection timeout - rate limiting disabled")
-            self.enabled = False
+            logger.warning("Redis connection timeout - rate limiting without Redis")
+            self.redis_client = None
         except Exception as e:
             logger.error(f"Failed to connect to Redis for rate limiting: {e}")
-            self.enabled = False
+            self.redis_client = None
 
     async def close(self) -> None:
         """Close Redis connection"""
         if self.redis_client:
             await self.redis_client.close()
 
+    @staticmethod
+    def _bucket(identifier: str, limit: int, window: int) -> str:
+        return f"{identifier}:{limit}/{window}"
+
+    def _state(self, bucket: str, now: float) -> _LocalState:
+        state = self._local.get(bucket)
+        if state is None:
+            state = self._local[bucket] = _LocalState()
+        else:
+            self._local.move_to_end(bucket)
+
+        # Evict clients that have gone quiet; they start fresh if they return
+        while len(self._local) > 1:
+            oldest_id, oldest = next(iter(self._local.items()))
+            if not oldest.idle(now) and len(self._local) <= self.max_clients:
+                break
+            del self._local[oldest_id]
+            self.stats["evicted"] += 1
+        return state
+
     async def check_rate_limit(
-        self, identifier: str, limit: int, window: int = RATE_LIMIT_WINDOW
-    ) -> tuple[bool, int, int]:
+        self,
+        identifier: str,
+        limit: int,
+        window: int = RATE_LIMIT_WINDOW,
+        local_fallback: bool = RATE_LIMIT_LOCAL_FALLBACK,
+    ) -> RateLimitDecision:
         """
         Check if request is within rate limit
 
@@ -96,60 +222,122 @@ class RedisRateLimiter:
             identifier: Unique identifier (API key or IP)
             limit: Maximum requests allowed in window
             window: Time window in seconds
+            local_fallback: Limit per process when Redis is unavailable
+                instead of allowing every request
 
         Returns:
-            (is_allowed, current_count, remaining)
+            RateLimitDecision
         """
-        if not self.enabled or not self.redis_client:
-            return True, 0, limit  # Allow all if disabled
-
-        try:
-            # Generate window-based key
-            current_window = int(time.time()) // window
-            key = f"ratelimit:{identifier}:{current_window}"
+        now = time.monotonic()
+        bucket = self._bucket(identifier, limit, window)
+        state = self._state(bucket, now)
+
+        if state.denied_until > now:
+            self.stats["denied"] += 1
+            return RateLimitDecision(False, limit, 0, state.denied_until - now)
+
+        if state.tokens > 0 and state.lease_expires > now:
+            state.tokens -= 1
+            self.stats["local"] += 1
+            return RateLimitDecision(
+                True, limit, state.remaining + state.tokens, 0.0, state.lease_expires - now
+            )
 
-            # Increment counter
-            current = await self.redis_client.incr(key)
+        if self.enabled and self.redis_client is not None:
+            try:
+                return await self._check_redis(bucket, state, limit, window, now)
+            except Exception as e:
+                logger.error(f"Rate limit check failed: {e}")
+
+        if not local_fallback:
+            return RateLimitDecision(True, limit, limit)  # Allow all without Redis
+        return self._check_local(state, limit, window, now)
+
+    async def _check_redis(
+        self, bucket: str, state: _LocalState, limit: int, window: int, now: float
+    ) -> RateLimitDecision:
+        if self._script is None:
+            assert self.redis_client is not None
+            self._script = self.redis_client.register_script(GCRA_LUA)
+
+        # Whole milliseconds, rounded up: never more than `limit` per window
+        emission_ms = max(1, math.ceil(window * 1000 / limit))
+        lease = max(1, min(self.local_burst, limit // 20))
+        granted, remaining, retry_after_ms, reset_after_ms = (
+            int(value)
+            for value in await self._script(
+                keys=[f"ratelimit:{bucket}"],
+                args=[emission_ms, window * 1000, lease],
+            )
+        )
+        self.stats["redis"] += 1
 
-            # Set expiry on first request in window
-            if current == 1:
-                await self.redis_client.expire(key, window)
+        if granted == 0:
+            state.denied_until = now + retry_after_ms / 1000.0
+            self.stats["denied"] += 1
+            return RateLimitDecision(
+                False, limit, 0, retry_after_ms / 1000.0, reset_after_ms / 1000.0
+            )
 
-            # Check if limit exceeded
-            is_allowed = current <= limit
-            remaining = max(0, limit - current)
+        state.tokens = granted - 1
+        state.remaining = remaining
+        state.lease_expires = now + self.sync_interval
+        return RateLimitDecision(
+            True, limit, remaining + state.tokens, 0.0, reset_after_ms / 1000.0
+        )
 
-            return is_allowed, current, remaining
+    def _check_local(
+        self, state: _LocalState, limit: int, window: int, now: float
+    ) -> RateLimitDecision:
+        """The GCRA script's algorithm on process-local state"""
+        emission = window / limit
+        tat = max(state.tat, now)
+        available = math.floor((now + window - tat) / emission)
+        if available < 1:
+            retry_after = tat - window + emission - now
+            state.denied_until = now + retry_after
+            self.stats["denied"] += 1
+            return RateLimitDecision(False, limit, 0, retry_after, tat - now)
 
-        except Exception as e:
-            logger.error(f"Rate limit check failed: {e}")
-            return True, 0, limit  # Fail open on error
+        state.tat = tat + emission
+        self.stats["local"] += 1
+        return RateLimitDecision(True, limit, available - 1, 0.0, state.tat - now)
 
 
 # Global rate limiter instance
 rate_limiter = RedisRateLimiter()
 
 
-def get_client_identifier(request: Request) -> str:
+def get_client_identifier(request: Request) -> Tuple[str, Optional[str]]:
     """
-    Extract API key or IP address for rate limiting
+    Extract API key or IP address for rate limiting, and the key's scope
     Priority: API Key > IP Address
+
+    A key's scope is only known once it has been verified (and cached)
+    by apps.api.deps.verify_api_key; until then the method tiers apply.
     """
     api_key = request.headers.get("X-API-Key")
     if api_key:
-        return f"apikey:{api_key[:16]}"
+        from apps.api.security.api_key_cache import get_verified_key_cache
+
+        key_info = get_verified_key_cache().get(api_key)
+        if key_info is not None:
+            return f"apikey:{key_info.key_id}", key_info.scope
+        return f"apikey:{api_key[:16]}", None
 
     # Get client IP
     if request.client:
-        return f"ip:{request.client.host}"
+        return f"ip:{request.client.host}", None
 
-    return "ip:unknown"
+    return "ip:unknown", None
 
 
-def get_rate_limit_for_method(method: str) -> int:
+def get_rate_limit_for_method(method: str, scope: Optional[str] = None) -> int:
     """
-    Get rate limit based on HTTP method
+    Get rate limit based on API key scope, then HTTP method
     """
+    if scope is not None and scope in SCOPE_RATE_LIMITS:
+        return SCOPE_RATE_LIMITS[scope]
     if method == "GET":
         return RATE_LIMIT_READ
     elif method in ["POST", "PUT", "PATCH", "DELETE"]:
@@ -170,21 +358,22 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             return await call_next(request)  # type: ignore[no-any-return]
 
         # Get client identifier
-        identifier = get_client_identifier(request)
+        identifier, scope = get_client_identifier(request)
 
-        # Get rate limit for method
-        limit = get_rate_limit_for_method(request.method)
+        # Get rate limit for scope or method
+        limit = get_rate_limit_for_method(request.method, scope)
 
         # Check rate limit
-        is_allowed, current, remaining = await rate_limiter.check_rate_limit(
+        decision = await rate_limiter.check_rate_limit(
             identifier, limit, RATE_LIMIT_WINDOW
         )
 
-        if not is_allowed:
+        if not decision.allowed:
+            retry_after = math.ceil(decision.retry_after)
             logger.warning(
                 f"Rate limit exceeded for {identifier} "
                 f"on {request.method} {request.url.path} "
-                f"({current}/{limit} in {RATE_LIMIT_WINDOW}s window)"
+                f"({limit} per {RATE_LIMIT_WINDOW}s, retry after {retry_after}s)"
             )
             raise HTTPException(
                 status_code=429,
@@ -192,9 +381,10 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                     "error": "Rate limit exceeded",
                     "limit": limit,
                     "window": RATE_LIMIT_WINDOW,
-                    "current": current,
-                    "retry_after": RATE_LIMIT_WINDOW,
+                    "current": limit - decision.remaining,
+                    "retry_after": retry_after,
                 },
+                headers={"Retry-After": str(retry_after)},
             )
 
         # Process request
@@ -202,9 +392,9 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
 
         # Add rate limit headers
         response.headers["X-RateLimit-Limit"] = str(limit)
-        response.headers["X-RateLimit-Remaining"] = str(remaining)
+        response.headers["X-RateLimit-Remaining"] = str(decision.remaining)
         response.headers["X-RateLimit-Reset"] = str(
-            (int(time.time()) // RATE_LIMIT_WINDOW + 1) * RATE_LIMIT_WINDOW
+            math.ceil(time.time() + decision.reset_after)
         )
 
         return response  # type: ignore[no-any-return]
@@ -212,6 +402,7 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
 
 __all__ = [
     "rate_limiter",
+    "RateLimitDecision",
     "RateLimitMiddleware",
     "RATE_LIMIT_READ",
     "RATE_LIMIT_WRITE",
@@ -2,12 +2,35 @@
 API Optimization Package
 
 Contains performance optimization utilities:
-- Query optimization
-- Response compression
-- Database query optimization
-- Performance monitoring
+- async_executor: parallel BM25/vector retrieval and bounded CPU offloading
+- memory_optimizer: GC-pause-aware request context
+- concurrency_control: per-operation concurrency limiting
 """
 
-from typing import List
+from .async_executor import (
+    AsyncExecutionOptimizer,
+    ExecutionMetrics,
+    get_async_optimizer,
+    shutdown_async_optimizer,
+)
+from .concurrency_control import (
+    ConcurrencyController,
+    ConcurrencyLimitExceeded,
+    OperationMetrics,
+    get_concurrency_controller,
+)
+from .memory_optimizer import GCMetrics, GCOptimizer, get_gc_optimizer
 
-__all__: List[str] = []
+__all__ = [
+    "AsyncExecutionOptimizer",
+    "ExecutionMetrics",
+    "get_async_optimizer",
+    "shutdown_async_optimizer",
+    "ConcurrencyController",
+    "ConcurrencyLimitExceeded",
+    "OperationMetrics",
+    "get_concurrency_controller",
+    "GCMetrics",
+    "GCOptimizer",
+    "get_gc_optimizer",
+]
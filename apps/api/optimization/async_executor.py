@@ -0,0 +1,246 @@
+"""
+Async execution optimizer for hybrid search.
+
+Runs BM25 and vector retrieval concurrently on separate pooled sessions and
+moves CPU-bound fusion/reranking onto a bounded thread pool so the event loop
+stays responsive under load.
+
+@CODE:OPTIMIZATION-001
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar, Union
+
+logger = logging.getLogger(__name__)
+
+try:
+    import psutil
+
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+    logger.debug("psutil not available, memory usage will not be reported")
+
+__all__ = [
+    "ExecutionMetrics",
+    "AsyncExecutionOptimizer",
+    "get_async_optimizer",
+    "shutdown_async_optimizer",
+]
+
+T = TypeVar("T")
+
+
+def _current_memory_mb() -> float:
+    """Resident set size of the current process in MB (0.0 if unavailable)."""
+    if not PSUTIL_AVAILABLE:
+        return 0.0
+    try:
+        return float(psutil.Process().memory_info().rss) / (1024 * 1024)
+    except Exception:
+        return 0.0
+
+
+@dataclass
+class ExecutionMetrics:
+    """Timing and resource metrics for one optimized search execution."""
+
+    total_time: float = 0.0
+    parallel_time: float = 0.0
+    bm25_time: float = 0.0
+    vector_time: float = 0.0
+    memory_usage: float = 0.0
+    bm25_candidates: int = 0
+    vector_candidates: int = 0
+    bm25_error: Optional[str] = None
+    vector_error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class AsyncExecutionOptimizer:
+    """Parallel retrieval and bounded CPU offloading for hybrid search."""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_pending_cpu_tasks: Optional[int] = None,
+    ) -> None:
+        cpu_count = os.cpu_count() or 1
+        self.max_workers = max_workers or int(
+            os.getenv("SEARCH_CPU_WORKERS", str(min(4, cpu_count)))
+        )
+        self.max_pending_cpu_tasks = max_pending_cpu_tasks or self.max_workers * 4
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="search-cpu"
+        )
+        self._cpu_semaphore: Optional[asyncio.Semaphore] = None
+        self._stats: Dict[str, float] = {
+            "parallel_searches": 0,
+            "cpu_tasks": 0,
+            "cpu_task_time": 0.0,
+        }
+
+    def _get_cpu_semaphore(self) -> asyncio.Semaphore:
+        if self._cpu_semaphore is None:
+            self._cpu_semaphore = asyncio.Semaphore(self.max_pending_cpu_tasks)
+        return self._cpu_semaphore
+
+    async def execute_parallel_search(
+        self,
+        session: Any,
+        query: str,
+        query_embedding: List[float],
+        search_params: Dict[str, Any],
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], ExecutionMetrics]:
+        """Run BM25 and vector search concurrently.
+
+        An AsyncSession cannot run two statements at once, so BM25 runs on the
+        caller's session while the vector search checks out its own session
+        from the pool.
+        """
+        from ..database.daos.database_manager import db_manager
+        from ..database.daos.search_dao import SearchDAO
+
+        start_time = time.perf_counter()
+        metrics = ExecutionMetrics()
+        filters = search_params.get("filters") or {}
+
+        async def run_bm25() -> List[Dict[str, Any]]:
+            bm25_start = time.perf_counter()
+            try:
+                return await SearchDAO._perform_bm25_search(
+                    session, query, search_params.get("bm25_topk", 12), filters
+                )
+            finally:
+                metrics.bm25_time = time.perf_counter() - bm25_start
+
+        async def run_vector() -> List[Dict[str, Any]]:
+            vector_start = time.perf_counter()
+            try:
+                async with db_manager.async_session() as vector_session:
+                    return await SearchDAO._perform_vector_search(
+                        vector_session,
+                        query_embedding,
+                        search_params.get("vector_topk", 12),
+                        filters,
+                        search_params.get("ann_params"),
+                    )
+            finally:
+                metrics.vector_time = time.perf_counter() - vector_start
+
+        # @CODE:MYPY-CONSOLIDATION-002 | has-type resolution (explicit typing for asyncio.gather results)
+        bm25_outcome: Union[List[Dict[str, Any]], BaseException]
+        vector_outcome: Union[List[Dict[str, Any]], BaseException]
+        bm25_outcome, vector_outcome = await asyncio.gather(
+            run_bm25(), run_vector(), return_exceptions=True
+        )
+        metrics.parallel_time = time.perf_counter() - start_time
+
+        bm25_results: List[Dict[str, Any]] = []
+        vector_results: List[Dict[str, Any]] = []
+
+        if isinstance(bm25_outcome, BaseException):
+            logger.error(f"Parallel BM25 search failed: {bm25_outcome}")
+            metrics.bm25_error = str(bm25_outcome)
+        else:
+            bm25_results = bm25_outcome
+
+        if isinstance(vector_outcome, BaseException):
+            logger.error(f"Parallel vector search failed: {vector_outcome}")
+            metrics.vector_error = str(vector_outcome)
+        else:
+            vector_results = vector_outcome
+
+        metrics.bm25_candidates = len(bm25_results)
+        metrics.vector_candidates = len(vector_results)
+        metrics.memory_usage = _current_memory_mb()
+        metrics.total_time = time.perf_counter() - start_time
+        self._stats["parallel_searches"] += 1
+
+        return bm25_results, vector_results, metrics
+
+    async def execute_fusion_with_concurrency_control(
+        self,
+        bm25_results: List[Dict[str, Any]],
+        vector_results: List[Dict[str, Any]],
+        fusion_params: Dict[str, Any],
+    ) -> List[Dict[str, Any]]:
+        """Fuse BM25 and vector candidates on the CPU pool."""
+        from ..database.daos.search_dao import SearchDAO
+        from ..database.utils.reranker import BM25_WEIGHT, VECTOR_WEIGHT
+
+        return await self.execute_cpu_intensive_task(
+            SearchDAO._combine_search_results,
+            bm25_results,
+            vector_results,
+            fusion_params.get("max_candidates", 50),
+            fusion_params.get("bm25_weight", BM25_WEIGHT),
+            fusion_params.get("vector_weight", VECTOR_WEIGHT),
+        )
+
+    async def execute_cpu_intensive_task(
+        self, func: Callable[..., T], *args: Any, **kwargs: Any
+    ) -> T:
+        """Run a synchronous function on the bounded thread pool.
+
+        The semaphore caps queued work so a burst of requests cannot pile
+        unbounded closures onto the executor queue.
+        """
+        async with self._get_cpu_semaphore():
+            loop = asyncio.get_running_loop()
+            task_start = time.perf_counter()
+            try:
+                return await loop.run_in_executor(
+                    self._executor, functools.partial(func, *args, **kwargs)
+                )
+            finally:
+                self._stats["cpu_tasks"] += 1
+                self._stats["cpu_task_time"] += time.perf_counter() - task_start
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return executor statistics."""
+        cpu_tasks = self._stats["cpu_tasks"]
+        return {
+            "max_workers": self.max_workers,
+            "max_pending_cpu_tasks": self.max_pending_cpu_tasks,
+            "parallel_searches": int(self._stats["parallel_searches"]),
+            "cpu_tasks": int(cpu_tasks),
+            "avg_cpu_task_time": (
+                self._stats["cpu_task_time"] / cpu_tasks if cpu_tasks else 0.0
+            ),
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down the CPU thread pool."""
+        self._executor.shutdown(wait=wait)
+
+
+# Global optimizer instance
+_async_optimizer: Optional[AsyncExecutionOptimizer] = None
+
+
+async def get_async_optimizer() -> AsyncExecutionOptimizer:
+    """Get the global async execution optimizer."""
+    global _async_optimizer
+    if _async_optimizer is None:
+        _async_optimizer = AsyncExecutionOptimizer()
+    return _async_optimizer
+
+
+def shutdown_async_optimizer() -> None:
+    """Shut down the global optimizer (used on application shutdown)."""
+    global _async_optimizer
+    if _async_optimizer is not None:
+        _async_optimizer.shutdown(wait=False)
+        _async_optimizer = None
@@ -0,0 +1,168 @@
+"""
+Per-operation concurrency limiting.
+
+Each named operation (e.g. ``hybrid_search``) gets its own semaphore so one
+expensive code path cannot exhaust the database pool for everything else.
+Callers that wait longer than the queue timeout get
+``ConcurrencyLimitExceeded`` instead of queueing indefinitely.
+
+@CODE:OPTIMIZATION-003
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, asdict
+from typing import Any, AsyncIterator, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "ConcurrencyLimitExceeded",
+    "OperationMetrics",
+    "ConcurrencyController",
+    "get_concurrency_controller",
+]
+
+# Default in-flight limits per operation
+DEFAULT_OPERATION_LIMITS: Dict[str, int] = {
+    "hybrid_search": 32,
+    "vector_search": 32,
+    "bm25_search": 32,
+    "embedding": 16,
+}
+
+
+class ConcurrencyLimitExceeded(RuntimeError):
+    """Raised when an operation slot could not be acquired in time."""
+
+
+@dataclass
+class OperationMetrics:
+    """Concurrency metrics for a single operation."""
+
+    limit: int = 0
+    in_flight: int = 0
+    waiting: int = 0
+    completed: int = 0
+    rejected: int = 0
+    total_wait_time: float = 0.0
+    max_wait_time: float = 0.0
+    peak_in_flight: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["avg_wait_time"] = (
+            self.total_wait_time / self.completed if self.completed else 0.0
+        )
+        return data
+
+
+class ConcurrencyController:
+    """Bounded in-flight execution keyed by operation name."""
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, int]] = None,
+        default_limit: Optional[int] = None,
+        queue_timeout: Optional[float] = None,
+    ) -> None:
+        self.limits = dict(DEFAULT_OPERATION_LIMITS)
+        if limits:
+            self.limits.update(limits)
+        self.default_limit = default_limit or int(
+            os.getenv("SEARCH_DEFAULT_CONCURRENCY", "16")
+        )
+        self.queue_timeout = (
+            queue_timeout
+            if queue_timeout is not None
+            else float(os.getenv("SEARCH_QUEUE_TIMEOUT", "10"))
+        )
+
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._metrics: Dict[str, OperationMetrics] = {}
+
+    def _limit_for(self, operation: str) -> int:
+        env_limit = os.getenv(f"CONCURRENCY_LIMIT_{operation.upper()}")
+        if env_limit:
+            return int(env_limit)
+        return self.limits.get(operation, self.default_limit)
+
+    def _get_semaphore(self, operation: str) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(operation)
+        if semaphore is None:
+            limit = self._limit_for(operation)
+            semaphore = asyncio.Semaphore(limit)
+            self._semaphores[operation] = semaphore
+            self._metrics[operation] = OperationMetrics(limit=limit)
+        return semaphore
+
+    def set_limit(self, operation: str, limit: int) -> None:
+        """Change the limit for an operation (applies to new semaphores)."""
+        if limit < 1:
+            raise ValueError("Concurrency limit must be at least 1")
+        self.limits[operation] = limit
+        if self._metrics.get(operation, OperationMetrics()).in_flight == 0:
+            self._semaphores.pop(operation, None)
+            self._metrics.pop(operation, None)
+
+    @asynccontextmanager
+    async def controlled_execution(self, operation: str) -> AsyncIterator[None]:
+        """Hold one slot of ``operation`` for the duration of the block."""
+        semaphore = self._get_semaphore(operation)
+        metrics = self._metrics[operation]
+
+        wait_start = time.perf_counter()
+        metrics.waiting += 1
+        try:
+            if self.queue_timeout > 0:
+                await asyncio.wait_for(semaphore.acquire(), timeout=self.queue_timeout)
+            else:
+                await semaphore.acquire()
+        except asyncio.TimeoutError:
+            metrics.rejected += 1
+            logger.warning(
+                f"Concurrency limit reached for '{operation}' "
+                f"({metrics.limit} in flight, waited {self.queue_timeout}s)"
+            )
+            raise ConcurrencyLimitExceeded(
+                f"Too many concurrent '{operation}' operations"
+            )
+        finally:
+            metrics.waiting -= 1
+
+        wait_time = time.perf_counter() - wait_start
+        metrics.total_wait_time += wait_time
+        metrics.max_wait_time = max(metrics.max_wait_time, wait_time)
+        metrics.in_flight += 1
+        metrics.peak_in_flight = max(metrics.peak_in_flight, metrics.in_flight)
+
+        try:
+            yield
+        finally:
+            metrics.in_flight -= 1
+            metrics.completed += 1
+            semaphore.release()
+
+    def get_metrics(self, operation: Optional[str] = None) -> Dict[str, Any]:
+        """Return metrics for one operation or all operations."""
+        if operation is not None:
+            metrics = self._metrics.get(operation)
+            return metrics.to_dict() if metrics else {}
+        return {name: m.to_dict() for name, m in self._metrics.items()}
+
+
+# Global concurrency controller instance
+_concurrency_controller: Optional[ConcurrencyController] = None
+
+
+def get_concurrency_controller() -> ConcurrencyController:
+    """Get the global concurrency controller."""
+    global _concurrency_controller
+    if _concurrency_controller is None:
+        _concurrency_controller = ConcurrencyController()
+    return _concurrency_controller
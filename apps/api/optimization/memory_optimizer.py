@@ -0,0 +1,146 @@
+"""
+GC pause management for latency-sensitive request paths.
+
+While at least one search is in flight the generation-0 threshold is raised so
+that the allocation burst of a search (rows, dicts, score lists) does not
+trigger young and cascading full collections mid-request. Thresholds are
+restored when the last in-flight search leaves the context. GC pauses are
+timed through ``gc.callbacks`` so their impact is visible in metrics.
+
+@CODE:OPTIMIZATION-002
+"""
+
+from __future__ import annotations
+
+import gc
+import logging
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, asdict
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["GCMetrics", "GCOptimizer", "get_gc_optimizer"]
+
+
+@dataclass
+class GCMetrics:
+    """Garbage collector pause statistics."""
+
+    collections: int = 0
+    total_pause_time: float = 0.0
+    max_pause_time: float = 0.0
+    pauses_during_requests: int = 0
+    pause_time_during_requests: float = 0.0
+    active_contexts: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class GCOptimizer:
+    """Raise GC thresholds while requests are in flight and time GC pauses."""
+
+    def __init__(
+        self, gen0_threshold: Optional[int] = None, enabled: Optional[bool] = None
+    ) -> None:
+        self.enabled = (
+            enabled
+            if enabled is not None
+            else os.getenv("SEARCH_GC_OPTIMIZATION", "true").lower() == "true"
+        )
+        self.gen0_threshold = gen0_threshold or int(
+            os.getenv("SEARCH_GC_GEN0_THRESHOLD", "10000")
+        )
+
+        self._lock = threading.Lock()
+        self._active = 0
+        self._saved_thresholds: Optional[Tuple[int, ...]] = None
+        self._pause_start: Optional[float] = None
+        self._metrics = GCMetrics()
+
+        gc.callbacks.append(self._gc_callback)
+
+    def _gc_callback(self, phase: str, info: Dict[str, Any]) -> None:
+        """Time each collection (called by the interpreter around GC runs)."""
+        if phase == "start":
+            self._pause_start = time.perf_counter()
+            return
+
+        if self._pause_start is None:
+            return
+
+        pause = time.perf_counter() - self._pause_start
+        self._pause_start = None
+
+        metrics = self._metrics
+        metrics.collections += 1
+        metrics.total_pause_time += pause
+        if pause > metrics.max_pause_time:
+            metrics.max_pause_time = pause
+        if self._active > 0:
+            metrics.pauses_during_requests += 1
+            metrics.pause_time_during_requests += pause
+
+    def _enter(self) -> None:
+        with self._lock:
+            self._active += 1
+            if self._active == 1:
+                self._saved_thresholds = gc.get_threshold()
+                current_gen0 = self._saved_thresholds[0]
+                if current_gen0 and current_gen0 < self.gen0_threshold:
+                    gc.set_threshold(self.gen0_threshold, *self._saved_thresholds[1:])
+
+    def _exit(self) -> None:
+        with self._lock:
+            self._active -= 1
+            if self._active == 0 and self._saved_thresholds is not None:
+                gc.set_threshold(*self._saved_thresholds)
+                self._saved_thresholds = None
+
+    @asynccontextmanager
+    async def optimized_gc_context(self) -> AsyncIterator[None]:
+        """Defer young-generation collections for the duration of a request."""
+        if not self.enabled:
+            yield
+            return
+
+        self._enter()
+        try:
+            yield
+        finally:
+            self._exit()
+
+    def get_metrics(self) -> GCMetrics:
+        """Return a snapshot of GC pause metrics."""
+        snapshot = GCMetrics(**asdict(self._metrics))
+        snapshot.active_contexts = self._active
+        return snapshot
+
+    def reset_metrics(self) -> None:
+        self._metrics = GCMetrics()
+
+    def close(self) -> None:
+        """Detach the GC callback and restore thresholds."""
+        if self._gc_callback in gc.callbacks:
+            gc.callbacks.remove(self._gc_callback)
+        with self._lock:
+            if self._saved_thresholds is not None:
+                gc.set_threshold(*self._saved_thresholds)
+                self._saved_thresholds = None
+            self._active = 0
+
+
+# Global GC optimizer instance
+_gc_optimizer: Optional[GCOptimizer] = None
+
+
+def get_gc_optimizer() -> GCOptimizer:
+    """Get the global GC optimizer."""
+    global _gc_optimizer
+    if _gc_optimizer is None:
+        _gc_optimizer = GCOptimizer()
+    return _gc_optimizer
@@ -18,6 +18,8 @@ from apps.api.deps import verify_api_key
 from apps.core.db_session import async_session
 from apps.api.agent_dao import AgentDAO
 from apps.api.database import SearchDAO, TaxonomyNode, BackgroundTask, Agent
+from apps.api.database.utils import ANNSearchParams
+from apps.api.optimization.concurrency_control import ConcurrencyLimitExceeded
 from apps.knowledge_builder.coverage.meter import CoverageMeterService
 from apps.api.background.agent_task_queue import AgentTaskQueue
 from apps.api.background.coverage_history_dao import CoverageHistoryDAO
@@ -50,6 +52,16 @@ async def get_session() -> Any:
         yield session
 
 
+def agent_ann_params(retrieval_config: Optional[Dict[str, Any]]) -> Optional[ANNSearchParams]:
+    """ANN tuning (ef_search, probes, vector_prefix_dims, rescore_oversample)
+    from an agent's retrieval_config; invalid values fall back to defaults."""
+    try:
+        return ANNSearchParams.from_retrieval_config(retrieval_config)
+    except (TypeError, ValueError) as e:
+        logger.warning(f"Ignoring invalid ANN settings in retrieval_config: {e}")
+        return None
+
+
 async def validate_taxonomy_nodes(
     session: AsyncSession, taxonomy_node_ids: list[Any], taxonomy_version: str
 ) -> None:
@@ -403,6 +415,7 @@ async def query_agent(
                 "version": agent.taxonomy_version,
             },
             topk=top_k,
+            ann_params=agent_ann_params(agent.retrieval_config),
         )
 
         await AgentDAO.update_agent(
@@ -454,6 +467,13 @@ async def query_agent(
 
     except HTTPException:
         raise
+    except ConcurrencyLimitExceeded as e:
+        logger.warning(f"Query rejected under load: {e}")
+        raise HTTPException(
+            status_code=503,
+            detail="Search is overloaded, retry shortly",
+            headers={"Retry-After": "1"},
+        )
     except Exception as e:
         logger.error(f"Query execution failed: {e}", exc_info=True)
         raise HTTPException(status_code=503, detail="Service temporarily unavailable")
@@ -854,6 +874,7 @@ async def query_agent_stream(
                     "version": agent.taxonomy_version,
                 },
                 topk=top_k,
+                ann_params=agent_ann_params(agent.retrieval_config),
             )
 
             await AgentDAO.update_agent(
@@ -8,11 +8,14 @@ from typing import Dict, Any
 from fastapi import APIRouter
 import time
 
+from apps.security.middleware.json_stream import skip_response_sanitization
+
 router = APIRouter()
 
 
 # @CODE:MYPY-CONSOLIDATION-002 | Phase 3: no-untyped-def resolution
 @router.get("/healthz")
+@skip_response_sanitization
 async def health_check() -> Dict[str, Any]:
     """Basic health check endpoint"""
     return {"status": "healthy", "timestamp": time.time(), "service": "dt-rag-api"}
@@ -5,6 +5,7 @@ Provides REST endpoints for system monitoring:
 - LLM cost tracking via Langfuse
 - System health metrics
 - Performance monitoring
+- Embedding cache hit rates (L1 process-local / L2 Redis)
 
 @CODE:MONITORING-001
 """
@@ -16,6 +17,10 @@ import psutil
 import os
 from datetime import datetime
 
+from apps.security.middleware.json_stream import skip_response_sanitization
+
+from ..cache.embedding_cache import get_embedding_cache
+
 # Import API key authentication
 try:
     from ..deps import verify_api_key
@@ -48,6 +53,7 @@ router = APIRouter(prefix="/monitoring", tags=["Monitoring"])
 
 # @CODE:MYPY-CONSOLIDATION-002 | Phase 3: no-untyped-def resolution
 @router.get("/health")
+@skip_response_sanitization
 async def get_system_health() -> Dict[str, Any]:
     """Get comprehensive system health status"""
     try:
@@ -87,6 +93,7 @@ async def get_system_health() -> Dict[str, Any]:
 
 # @CODE:MYPY-CONSOLIDATION-002 | Phase 3: no-untyped-def resolution
 @router.get("/llm-costs")
+@skip_response_sanitization
 async def get_llm_costs() -> Dict[str, Any]:
     """
     Get LLM cost tracking dashboard (Gemini 2.5 Flash + OpenAI Embedding)
@@ -211,6 +218,7 @@ async def get_llm_costs() -> Dict[str, Any]:
 
 # @CODE:MYPY-CONSOLIDATION-002 | Phase 3: no-untyped-def resolution
 @router.get("/langfuse-status")
+@skip_response_sanitization
 async def get_langfuse_integration_status() -> Dict[str, Any]:
     """Get Langfuse integration status and configuration"""
     if not LANGFUSE_AVAILABLE:
@@ -218,3 +226,10 @@ async def get_langfuse_integration_status() -> Dict[str, Any]:
 
     status = get_langfuse_status()
     return status
+
+
+@router.get("/embedding-cache")
+@skip_response_sanitization
+async def get_embedding_cache_stats() -> Dict[str, Any]:
+    """Get embedding cache statistics with per-layer (L1/L2) hit rates"""
+    return {"timestamp": time.time(), **get_embedding_cache().get_stats()}
@@ -186,6 +186,7 @@ class ProductionSearchHandler:
             bm25_candidates=min(100, request.max_results * 4),
             vector_candidates=min(100, request.max_results * 4),
             correlation_id=correlation_id,
+            ann_params=self._prepare_ann_params(request),
         )
 
         # Convert to SearchHit objects
@@ -414,6 +415,15 @@ class ProductionSearchHandler:
 
         return filters
 
+    def _prepare_ann_params(self, request: SearchRequest) -> Optional[Any]:
+        """Per-request ANN recall knobs (None keeps the configured defaults)"""
+        if request.ef_search is None and request.probes is None:
+            return None
+
+        from ..database.utils.vector_index import ANNSearchParams
+
+        return ANNSearchParams(ef_search=request.ef_search, probes=request.probes)
+
     async def get_analytics(self) -> SearchAnalytics:
         """Get comprehensive search analytics"""
         try:
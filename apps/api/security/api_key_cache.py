@@ -0,0 +1,185 @@
+"""
+Verified API Key Cache
+
+Verifying a presented key costs a database lookup and a 100,000-iteration
+PBKDF2 hash. Keys that verified recently are kept in a short-TTL in-process
+LRU, so repeat requests skip both. Entries are keyed by an HMAC-SHA256 of the
+presented key under a per-process random secret: the cache never holds
+plaintext keys, and its keys mean nothing outside the process.
+
+Revoking or updating a key drops its entries locally and publishes the key_id
+on a Redis channel; every API process listening on the channel drops its
+entries too. Without Redis, other processes pick up the change when the TTL
+expires.
+
+Configuration (environment):
+- API_KEY_CACHE_TTL_S: seconds a verified key is trusted (default 30)
+- API_KEY_CACHE_SIZE: maximum cached keys per process (default 10000)
+
+@CODE:AUTH-003
+"""
+
+import asyncio
+import hashlib
+import hmac
+import logging
+import os
+import secrets
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set, Tuple
+
+from ..cache.redis_manager import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "api_keys:invalidate"
+
+
+class VerifiedKeyCache:
+    """TTL + LRU cache of verified API keys, invalidated by key_id"""
+
+    def __init__(
+        self,
+        ttl_s: Optional[float] = None,
+        max_size: Optional[int] = None,
+    ):
+        self.ttl_s = (
+            ttl_s if ttl_s is not None else float(os.getenv("API_KEY_CACHE_TTL_S", "30"))
+        )
+        self.max_size = max_size or int(os.getenv("API_KEY_CACHE_SIZE", "10000"))
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0}
+        # Bumped by every invalidation; see put()
+        self.generation = 0
+
+        self._secret = secrets.token_bytes(32)
+        self._entries: "OrderedDict[bytes, Tuple[float, str, Any]]" = OrderedDict()
+        self._by_key_id: Dict[str, Set[bytes]] = {}
+        self._listener: Optional["asyncio.Task[None]"] = None
+
+    def _fingerprint(self, plaintext_key: str) -> bytes:
+        return hmac.new(self._secret, plaintext_key.encode(), hashlib.sha256).digest()
+
+    def get(self, plaintext_key: str) -> Optional[Any]:
+        """Cached verification result for a presented key, if still fresh"""
+        fingerprint = self._fingerprint(plaintext_key)
+        entry = self._entries.get(fingerprint)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                self._remove(fingerprint)
+            self.stats["misses"] += 1
+            return None
+        self._entries.move_to_end(fingerprint)
+        self.stats["hits"] += 1
+        return entry[2]
+
+    def put(self, plaintext_key: str, key_id: str, value: Any, generation: int) -> None:
+        """Cache a verification result.
+
+        ``generation`` is the value of :attr:`generation` read before the
+        database lookup. If an invalidation arrived since, the result may
+        predate a revoke and is not cached.
+        """
+        if generation != self.generation or self.ttl_s <= 0:
+            return
+        fingerprint = self._fingerprint(plaintext_key)
+        self._remove(fingerprint)
+        self._entries[fingerprint] = (time.monotonic() + self.ttl_s, key_id, value)
+        self._by_key_id.setdefault(key_id, set()).add(fingerprint)
+        while len(self._entries) > self.max_size:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, fingerprint: bytes) -> None:
+        entry = self._entries.pop(fingerprint, None)
+        if entry is None:
+            return
+        fingerprints = self._by_key_id.get(entry[1])
+        if fingerprints is not None:
+            fingerprints.discard(fingerprint)
+            if not fingerprints:
+                del self._by_key_id[entry[1]]
+
+    def invalidate(self, key_id: str) -> None:
+        """Drop this process's entries for a key"""
+        self.generation += 1
+        self.stats["invalidations"] += 1
+        for fingerprint in list(self._by_key_id.get(key_id, ())):
+            self._remove(fingerprint)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._entries.clear()
+        self._by_key_id.clear()
+
+    async def publish_invalidation(self, key_id: str) -> None:
+        """Drop a key's entries here and in every other API process"""
+        self.invalidate(key_id)
+        client = await get_redis_client()
+        if client is None:
+            logger.warning(
+                f"Redis unavailable - other processes may trust key {key_id} "
+                f"for up to {self.ttl_s}s"
+            )
+            return
+        try:
+            await client.publish(INVALIDATION_CHANNEL, key_id)
+        except Exception as e:
+            logger.warning(f"Failed to publish API key invalidation for {key_id}: {e}")
+
+    def start_listener(self) -> None:
+        """Subscribe to invalidations from other processes (idempotent)"""
+        loop = asyncio.get_running_loop()
+        if (
+            self._listener is None
+            or self._listener.done()
+            or self._listener.get_loop() is not loop
+        ):
+            self._listener = loop.create_task(self._listen())
+
+    async def stop_listener(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+
+    async def _listen(self) -> None:
+        while True:
+            client = await get_redis_client()
+            if client is None:
+                await asyncio.sleep(30)
+                continue
+            pubsub = client.pubsub()
+            try:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                # Entries cached while unsubscribed may have missed a revoke
+                self.clear()
+                while True:
+                    # Short polls stay under the client's socket timeout
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True, timeout=1.0
+                    )
+                    if message is not None:
+                        data = message["data"]
+                        self.invalidate(data.decode() if isinstance(data, bytes) else data)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"API key invalidation listener disconnected: {e}")
+                await asyncio.sleep(5)
+            finally:
+                try:
+                    await pubsub.reset()
+                except Exception:
+                    pass
+
+
+# Global cache instance
+_verified_key_cache: Optional[VerifiedKeyCache] = None
+
+
+def get_verified_key_cache() -> VerifiedKeyCache:
+    """Process-wide verified key cache"""
+    global _verified_key_cache
+    if _verified_key_cache is None:
+        _verified_key_cache = VerifiedKeyCache()
+    return _verified_key_cache
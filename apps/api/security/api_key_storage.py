@@ -4,6 +4,10 @@ Secure API Key Storage and Management
 This module provides database models and management functions for secure API key storage,
 including proper hashing, rate limiting, and audit logging.
 
+Per-request verification is served from a short-lived cache of verified keys
+(api_key_cache); rate limits and usage logging are kept off the request's
+database transaction (api_key_usage).
+
 @CODE:AUTH-002
 @CODE:MYPY-CONSOLIDATION-002 | Phase 1: SQLAlchemy Column Type Casting
 """
@@ -28,10 +32,17 @@ from sqlalchemy import (
 from sqlalchemy.engine import CursorResult
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 import json
 
+from .api_key_cache import VerifiedKeyCache, get_verified_key_cache
 from .api_key_generator import SecureAPIKeyGenerator
+from .api_key_usage import (
+    KeyRateLimiter,
+    UsageLogWriter,
+    get_key_rate_limiter,
+    get_usage_log_writer,
+)
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -221,8 +232,17 @@ class APIKeyManager:
     Secure API key management with comprehensive security features
     """
 
-    def __init__(self, db_session: AsyncSession):
+    def __init__(
+        self,
+        db_session: AsyncSession,
+        key_cache: Optional[VerifiedKeyCache] = None,
+        rate_limiter: Optional[KeyRateLimiter] = None,
+        usage_writer: Optional[UsageLogWriter] = None,
+    ):
         self.db = db_session
+        self.key_cache = key_cache or get_verified_key_cache()
+        self.rate_limiter = rate_limiter or get_key_rate_limiter()
+        self.usage_writer = usage_writer or get_usage_log_writer()
 
     async def create_api_key(
         self, request: APIKeyCreateRequest, created_by: str, client_ip: str
@@ -321,34 +341,41 @@ class APIKeyManager:
         # Extract key ID from plaintext key for faster lookup
         key_id = hashlib.md5(plaintext_key.encode()).hexdigest()[:16]
 
-        # Get API key from database
-        stmt = select(APIKey).where(and_(APIKey.key_id == key_id, APIKey.is_active))
-        result = await self.db.execute(stmt)
-        api_key = result.scalar_one_or_none()
+        self.key_cache.start_listener()
+        key_info: Optional[APIKeyInfo] = self.key_cache.get(plaintext_key)
+        if key_info is None:
+            generation = self.key_cache.generation
 
-        if not api_key:
-            await self._log_usage(key_id, endpoint, method, client_ip, 401, None)
-            return None
+            # Get API key from database
+            stmt = select(APIKey).where(and_(APIKey.key_id == key_id, APIKey.is_active))
+            result = await self.db.execute(stmt)
+            api_key = result.scalar_one_or_none()
 
-        # Verify key hash
-        if not SecureAPIKeyGenerator.verify_key_hash(plaintext_key, api_key.key_hash):
-            await self._log_usage(key_id, endpoint, method, client_ip, 401, None)
-            api_key.failed_requests += 1
-            await self.db.commit()
-            return None
+            if not api_key:
+                await self._log_usage(key_id, endpoint, method, client_ip, 401, None)
+                return None
+
+            # Verify key hash
+            if not SecureAPIKeyGenerator.verify_key_hash(plaintext_key, api_key.key_hash):
+                await self._log_usage(
+                    key_id, endpoint, method, client_ip, 401, None, failed=True
+                )
+                return None
+
+            key_info = self._key_info(api_key)
+            self.key_cache.put(plaintext_key, key_id, key_info, generation)
 
         # Check expiration
-        if api_key.expires_at and datetime.now(timezone.utc) > api_key.expires_at:
+        if key_info.expires_at and datetime.now(timezone.utc) > key_info.expires_at:
             await self._log_usage(
                 key_id, endpoint, method, client_ip, 401, None, "expired"
             )
             return None
 
         # Check IP restrictions
-        if api_key.allowed_ips:
-            allowed_ips = json.loads(api_key.allowed_ips)
-            if client_ip not in allowed_ips and not self._ip_in_ranges(
-                client_ip, allowed_ips
+        if key_info.allowed_ips:
+            if client_ip not in key_info.allowed_ips and not self._ip_in_ranges(
+                client_ip, key_info.allowed_ips
             ):
                 await self._log_usage(
                     key_id, endpoint, method, client_ip, 403, None, "ip_restricted"
@@ -356,35 +383,20 @@ class APIKeyManager:
                 return None
 
         # Check rate limiting
-        if not await self._check_rate_limit(key_id, api_key.rate_limit):
+        if not await self._check_rate_limit(key_id, key_info.rate_limit):
             await self._log_usage(
                 key_id, endpoint, method, client_ip, 429, None, "rate_limited"
             )
             return None
 
-        # Update usage statistics
-        api_key.total_requests += 1
-        api_key.last_used_at = datetime.now(timezone.utc)
-        await self._log_usage(key_id, endpoint, method, client_ip, 200, None)
+        # Update usage statistics (written in the background)
+        await self._log_usage(key_id, endpoint, method, client_ip, 200, None, used=True)
 
-        await self.db.commit()
-
-        return APIKeyInfo(
-            key_id=api_key.key_id,
-            name=api_key.name,
-            description=api_key.description,
-            scope=api_key.scope,
-            permissions=json.loads(api_key.permissions),
-            allowed_ips=(
-                json.loads(api_key.allowed_ips) if api_key.allowed_ips else None
-            ),
-            rate_limit=api_key.rate_limit,
-            is_active=api_key.is_active,
-            expires_at=api_key.expires_at,
-            created_at=api_key.created_at,
-            last_used_at=api_key.last_used_at,
-            total_requests=api_key.total_requests,
-            failed_requests=api_key.failed_requests,
+        # Counters in a cached entry lag the database by up to the cache TTL
+        return replace(
+            key_info,
+            last_used_at=datetime.now(timezone.utc),
+            total_requests=key_info.total_requests + 1,
         )
 
     async def list_api_keys(
@@ -455,6 +467,7 @@ class APIKeyManager:
         )
 
         await self.db.commit()
+        await self.key_cache.publish_invalidation(key_id)
 
         logger.info(f"Revoked API key: key_id={key_id}, revoked_by={revoked_by}")
         return True
@@ -556,6 +569,7 @@ class APIKeyManager:
         )
 
         await self.db.commit()
+        await self.key_cache.publish_invalidation(key_id)
 
         logger.info(
             f"Updated API key: key_id={key_id}, fields={updated_fields}, updated_by={updated_by}"
@@ -573,6 +587,10 @@ class APIKeyManager:
         if not api_key:
             return None
 
+        return self._key_info(api_key)
+
+    @staticmethod
+    def _key_info(api_key: APIKey) -> APIKeyInfo:
         return APIKeyInfo(
             key_id=api_key.key_id,
             name=api_key.name,
@@ -592,16 +610,8 @@ class APIKeyManager:
         )
 
     async def _check_rate_limit(self, key_id: str, rate_limit: int) -> bool:
-        """Check if API key is within rate limits"""
-        one_hour_ago = datetime.now(timezone.utc) - timedelta(hours=1)
-
-        stmt = select(APIKeyUsage).where(
-            and_(APIKeyUsage.key_id == key_id, APIKeyUsage.timestamp > one_hour_ago)
-        )
-        result = await self.db.execute(stmt)
-        usage_count = len(result.scalars().all())
-
-        return usage_count < rate_limit
+        """Check if API key is within rate limits (requests per hour)"""
+        return await self.rate_limiter.allow(key_id, rate_limit)
 
     async def _log_usage(
         self,
@@ -612,9 +622,11 @@ class APIKeyManager:
         status_code: int,
         response_time_ms: Optional[int],
         request_metadata: Optional[str] = None,
+        used: bool = False,
+        failed: bool = False,
     ) -> None:
-        """Log API key usage"""
-        usage = APIKeyUsage(
+        """Log API key usage (batched, outside this session's transaction)"""
+        self.usage_writer.record(
             key_id=key_id,
             endpoint=endpoint,
             method=method,
@@ -622,8 +634,9 @@ class APIKeyManager:
             status_code=status_code,
             response_time_ms=response_time_ms,
             request_metadata=request_metadata,
+            used=used,
+            failed=failed,
         )
-        self.db.add(usage)
 
     async def _log_operation(
         self,
@@ -0,0 +1,266 @@
+"""
+API Key Rate Limiting and Usage Logging
+
+Keeps per-request bookkeeping for API keys off the database:
+
+- KeyRateLimiter counts requests per key in Redis (one INCR per request on
+  hourly windows, weighted across the previous window), or in process
+  memory when Redis is unreachable.
+- UsageLogWriter buffers api_key_usage rows and api_keys counter updates and
+  writes them in one transaction per batch, outside the request.
+
+Configuration (environment):
+- API_KEY_USAGE_BATCH_SIZE: usage rows per transaction (default 200)
+- API_KEY_USAGE_FLUSH_MS: longest a row waits before being written (1000)
+- API_KEY_USAGE_MAX_PENDING: rows buffered before new ones are dropped (10000)
+
+@CODE:AUTH-003
+"""
+
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import insert, update
+
+from ..cache.redis_manager import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_KEY_PREFIX = "api_key_rate"
+RATE_LIMIT_WINDOW_S = 3600
+# How long to use in-memory counters before asking for Redis again
+REDIS_RETRY_S = 30.0
+
+
+class KeyRateLimiter:
+    """Requests per key over a sliding hour.
+
+    Keeps a counter per key and clock hour; the estimate for the last hour
+    is the current hour's count plus the previous hour's, weighted by how
+    much of it is still inside the window.
+    """
+
+    def __init__(self, client: Any = None):
+        self._client = client
+        self._retry_redis_at = 0.0 if client is None else float("inf")
+        # key_id -> (window, count in window, count in previous window)
+        self._local: Dict[str, Tuple[int, int, int]] = {}
+
+    async def _redis(self) -> Any:
+        if self._client is None and time.monotonic() >= self._retry_redis_at:
+            self._client = await get_redis_client()
+            if self._client is None:
+                self._retry_redis_at = time.monotonic() + REDIS_RETRY_S
+        return self._client
+
+    async def allow(self, key_id: str, limit: int) -> bool:
+        """Count one request and report whether it is within ``limit``"""
+        now = time.time()
+        window = int(now // RATE_LIMIT_WINDOW_S)
+        previous_weight = 1.0 - (now % RATE_LIMIT_WINDOW_S) / RATE_LIMIT_WINDOW_S
+
+        client = await self._redis()
+        if client is not None:
+            try:
+                key = f"{RATE_LIMIT_KEY_PREFIX}:{key_id}:{window}"
+                async with client.pipeline(transaction=False) as pipe:
+                    pipe.incr(key)
+                    pipe.expire(key, 2 * RATE_LIMIT_WINDOW_S)
+                    pipe.get(f"{RATE_LIMIT_KEY_PREFIX}:{key_id}:{window - 1}")
+                    current, _, previous = await pipe.execute()
+                return bool(current + int(previous or 0) * previous_weight <= limit)
+            except Exception as e:
+                logger.warning(f"Redis rate limit check failed, counting in memory: {e}")
+                self._client = None
+                self._retry_redis_at = time.monotonic() + REDIS_RETRY_S
+
+        stored_window, current, previous = self._local.get(key_id, (window, 0, 0))
+        if stored_window != window:
+            previous = current if stored_window == window - 1 else 0
+            current = 0
+        current += 1
+        self._local[key_id] = (window, current, previous)
+        return current + previous * previous_weight <= limit
+
+
+class UsageLogWriter:
+    """Batched, fire-and-forget writer for API key usage.
+
+    :meth:`record` only appends to a buffer. Rows are written when
+    ``batch_size`` are pending or ``flush_ms`` after the first one, as one
+    multi-row insert into api_key_usage plus one counter update per key.
+    Usage logs are best-effort: a failed batch is logged and dropped.
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Any]] = None,
+        batch_size: Optional[int] = None,
+        flush_ms: Optional[float] = None,
+        max_pending: Optional[int] = None,
+    ):
+        self._session_factory = session_factory
+        self.batch_size = batch_size or int(os.getenv("API_KEY_USAGE_BATCH_SIZE", "200"))
+        self.flush_ms = (
+            flush_ms
+            if flush_ms is not None
+            else float(os.getenv("API_KEY_USAGE_FLUSH_MS", "1000"))
+        )
+        self.max_pending = max_pending or int(
+            os.getenv("API_KEY_USAGE_MAX_PENDING", "10000")
+        )
+        self.stats = {"recorded": 0, "written": 0, "dropped": 0, "batches": 0}
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: List[Dict[str, Any]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set["asyncio.Task[None]"] = set()
+        # Rows handed to writes that have not finished
+        self._in_flight = 0
+
+    def _bind_loop(self) -> asyncio.AbstractEventLoop:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._pending = []
+            self._flush_handle = None
+            self._tasks = set()
+            self._in_flight = 0
+        return loop
+
+    def record(
+        self,
+        key_id: str,
+        endpoint: str,
+        method: str,
+        client_ip: str,
+        status_code: int,
+        response_time_ms: Optional[int] = None,
+        request_metadata: Optional[str] = None,
+        used: bool = False,
+        failed: bool = False,
+    ) -> None:
+        """Queue a usage row.
+
+        ``used`` and ``failed`` also add one to the key's total_requests or
+        failed_requests (and, for ``used``, set last_used_at).
+        """
+        loop = self._bind_loop()
+        if len(self._pending) + self._in_flight >= self.max_pending:
+            # The database is not keeping up; shed usage rows, not requests
+            self.stats["dropped"] += 1
+            return
+        self.stats["recorded"] += 1
+        self._pending.append(
+            {
+                "key_id": key_id,
+                "endpoint": endpoint,
+                "method": method,
+                "client_ip": client_ip,
+                "status_code": status_code,
+                "response_time_ms": response_time_ms,
+                "request_metadata": request_metadata,
+                "timestamp": datetime.now(timezone.utc),
+                "_used": used,
+                "_failed": failed,
+            }
+        )
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.flush_ms / 1000.0, self._flush)
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, []
+        self._in_flight += len(batch)
+        assert self._loop is not None
+        task = self._loop.create_task(self._write(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def flush(self) -> None:
+        """Write everything recorded so far (e.g. on shutdown)"""
+        if self._loop is not asyncio.get_running_loop():
+            return
+        self._flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _write(self, batch: List[Dict[str, Any]]) -> None:
+        from .api_key_storage import APIKey, APIKeyUsage
+
+        table = APIKey.__table__
+        # key_id -> [uses, failures, last use]
+        counters: Dict[str, List[Any]] = {}
+        rows = []
+        for row in batch:
+            used, failed = row.pop("_used"), row.pop("_failed")
+            rows.append(row)
+            if used or failed:
+                entry = counters.setdefault(row["key_id"], [0, 0, None])
+                entry[0] += int(used)
+                entry[1] += int(failed)
+                if used:
+                    entry[2] = row["timestamp"]
+
+        session_factory = self._session_factory
+        if session_factory is None:
+            from ..database import async_session
+
+            session_factory = async_session
+
+        try:
+            async with session_factory() as session:
+                # One executemany for the whole batch
+                await session.execute(insert(APIKeyUsage.__table__), rows)
+                for key_id, (uses, failures, last_used_at) in counters.items():
+                    values: Dict[str, Any] = {
+                        "total_requests": table.c.total_requests + uses,
+                        "failed_requests": table.c.failed_requests + failures,
+                    }
+                    if last_used_at is not None:
+                        values["last_used_at"] = last_used_at
+                    await session.execute(
+                        update(table).where(table.c.key_id == key_id).values(**values)
+                    )
+                await session.commit()
+        except Exception as e:
+            self.stats["dropped"] += len(rows)
+            logger.error(f"Failed to write {len(rows)} API key usage rows: {e}")
+            return
+        finally:
+            self._in_flight -= len(rows)
+
+        self.stats["written"] += len(rows)
+        self.stats["batches"] += 1
+
+
+# Global instances
+_key_rate_limiter: Optional[KeyRateLimiter] = None
+_usage_log_writer: Optional[UsageLogWriter] = None
+
+
+def get_key_rate_limiter() -> KeyRateLimiter:
+    """Process-wide API key rate limiter"""
+    global _key_rate_limiter
+    if _key_rate_limiter is None:
+        _key_rate_limiter = KeyRateLimiter()
+    return _key_rate_limiter
+
+
+def get_usage_log_writer() -> UsageLogWriter:
+    """Process-wide API key usage writer"""
+    global _usage_log_writer
+    if _usage_log_writer is None:
+        _usage_log_writer = UsageLogWriter()
+    return _usage_log_writer
@@ -3,7 +3,8 @@ Batch processing module for ingestion pipeline.
 
 @CODE:INGESTION-001
 """
-from .job_queue import JobQueue
+from .job_queue import JobQueue, create_job_queue
+from .stream_queue import StreamJobQueue
 from .job_orchestrator import JobOrchestrator
 
-__all__ = ["JobQueue", "JobOrchestrator"]
+__all__ = ["JobQueue", "StreamJobQueue", "create_job_queue", "JobOrchestrator"]
@@ -0,0 +1,67 @@
+"""
+Content hashing and change planning for incremental re-ingestion.
+
+Chunks are identified by the SHA-256 of their normalized text (NFKC,
+whitespace collapsed), so formatting-only edits do not count as changes.
+A document's hash is derived from its ordered chunk hashes.
+
+@CODE:INGESTION-004
+"""
+import hashlib
+import re
+import unicodedata
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Sequence, Tuple
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    return _WHITESPACE_RE.sub(" ", unicodedata.normalize("NFKC", text)).strip()
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+def document_hash(chunk_hashes: Sequence[str]) -> str:
+    return hashlib.sha256("\n".join(chunk_hashes).encode("ascii")).hexdigest()
+
+
+@dataclass
+class ChunkChangePlan:
+    """How to turn a document's stored chunks into a new chunk list"""
+
+    # (new chunk index, existing chunk id) pairs whose content is unchanged
+    kept: List[Tuple[int, Any]] = field(default_factory=list)
+    # New chunk indexes that need a row (and an embedding, unless reusable)
+    inserted: List[int] = field(default_factory=list)
+    # Existing chunk ids no longer present in the document
+    tombstoned: List[Any] = field(default_factory=list)
+
+
+def plan_chunk_changes(
+    existing: Sequence[Tuple[Any, str]], new_hashes: Sequence[str]
+) -> ChunkChangePlan:
+    """Match new chunk hashes against ``(chunk_id, hash)`` rows already stored.
+
+    Repeated content is matched one-to-one, so a chunk that now appears
+    twice keeps one row and gets one new one.
+    """
+    available: Dict[str, List[Any]] = defaultdict(list)
+    for chunk_id, chunk_hash in existing:
+        available[chunk_hash].append(chunk_id)
+
+    plan = ChunkChangePlan()
+    for idx, chunk_hash in enumerate(new_hashes):
+        candidates = available.get(chunk_hash)
+        if candidates:
+            plan.kept.append((idx, candidates.pop(0)))
+        else:
+            plan.inserted.append(idx)
+
+    plan.tombstoned = [
+        chunk_id for chunk_ids in available.values() for chunk_id in chunk_ids
+    ]
+    return plan
@@ -5,7 +5,9 @@ Job orchestration for batch document processing.
 """
 import asyncio
 import logging
-from typing import Optional, Dict, Any, List
+import os
+import time
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime
 import uuid
 
@@ -15,11 +17,12 @@ from apps.ingestion.contracts.signals import (
     DocumentUploadCommandV1,
     DocumentProcessedEventV1,
     ProcessingStatusV1,
-    ChunkV1,
 )
-from apps.ingestion.parsers import ParserFactory
-from apps.ingestion.chunking import IntelligentChunker
-from apps.ingestion.pii import PIIDetector
+from apps.ingestion.preprocess import (
+    PreprocessPool,
+    PreprocessedDocument,
+)
+from apps.ingestion.storage import BlobStore, get_blob_store
 from apps.api.embedding_service import EmbeddingService
 from apps.core.db_session import async_session
 from apps.api.database import (
@@ -29,11 +32,22 @@ from apps.api.database import (
     DocTaxonomy,
     TaxonomyNode,
 )
-from .job_queue import JobQueue
+from .dedup import content_hash, document_hash, plan_chunk_changes
+from .job_queue import JobQueue, create_job_queue
+from .writer import DocumentWrite, DocumentWriteBatcher
 
 logger = logging.getLogger(__name__)
 
 
+async def _invalidate_search_cache() -> None:
+    """Stop serving cached search results that predate newly stored documents."""
+    try:
+        from apps.search.hybrid_search_engine import publish_cache_invalidation
+    except ImportError:
+        return
+    await publish_cache_invalidation()
+
+
 # @CODE:JOB-OPTIMIZE-001
 class JobOrchestrator:
     def __init__(
@@ -41,16 +55,28 @@ class JobOrchestrator:
         job_queue: Optional[JobQueue] = None,
         embedding_service: Optional[EmbeddingService] = None,
         max_workers: int = 10,
+        blob_store: Optional[BlobStore] = None,
     ):
-        self.job_queue = job_queue or JobQueue()
+        self.job_queue = job_queue or create_job_queue()
         self.embedding_service = embedding_service or EmbeddingService()
+        # Uploaded files live here; jobs only carry their SHA-256
+        self.blob_store = blob_store or get_blob_store()
         self.max_workers = max_workers
-        self.chunker = IntelligentChunker(chunk_size=500, overlap_size=128)
-        self.pii_detector = PIIDetector()
+        # Parse -> chunk -> PII mask runs in executor lanes, off the event loop
+        self.preprocess_pool = PreprocessPool(chunk_size=500, overlap_size=128)
+        self.job_timeout = float(os.getenv("INGESTION_JOB_TIMEOUT_S", "300"))
+        # Chunk/embedding rows of concurrently finishing jobs share a transaction
+        self.write_batcher = DocumentWriteBatcher(async_session)
         self.workers: List[asyncio.Task] = []
         self.running = False
-        self.internal_queue: asyncio.Queue = asyncio.Queue(maxsize=100)
+        # Jobs read from Redis but not yet started. Redeliverable queues keep
+        # this near the worker count: a prefetched job's lease is ticking.
+        prefetch = int(os.getenv("INGESTION_PREFETCH", "0")) or (
+            max_workers if self.job_queue.heartbeat_interval else 100
+        )
+        self.internal_queue: asyncio.Queue = asyncio.Queue(maxsize=prefetch)
         self.dispatcher_task: Optional[asyncio.Task] = None
+        self.worker_metrics: Dict[int, Dict[str, Any]] = {}
 
     # @CODE:MYPY-CONSOLIDATION-002 | Phase 3: no-untyped-def resolution
     async def start(self) -> None:
@@ -86,6 +112,7 @@ class JobOrchestrator:
 
         self.workers.clear()
         self.dispatcher_task = None
+        self.preprocess_pool.shutdown()
         logger.info("Job Orchestrator stopped")
 
     # @CODE:JOB-OPTIMIZE-001
@@ -98,9 +125,16 @@ class JobOrchestrator:
 
         while self.running and retry_count < max_retries:
             try:
+                # Backpressure: leave jobs in Redis for other hosts while
+                # every local slot is taken
+                if self.internal_queue.full():
+                    await asyncio.sleep(0.05)
+                    continue
+
                 job_payload = await self.job_queue.dequeue_job(timeout=5)
 
                 if job_payload:
+                    job_payload["dispatched_at"] = time.monotonic()
                     await self.internal_queue.put(job_payload)
                     logger.debug(
                         "Job dispatched to internal queue",
@@ -136,15 +170,23 @@ class JobOrchestrator:
         logger.info(f"Worker {worker_id} started")
 
         QUEUE_TIMEOUT = 5.0
+        metrics = self.worker_metrics.setdefault(worker_id, self._new_worker_metrics())
+        # Job whose preprocessing was started while the previous job was storing
+        lookahead: Optional[Tuple[Dict[str, Any], "asyncio.Task[PreprocessedDocument]"]] = None
 
         while self.running:
             try:
-                try:
-                    job_payload = await asyncio.wait_for(
-                        self.internal_queue.get(), timeout=QUEUE_TIMEOUT
-                    )
-                except asyncio.TimeoutError:
-                    continue
+                if lookahead is not None:
+                    job_payload, preprocess_task = lookahead
+                    lookahead = None
+                else:
+                    try:
+                        job_payload = await asyncio.wait_for(
+                            self.internal_queue.get(), timeout=QUEUE_TIMEOUT
+                        )
+                    except asyncio.TimeoutError:
+                        continue
+                    preprocess_task = self._start_preprocess(job_payload)
 
                 job_id = job_payload["job_id"]
                 command_id = job_payload["command_id"]
@@ -161,8 +203,31 @@ class JobOrchestrator:
                     started_at=datetime.utcnow().isoformat(),
                 )
 
+                if "queue_wait_ms" in job_payload:
+                    self._record_stage_ms(
+                        metrics, "queue_wait", job_payload["queue_wait_ms"]
+                    )
+
+                heartbeat = self._start_heartbeat(job_payload)
                 try:
-                    event = await self._process_document(command_id, job_data)
+                    started = time.perf_counter()
+                    preprocessed = await preprocess_task
+                    self._record_stage(metrics, "preprocess", started)
+                    for stage, ms in preprocessed.stage_ms.items():
+                        self._record_stage_ms(metrics, stage, ms)
+
+                    # Pipeline: parse job N+1 while job N embeds and writes
+                    if not self.internal_queue.empty():
+                        next_payload = self.internal_queue.get_nowait()
+                        lookahead = (next_payload, self._start_preprocess(next_payload))
+
+                    started = time.perf_counter()
+                    event = await self._process_document(
+                        command_id, job_data, preprocessed=preprocessed
+                    )
+                    self._record_stage(metrics, "embed_store", started)
+                    metrics["jobs_completed"] += 1
+                    metrics["embedding_calls_saved"] += event.embedding_calls_saved
 
                     await self.job_queue.set_job_status(
                         job_id=job_id,
@@ -178,8 +243,10 @@ class JobOrchestrator:
                     logger.info(f"Worker {worker_id} completed job {job_id}")
 
                 except Exception as e:
+                    metrics["jobs_failed"] += 1
                     logger.error(f"Worker {worker_id} failed job {job_id}: {e}")
 
+                    retry_success = False
                     if await self._should_retry(job_id, e):
                         priority = job_data.get("priority", 5)
                         retry_success = await self.job_queue.retry_job(
@@ -188,19 +255,26 @@ class JobOrchestrator:
                             job_data=job_data,
                             priority=priority,
                         )
-                        if retry_success:
-                            logger.info(f"Job {job_id} scheduled for retry")
-                            continue
 
-                    await self.job_queue.set_job_status(
-                        job_id=job_id,
-                        command_id=command_id,
-                        status="failed",
-                        progress_percentage=0.0,
-                        current_stage="Failed",
-                        error_message=str(e),
-                        completed_at=datetime.utcnow().isoformat(),
-                    )
+                    if retry_success:
+                        logger.info(f"Job {job_id} scheduled for retry")
+                    else:
+                        await self.job_queue.set_job_status(
+                            job_id=job_id,
+                            command_id=command_id,
+                            status="failed",
+                            progress_percentage=0.0,
+                            current_stage="Failed",
+                            error_message=str(e),
+                            completed_at=datetime.utcnow().isoformat(),
+                        )
+                finally:
+                    if heartbeat is not None:
+                        heartbeat.cancel()
+
+                # Not reached on cancellation: an interrupted job stays
+                # pending and is redelivered
+                await self.job_queue.ack_job(job_payload)
 
             except asyncio.CancelledError:
                 logger.info(f"Worker {worker_id} cancelled")
@@ -209,151 +283,386 @@ class JobOrchestrator:
                 logger.error(f"Worker {worker_id} encountered error: {e}")
                 await asyncio.sleep(1)
 
-        logger.info(f"Worker {worker_id} stopped")
+        if lookahead is not None:
+            lookahead[1].cancel()
 
-    async def _process_document(
-        self, command_id: str, job_data: Dict[str, Any]
-    ) -> DocumentProcessedEventV1:
-        start_time = datetime.utcnow()
+        logger.info(f"Worker {worker_id} stopped")
 
+    def _start_heartbeat(
+        self, job_payload: Dict[str, Any]
+    ) -> Optional["asyncio.Task[None]"]:
+        """Keep extending a running job's lease in the job queue"""
+        interval = self.job_queue.heartbeat_interval
+        if interval is None:
+            return None
+
+        async def beat() -> None:
+            while True:
+                await self.job_queue.touch_job(job_payload)
+                await asyncio.sleep(interval)
+
+        return asyncio.create_task(beat())
+
+    def _start_preprocess(
+        self, job_payload: Dict[str, Any]
+    ) -> "asyncio.Task[PreprocessedDocument]":
+        """Start parse/chunk/PII for a job in the preprocess pool"""
+        dispatched_at = job_payload.get("dispatched_at")
+        if dispatched_at is not None:
+            job_payload["queue_wait_ms"] = (time.monotonic() - dispatched_at) * 1000
+        return asyncio.create_task(self._preprocess(job_payload["data"]))
+
+    async def _preprocess(self, job_data: Dict[str, Any]) -> PreprocessedDocument:
+        """Preprocess a job's file, reusing the cached result for known content"""
         file_name = job_data["file_name"]
-        file_content = bytes.fromhex(job_data["file_content_hex"])
         file_format = job_data["file_format"]
+        blob_sha256 = job_data.get("blob_sha256")
+        if blob_sha256 is None:
+            # Jobs enqueued before the blob store carried the file inline
+            return await self.preprocess_pool.run(
+                bytes.fromhex(job_data["file_content_hex"]),
+                file_name,
+                file_format,
+                timeout=self.job_timeout,
+            )
 
-        logger.info(f"Processing document: {file_name} (format: {file_format})")
-
-        parser = ParserFactory.get_parser(file_format)
-        parsed_text = parser.parse(file_content, file_name)
-
-        logger.info(f"Parsed {len(parsed_text)} characters from {file_name}")
-
-        chunks = self.chunker.chunk_text(parsed_text)
+        cache_name = (
+            f"preprocessed-v1-{file_format}-"
+            f"{self.preprocess_pool.chunk_size}-{self.preprocess_pool.overlap_size}.json"
+        )
+        cached = await self.blob_store.get_derived(blob_sha256, cache_name)
+        if cached is not None:
+            try:
+                preprocessed = PreprocessedDocument.from_json(cached)
+                logger.info(f"Reusing preprocessed chunks for {file_name} ({blob_sha256})")
+                return preprocessed
+            except (ValueError, KeyError) as e:
+                logger.warning(f"Ignoring unreadable preprocess cache for {blob_sha256}: {e}")
+
+        preprocessed = await self.preprocess_pool.run(
+            await self.blob_store.local_path(blob_sha256),
+            file_name,
+            file_format,
+            timeout=self.job_timeout,
+        )
+        try:
+            await self.blob_store.put_derived(
+                blob_sha256, cache_name, preprocessed.to_json()
+            )
+        except Exception as e:
+            logger.warning(f"Failed to cache preprocessed chunks for {blob_sha256}: {e}")
+        return preprocessed
+
+    @staticmethod
+    def _new_worker_metrics() -> Dict[str, Any]:
+        return {
+            "jobs_completed": 0,
+            "jobs_failed": 0,
+            "embedding_calls_saved": 0,
+            "stages": {},
+        }
 
-        logger.info(f"Created {len(chunks)} chunks from {file_name}")
+    @classmethod
+    def _record_stage(cls, metrics: Dict[str, Any], stage: str, started: float) -> None:
+        cls._record_stage_ms(metrics, stage, (time.perf_counter() - started) * 1000)
 
-        chunk_signals = []
-        for idx, chunk in enumerate(chunks):
-            masked_text, pii_matches = self.pii_detector.detect_and_mask(chunk.text)
+    @staticmethod
+    def _record_stage_ms(metrics: Dict[str, Any], stage: str, ms: float) -> None:
+        entry = metrics["stages"].setdefault(
+            stage, {"count": 0, "total_ms": 0.0, "max_ms": 0.0}
+        )
+        entry["count"] += 1
+        entry["total_ms"] += ms
+        entry["max_ms"] = max(entry["max_ms"], ms)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Queue depths and per-worker stage latencies"""
+        workers: Dict[int, Dict[str, Any]] = {}
+        for worker_id, metrics in self.worker_metrics.items():
+            workers[worker_id] = {
+                "jobs_completed": metrics["jobs_completed"],
+                "jobs_failed": metrics["jobs_failed"],
+                "embedding_calls_saved": metrics["embedding_calls_saved"],
+                "stages": {
+                    stage: {
+                        "count": entry["count"],
+                        "avg_ms": entry["total_ms"] / max(entry["count"], 1),
+                        "max_ms": entry["max_ms"],
+                    }
+                    for stage, entry in metrics["stages"].items()
+                },
+            }
+        return {
+            "internal_queue_depth": self.internal_queue.qsize(),
+            "preprocess": self.preprocess_pool.get_stats(),
+            "writes": dict(self.write_batcher.stats),
+            "workers": workers,
+        }
 
-            has_pii = len(pii_matches) > 0
-            pii_types = [match.pii_type.value for match in pii_matches]
+    async def _process_document(
+        self,
+        command_id: str,
+        job_data: Dict[str, Any],
+        preprocessed: Optional[PreprocessedDocument] = None,
+    ) -> DocumentProcessedEventV1:
+        file_name = job_data["file_name"]
+        file_format = job_data["file_format"]
 
-            chunk_signal = ChunkV1(
-                text=masked_text,
-                token_count=chunk.token_count,
-                position=idx,
-                has_pii=has_pii,
-                pii_types=pii_types,
-            )
+        logger.info(f"Processing document: {file_name} (format: {file_format})")
 
-            chunk_signals.append(chunk_signal)
+        if preprocessed is None:
+            preprocessed = await self._preprocess(job_data)
 
-        logger.info(f"PII detection completed for {file_name}")
+        chunk_signals = preprocessed.chunks
 
-        total_tokens = sum(chunk.token_count for chunk in chunks)
+        logger.info(
+            f"Parsed {preprocessed.parsed_chars} characters and created "
+            f"{len(chunk_signals)} PII-masked chunks from {file_name}"
+        )
 
-        processing_duration_ms = (datetime.utcnow() - start_time).total_seconds() * 1000
+        processing_duration_ms = sum(preprocessed.stage_ms.values())
 
-        doc_id = uuid.uuid4()
+        chunk_hashes = [content_hash(chunk_signal.text) for chunk_signal in chunk_signals]
+        doc_hash = document_hash(chunk_hashes)
+        source_url = job_data.get("source_url")
+        taxonomy_path = job_data.get("taxonomy_path")
+        chunk_metadata = {
+            "taxonomy_path": taxonomy_path,
+            "author": job_data.get("author"),
+            "language": job_data.get("language"),
+        }
 
         async with async_session() as session:
-            try:
-                document = Document(
-                    doc_id=doc_id,
-                    source_url=job_data.get("source_url"),
-                    title=file_name,
-                    content_type=f"application/{file_format}",
-                    doc_metadata=job_data.get("metadata", {}),
-                    processed_at=datetime.utcnow(),
-                )
-                session.add(document)
-
-                # @CODE:SCHEMA-SYNC-001:QUERY
-                taxonomy_path = job_data.get("taxonomy_path")
-                if taxonomy_path:
-                    query = select(TaxonomyNode.node_id).where(
-                        TaxonomyNode.canonical_path == cast(taxonomy_path, ARRAY(Text))
-                    )
-                    result = await session.execute(query)
-                    node_id = result.scalar_one_or_none()
-
-                    if not node_id:
-                        error_msg = f"Taxonomy path {taxonomy_path} not found in taxonomy_nodes table"
-                        logger.error(error_msg, extra={"taxonomy_path": taxonomy_path})
-                        raise ValueError(error_msg)
-
-                    doc_taxonomy = DocTaxonomy(
-                        doc_id=doc_id,
-                        node_id=node_id,
-                        version="1.0.0",
-                        path=taxonomy_path,
-                        confidence=1.0,
-                        hitl_required=False,
-                    )
-                    session.add(doc_taxonomy)
-                    logger.info(
-                        "Assigned taxonomy to document",
-                        extra={
-                            "doc_id": str(doc_id),
-                            "node_id": str(node_id),
-                            "taxonomy_path": taxonomy_path,
-                            "version": "1.0.0",
-                        },
-                    )
-
-                all_chunk_texts = [chunk_signal.text for chunk_signal in chunk_signals]
-
+            document = await self._find_stored_document(session, source_url)
+            node_id = await self._taxonomy_node_id(session, taxonomy_path)
+            taxonomy_assigned = node_id is None or (
+                document is not None
+                and await session.get(DocTaxonomy, (document.doc_id, node_id, "1.0.0"))
+                is not None
+            )
+            if (
+                document is not None
+                and document.checksum == doc_hash
+                and taxonomy_assigned
+            ):
                 logger.info(
-                    f"Generating embeddings for {len(all_chunk_texts)} chunks in batch"
+                    f"{file_name} matches stored document {document.doc_id}, "
+                    f"skipping {len(chunk_signals)} embeddings"
                 )
-                embedding_vectors = (
-                    await self.embedding_service.batch_generate_embeddings(
-                        all_chunk_texts, batch_size=50, show_progress=True
-                    )
+                return self._processed_event(
+                    command_id,
+                    job_data,
+                    document.doc_id,
+                    preprocessed,
+                    processing_duration_ms,
+                    chunks_reused=len(chunk_signals),
+                    embedding_calls_saved=len(chunk_signals),
                 )
 
-                for idx, (chunk_signal, embedding_vector) in enumerate(
-                    zip(chunk_signals, embedding_vectors)
-                ):
-                    chunk_id = uuid.uuid4()
-
-                    chunk = DocumentChunk(
-                        chunk_id=chunk_id,
-                        doc_id=doc_id,
-                        text=chunk_signal.text,
-                        span=f"{chunk_signal.position},{chunk_signal.position + len(chunk_signal.text)}",
-                        chunk_index=idx,
-                        chunk_metadata={
-                            "taxonomy_path": job_data.get("taxonomy_path"),
-                            "author": job_data.get("author"),
-                            "language": job_data.get("language"),
-                        },
-                        token_count=chunk_signal.token_count,
-                        has_pii=chunk_signal.has_pii,
-                        pii_types=chunk_signal.pii_types,
-                        created_at=datetime.utcnow(),
-                    )
-                    session.add(chunk)
-
-                    embedding = Embedding(
-                        embedding_id=uuid.uuid4(),
-                        chunk_id=chunk_id,
-                        vec=embedding_vector,
-                        model_name=self.embedding_service.model_name,
-                        created_at=datetime.utcnow(),
+            document_values: Dict[str, Any] = {
+                "title": file_name,
+                "content_type": f"application/{file_format}",
+                "file_size": job_data.get("file_size"),
+                "checksum": doc_hash,
+                "doc_metadata": job_data.get("metadata", {}),
+                "processed_at": datetime.utcnow(),
+            }
+            stored_chunks: List[Tuple[Any, str]] = []
+            if document is None:
+                doc_id = uuid.uuid4()
+                write = DocumentWrite(
+                    doc_id=doc_id,
+                    document={
+                        "doc_id": doc_id,
+                        "source_url": source_url,
+                        "created_at": datetime.utcnow(),
+                        **document_values,
+                    },
+                )
+            else:
+                doc_id = document.doc_id
+                write = DocumentWrite(doc_id=doc_id, document=document_values, is_new=False)
+                result = await session.execute(
+                    select(
+                        DocumentChunk.chunk_id,
+                        DocumentChunk.content_hash,
+                        DocumentChunk.text,
+                    ).where(
+                        DocumentChunk.doc_id == doc_id,
+                        DocumentChunk.deleted_at.is_(None),
                     )
-                    session.add(embedding)
-
-                await session.commit()
+                )
+                # Chunks without a hash predate 0017; hash their stored text
+                stored_chunks = [
+                    (chunk_id, chunk_hash or content_hash(chunk_text))
+                    for chunk_id, chunk_hash, chunk_text in result.all()
+                ]
+
+            if not taxonomy_assigned:
+                write.doc_taxonomy = {
+                    "doc_id": doc_id,
+                    "node_id": node_id,
+                    "version": "1.0.0",
+                    "path": taxonomy_path,
+                    "confidence": 1.0,
+                    "hitl_required": False,
+                }
                 logger.info(
-                    f"Stored document {doc_id} with {len(chunk_signals)} chunks in database"
+                    "Assigned taxonomy to document",
+                    extra={
+                        "doc_id": str(doc_id),
+                        "node_id": str(node_id),
+                        "taxonomy_path": taxonomy_path,
+                        "version": "1.0.0",
+                    },
                 )
 
-            except Exception as e:
-                await session.rollback()
-                logger.error(f"Database storage failed for {file_name}: {e}")
-                raise
+            plan = plan_chunk_changes(stored_chunks, chunk_hashes)
+
+            # Look up reusable vectors before tombstoning drops this
+            # document's old embeddings
+            texts_by_hash = {
+                chunk_hashes[idx]: chunk_signals[idx].text for idx in plan.inserted
+            }
+            vectors = await self._find_reusable_embeddings(session, list(texts_by_hash))
+
+        # Embedding API calls happen outside any database transaction
+        missing = [h for h in texts_by_hash if h not in vectors]
+        logger.info(
+            f"Generating embeddings for {len(missing)} of "
+            f"{len(chunk_signals)} chunks in batch"
+        )
+        embedding_vectors = await self.embedding_service.batch_generate_embeddings(
+            [texts_by_hash[h] for h in missing], batch_size=50, show_progress=True
+        )
+        vectors.update(zip(missing, embedding_vectors))
+
+        for idx, chunk_id in plan.kept:
+            chunk_signal = chunk_signals[idx]
+            write.kept.append(
+                {
+                    "chunk_id": chunk_id,
+                    "chunk_index": idx,
+                    "span": f"{chunk_signal.position},{chunk_signal.position + len(chunk_signal.text)}",
+                    "content_hash": chunk_hashes[idx],
+                    "chunk_metadata": chunk_metadata,
+                }
+            )
+        write.tombstoned = plan.tombstoned
+
+        created_at = datetime.utcnow()
+        write.model_name = self.embedding_service.model_name
+        for idx in plan.inserted:
+            chunk_signal = chunk_signals[idx]
+            chunk_id = uuid.uuid4()
+            write.chunks.append(
+                {
+                    "chunk_id": chunk_id,
+                    "doc_id": doc_id,
+                    "text": chunk_signal.text,
+                    "span": f"{chunk_signal.position},{chunk_signal.position + len(chunk_signal.text)}",
+                    "chunk_index": idx,
+                    "chunk_metadata": chunk_metadata,
+                    "token_count": chunk_signal.token_count,
+                    "has_pii": chunk_signal.has_pii,
+                    "pii_types": chunk_signal.pii_types,
+                    "content_hash": chunk_hashes[idx],
+                    "created_at": created_at,
+                }
+            )
+            write.embeddings.append((chunk_id, vectors[chunk_hashes[idx]]))
+
+        try:
+            await self.write_batcher.write(write)
+        except Exception as e:
+            logger.error(f"Database storage failed for {file_name}: {e}")
+            raise
+
+        await _invalidate_search_cache()
+        logger.info(
+            f"Stored document {doc_id}: {len(plan.inserted)} new, "
+            f"{len(plan.kept)} unchanged, {len(plan.tombstoned)} removed chunks"
+        )
+
+        return self._processed_event(
+            command_id,
+            job_data,
+            doc_id,
+            preprocessed,
+            processing_duration_ms,
+            chunks_reused=len(plan.kept),
+            chunks_tombstoned=len(plan.tombstoned),
+            embedding_calls_saved=len(chunk_signals) - len(missing),
+        )
 
+    @staticmethod
+    async def _find_stored_document(
+        session: Any, source_url: Optional[str]
+    ) -> Optional[Document]:
+        """Stored version of an upload: the latest document with its source_url.
+
+        The same content under another source_url is a separate document;
+        it only reuses that content's embeddings.
+        """
+        if not source_url:
+            return None
+        result = await session.execute(
+            select(Document)
+            .where(Document.source_url == source_url)
+            .order_by(Document.processed_at.desc())
+            .limit(1)
+        )
+        document: Optional[Document] = result.scalars().first()
+        return document
+
+    @staticmethod
+    async def _taxonomy_node_id(
+        session: Any, taxonomy_path: Optional[List[str]]
+    ) -> Optional[Any]:
+        """Node of the requested taxonomy path; ValueError if it is unknown"""
+        if not taxonomy_path:
+            return None
+        # @CODE:SCHEMA-SYNC-001:QUERY
+        query = select(TaxonomyNode.node_id).where(
+            TaxonomyNode.canonical_path == cast(taxonomy_path, ARRAY(Text))
+        )
+        result = await session.execute(query)
+        node_id = result.scalar_one_or_none()
+
+        if not node_id:
+            error_msg = f"Taxonomy path {taxonomy_path} not found in taxonomy_nodes table"
+            logger.error(error_msg, extra={"taxonomy_path": taxonomy_path})
+            raise ValueError(error_msg)
+        return node_id
+
+    async def _find_reusable_embeddings(
+        self, session: Any, hashes: List[str]
+    ) -> Dict[str, Any]:
+        """Vectors of live chunks with the same content, from any document"""
+        if not hashes:
+            return {}
+        result = await session.execute(
+            select(DocumentChunk.content_hash, Embedding.vec)
+            .join(Embedding, Embedding.chunk_id == DocumentChunk.chunk_id)
+            .where(
+                DocumentChunk.content_hash.in_(hashes),
+                DocumentChunk.deleted_at.is_(None),
+                Embedding.model_name == self.embedding_service.model_name,
+            )
+        )
+        return {chunk_hash: vec for chunk_hash, vec in result.all()}
+
+    @staticmethod
+    def _processed_event(
+        command_id: str,
+        job_data: Dict[str, Any],
+        doc_id: uuid.UUID,
+        preprocessed: PreprocessedDocument,
+        processing_duration_ms: float,
+        chunks_reused: int = 0,
+        chunks_tombstoned: int = 0,
+        embedding_calls_saved: int = 0,
+    ) -> DocumentProcessedEventV1:
         correlation_id = job_data.get("correlation_id", command_id)
 
         # @CODE:MYPY-CONSOLIDATION-002 | Phase 2: call-arg resolution
@@ -362,10 +671,13 @@ class JobOrchestrator:
             command_id=command_id,
             status=ProcessingStatusV1.COMPLETED,
             document_id=str(doc_id),
-            chunks=chunk_signals,
-            total_chunks=len(chunk_signals),
-            total_tokens=total_tokens,
+            chunks=preprocessed.chunks,
+            total_chunks=len(preprocessed.chunks),
+            total_tokens=preprocessed.total_tokens,
             processing_duration_ms=processing_duration_ms,
+            chunks_reused=chunks_reused,
+            chunks_tombstoned=chunks_tombstoned,
+            embedding_calls_saved=embedding_calls_saved,
             error_message=None,  # Explicit None for successful processing
             error_code=None,  # Explicit None for successful processing
         )
@@ -374,12 +686,14 @@ class JobOrchestrator:
 
     async def submit_job(self, command: DocumentUploadCommandV1) -> str:
         job_id = str(uuid.uuid4())
+        blob_sha256 = await self.blob_store.put(command.file_content)
 
         job_data = {
             "correlation_id": command.correlationId,
             "idempotency_key": command.idempotencyKey,
             "file_name": command.file_name,
-            "file_content_hex": command.file_content.hex(),
+            "blob_sha256": blob_sha256,
+            "file_size": len(command.file_content),
             "file_format": command.file_format.value,
             "taxonomy_path": command.taxonomy_path,
             "source_url": command.source_url,
@@ -418,7 +732,12 @@ class JobOrchestrator:
             logger.info(f"Job {job_id} reached max retries ({max_retries})")
             return False
 
-        non_retryable_errors = ["ParserError", "ValidationError", "AuthenticationError"]
+        non_retryable_errors = [
+            "ParserError",
+            "ValidationError",
+            "AuthenticationError",
+            "PreprocessTimeoutError",
+        ]
 
         error_type = type(error).__name__
         if any(err in error_type for err in non_retryable_errors):
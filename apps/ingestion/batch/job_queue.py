@@ -6,6 +6,7 @@ Job queue management for ingestion tasks.
 import asyncio
 import json
 import logging
+import os
 from typing import Optional, Dict, Any, cast
 from datetime import datetime, timedelta
 from apps.api.cache.redis_manager import RedisManager, get_redis_manager
@@ -18,6 +19,9 @@ class JobQueue:
     JOB_STATUS_PREFIX = "ingestion:job"
     IDEMPOTENCY_KEY_PREFIX = "ingestion:idempotency"
     PRIORITY_QUEUES = ["high", "medium", "low"]
+    # Seconds between touch_job() calls while a job runs; None if jobs
+    # cannot be redelivered
+    heartbeat_interval: Optional[float] = None
 
     def __init__(self, redis_manager: Optional[RedisManager] = None):
         self.redis_manager = redis_manager
@@ -62,6 +66,13 @@ class JobQueue:
     def _get_idempotency_key(self, idempotency_key: str) -> str:
         return f"{self.IDEMPOTENCY_KEY_PREFIX}:{idempotency_key}"
 
+    @staticmethod
+    def _priority_level(priority: int) -> str:
+        return "high" if priority <= 3 else ("medium" if priority <= 7 else "low")
+
+    async def _push(self, priority_level: str, payload: str) -> None:
+        await self.redis_manager.lpush(self._get_queue_key(priority_level), payload)
+
     async def check_idempotency_key(self, idempotency_key: str) -> Optional[str]:
         await self.initialize()
         if not self.is_redis_available:
@@ -120,11 +131,7 @@ class JobQueue:
                         f"Duplicate request with idempotency key: {idempotency_key}"
                     )
 
-            priority_level = (
-                "high" if priority <= 3 else ("medium" if priority <= 7 else "low")
-            )
-
-            queue_key = self._get_queue_key(priority_level)
+            priority_level = self._priority_level(priority)
 
             job_payload = {
                 "job_id": job_id,
@@ -134,7 +141,7 @@ class JobQueue:
                 "enqueued_at": datetime.utcnow().isoformat(),
             }
 
-            await self.redis_manager.lpush(queue_key, json.dumps(job_payload))
+            await self._push(priority_level, json.dumps(job_payload))
 
             await self.set_job_status(
                 job_id=job_id,
@@ -183,6 +190,12 @@ class JobQueue:
             logger.error(f"Failed to dequeue job: {e}")
             return None
 
+    async def ack_job(self, job_payload: Dict[str, Any]) -> None:
+        """Mark a dequeued job as handled. BRPOP already removed it."""
+
+    async def touch_job(self, job_payload: Dict[str, Any]) -> None:
+        """Extend a running job's lease. List jobs have none."""
+
     async def set_job_status(
         self,
         job_id: str,
@@ -357,3 +370,19 @@ class JobQueue:
         except Exception as e:
             logger.error(f"Failed to retry job {job_id}: {e}")
             return False
+
+
+def create_job_queue() -> JobQueue:
+    """Job queue for the backend named by INGESTION_QUEUE_BACKEND.
+
+    "list" (default) pops jobs with BRPOP; "streams" uses Redis Streams
+    consumer groups so jobs held by a crashed worker are redelivered.
+    """
+    backend = os.getenv("INGESTION_QUEUE_BACKEND", "list").lower()
+    if backend == "streams":
+        from .stream_queue import StreamJobQueue
+
+        return StreamJobQueue()
+    if backend != "list":
+        raise ValueError(f"Unknown INGESTION_QUEUE_BACKEND: {backend}")
+    return JobQueue()
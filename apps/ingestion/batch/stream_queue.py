@@ -0,0 +1,331 @@
+"""
+Redis Streams job queue with consumer groups.
+
+BRPOP removes a job from Redis the moment a worker receives it, so a worker
+that dies mid-job loses it. Here jobs are XADDed to one stream per priority
+and read with XREADGROUP; a read job stays in the group's pending entries
+list (PEL) until the worker XACKs it. Any process sharing the consumer group
+reclaims entries idle longer than the visibility timeout with XAUTOCLAIM, so
+workers can run as N processes on M hosts. Running workers call touch_job()
+to keep long jobs from being reclaimed.
+
+Delivery is at-least-once. Re-running a job is cheap because ingestion skips
+unchanged documents and chunks by content hash. Entries delivered more than
+INGESTION_STREAM_MAX_DELIVERIES times go to a dead-letter stream.
+
+Configuration (environment):
+- INGESTION_QUEUE_BACKEND=streams selects this queue (see create_job_queue)
+- INGESTION_STREAM_GROUP: consumer group name (default "ingestion-workers")
+- INGESTION_STREAM_VISIBILITY_TIMEOUT_S: idle time before reclaim (600)
+- INGESTION_STREAM_MAX_DELIVERIES: deliveries before dead-lettering (5)
+
+Requires Redis >= 6.2 (XAUTOCLAIM).
+
+@CODE:INGESTION-006
+"""
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from apps.api.cache.redis_manager import RedisManager
+
+from .job_queue import JobQueue
+
+logger = logging.getLogger(__name__)
+
+# Longest single XREADGROUP block; stays under RedisConfig.socket_timeout
+MAX_BLOCK_MS = 2000
+
+
+def _field(fields: Dict[Any, Any], name: str) -> Any:
+    value = fields.get(name.encode())
+    return value if value is not None else fields.get(name)
+
+
+def _entry_id(entry_id: Any) -> str:
+    return entry_id.decode() if isinstance(entry_id, bytes) else str(entry_id)
+
+
+class StreamJobQueue(JobQueue):
+    STREAM_KEY_PREFIX = "ingestion:stream"
+    DEAD_LETTER_KEY = "ingestion:stream:dead"
+
+    def __init__(
+        self,
+        redis_manager: Optional[RedisManager] = None,
+        group: Optional[str] = None,
+        consumer: Optional[str] = None,
+        visibility_timeout_s: Optional[float] = None,
+        max_deliveries: Optional[int] = None,
+    ):
+        super().__init__(redis_manager)
+        self.group = group or os.getenv("INGESTION_STREAM_GROUP", "ingestion-workers")
+        # Unique per process: a restarted worker must not inherit a dead
+        # consumer's pending entries, those are reclaimed instead
+        self.consumer = (
+            consumer or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        )
+        self.visibility_timeout_s = (
+            visibility_timeout_s
+            if visibility_timeout_s is not None
+            else float(os.getenv("INGESTION_STREAM_VISIBILITY_TIMEOUT_S", "600"))
+        )
+        self.max_deliveries = max_deliveries or int(
+            os.getenv("INGESTION_STREAM_MAX_DELIVERIES", "5")
+        )
+        self.heartbeat_interval = self.visibility_timeout_s / 3
+        self.reclaim_interval_s = min(self.visibility_timeout_s / 2, 30.0)
+        self.stats = {"reclaimed": 0, "dead_lettered": 0, "acked": 0}
+
+        self._groups_ready = False
+        self._next_reclaim = 0.0
+        self._claim_cursors: Dict[str, str] = {}
+        # Entries read together with a higher-priority one; already in our PEL
+        self._buffer: List[Dict[str, Any]] = []
+
+    def _get_queue_key(self, priority: str) -> str:
+        return f"{self.STREAM_KEY_PREFIX}:{priority}"
+
+    async def _client(self) -> Any:
+        await self.initialize()
+        redis_manager = self.redis_manager
+        if not self.is_redis_available or redis_manager is None:
+            return None
+        if not await redis_manager.ensure_connection():
+            return None
+        client = redis_manager.client
+        if client is None:
+            return None
+        if not self._groups_ready:
+            for priority in self.PRIORITY_QUEUES:
+                try:
+                    await client.xgroup_create(
+                        self._get_queue_key(priority), self.group, id="0", mkstream=True
+                    )
+                except Exception as e:
+                    if "BUSYGROUP" not in str(e):
+                        raise
+            self._groups_ready = True
+        return client
+
+    async def _push(self, priority_level: str, payload: str) -> None:
+        client = await self._client()
+        if client is None:
+            raise ConnectionError("Redis unavailable")
+        await client.xadd(self._get_queue_key(priority_level), {"payload": payload})
+
+    def _decode(
+        self, stream_key: str, entry_id: Any, fields: Dict[Any, Any]
+    ) -> Dict[str, Any]:
+        job_payload: Dict[str, Any] = json.loads(_field(fields, "payload"))
+        job_payload["stream_key"] = stream_key
+        job_payload["stream_entry_id"] = _entry_id(entry_id)
+        return job_payload
+
+    async def dequeue_job(self, timeout: int = 5) -> Optional[Dict[str, Any]]:
+        try:
+            client = await self._client()
+            if client is None:
+                logger.debug("Redis unavailable - cannot dequeue jobs")
+                return None
+
+            if time.monotonic() >= self._next_reclaim:
+                self._next_reclaim = time.monotonic() + self.reclaim_interval_s
+                self._buffer.extend(await self._reclaim(client))
+            if self._buffer:
+                return self._buffer.pop(0)
+
+            # Highest priority first without blocking ...
+            for priority in self.PRIORITY_QUEUES:
+                jobs = await self._read(client, [priority], block_ms=None)
+                if jobs:
+                    return jobs[0]
+
+            # ... then wait on all streams at once
+            jobs = await self._read(
+                client,
+                self.PRIORITY_QUEUES,
+                block_ms=min(int(timeout * 1000), MAX_BLOCK_MS),
+            )
+            if not jobs:
+                return None
+            self._buffer.extend(jobs[1:])
+            return jobs[0]
+
+        except Exception as e:
+            if "NOGROUP" in str(e):
+                # Streams were deleted (clear_queue); recreate on next call
+                self._groups_ready = False
+            logger.error(f"Failed to dequeue job: {e}")
+            await asyncio.sleep(min(timeout, 1))
+            return None
+
+    async def _read(
+        self, client: Any, priorities: List[str], block_ms: Optional[int]
+    ) -> List[Dict[str, Any]]:
+        response = await client.xreadgroup(
+            self.group,
+            self.consumer,
+            {self._get_queue_key(p): ">" for p in priorities},
+            count=1,
+            block=block_ms,
+        )
+        jobs = []
+        for stream_key, entries in response or []:
+            stream_key = _entry_id(stream_key)
+            for entry_id, fields in entries:
+                jobs.append(self._decode(stream_key, entry_id, fields))
+                logger.info(
+                    f"Dequeued job {jobs[-1]['job_id']} from {stream_key} "
+                    f"({jobs[-1]['stream_entry_id']})"
+                )
+        # XREADGROUP answers in request order, i.e. highest priority first
+        return jobs
+
+    async def _reclaim(self, client: Any) -> List[Dict[str, Any]]:
+        """Take over entries other consumers have held past the timeout"""
+        min_idle_ms = int(self.visibility_timeout_s * 1000)
+        reclaimed = []
+        for priority in self.PRIORITY_QUEUES:
+            stream_key = self._get_queue_key(priority)
+            cursor = self._claim_cursors.get(stream_key, "0-0")
+            result = await client.xautoclaim(
+                stream_key,
+                self.group,
+                self.consumer,
+                min_idle_time=min_idle_ms,
+                start_id=cursor,
+                count=10,
+            )
+            self._claim_cursors[stream_key] = _entry_id(result[0])
+            for entry_id, fields in result[1]:
+                if not fields:
+                    # Entry was deleted while pending (Redis 6.2 reports these)
+                    await client.xack(stream_key, self.group, entry_id)
+                    continue
+                job_payload = self._decode(stream_key, entry_id, fields)
+                job_payload["redelivered"] = True
+                if await self._deliveries(client, stream_key, entry_id) > self.max_deliveries:
+                    await self._dead_letter(client, job_payload)
+                    continue
+                logger.warning(
+                    f"Reclaimed job {job_payload['job_id']} ({job_payload['stream_entry_id']}) "
+                    f"idle for over {self.visibility_timeout_s}s"
+                )
+                self.stats["reclaimed"] += 1
+                reclaimed.append(job_payload)
+            await self._prune_consumers(client, stream_key)
+        return reclaimed
+
+    async def _prune_consumers(self, client: Any, stream_key: str) -> None:
+        """Forget consumers of exited processes once nothing is pending on them"""
+        idle_limit_ms = int(self.visibility_timeout_s * 1000) * 10
+        for info in await client.xinfo_consumers(stream_key, self.group):
+            name = _entry_id(info["name"])
+            if name != self.consumer and info["pending"] == 0 and info["idle"] > idle_limit_ms:
+                await client.xgroup_delconsumer(stream_key, self.group, name)
+
+    async def _deliveries(self, client: Any, stream_key: str, entry_id: Any) -> int:
+        pending = await client.xpending_range(
+            stream_key, self.group, min=entry_id, max=entry_id, count=1
+        )
+        return int(pending[0]["times_delivered"]) if pending else 0
+
+    async def _dead_letter(self, client: Any, job_payload: Dict[str, Any]) -> None:
+        job_id = job_payload["job_id"]
+        logger.error(
+            f"Job {job_id} delivered more than {self.max_deliveries} times, "
+            f"moving to {self.DEAD_LETTER_KEY}"
+        )
+        await client.xadd(
+            self.DEAD_LETTER_KEY,
+            {"payload": json.dumps(job_payload), "dead_at": datetime.utcnow().isoformat()},
+        )
+        await self.ack_job(job_payload)
+        await self.set_job_status(
+            job_id=job_id,
+            command_id=job_payload["command_id"],
+            status="failed",
+            current_stage="Failed",
+            error_message=f"Job delivered more than {self.max_deliveries} times",
+            completed_at=datetime.utcnow().isoformat(),
+        )
+        self.stats["dead_lettered"] += 1
+
+    def _entry(self, job_payload: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+        stream_key = job_payload.get("stream_key")
+        entry_id = job_payload.get("stream_entry_id")
+        if not stream_key or not entry_id:
+            return None
+        return stream_key, entry_id
+
+    async def ack_job(self, job_payload: Dict[str, Any]) -> None:
+        """XACK and delete a finished job's entry.
+
+        On failure the entry stays pending and is redelivered after the
+        visibility timeout.
+        """
+        entry = self._entry(job_payload)
+        if entry is None:
+            return
+        stream_key, entry_id = entry
+        try:
+            client = await self._client()
+            if client is None:
+                return
+            async with client.pipeline(transaction=True) as pipe:
+                pipe.xack(stream_key, self.group, entry_id)
+                pipe.xdel(stream_key, entry_id)
+                await pipe.execute()
+            self.stats["acked"] += 1
+        except Exception as e:
+            logger.warning(f"Failed to ack job {job_payload.get('job_id')}: {e}")
+
+    async def touch_job(self, job_payload: Dict[str, Any]) -> None:
+        """Reset a running job's idle time so it is not reclaimed"""
+        entry = self._entry(job_payload)
+        if entry is None:
+            return
+        stream_key, entry_id = entry
+        try:
+            client = await self._client()
+            if client is None:
+                return
+            # JUSTID claims do not count as a delivery
+            await client.xclaim(
+                stream_key,
+                self.group,
+                self.consumer,
+                min_idle_time=0,
+                message_ids=[entry_id],
+                justid=True,
+            )
+        except Exception as e:
+            logger.warning(f"Failed to extend lease of job {job_payload.get('job_id')}: {e}")
+
+    async def get_queue_size(self, priority: Optional[str] = None) -> int:
+        """Jobs not yet acknowledged, including ones being processed"""
+        try:
+            client = await self._client()
+            if client is None:
+                return 0
+            priorities = [priority] if priority else self.PRIORITY_QUEUES
+            total = 0
+            for p in priorities:
+                total += await client.xlen(self._get_queue_key(p))
+            return total
+        except Exception as e:
+            logger.error(f"Failed to get queue size: {e}")
+            return 0
+
+    async def clear_queue(self, priority: Optional[str] = None) -> bool:
+        cleared = await super().clear_queue(priority)
+        self._groups_ready = False
+        self._buffer = []
+        return cleared
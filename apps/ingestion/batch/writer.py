@@ -0,0 +1,250 @@
+"""
+Bulk, group-committed storage of processed documents.
+
+Workers describe what a document needs written as a :class:`DocumentWrite`
+and hand it to :class:`DocumentWriteBatcher`, which applies the writes of
+concurrently finishing documents in one transaction: one multi-row insert
+for documents, one for chunks and one COPY/merge for embeddings, instead of
+an ORM object and flush entry per chunk.
+
+Committed embeddings and tombstones are mirrored into the local vector
+index when it serves vector search (no pgvector).
+
+Configuration (environment):
+- INGESTION_WRITE_BATCH_DOCS: documents per transaction (default 8)
+- INGESTION_WRITE_BATCH_WAIT_MS: how long to wait for more documents (20)
+
+@CODE:INGESTION-005
+"""
+import asyncio
+import logging
+import os
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import delete, insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from apps.api.database import DocTaxonomy, Document, DocumentChunk, Embedding
+from apps.api.database.utils.bulk_write import (
+    bulk_insert_chunks,
+    bulk_insert_documents,
+    bulk_upsert_embeddings,
+)
+from apps.api.database.utils.local_vector_index import (
+    get_local_vector_index,
+    vector_search_backend,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DocumentWrite:
+    """Rows to write for one processed document"""
+
+    doc_id: Any
+    # Full row for a new document, or the columns to update on a stored one
+    document: Dict[str, Any]
+    is_new: bool = True
+    doc_taxonomy: Optional[Dict[str, Any]] = None
+    chunks: List[Dict[str, Any]] = field(default_factory=list)
+    # (chunk_id, vector) for every row in ``chunks``, embedded with model_name
+    embeddings: List[Tuple[Any, Any]] = field(default_factory=list)
+    model_name: str = ""
+    # Primary-key updates ({"chunk_id": ..., column: value}) for kept chunks
+    kept: List[Dict[str, Any]] = field(default_factory=list)
+    tombstoned: List[Any] = field(default_factory=list)
+
+
+async def tombstone_chunks(session: AsyncSession, chunk_ids: Sequence[Any]) -> None:
+    """Hide dropped chunks from search without deleting their rows"""
+    if not chunk_ids:
+        return
+    values: Dict[str, Any] = {"deleted_at": datetime.utcnow()}
+    connection = await session.connection()
+    if connection.dialect.name == "postgresql":
+        # Clearing search_tsv takes the chunk out of BM25 matches
+        values["search_tsv"] = None
+    await session.execute(
+        update(DocumentChunk.__table__)
+        .where(DocumentChunk.__table__.c.chunk_id.in_(chunk_ids))
+        .values(**values)
+    )
+    # The embeddings table is the ANN index
+    await session.execute(
+        delete(Embedding.__table__).where(
+            Embedding.__table__.c.chunk_id.in_(chunk_ids)
+        )
+    )
+
+
+async def apply_document_writes(
+    session: AsyncSession, writes: Sequence[DocumentWrite]
+) -> None:
+    """Apply several documents' writes with a constant number of statements.
+
+    Runs inside the caller's transaction; the caller commits.
+    """
+    await bulk_insert_documents(session, [w.document for w in writes if w.is_new])
+    for write in writes:
+        if not write.is_new:
+            await session.execute(
+                update(Document.__table__)
+                .where(Document.__table__.c.doc_id == write.doc_id)
+                .values(**write.document)
+            )
+
+    taxonomy_rows = [w.doc_taxonomy for w in writes if w.doc_taxonomy is not None]
+    if taxonomy_rows:
+        await session.execute(insert(DocTaxonomy.__table__), taxonomy_rows)
+
+    kept = [row for w in writes for row in w.kept]
+    if kept:
+        # ORM bulk UPDATE by primary key: one executemany
+        await session.execute(update(DocumentChunk), kept)
+
+    await tombstone_chunks(session, [cid for w in writes for cid in w.tombstoned])
+    await bulk_insert_chunks(session, [row for w in writes for row in w.chunks])
+    embeddings_by_model: Dict[str, List[Tuple[Any, Any]]] = {}
+    for write in writes:
+        if write.embeddings:
+            embeddings_by_model.setdefault(write.model_name, []).extend(write.embeddings)
+    for model_name, rows in embeddings_by_model.items():
+        await bulk_upsert_embeddings(session, rows, model_name)
+
+
+async def update_local_vector_index(writes: Sequence[DocumentWrite]) -> None:
+    """Mirror committed writes into the local vector index, if it is in use.
+
+    Failures only leave the index behind the embeddings table; it is
+    rebuilt when a process next loads it.
+    """
+    if vector_search_backend() != "local":
+        return
+    upserts = [row for w in writes for row in w.embeddings]
+    removed = [chunk_id for w in writes for chunk_id in w.tombstoned]
+    if not upserts and not removed:
+        return
+    try:
+        await asyncio.to_thread(get_local_vector_index().apply, upserts, removed)
+    except Exception as e:
+        logger.warning(f"Local vector index update failed: {e}")
+
+
+def _consume_exception(future: "asyncio.Future[None]") -> None:
+    if not future.cancelled():
+        future.exception()
+
+
+class DocumentWriteBatcher:
+    """Group-commit :class:`DocumentWrite` batches from concurrent workers.
+
+    Writes are collected for up to ``max_wait_ms`` (or until
+    ``max_batch_docs`` are pending) and committed together. If the combined
+    transaction fails, each document is retried in its own transaction so
+    one bad document only fails its own job.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Any],
+        max_batch_docs: Optional[int] = None,
+        max_wait_ms: Optional[float] = None,
+    ) -> None:
+        self._session_factory = session_factory
+        self.max_batch_docs = max_batch_docs or int(
+            os.getenv("INGESTION_WRITE_BATCH_DOCS", "8")
+        )
+        self.max_wait_ms = (
+            max_wait_ms
+            if max_wait_ms is not None
+            else float(os.getenv("INGESTION_WRITE_BATCH_WAIT_MS", "20"))
+        )
+        self.stats = {"documents": 0, "transactions": 0, "fallbacks": 0}
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: List[Tuple[DocumentWrite, "asyncio.Future[None]"]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set["asyncio.Task[None]"] = set()
+
+    def _bind_loop(self) -> asyncio.AbstractEventLoop:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Futures belong to one loop; state from a previous loop is stale
+            self._loop = loop
+            self._pending = []
+            self._flush_handle = None
+            self._tasks = set()
+        return loop
+
+    async def write(self, document: DocumentWrite) -> None:
+        """Write one document as part of the next transaction"""
+        loop = self._bind_loop()
+        self.stats["documents"] += 1
+
+        future: "asyncio.Future[None]" = loop.create_future()
+        future.add_done_callback(_consume_exception)
+        self._pending.append((document, future))
+        if len(self._pending) >= self.max_batch_docs:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_wait_ms / 1000.0, self._flush)
+
+        # shield: a cancelled worker must not cancel the shared transaction
+        await asyncio.shield(future)
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, []
+        assert self._loop is not None
+        task = self._loop.create_task(self._run_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _commit(self, writes: Sequence[DocumentWrite]) -> None:
+        async with self._session_factory() as session:
+            try:
+                await apply_document_writes(session, writes)
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+        self.stats["transactions"] += 1
+        await update_local_vector_index(writes)
+
+    async def _run_batch(
+        self, batch: List[Tuple[DocumentWrite, "asyncio.Future[None]"]]
+    ) -> None:
+        try:
+            await self._commit([document for document, _ in batch])
+        except Exception as e:
+            if len(batch) == 1:
+                if not batch[0][1].done():
+                    batch[0][1].set_exception(e)
+                return
+            logger.warning(
+                f"Batched write of {len(batch)} documents failed, "
+                f"retrying individually: {e}"
+            )
+            self.stats["fallbacks"] += 1
+            for document, future in batch:
+                try:
+                    await self._commit([document])
+                except Exception as single_error:
+                    if not future.done():
+                        future.set_exception(single_error)
+                else:
+                    if not future.done():
+                        future.set_result(None)
+            return
+
+        for _, future in batch:
+            if not future.done():
+                future.set_result(None)
@@ -4,7 +4,9 @@ Intelligent text chunking with sentence boundary preservation.
 @CODE:INGESTION-001
 """
 import re
-from typing import List
+from bisect import bisect_left
+from itertools import accumulate
+from typing import Dict, Iterable, Iterator, List, Tuple
 from dataclasses import dataclass
 
 try:
@@ -28,18 +30,37 @@ class ChunkingError(Exception):
     pass
 
 
+@dataclass
+class _Sentence:
+    text: str
+    token_count: int
+    start_position: int
+    end_position: int
+
+
+# Blank line(s) separate paragraphs; a sentence ends at terminal punctuation
+# followed by whitespace (same rule as split_into_sentences)
+_PARAGRAPH_BREAK = re.compile(r"\n[ \t]*\n")
+_SENTENCE_END = re.compile(r"[.!?。！？](?=\s)")
+
+# encoding name -> number of characters each token id starts
+_TOKEN_CHAR_STARTS: Dict[str, List[int]] = {}
+
+
 class IntelligentChunker:
     def __init__(
         self,
         chunk_size: int = 500,
         overlap_size: int = 128,
         encoding_name: str = "cl100k_base",
+        max_paragraph_chars: int = 100_000,
     ):
         if not TIKTOKEN_AVAILABLE:
             raise ChunkingError("tiktoken not installed")
 
         self.chunk_size = chunk_size
         self.overlap_size = overlap_size
+        self.max_paragraph_chars = max_paragraph_chars
         self.encoding = tiktoken.get_encoding(encoding_name)
 
     def count_tokens(self, text: str) -> int:
@@ -57,116 +78,181 @@ class IntelligentChunker:
         if not text or not text.strip():
             raise ChunkingError("Input text is empty")
 
-        sentences = self.split_into_sentences(text)
+        chunks = list(self.iter_chunks([text]))
 
-        if not sentences:
+        if not chunks:
             raise ChunkingError("No sentences found in text")
 
-        chunks = []
-        current_chunk_sentences: list[str] = []
-        current_tokens = 0
-        position = 0
-
-        for sentence in sentences:
-            sentence_tokens = self.count_tokens(sentence)
-
-            if sentence_tokens > self.chunk_size:
-                if current_chunk_sentences:
-                    chunk_text = " ".join(current_chunk_sentences)
-                    chunks.append(
-                        Chunk(
-                            text=chunk_text,
-                            token_count=current_tokens,
-                            start_position=position - current_tokens,
-                            end_position=position,
-                            sentence_boundary_preserved=True,
-                        )
-                    )
-                    current_chunk_sentences = []
-                    current_tokens = 0
-
-                words = sentence.split()
-                word_chunk: list[str] = []
-                word_tokens = 0
-
-                for word in words:
-                    word_token_count = self.count_tokens(word)
-
-                    if word_tokens + word_token_count > self.chunk_size:
-                        if word_chunk:
-                            chunk_text = " ".join(word_chunk)
-                            chunks.append(
-                                Chunk(
-                                    text=chunk_text,
-                                    token_count=word_tokens,
-                                    start_position=position,
-                                    end_position=position + word_tokens,
-                                    sentence_boundary_preserved=False,
-                                )
-                            )
-                            position += word_tokens
-                            word_chunk = []
-                            word_tokens = 0
-
-                    word_chunk.append(word)
-                    word_tokens += word_token_count
-
-                if word_chunk:
-                    chunk_text = " ".join(word_chunk)
-                    chunks.append(
-                        Chunk(
-                            text=chunk_text,
-                            token_count=word_tokens,
-                            start_position=position,
-                            end_position=position + word_tokens,
-                            sentence_boundary_preserved=False,
+        return chunks
+
+    def iter_chunks(self, stream: Iterable[str]) -> Iterator[Chunk]:
+        """Yield chunks from an iterable of text pieces (e.g. an open file).
+
+        Each paragraph is encoded once; sentence token counts come from the
+        token offsets of that single encoding, so no text is re-encoded for
+        splitting or overlap. Only one paragraph (at most
+        ``max_paragraph_chars``) plus the current chunk is held in memory.
+        ``start_position``/``end_position`` are character offsets into the
+        concatenated stream.
+        """
+        pending: List[_Sentence] = []
+        pending_tokens = 0
+
+        for base, paragraph in self._iter_paragraphs(stream):
+            for sentence, offsets in self._encode_sentences(base, paragraph):
+                if sentence.token_count > self.chunk_size:
+                    if pending:
+                        yield self._make_chunk(pending, pending_tokens)
+                        pending = []
+                        pending_tokens = 0
+                    yield from self._split_oversized(base, paragraph, sentence, offsets)
+                    continue
+
+                if pending_tokens + sentence.token_count > self.chunk_size:
+                    yield self._make_chunk(pending, pending_tokens)
+                    pending, pending_tokens = self._overlap(pending)
+
+                pending.append(sentence)
+                pending_tokens += sentence.token_count
+
+        if pending:
+            yield self._make_chunk(pending, pending_tokens)
+
+    def _iter_paragraphs(self, stream: Iterable[str]) -> Iterator[Tuple[int, str]]:
+        """Yield ``(char offset, paragraph)`` pairs from a stream of text pieces"""
+        buffer = ""
+        base = 0
+
+        for piece in stream:
+            # A break can only end inside the new piece or the line before it
+            scan_from = max(buffer.rfind("\n"), 0)
+            buffer += piece
+
+            while True:
+                match = _PARAGRAPH_BREAK.search(buffer, scan_from)
+                if match:
+                    cut, resume = match.start(), match.end()
+                elif len(buffer) > self.max_paragraph_chars:
+                    # No blank line for too long: cut after the last sentence
+                    ends = [
+                        m.end()
+                        for m in _SENTENCE_END.finditer(
+                            buffer, 0, self.max_paragraph_chars
                         )
-                    )
-                    position += word_tokens
-
-                continue
-
-            if current_tokens + sentence_tokens > self.chunk_size:
-                chunk_text = " ".join(current_chunk_sentences)
-                chunks.append(
-                    Chunk(
-                        text=chunk_text,
-                        token_count=current_tokens,
-                        start_position=position - current_tokens,
-                        end_position=position,
-                        sentence_boundary_preserved=True,
-                    )
-                )
+                    ]
+                    cut = resume = ends[-1] if ends else self.max_paragraph_chars
+                else:
+                    break
+
+                if buffer[:cut].strip():
+                    yield base, buffer[:cut]
+                base += resume
+                buffer = buffer[resume:]
+                scan_from = 0
+
+        if buffer.strip():
+            yield base, buffer
+
+    def _encode_sentences(
+        self, base: int, paragraph: str
+    ) -> Iterator[Tuple[_Sentence, List[int]]]:
+        """Encode a paragraph once and split its tokens at sentence ends.
+
+        Yields each sentence with the paragraph-relative character offsets
+        of its tokens.
+        """
+        tokens = self.encoding.encode_ordinary(paragraph)
+        # offsets[i] is the character offset of token i (offsets[-1] == len)
+        offsets = list(
+            accumulate(map(self._token_char_starts().__getitem__, tokens), initial=0)
+        )
 
-                overlap_sentences: list[str] = []
-                overlap_tokens = 0
-                for sent in reversed(current_chunk_sentences):
-                    sent_tokens = self.count_tokens(sent)
-                    if overlap_tokens + sent_tokens > self.overlap_size:
-                        break
-                    overlap_sentences.insert(0, sent)
-                    overlap_tokens += sent_tokens
-
-                current_chunk_sentences = overlap_sentences
-                current_tokens = overlap_tokens
-
-            current_chunk_sentences.append(sentence)
-            current_tokens += sentence_tokens
-            position += sentence_tokens
-
-        if current_chunk_sentences:
-            chunk_text = " ".join(current_chunk_sentences)
-            chunks.append(
-                Chunk(
-                    text=chunk_text,
-                    token_count=current_tokens,
-                    start_position=position - current_tokens,
-                    end_position=position,
-                    sentence_boundary_preserved=True,
+        ends = [m.end() for m in _SENTENCE_END.finditer(paragraph)]
+        ends.append(len(paragraph))
+
+        char_start = 0
+        token_start = 0
+        for char_end in ends:
+            # Tokens belong to the sentence in which they start
+            token_end = bisect_left(offsets, char_end, lo=token_start, hi=len(tokens))
+            raw = paragraph[char_start:char_end]
+            text = raw.strip()
+            if text:
+                start = char_start + len(raw) - len(raw.lstrip())
+                yield (
+                    _Sentence(
+                        text=text,
+                        token_count=token_end - token_start,
+                        start_position=base + start,
+                        end_position=base + start + len(text),
+                    ),
+                    offsets[token_start:token_end],
+                )
+            char_start = char_end
+            token_start = token_end
+
+    def _token_char_starts(self) -> List[int]:
+        """Per token id, how many characters it starts (built once per encoding).
+
+        Summing this over the tokens of a paragraph gives character offsets
+        without decoding, which is far cheaper than ``decode_with_offsets``.
+        """
+        table = _TOKEN_CHAR_STARTS.get(self.encoding.name)
+        if table is None:
+            table = []
+            for token in range(self.encoding.n_vocab):
+                try:
+                    data = self.encoding.decode_single_token_bytes(token)
+                except KeyError:
+                    data = b""
+                # UTF-8 continuation bytes (10xxxxxx) do not start a character
+                table.append(sum(1 for byte in data if not 0x80 <= byte < 0xC0))
+            _TOKEN_CHAR_STARTS[self.encoding.name] = table
+        return table
+
+    def _split_oversized(
+        self, base: int, paragraph: str, sentence: _Sentence, offsets: List[int]
+    ) -> Iterator[Chunk]:
+        """Split a sentence longer than chunk_size at token window boundaries"""
+        for i in range(0, len(offsets), self.chunk_size):
+            window = offsets[i : i + self.chunk_size]
+            start = max(base + window[0], sentence.start_position)
+            if i + self.chunk_size < len(offsets):
+                end = base + offsets[i + self.chunk_size]
+            else:
+                end = sentence.end_position
+            raw = paragraph[start - base : end - base]
+            text = raw.strip()
+            if text:
+                start += len(raw) - len(raw.lstrip())
+                yield Chunk(
+                    text=text,
+                    token_count=len(window),
+                    start_position=start,
+                    end_position=start + len(text),
+                    sentence_boundary_preserved=False,
                 )
-            )
 
-        return chunks
+    def _overlap(self, sentences: List[_Sentence]) -> Tuple[List[_Sentence], int]:
+        """Trailing sentences that fit in overlap_size, and their token total"""
+        overlap: List[_Sentence] = []
+        overlap_tokens = 0
+        for sentence in reversed(sentences):
+            if overlap_tokens + sentence.token_count > self.overlap_size:
+                break
+            overlap.insert(0, sentence)
+            overlap_tokens += sentence.token_count
+        return overlap, overlap_tokens
+
+    @staticmethod
+    def _make_chunk(sentences: List[_Sentence], token_count: int) -> Chunk:
+        return Chunk(
+            text=" ".join(sentence.text for sentence in sentences),
+            token_count=token_count,
+            start_position=sentences[0].start_position,
+            end_position=sentences[-1].end_position,
+            sentence_boundary_preserved=True,
+        )
 
     def calculate_sentence_boundary_preservation_rate(
         self, chunks: List[Chunk]
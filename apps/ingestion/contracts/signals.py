@@ -84,6 +84,9 @@ class DocumentProcessedEventV1(BaseModel):
     total_chunks: int = Field(default=0, ge=0)
     total_tokens: int = Field(default=0, ge=0)
     processing_duration_ms: float = Field(..., ge=0.0)
+    chunks_reused: int = Field(default=0, ge=0)
+    chunks_tombstoned: int = Field(default=0, ge=0)
+    embedding_calls_saved: int = Field(default=0, ge=0)
     error_message: Optional[str] = Field(None, max_length=1000)
     error_code: Optional[str] = Field(None, max_length=100)
     processed_at: datetime = Field(default_factory=datetime.utcnow)
@@ -4,7 +4,7 @@ PII detection and masking utilities.
 @CODE:INGESTION-001
 """
 import re
-from typing import List, Tuple, Dict
+from typing import Iterable, List, Optional, Tuple, Dict
 from dataclasses import dataclass
 from enum import Enum
 
@@ -55,6 +55,18 @@ class PIIDetector:
         PIIType.BANK_ACCOUNT: "[계좌번호]",
     }
 
+    # Overlapping matches are resolved in this order
+    PRIORITY_ORDER = [
+        PIIType.RESIDENT_REGISTRATION_NUMBER,
+        PIIType.CREDIT_CARD,
+        PIIType.PHONE_NUMBER,
+        PIIType.EMAIL,
+        PIIType.BANK_ACCOUNT,
+    ]
+
+    _scanner: Optional["re.Pattern[str]"] = None
+    _scan_order: List[PIIType] = []
+
     # @CODE:MYPY-CONSOLIDATION-002 | Phase 3: no-untyped-def resolution
     def __init__(self) -> None:
         self.compiled_patterns: Dict[PIIType, List[re.Pattern]] = {}
@@ -62,6 +74,32 @@ class PIIDetector:
             self.compiled_patterns[pii_type] = [
                 re.compile(pattern) for pattern in patterns
             ]
+        self._build_scanner()
+
+    @classmethod
+    def _build_scanner(cls) -> None:
+        """Compile every pattern into one regex (once per process).
+
+        The leading lookahead is an alternation of all patterns, so text is
+        scanned once and only positions where some pattern matches are
+        reported. At those positions each pattern is re-tried inside its own
+        optional lookahead group, which yields every candidate (including
+        overlapping ones) so the per-pattern priority rules can be applied
+        exactly as if each pattern had been scanned separately.
+        """
+        if cls._scanner is not None:
+            return
+        order = [
+            (pii_type, pattern)
+            for pii_type in cls.PRIORITY_ORDER
+            for pattern in cls.PATTERNS[pii_type]
+        ]
+        gate = "|".join(f"(?:{pattern})" for _, pattern in order)
+        groups = "".join(
+            f"(?:(?=({pattern})))?" for _, pattern in order
+        )
+        cls._scan_order = [pii_type for pii_type, _ in order]
+        cls._scanner = re.compile(f"(?=(?:{gate})){groups}")
 
     def validate_resident_registration_number(self, rrn: str) -> bool:
         rrn_clean = re.sub(r"[-\s]", "", rrn)
@@ -109,52 +147,54 @@ class PIIDetector:
         return checksum % 10 == 0
 
     def detect_pii(self, text: str) -> List[PIIMatch]:
-        matches: List[PIIMatch] = []
-        matched_ranges: set[Tuple[int, int]] = set()
-
-        priority_order = [
-            PIIType.RESIDENT_REGISTRATION_NUMBER,
-            PIIType.CREDIT_CARD,
-            PIIType.PHONE_NUMBER,
-            PIIType.EMAIL,
-            PIIType.BANK_ACCOUNT,
-        ]
+        if not text:
+            return []
+        assert self._scanner is not None
+
+        # candidates[i]: (start, end) of pattern i at every position it matches
+        candidates: List[List[Tuple[int, int]]] = [[] for _ in self._scan_order]
+        for hit in self._scanner.finditer(text):
+            for i, span in enumerate(hit.regs[1:]):
+                if span[0] >= 0:
+                    candidates[i].append(span)
 
-        for pii_type in priority_order:
-            compiled_patterns = self.compiled_patterns.get(pii_type, [])
-            for pattern in compiled_patterns:
-                for match in pattern.finditer(text):
-                    original_text = match.group(0)
-                    start_pos = match.start()
-                    end_pos = match.end()
-
-                    if any(
-                        start_pos < r_end and end_pos > r_start
-                        for r_start, r_end in matched_ranges
-                    ):
+        matches: List[PIIMatch] = []
+        matched_ranges: List[Tuple[int, int]] = []
+
+        for pii_type, pattern_candidates in zip(self._scan_order, candidates):
+            # A separate finditer would resume after each match it returns
+            resume_at = 0
+            for start_pos, end_pos in pattern_candidates:
+                if start_pos < resume_at:
+                    continue
+                resume_at = end_pos
+
+                if any(
+                    start_pos < r_end and end_pos > r_start
+                    for r_start, r_end in matched_ranges
+                ):
+                    continue
+
+                original_text = text[start_pos:end_pos]
+
+                # Checksum/date validation only runs on surviving candidates
+                if pii_type == PIIType.RESIDENT_REGISTRATION_NUMBER:
+                    if not self.validate_resident_registration_number(original_text):
+                        continue
+                elif pii_type == PIIType.CREDIT_CARD:
+                    if not self.validate_luhn(original_text):
                         continue
 
-                    confidence = 1.0
-
-                    if pii_type == PIIType.RESIDENT_REGISTRATION_NUMBER:
-                        if not self.validate_resident_registration_number(
-                            original_text
-                        ):
-                            continue
-                    elif pii_type == PIIType.CREDIT_CARD:
-                        if not self.validate_luhn(original_text):
-                            continue
-
-                    matches.append(
-                        PIIMatch(
-                            pii_type=pii_type,
-                            original_text=original_text,
-                            start_position=start_pos,
-                            end_position=end_pos,
-                            confidence=confidence,
-                        )
+                matches.append(
+                    PIIMatch(
+                        pii_type=pii_type,
+                        original_text=original_text,
+                        start_position=start_pos,
+                        end_position=end_pos,
+                        confidence=1.0,
                     )
-                    matched_ranges.add((start_pos, end_pos))
+                )
+                matched_ranges.append((start_pos, end_pos))
 
         matches.sort(key=lambda m: m.start_position)
 
@@ -184,6 +224,12 @@ class PIIDetector:
         masked_text = self.mask_pii(text, matches)
         return masked_text, matches
 
+    def detect_and_mask_batch(
+        self, texts: Iterable[str]
+    ) -> List[Tuple[str, List[PIIMatch]]]:
+        """detect_and_mask for many texts (e.g. all chunks of a document)"""
+        return [self.detect_and_mask(text) for text in texts]
+
     def has_pii(self, text: str) -> bool:
         return len(self.detect_pii(text)) > 0
 
@@ -191,3 +237,17 @@ class PIIDetector:
         matches = self.detect_pii(text)
         pii_types = list(set([match.pii_type.value for match in matches]))
         return pii_types
+
+
+_default_detector: Optional[PIIDetector] = None
+
+
+def detect_and_mask_batch(texts: Iterable[str]) -> List[Tuple[str, List[PIIMatch]]]:
+    """Module-level batch entry point for executors and worker processes.
+
+    Picklable by reference; the detector is built once per process.
+    """
+    global _default_detector
+    if _default_detector is None:
+        _default_detector = PIIDetector()
+    return _default_detector.detect_and_mask_batch(texts)
@@ -0,0 +1,14 @@
+"""
+Preprocessing stage (parse -> chunk -> PII mask) for the ingestion pipeline.
+
+@CODE:INGESTION-002
+"""
+from .pool import PreprocessPool, PreprocessTimeoutError
+from .worker import PreprocessedDocument, preprocess_document
+
+__all__ = [
+    "PreprocessPool",
+    "PreprocessTimeoutError",
+    "PreprocessedDocument",
+    "preprocess_document",
+]
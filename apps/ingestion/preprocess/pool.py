@@ -0,0 +1,182 @@
+"""
+Executor stage that keeps parse/chunk/PII work off the event loop.
+
+Formats are routed to lanes, each with its own executor, so a slow PDF can
+only occupy the binary-format workers while plain text keeps flowing.
+
+Configuration (environment):
+- INGESTION_PREPROCESS_MODE: process (default) | thread
+- INGESTION_PREPROCESS_START_METHOD: multiprocessing start method (spawn)
+- INGESTION_BINARY_PARSE_WORKERS: workers for pdf/docx (default: CPUs - 1)
+- INGESTION_TEXT_PARSE_WORKERS: workers for every other format (default 2)
+
+@CODE:INGESTION-002
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Optional
+
+from .worker import DocumentSource, PreprocessedDocument, preprocess_document
+
+logger = logging.getLogger(__name__)
+
+BINARY_FORMATS: FrozenSet[str] = frozenset({"pdf", "docx"})
+
+
+class PreprocessTimeoutError(Exception):
+    """Preprocessing did not finish within the job timeout"""
+
+
+@dataclass
+class _Lane:
+    name: str
+    workers: int
+    executor: Optional[Executor] = None
+    pending: int = 0
+    completed: int = 0
+    timeouts: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    recycles: int = 0
+    stage_ms: Dict[str, float] = field(default_factory=dict)
+
+
+class PreprocessPool:
+    """Per-format executor lanes for :func:`preprocess_document`"""
+
+    def __init__(
+        self,
+        mode: Optional[str] = None,
+        binary_workers: Optional[int] = None,
+        text_workers: Optional[int] = None,
+        chunk_size: int = 500,
+        overlap_size: int = 128,
+    ) -> None:
+        self.mode = (mode or os.getenv("INGESTION_PREPROCESS_MODE") or "process").lower()
+        if self.mode not in ("process", "thread"):
+            raise ValueError(
+                f"Unsupported preprocess mode '{self.mode}', expected process or thread"
+            )
+        self.chunk_size = chunk_size
+        self.overlap_size = overlap_size
+        self.lanes: Dict[str, _Lane] = {
+            "binary": _Lane(
+                "binary",
+                binary_workers
+                or int(
+                    os.getenv(
+                        "INGESTION_BINARY_PARSE_WORKERS",
+                        str(max(1, (os.cpu_count() or 2) - 1)),
+                    )
+                ),
+            ),
+            "text": _Lane(
+                "text", text_workers or int(os.getenv("INGESTION_TEXT_PARSE_WORKERS", "2"))
+            ),
+        }
+
+    @staticmethod
+    def lane_for(file_format: str) -> str:
+        return "binary" if file_format.lower() in BINARY_FORMATS else "text"
+
+    def _executor(self, lane: _Lane) -> Executor:
+        if lane.executor is None:
+            if self.mode == "process":
+                context = multiprocessing.get_context(
+                    os.getenv("INGESTION_PREPROCESS_START_METHOD", "spawn")
+                )
+                lane.executor = ProcessPoolExecutor(
+                    max_workers=lane.workers, mp_context=context
+                )
+            else:
+                lane.executor = ThreadPoolExecutor(
+                    max_workers=lane.workers,
+                    thread_name_prefix=f"ingest-{lane.name}",
+                )
+        return lane.executor
+
+    def _recycle(self, lane: _Lane) -> None:
+        """Drop a lane's executor, killing a worker stuck on a timed-out job.
+
+        Other jobs running in the same lane fail with BrokenProcessPool and
+        are retried by the orchestrator.
+        """
+        executor, lane.executor = lane.executor, None
+        if executor is None:
+            return
+        lane.recycles += 1
+        # Threads cannot be killed; the stuck thread finishes in the background
+        processes = getattr(executor, "_processes", None) or {}
+        for process in list(processes.values()):
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def run(
+        self,
+        file_content: DocumentSource,
+        file_name: str,
+        file_format: str,
+        timeout: Optional[float] = None,
+    ) -> PreprocessedDocument:
+        """Preprocess one document in its format's lane"""
+        lane = self.lanes[self.lane_for(file_format)]
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(
+            self._executor(lane),
+            preprocess_document,
+            file_content,
+            file_name,
+            file_format,
+            self.chunk_size,
+            self.overlap_size,
+        )
+
+        lane.pending += 1
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            lane.timeouts += 1
+            self._recycle(lane)
+            raise PreprocessTimeoutError(
+                f"Preprocessing {file_name} exceeded {timeout}s"
+            ) from None
+        finally:
+            lane.pending -= 1
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        lane.completed += 1
+        lane.total_ms += elapsed_ms
+        lane.max_ms = max(lane.max_ms, elapsed_ms)
+        for stage, ms in result.stage_ms.items():
+            lane.stage_ms[stage] = lane.stage_ms.get(stage, 0.0) + ms
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = {"mode": self.mode, "lanes": {}}
+        for lane in self.lanes.values():
+            done = max(lane.completed, 1)
+            stats["lanes"][lane.name] = {
+                "workers": lane.workers,
+                "queue_depth": lane.pending,
+                "completed": lane.completed,
+                "timeouts": lane.timeouts,
+                "recycles": lane.recycles,
+                "avg_ms": lane.total_ms / done,
+                "max_ms": lane.max_ms,
+                "avg_stage_ms": {
+                    stage: total / done for stage, total in lane.stage_ms.items()
+                },
+            }
+        return stats
+
+    def shutdown(self) -> None:
+        for lane in self.lanes.values():
+            if lane.executor is not None:
+                lane.executor.shutdown(wait=False, cancel_futures=True)
+                lane.executor = None
@@ -0,0 +1,22 @@
+"""
+Content-addressed storage for uploaded documents.
+
+@CODE:INGESTION-003
+"""
+from .blob_store import (
+    BlobStore,
+    BlobStoreError,
+    FilesystemBlobStore,
+    S3BlobStore,
+    blob_key,
+    get_blob_store,
+)
+
+__all__ = [
+    "BlobStore",
+    "BlobStoreError",
+    "FilesystemBlobStore",
+    "S3BlobStore",
+    "blob_key",
+    "get_blob_store",
+]
@@ -0,0 +1,263 @@
+"""
+Content-addressed blob storage for uploaded documents.
+
+Uploads are stored once under their SHA-256 digest and ingestion jobs carry
+only that key, so Redis never holds file bodies. Preprocess workers open the
+blob from a local path instead of receiving the bytes through the job.
+Derived artifacts (e.g. cached preprocessing output) live next to the blob
+under ``<sha256>.<name>``.
+
+Configuration (environment):
+- INGESTION_BLOB_BACKEND: filesystem (default) | s3
+- INGESTION_BLOB_DIR: filesystem root, or local cache dir for s3 (data/blobs)
+- INGESTION_BLOB_S3_BUCKET / INGESTION_BLOB_S3_PREFIX / INGESTION_BLOB_S3_ENDPOINT
+
+@CODE:INGESTION-003
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import tempfile
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Optional
+
+try:
+    import boto3
+    from botocore.exceptions import ClientError
+
+    BOTO3_AVAILABLE = True
+except ImportError:
+    BOTO3_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+_SHA256_RE = re.compile(r"^[0-9a-f]{64}$")
+_NAME_RE = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+
+class BlobStoreError(Exception):
+    """Blob could not be stored or found"""
+
+
+def blob_key(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _check_key(key: str) -> str:
+    if not _SHA256_RE.match(key):
+        raise BlobStoreError(f"Invalid blob key '{key}'")
+    return key
+
+
+def _check_name(name: str) -> str:
+    if not _NAME_RE.match(name):
+        raise BlobStoreError(f"Invalid derived artifact name '{name}'")
+    return name
+
+
+class BlobStore(ABC):
+    """Blobs keyed by the SHA-256 of their content"""
+
+    @abstractmethod
+    async def put(self, data: bytes) -> str:
+        """Store ``data`` (no-op if already present) and return its key"""
+
+    @abstractmethod
+    async def exists(self, key: str) -> bool:
+        pass
+
+    @abstractmethod
+    async def get(self, key: str) -> bytes:
+        pass
+
+    @abstractmethod
+    async def local_path(self, key: str) -> Path:
+        """Local file holding the blob, for workers to open or mmap"""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        pass
+
+    @abstractmethod
+    async def put_derived(self, key: str, name: str, data: bytes) -> None:
+        pass
+
+    @abstractmethod
+    async def get_derived(self, key: str, name: str) -> Optional[bytes]:
+        pass
+
+
+class FilesystemBlobStore(BlobStore):
+    """Blobs under ``root/ab/cd/<sha256>``, written atomically"""
+
+    def __init__(self, root: str) -> None:
+        self.root = Path(root)
+
+    def path_for(self, key: str, name: Optional[str] = None) -> Path:
+        _check_key(key)
+        filename = key if name is None else f"{key}.{_check_name(name)}"
+        return self.root / key[:2] / key[2:4] / filename
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                tmp.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _put_sync(self, data: bytes) -> str:
+        key = blob_key(data)
+        path = self.path_for(key)
+        if not path.exists():
+            self._write_atomic(path, data)
+        return key
+
+    async def put(self, data: bytes) -> str:
+        return await asyncio.to_thread(self._put_sync, data)
+
+    async def exists(self, key: str) -> bool:
+        return self.path_for(key).exists()
+
+    async def get(self, key: str) -> bytes:
+        path = await self.local_path(key)
+        return await asyncio.to_thread(path.read_bytes)
+
+    async def local_path(self, key: str) -> Path:
+        path = self.path_for(key)
+        if not path.exists():
+            raise BlobStoreError(f"Blob {key} not found")
+        return path
+
+    async def delete(self, key: str) -> None:
+        for path in self.path_for(key).parent.glob(f"{key}*"):
+            path.unlink(missing_ok=True)
+
+    async def put_derived(self, key: str, name: str, data: bytes) -> None:
+        await asyncio.to_thread(self._write_atomic, self.path_for(key, name), data)
+
+    async def get_derived(self, key: str, name: str) -> Optional[bytes]:
+        path = self.path_for(key, name)
+        try:
+            return await asyncio.to_thread(path.read_bytes)
+        except FileNotFoundError:
+            return None
+
+
+class S3BlobStore(BlobStore):
+    """Blobs in an S3-compatible bucket, downloaded to a local cache for workers"""
+
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str = "blobs/",
+        endpoint_url: Optional[str] = None,
+        cache_dir: str = "data/blobs",
+        client: Any = None,
+    ) -> None:
+        if client is None:
+            if not BOTO3_AVAILABLE:
+                raise BlobStoreError("boto3 not installed")
+            client = boto3.client("s3", endpoint_url=endpoint_url)
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix
+        self.cache = FilesystemBlobStore(cache_dir)
+
+    def _object_key(self, key: str, name: Optional[str] = None) -> str:
+        _check_key(key)
+        if name is None:
+            return f"{self.prefix}{key}"
+        return f"{self.prefix}{key}.{_check_name(name)}"
+
+    def _read_object(self, object_key: str) -> Optional[bytes]:
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=object_key)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey"):
+                return None
+            raise
+        data: bytes = response["Body"].read()
+        return data
+
+    def _exists_sync(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self._object_key(key))
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey"):
+                return False
+            raise
+        return True
+
+    async def put(self, data: bytes) -> str:
+        key = blob_key(data)
+        if not await self.exists(key):
+            await asyncio.to_thread(
+                self.client.put_object,
+                Bucket=self.bucket,
+                Key=self._object_key(key),
+                Body=data,
+            )
+        return key
+
+    async def exists(self, key: str) -> bool:
+        return await asyncio.to_thread(self._exists_sync, key)
+
+    async def get(self, key: str) -> bytes:
+        path = await self.local_path(key)
+        return await asyncio.to_thread(path.read_bytes)
+
+    async def local_path(self, key: str) -> Path:
+        if await self.cache.exists(key):
+            return await self.cache.local_path(key)
+        data = await asyncio.to_thread(self._read_object, self._object_key(key))
+        if data is None:
+            raise BlobStoreError(f"Blob {key} not found in s3://{self.bucket}")
+        # Content addressing makes the cached copy valid forever
+        await self.cache.put(data)
+        return await self.cache.local_path(key)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(
+            self.client.delete_object, Bucket=self.bucket, Key=self._object_key(key)
+        )
+        await self.cache.delete(key)
+
+    async def put_derived(self, key: str, name: str, data: bytes) -> None:
+        await asyncio.to_thread(
+            self.client.put_object,
+            Bucket=self.bucket,
+            Key=self._object_key(key, name),
+            Body=data,
+        )
+
+    async def get_derived(self, key: str, name: str) -> Optional[bytes]:
+        return await asyncio.to_thread(self._read_object, self._object_key(key, name))
+
+
+def get_blob_store() -> BlobStore:
+    """Build the blob store configured in the environment"""
+    backend = os.getenv("INGESTION_BLOB_BACKEND", "filesystem").lower()
+    blob_dir = os.getenv("INGESTION_BLOB_DIR", "data/blobs")
+    if backend == "filesystem":
+        return FilesystemBlobStore(blob_dir)
+    if backend == "s3":
+        bucket = os.getenv("INGESTION_BLOB_S3_BUCKET")
+        if not bucket:
+            raise BlobStoreError("INGESTION_BLOB_S3_BUCKET is required for the s3 backend")
+        return S3BlobStore(
+            bucket=bucket,
+            prefix=os.getenv("INGESTION_BLOB_S3_PREFIX", "blobs/"),
+            endpoint_url=os.getenv("INGESTION_BLOB_S3_ENDPOINT"),
+            cache_dir=blob_dir,
+        )
+    raise BlobStoreError(
+        f"Unsupported blob backend '{backend}', expected filesystem or s3"
+    )
@@ -24,6 +24,7 @@ try:
         HybridSearchEngine,
         SearchResult,
         SearchMetrics,
+        CandidateBatch,
         ScoreNormalizer,
         HybridScoreFusion,
         HybridScoreReranker,
@@ -34,6 +35,8 @@ try:
         get_search_engine_config,
         update_search_engine_config,
         clear_search_cache,
+        bump_cache_generation,
+        publish_cache_invalidation,
         get_search_statistics,
     )
 
@@ -41,6 +44,7 @@ try:
         "HybridSearchEngine",
         "SearchResult",
         "SearchMetrics",
+        "CandidateBatch",
         "ScoreNormalizer",
         "HybridScoreFusion",
         "HybridScoreReranker",
@@ -51,6 +55,8 @@ try:
         "get_search_engine_config",
         "update_search_engine_config",
         "clear_search_cache",
+        "bump_cache_generation",
+        "publish_cache_invalidation",
         "get_search_statistics",
     ]
 
@@ -3,7 +3,8 @@ Hybrid Search Engine Implementation for DT-RAG v1.8.1
 
 Combines BM25 keyword search with vector similarity search using:
 - PostgreSQL Full-text Search for BM25
-- pgvector for efficient vector similarity computation
+- pgvector for efficient vector similarity computation (an in-process
+  memory-mapped index where pgvector is unavailable)
 - Cross-encoder reranking for result quality improvement
 - Advanced score normalization and fusion algorithms
 
@@ -19,15 +20,18 @@ import time
 import logging
 import asyncio
 # @CODE:MYPY-CONSOLIDATION-002 | Phase 14d: assignment (Fix 51-52 - add cast import)
-from typing import List, Dict, Any, Optional, Tuple, Union, cast
+from typing import List, Dict, Any, Optional, Tuple, Union, Callable, Awaitable, cast
 from datetime import datetime
 import numpy as np
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
+from collections import OrderedDict
 import json
 import hashlib
+import os
+import pickle
 
 # PostgreSQL and pgvector imports
-from sqlalchemy import text
+from sqlalchemy import bindparam, text
 
 # Direct imports (순환 참조 해결: core.db_session 분리)
 from ..api.embedding_service import embedding_service
@@ -48,6 +52,40 @@ def _get_search_metrics() -> Any:
     return search_metrics
 
 
+def _get_vector_index() -> Any:
+    from ..api.database.utils import vector_index
+
+    return vector_index
+
+
+def _get_taxonomy_filter() -> Any:
+    from ..api.database.utils import taxonomy_filter
+
+    return taxonomy_filter
+
+
+def _get_filtered_ann() -> Any:
+    from ..api.database.utils import filtered_ann
+
+    return filtered_ann
+
+
+def _get_local_vector_index() -> Any:
+    from ..api.database.utils import local_vector_index
+
+    return local_vector_index
+
+
+def _get_cross_encoder_module() -> Any:
+    from ..api.database.utils import cross_encoder
+
+    return cross_encoder
+
+
+def _get_cross_encoder_stage() -> Any:
+    return _get_cross_encoder_module().get_cross_encoder_stage()
+
+
 # @CODE:MYPY-CONSOLIDATION-002 | Phase 3: no-untyped-def resolution
 def _get_search_dao() -> Any:
     from ..api.database import SearchDAO
@@ -100,83 +138,164 @@ class SearchMetrics:
     vector_candidates: int = 0
     final_results: int = 0
     cache_hit: bool = False
+    # Filtered ANN plan of the vector query (see utils/filtered_ann.py):
+    # strategy, estimated filter selectivity, query rounds and recall@k
+    # (1.0 for exact scans, measured for sampled ANN searches, else None)
+    vector_strategy: Optional[str] = None
+    vector_selectivity: Optional[float] = None
+    vector_rounds: int = 0
+    vector_recall: Optional[float] = None
 
 
-class ScoreNormalizer:
+@dataclass
+class CandidateBatch:
+    """Struct-of-arrays view of one query's fused candidates.
+
+    Scores live in contiguous float64 arrays so normalization, fusion and
+    reranking are vectorized; ``results`` is only the row store for text and
+    metadata. Scores are written back onto the SearchResult objects that
+    survive top-k selection (``materialize``), not onto every candidate.
+    """
+
+    results: List[SearchResult]
+    bm25_scores: np.ndarray
+    vector_scores: np.ndarray
+    hybrid_scores: np.ndarray
+    rerank_scores: Optional[np.ndarray] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_results(cls, results: List[SearchResult]) -> "CandidateBatch":
+        n = len(results)
+        return cls(
+            results=results,
+            bm25_scores=np.fromiter((r.bm25_score for r in results), np.float64, n),
+            vector_scores=np.fromiter((r.vector_score for r in results), np.float64, n),
+            hybrid_scores=np.fromiter((r.hybrid_score for r in results), np.float64, n),
+        )
+
+    def __len__(self) -> int:
+        return len(self.results)
 
     @staticmethod
-    def min_max_normalize(scores: List[float]) -> List[float]:
-        try:
-            if not scores or len(scores) == 1:
-                return scores
+    def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+        """Indices of the k highest scores, descending, ties in input order."""
+        n = len(scores)
+        if k <= 0 or n == 0:
+            return np.empty(0, dtype=np.intp)
+        if k < n:
+            candidates = np.argpartition(-scores, k - 1)[:k]
+        else:
+            candidates = np.arange(n)
+        # lexsort: last key is primary (score desc), then original position
+        order = np.lexsort((candidates, -scores[candidates]))
+        return candidates[order]
+
+    def materialize(self, indices: np.ndarray) -> List[SearchResult]:
+        """Write scores back onto the selected results and return them."""
+        selected = []
+        for i in indices.tolist():
+            result = self.results[i]
+            result.bm25_score = float(self.bm25_scores[i])
+            result.vector_score = float(self.vector_scores[i])
+            result.hybrid_score = float(self.hybrid_scores[i])
+            if self.rerank_scores is not None:
+                result.rerank_score = float(self.rerank_scores[i])
+            if self.metadata:
+                result.metadata.update(self.metadata)
+            selected.append(result)
+        return selected
+
+    def take(self, indices: np.ndarray) -> "CandidateBatch":
+        """Sub-batch of the given rows (scores are copied, results shared)."""
+        return CandidateBatch(
+            results=[self.results[i] for i in indices.tolist()],
+            bm25_scores=self.bm25_scores[indices],
+            vector_scores=self.vector_scores[indices],
+            hybrid_scores=self.hybrid_scores[indices],
+            rerank_scores=(
+                self.rerank_scores[indices] if self.rerank_scores is not None else None
+            ),
+            metadata=dict(self.metadata),
+        )
 
-            min_score = min(scores)
-            max_score = max(scores)
+    def top_k(self, k: int) -> List[SearchResult]:
+        """Top-k by rerank score when reranked, otherwise by hybrid score."""
+        scores = self.rerank_scores if self.rerank_scores is not None else self.hybrid_scores
+        return self.materialize(self.top_k_indices(scores, k))
 
-            if max_score == min_score:
-                return [1.0] * len(scores)
 
-            return [(score - min_score) / (max_score - min_score) for score in scores]
-        except Exception as e:
-            logger.error(f"Min-max normalization failed: {e}")
-            if SENTRY_AVAILABLE:
-                report_score_normalization_error(
-                    error=e,
-                    scores=scores,
-                    normalization_method="min_max",
-                    context={"operation": "min_max_normalize"},
-                )
-            return scores  # Fallback: return original scores
+class ScoreNormalizer:
+    """Score normalization over NumPy arrays.
+
+    The ``*_array`` methods are the vectorized kernels used by the fusion
+    pipeline; the list methods wrap them for callers passing plain lists.
+    """
 
     @staticmethod
-    def z_score_normalize(scores: List[float]) -> List[float]:
-        try:
-            if not scores or len(scores) == 1:
-                return scores
+    def min_max_array(scores: np.ndarray) -> np.ndarray:
+        if scores.size <= 1:
+            return scores.astype(np.float64, copy=True)
+        min_score = scores.min()
+        score_range = scores.max() - min_score
+        if score_range == 0:
+            return np.ones_like(scores, dtype=np.float64)
+        return (scores - min_score) / score_range
 
-            mean_score = np.mean(scores)
-            std_score = np.std(scores)
+    @staticmethod
+    def z_score_array(scores: np.ndarray) -> np.ndarray:
+        if scores.size <= 1:
+            return scores.astype(np.float64, copy=True)
+        std_score = scores.std()
+        if std_score == 0:
+            return np.zeros_like(scores, dtype=np.float64)
+        return (scores - scores.mean()) / std_score
 
-            if std_score == 0:
-                return [0.0] * len(scores)
+    @staticmethod
+    def reciprocal_rank_array(scores: np.ndarray, k: int = 60) -> np.ndarray:
+        """Reciprocal rank fusion normalization (RRF constant k=60)"""
+        order = np.argsort(-scores, kind="stable")
+        ranks = np.empty(scores.size, dtype=np.float64)
+        ranks[order] = np.arange(scores.size, dtype=np.float64)
+        return 1.0 / (ranks + k)
 
-            return [float((score - mean_score) / std_score) for score in scores]
+    @staticmethod
+    def _normalize_list(
+        scores: List[float], kernel: Any, normalization_method: str
+    ) -> List[float]:
+        try:
+            if not scores:
+                return scores
+            return cast(List[float], kernel(np.asarray(scores, dtype=np.float64)).tolist())
         except Exception as e:
-            logger.error(f"Z-score normalization failed: {e}")
+            logger.error(f"{normalization_method} normalization failed: {e}")
             if SENTRY_AVAILABLE:
                 report_score_normalization_error(
                     error=e,
                     scores=scores,
-                    normalization_method="z_score",
-                    context={"operation": "z_score_normalize"},
+                    normalization_method=normalization_method,
+                    context={"operation": f"{normalization_method}_normalize"},
                 )
             return scores  # Fallback: return original scores
 
     @staticmethod
-    def reciprocal_rank_normalize(scores: List[float]) -> List[float]:
-        """Reciprocal rank fusion normalization"""
-        try:
-            # Sort indices by scores (descending)
-            sorted_indices = sorted(
-                range(len(scores)), key=lambda i: scores[i], reverse=True
-            )
+    def min_max_normalize(scores: List[float]) -> List[float]:
+        return ScoreNormalizer._normalize_list(
+            scores, ScoreNormalizer.min_max_array, "min_max"
+        )
 
-            # Calculate reciprocal ranks
-            normalized = [0.0] * len(scores)
-            for rank, idx in enumerate(sorted_indices):
-                normalized[idx] = 1.0 / (rank + 60)  # RRF constant k=60
+    @staticmethod
+    def z_score_normalize(scores: List[float]) -> List[float]:
+        return ScoreNormalizer._normalize_list(
+            scores, ScoreNormalizer.z_score_array, "z_score"
+        )
 
-            return normalized
-        except Exception as e:
-            logger.error(f"RRF normalization failed: {e}")
-            if SENTRY_AVAILABLE:
-                report_score_normalization_error(
-                    error=e,
-                    scores=scores,
-                    normalization_method="reciprocal_rank",
-                    context={"operation": "reciprocal_rank_normalize"},
-                )
-            return scores  # Fallback: return original scores
+    @staticmethod
+    def reciprocal_rank_normalize(scores: List[float]) -> List[float]:
+        """Reciprocal rank fusion normalization"""
+        return ScoreNormalizer._normalize_list(
+            scores, ScoreNormalizer.reciprocal_rank_array, "reciprocal_rank"
+        )
 
 
 class HybridScoreFusion:
@@ -198,6 +317,24 @@ class HybridScoreFusion:
             self.bm25_weight = bm25_weight / total_weight
             self.vector_weight = vector_weight / total_weight
 
+    def _normalize(self, scores: np.ndarray) -> np.ndarray:
+        if self.normalization == "min_max":
+            return ScoreNormalizer.min_max_array(scores)
+        if self.normalization == "z_score":
+            return ScoreNormalizer.z_score_array(scores)
+        if self.normalization == "rrf":
+            return ScoreNormalizer.reciprocal_rank_array(scores)
+        return scores
+
+    def fuse_arrays(self, bm25_scores: np.ndarray, vector_scores: np.ndarray) -> np.ndarray:
+        """Fuse BM25 and vector score arrays with the configured normalization"""
+        if bm25_scores.shape != vector_scores.shape:
+            raise ValueError("Score lists must have equal length")
+
+        return self.bm25_weight * self._normalize(
+            bm25_scores
+        ) + self.vector_weight * self._normalize(vector_scores)
+
     def fuse_scores(
         self, bm25_scores: List[float], vector_scores: List[float]
     ) -> List[float]:
@@ -205,64 +342,60 @@ class HybridScoreFusion:
         if len(bm25_scores) != len(vector_scores):
             raise ValueError("Score lists must have equal length")
 
-        # Apply normalization
-        if self.normalization == "min_max":
-            norm_bm25 = ScoreNormalizer.min_max_normalize(bm25_scores)
-            norm_vector = ScoreNormalizer.min_max_normalize(vector_scores)
-        elif self.normalization == "z_score":
-            norm_bm25 = ScoreNormalizer.z_score_normalize(bm25_scores)
-            norm_vector = ScoreNormalizer.z_score_normalize(vector_scores)
-        elif self.normalization == "rrf":
-            norm_bm25 = ScoreNormalizer.reciprocal_rank_normalize(bm25_scores)
-            norm_vector = ScoreNormalizer.reciprocal_rank_normalize(vector_scores)
-        else:
-            norm_bm25 = bm25_scores
-            norm_vector = vector_scores
-
-        # Weighted combination
-        hybrid_scores = [
-            self.bm25_weight * bm25 + self.vector_weight * vector
-            for bm25, vector in zip(norm_bm25, norm_vector)
-        ]
-
-        return hybrid_scores
+        return cast(
+            List[float],
+            self.fuse_arrays(
+                np.asarray(bm25_scores, dtype=np.float64),
+                np.asarray(vector_scores, dtype=np.float64),
+            ).tolist(),
+        )
 
-    def adaptive_fusion(
-        self,
-        bm25_scores: List[float],
-        vector_scores: List[float],
-        query_characteristics: Dict[str, float],
-    ) -> List[float]:
-        """Adaptive fusion based on query characteristics"""
-        # Analyze query characteristics
+    def adaptive_weights(
+        self, query_characteristics: Dict[str, float]
+    ) -> Tuple[float, float]:
+        """BM25/vector weights adjusted for query characteristics"""
         query_length = query_characteristics.get("length", 1.0)
         has_exact_terms = query_characteristics.get("exact_terms", False)
         semantic_complexity = query_characteristics.get("semantic_complexity", 0.5)
 
-        # Adjust weights based on query characteristics
         if query_length <= 3 and has_exact_terms:
             # Short, specific queries favor BM25
             adaptive_bm25_weight = min(0.8, self.bm25_weight + 0.2)
-            adaptive_vector_weight = 1.0 - adaptive_bm25_weight
-        elif semantic_complexity > 0.7:
+            return adaptive_bm25_weight, 1.0 - adaptive_bm25_weight
+        if semantic_complexity > 0.7:
             # Complex semantic queries favor vector search
             adaptive_vector_weight = min(0.8, self.vector_weight + 0.2)
-            adaptive_bm25_weight = 1.0 - adaptive_vector_weight
-        else:
-            # Balanced approach
-            adaptive_bm25_weight = self.bm25_weight
-            adaptive_vector_weight = self.vector_weight
-
-        # Apply adaptive weights
-        norm_bm25 = ScoreNormalizer.min_max_normalize(bm25_scores)
-        norm_vector = ScoreNormalizer.min_max_normalize(vector_scores)
+            return 1.0 - adaptive_vector_weight, adaptive_vector_weight
+        # Balanced approach
+        return self.bm25_weight, self.vector_weight
 
-        hybrid_scores = [
-            adaptive_bm25_weight * bm25 + adaptive_vector_weight * vector
-            for bm25, vector in zip(norm_bm25, norm_vector)
-        ]
+    def adaptive_fusion_arrays(
+        self,
+        bm25_scores: np.ndarray,
+        vector_scores: np.ndarray,
+        query_characteristics: Dict[str, float],
+    ) -> np.ndarray:
+        """Vectorized adaptive fusion over score arrays"""
+        bm25_weight, vector_weight = self.adaptive_weights(query_characteristics)
+        return bm25_weight * ScoreNormalizer.min_max_array(
+            bm25_scores
+        ) + vector_weight * ScoreNormalizer.min_max_array(vector_scores)
 
-        return hybrid_scores
+    def adaptive_fusion(
+        self,
+        bm25_scores: List[float],
+        vector_scores: List[float],
+        query_characteristics: Dict[str, float],
+    ) -> List[float]:
+        """Adaptive fusion based on query characteristics"""
+        return cast(
+            List[float],
+            self.adaptive_fusion_arrays(
+                np.asarray(bm25_scores, dtype=np.float64),
+                np.asarray(vector_scores, dtype=np.float64),
+                query_characteristics,
+            ).tolist(),
+        )
 
 
 class HybridScoreReranker:
@@ -272,8 +405,14 @@ class HybridScoreReranker:
     - E-REQ-009: Fallback to heuristic reranking when cross-encoder unavailable
     - E-REQ-010: Calculate term overlap, length penalty, and diversity bonus
 
-    Cross-Encoder support (U-REQ-005) is planned for v2.0.
-    Current heuristic approach provides good quality with low latency.
+    Cross-Encoder support (U-REQ-005) is opt-in via SEARCH_RERANKER_BACKEND
+    (see apps.api.database.utils.cross_encoder); ``rerank_batch_async`` uses
+    it when configured and falls back to the heuristic when the model is
+    unavailable or misses its latency budget.
+
+    Signals are computed as arrays over a CandidateBatch; the diversity
+    bonus depends only on the candidate set, so it is computed once per
+    query.
     """
 
     def __init__(self) -> None:
@@ -286,24 +425,42 @@ class HybridScoreReranker:
         """Rerank search results using enhanced heuristics"""
         if not search_results:
             return []
+        return self.rerank_batch(query, CandidateBatch.from_results(search_results), top_k)
+
+    async def rerank_batch_async(
+        self, query: str, batch: CandidateBatch, top_k: int = 5
+    ) -> List[SearchResult]:
+        """Rerank with the cross-encoder stage if configured, else heuristically"""
+        stage = _get_cross_encoder_stage()
+        if stage is None or not len(batch):
+            return self.rerank_batch(query, batch, top_k)
+
+        # Only the best candidates by hybrid score go through the model
+        pool = batch.take(batch.top_k_indices(batch.hybrid_scores, stage.max_batch))
+        scores = await stage.score(
+            query, [(str(r.chunk_id), r.text) for r in pool.results]
+        )
+        if scores is None:
+            return self.rerank_batch(query, batch, top_k)
+
+        pool.rerank_scores = _get_cross_encoder_module().relevance_from_logits(scores)
+        pool.metadata["reranker"] = stage.model_name
+        return pool.top_k(top_k)
+
+    def rerank_batch(
+        self, query: str, batch: CandidateBatch, top_k: int = 5
+    ) -> List[SearchResult]:
+        """Rerank a candidate batch and return the top-k results"""
+        if not len(batch):
+            return []
 
         start_time = time.time()
 
         try:
-            # Apply heuristic reranking
-            reranked_results = self._heuristic_rerank(query, search_results)
-
-            # Apply rerank scores
-            for result in reranked_results:
-                result.rerank_score = (
-                    result.hybrid_score
-                    * self._calculate_quality_boost(query, result.text)
-                )
-
-            # Sort by rerank score and return top-k
-            final_results = sorted(
-                reranked_results, key=lambda x: x.rerank_score, reverse=True
-            )[:top_k]
+            batch.rerank_scores = batch.hybrid_scores * self._heuristic_multipliers(
+                query, batch.results
+            )
+            final_results = batch.top_k(top_k)
 
             rerank_time = time.time() - start_time
             logger.info(f"Heuristic reranking completed in {rerank_time:.3f}s")
@@ -318,116 +475,278 @@ class HybridScoreReranker:
                 report_reranker_error(
                     error=e,
                     query=query,
-                    results_count=len(search_results),
+                    results_count=len(batch),
                     rerank_config={"reranker_type": "heuristic", "top_k": top_k},
                 )
 
             # Fallback: return top results by hybrid score
-            return sorted(search_results, key=lambda x: x.hybrid_score, reverse=True)[
-                :top_k
-            ]
+            batch.rerank_scores = None
+            return batch.top_k(top_k)
 
-    def _heuristic_rerank(
+    def _heuristic_multipliers(
         self, query: str, results: List[SearchResult]
-    ) -> List[SearchResult]:
-        """Enhanced heuristic reranking"""
-        query_terms = set(query.lower().split())
-
-        for result in results:
-            text_terms = set(result.text.lower().split())
-
-            # Calculate additional quality signals
-            term_overlap = len(query_terms.intersection(text_terms)) / len(query_terms)
-            text_length_penalty = self._calculate_length_penalty(len(result.text))
-            diversity_bonus = self._calculate_diversity_bonus(result, results)
-
-            # Combine signals
-            quality_multiplier = (
-                1.0
-                + 0.2 * term_overlap
-                + 0.1 * text_length_penalty
-                + 0.1 * diversity_bonus
-            )
-
-            result.rerank_score = result.hybrid_score * quality_multiplier
+    ) -> np.ndarray:
+        """Per-candidate quality multipliers (E-REQ-010 signals x match boost)"""
+        query_lower = query.lower()
+        query_terms = set(query_lower.split())
+        texts_lower = [result.text.lower() for result in results]
+
+        text_lengths = np.fromiter((len(t) for t in texts_lower), np.float64, len(results))
+        length_scores = self._length_scores(text_lengths)
+
+        if query_terms:
+            term_overlap = np.fromiter(
+                (len(query_terms.intersection(t.split())) for t in texts_lower),
+                np.float64,
+                len(results),
+            ) / len(query_terms)
+        else:
+            term_overlap = np.zeros(len(results))
 
-        return results
+        diversity_bonus = self._diversity_bonus(results)
 
-    def _calculate_quality_boost(self, query: str, text: str) -> float:
-        """Calculate quality boost based on query-text match"""
-        # Position bonus for early matches
-        query_lower = query.lower()
-        text_lower = text.lower()
+        quality_multiplier = (
+            1.0 + 0.2 * term_overlap + 0.1 * length_scores + 0.1 * diversity_bonus
+        )
 
-        position_bonus = 1.0
-        if query_lower in text_lower:
-            position = text_lower.find(query_lower)
-            position_bonus = 1.2 - (position / len(text_lower)) * 0.2
+        # Position bonus for early exact-phrase matches
+        positions = np.fromiter(
+            (t.find(query_lower) for t in texts_lower), np.float64, len(results)
+        )
+        position_bonus = np.where(
+            positions >= 0,
+            1.2 - (positions / np.maximum(text_lengths, 1.0)) * 0.2,
+            1.0,
+        )
+        quality_boost = position_bonus * (1.0 + length_scores * 0.1)
 
-        # Length appropriateness
-        length_score = self._calculate_length_penalty(len(text))
+        return quality_multiplier * quality_boost
 
-        return position_bonus * (1.0 + length_score * 0.1)
+    @staticmethod
+    def _length_scores(text_lengths: np.ndarray) -> np.ndarray:
+        """Penalty/bonus based on text length"""
+        return np.select(
+            [
+                text_lengths < 50,  # Too short
+                text_lengths > 1000,  # Too long
+                (text_lengths >= 100) & (text_lengths <= 500),  # Optimal length
+            ],
+            [0.7, 0.8, 1.0],
+            default=0.9,  # Acceptable length
+        )
 
     def _calculate_length_penalty(self, text_length: int) -> float:
         """Calculate penalty/bonus based on text length"""
-        if text_length < 50:
-            return 0.7  # Too short
-        elif text_length > 1000:
-            return 0.8  # Too long
-        elif 100 <= text_length <= 500:
-            return 1.0  # Optimal length
-        else:
-            return 0.9  # Acceptable length
+        return float(self._length_scores(np.array([text_length], dtype=np.float64))[0])
 
-    def _calculate_diversity_bonus(
-        self, result: SearchResult, all_results: List[SearchResult]
-    ) -> float:
-        """Calculate diversity bonus to avoid redundant results"""
-        # Simple diversity based on source and taxonomy
-        unique_sources = len(set(r.source_url for r in all_results if r.source_url))
-        unique_taxonomies = len(set(str(r.taxonomy_path) for r in all_results))
+    @staticmethod
+    def _diversity_bonus(results: List[SearchResult]) -> float:
+        """Diversity bonus for the candidate set (same for every candidate)"""
+        unique_sources = len({r.source_url for r in results if r.source_url})
+        unique_taxonomies = len({tuple(r.taxonomy_path) for r in results})
 
         # Bonus for results from diverse sources
-        diversity_score = min(1.0, (unique_sources + unique_taxonomies) / 10.0)
-        return diversity_score
+        return min(1.0, (unique_sources + unique_taxonomies) / 10.0)
+
+
+# Bumped whenever the indexed corpus changes (see bump_cache_generation);
+# cached results from an older generation are never served.
+_cache_generation = 0
+
+# Ingestion INCRs the shared generation and publishes it; every API process
+# listening on the channel bumps its own. Without Redis, other processes
+# serve results from before an ingest until the cache TTL expires.
+CACHE_GENERATION_KEY = "search:cache_generation"
+CACHE_INVALIDATION_CHANNEL = "search:cache_invalidate"
+
+
+def get_cache_generation() -> int:
+    """Current search cache generation"""
+    return _cache_generation
+
+
+def bump_cache_generation() -> int:
+    """Invalidate this process's cached search results"""
+    global _cache_generation
+    _cache_generation += 1
+    return _cache_generation
+
+
+async def _get_redis_client() -> Optional[Any]:
+    from ..api.cache.redis_manager import get_redis_client
+
+    return await get_redis_client()
+
+
+class _CacheInvalidationListener:
+    """Applies cache generations published by other processes"""
+
+    def __init__(self) -> None:
+        # Highest shared generation applied here; older messages are ignored
+        self.shared_generation = 0
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    def apply(self, shared_generation: int) -> None:
+        if shared_generation > self.shared_generation:
+            self.shared_generation = shared_generation
+            bump_cache_generation()
+
+    def start(self) -> None:
+        """Subscribe to invalidations from other processes (idempotent)"""
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._task = loop.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _listen(self) -> None:
+        while True:
+            client = await _get_redis_client()
+            if client is None:
+                await asyncio.sleep(30)
+                continue
+            pubsub = client.pubsub()
+            try:
+                await pubsub.subscribe(CACHE_INVALIDATION_CHANNEL)
+                # Results cached while unsubscribed may predate an ingest
+                self.shared_generation = int(await client.get(CACHE_GENERATION_KEY) or 0)
+                bump_cache_generation()
+                while True:
+                    # Short polls stay under the client's socket timeout
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True, timeout=1.0
+                    )
+                    if message is not None:
+                        self.apply(int(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Search cache invalidation listener disconnected: {e}")
+                await asyncio.sleep(5)
+            finally:
+                try:
+                    await pubsub.reset()
+                except Exception:
+                    pass
+
+
+_invalidation_listener = _CacheInvalidationListener()
+
+
+async def publish_cache_invalidation() -> int:
+    """Invalidate cached search results here and in every other API process"""
+    generation = bump_cache_generation()
+    client = await _get_redis_client()
+    if client is None:
+        logger.warning("Redis unavailable - other processes keep cached search results until TTL")
+        return generation
+    try:
+        shared_generation = int(await client.incr(CACHE_GENERATION_KEY))
+        # Our own message must not bump this process a second time
+        _invalidation_listener.shared_generation = max(
+            _invalidation_listener.shared_generation, shared_generation
+        )
+        await client.publish(CACHE_INVALIDATION_CHANNEL, shared_generation)
+    except Exception as e:
+        logger.warning(f"Failed to publish search cache invalidation: {e}")
+    return generation
+
+
+def start_cache_invalidation_listener() -> None:
+    """Start applying invalidations published by other processes"""
+    _invalidation_listener.start()
+
+
+async def stop_cache_invalidation_listener() -> None:
+    await _invalidation_listener.stop()
+
+
+@dataclass(frozen=True)
+class _CacheEntry:
+    payload: bytes
+    stored_at: float
+    generation: int
 
 
 class ResultCache:
-    """In-memory cache for search results"""
+    """In-memory LRU + TTL cache for search results.
+
+    Entries are kept in an OrderedDict in recency order, so lookups,
+    inserts and evictions are O(1). Results are stored as pickled bytes:
+    the payload is immutable (later reranks or callers mutating returned
+    SearchResult objects cannot corrupt the cache) and its size is known
+    exactly, so the cache is bounded by both entry count and bytes.
+    """
 
-    def __init__(self, max_size: int = 1000, ttl_seconds: int = 3600) -> None:
-        self.cache: Dict[str, List[SearchResult]] = {}
-        self.access_times: Dict[str, float] = {}
+    def __init__(
+        self,
+        max_size: int = 1000,
+        ttl_seconds: int = 3600,
+        max_bytes: Optional[int] = None,
+    ) -> None:
+        self.cache: "OrderedDict[str, _CacheEntry]" = OrderedDict()
         self.max_size = max_size
         self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes or int(
+            os.getenv("SEARCH_CACHE_MAX_BYTES", str(64 * 1024 * 1024))
+        )
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
 
     def _generate_cache_key(
-        self, query: str, filters: Dict[str, Any], top_k: int
+        self,
+        query: str,
+        filters: Dict[str, Any],
+        top_k: int,
+        options: Optional[Dict[str, Any]] = None,
     ) -> str:
-        """Generate cache key for query"""
-        key_data = {"query": query, "filters": filters, "top_k": top_k}
+        """Generate cache key for query.
+
+        ``options`` holds every other argument that shapes the results
+        (candidate counts, ANN parameters).
+        """
+        key_data = {
+            "query": query,
+            "filters": filters,
+            "top_k": top_k,
+            "options": options or {},
+        }
         key_str = json.dumps(key_data, sort_keys=True)
         return hashlib.md5(key_str.encode()).hexdigest()
 
     def get(
-        self, query: str, filters: Dict[str, Any], top_k: int
+        self,
+        query: str,
+        filters: Dict[str, Any],
+        top_k: int,
+        options: Optional[Dict[str, Any]] = None,
     ) -> Optional[List[SearchResult]]:
-        """Get cached results"""
-        cache_key = self._generate_cache_key(query, filters, top_k)
-
-        if cache_key in self.cache:
-            cached_time = self.access_times[cache_key]
-            if time.time() - cached_time < self.ttl_seconds:
-                # Update access time
-                self.access_times[cache_key] = time.time()
-                logger.debug(f"Cache hit for query: {query[:50]}...")
-                return self.cache[cache_key]
+        """Get cached results (fresh copies the caller may mutate)"""
+        cache_key = self._generate_cache_key(query, filters, top_k, options)
+        entry = self.cache.get(cache_key)
+
+        if entry is not None:
+            if entry.generation != _cache_generation:
+                self._remove(cache_key)
+                self.invalidations += 1
+            elif time.time() - entry.stored_at >= self.ttl_seconds:
+                self._remove(cache_key)
+                self.expirations += 1
             else:
-                # Expired
-                del self.cache[cache_key]
-                del self.access_times[cache_key]
+                self.cache.move_to_end(cache_key)
+                self.hits += 1
+                logger.debug(f"Cache hit for query: {query[:50]}...")
+                return cast(List[SearchResult], pickle.loads(entry.payload))
 
+        self.misses += 1
         return None
 
     # @CODE:MYPY-CONSOLIDATION-002 | Phase 3: no-untyped-def resolution
@@ -437,44 +756,80 @@ class ResultCache:
         filters: Dict[str, Any],
         top_k: int,
         results: List[SearchResult],
+        options: Optional[Dict[str, Any]] = None,
     ) -> None:
         """Cache search results"""
-        cache_key = self._generate_cache_key(query, filters, top_k)
+        cache_key = self._generate_cache_key(query, filters, top_k, options)
+        payload = pickle.dumps(list(results), protocol=pickle.HIGHEST_PROTOCOL)
+        if len(payload) > self.max_bytes:
+            return
 
-        # Evict old entries if cache is full
-        if len(self.cache) >= self.max_size:
+        if cache_key in self.cache:
+            self._remove(cache_key)
+        self.cache[cache_key] = _CacheEntry(payload, time.time(), _cache_generation)
+        self.size_bytes += len(payload)
+
+        # Evict least recently used entries until both limits hold
+        while len(self.cache) > self.max_size or self.size_bytes > self.max_bytes:
             self._evict_oldest()
 
-        self.cache[cache_key] = results
-        self.access_times[cache_key] = time.time()
         logger.debug(f"Cached results for query: {query[:50]}...")
 
+    def _remove(self, cache_key: str) -> None:
+        entry = self.cache.pop(cache_key)
+        self.size_bytes -= len(entry.payload)
+
     # @CODE:MYPY-CONSOLIDATION-002 | Phase 3: no-untyped-def resolution
     def _evict_oldest(self) -> None:
-        """Evict oldest cache entry"""
-        if not self.access_times:
+        """Evict least recently used cache entry"""
+        if not self.cache:
             return
 
-        oldest_key = min(self.access_times.keys(), key=lambda k: self.access_times[k])
-        del self.cache[oldest_key]
-        del self.access_times[oldest_key]
+        _, entry = self.cache.popitem(last=False)
+        self.size_bytes -= len(entry.payload)
+        self.evictions += 1
 
     # @CODE:MYPY-CONSOLIDATION-002 | Phase 3: no-untyped-def resolution
     def clear(self) -> None:
         """Clear all cache entries"""
         self.cache.clear()
-        self.access_times.clear()
+        self.size_bytes = 0
 
     def get_stats(self) -> Dict[str, Union[int, float]]:
         """Get cache statistics"""
+        total_requests = self.hits + self.misses
         return {
             "size": len(self.cache),
             "max_size": self.max_size,
-            "hit_rate": getattr(self, "_hit_count", 0)
-            / max(1, getattr(self, "_total_requests", 1)),
+            "size_bytes": self.size_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / max(1, total_requests),
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "generation": _cache_generation,
         }
 
 
+# Fusion modes: "client" runs two queries and fuses in Python,
+# "server" runs one CTE statement that fuses in PostgreSQL
+FUSION_MODES = ("client", "server")
+SERVER_FUSION_METHODS = ("rrf", "min_max")
+
+# Settings update_config can change that decide how results are ranked;
+# they are part of every result cache key
+RANKING_CONFIG_KEYS = (
+    "bm25_weight",
+    "vector_weight",
+    "normalization",
+    "fusion_mode",
+    "server_fusion_method",
+    "rrf_k",
+)
+
+
 class HybridSearchEngine:
     """Main hybrid search engine combining BM25 and vector search"""
 
@@ -485,7 +840,16 @@ class HybridSearchEngine:
         enable_caching: bool = True,
         enable_reranking: bool = True,
         normalization: str = "min_max",
+        fusion_mode: str = "client",
+        server_fusion_method: str = "rrf",
+        rrf_k: int = 60,
     ):
+        if fusion_mode not in FUSION_MODES:
+            raise ValueError(f"fusion_mode must be one of {FUSION_MODES}")
+        if server_fusion_method not in SERVER_FUSION_METHODS:
+            raise ValueError(
+                f"server_fusion_method must be one of {SERVER_FUSION_METHODS}"
+            )
 
         self.score_fusion = HybridScoreFusion(
             bm25_weight=bm25_weight,
@@ -502,6 +866,9 @@ class HybridSearchEngine:
             "enable_caching": enable_caching,
             "enable_reranking": enable_reranking,
             "normalization": normalization,
+            "fusion_mode": fusion_mode,
+            "server_fusion_method": server_fusion_method,
+            "rrf_k": rrf_k,
         }
 
         logger.info(f"Hybrid search engine initialized: {self.config}")
@@ -514,8 +881,13 @@ class HybridSearchEngine:
         bm25_candidates: int = 50,
         vector_candidates: int = 50,
         correlation_id: Optional[str] = None,
+        ann_params: Optional[Any] = None,
     ) -> Tuple[List[SearchResult], SearchMetrics]:
-        """Perform hybrid search combining BM25 and vector similarity"""
+        """Perform hybrid search combining BM25 and vector similarity
+
+        ``ann_params`` (an ``ANNSearchParams``) trades ANN recall for latency
+        for this request only.
+        """
 
         start_time = time.time()
         metrics = SearchMetrics()
@@ -539,8 +911,12 @@ class HybridSearchEngine:
                 )
 
             # Check cache first
+            cache_options = self._cache_options(
+                bm25_candidates, vector_candidates, ann_params
+            )
             if self.cache:
-                cached_results = self.cache.get(query, filters, top_k)
+                start_cache_invalidation_listener()
+                cached_results = self.cache.get(query, filters, top_k, cache_options)
                 if cached_results:
                     metrics.total_time = time.time() - start_time
                     metrics.cache_hit = True
@@ -564,10 +940,43 @@ class HybridSearchEngine:
             query_embedding = await embedding_service.generate_embedding(query)
             metrics.embedding_time = time.time() - embedding_start
 
+            if self.config["fusion_mode"] == "server" and self._supports_server_fusion():
+                # Single round trip: candidates, metadata and fusion in one statement
+                fusion_start = time.time()
+                try:
+                    fused_results = await self._perform_server_fused_search(
+                        query,
+                        query_embedding,
+                        # Leave the reranker a candidate pool; otherwise top-k is final
+                        max(top_k, min(bm25_candidates + vector_candidates, top_k * 4))
+                        if self.reranker
+                        else top_k,
+                        bm25_candidates,
+                        vector_candidates,
+                        filters,
+                        ann_params,
+                        metrics,
+                    )
+                except Exception as e:
+                    logger.warning(
+                        f"Server-side fusion failed, falling back to client fusion: {e}"
+                    )
+                else:
+                    metrics.fusion_time = time.time() - fusion_start
+                    return await self._finalize_results(
+                        query,
+                        filters,
+                        top_k,
+                        CandidateBatch.from_results(fused_results),
+                        metrics,
+                        start_time,
+                        cache_options,
+                    )
+
             # Parallel execution of BM25 and vector search
             bm25_task = self._perform_bm25_search(query, bm25_candidates, filters)
             vector_task = self._perform_vector_search(
-                query_embedding, vector_candidates, filters
+                query_embedding, vector_candidates, filters, ann_params, metrics
             )
 
             bm25_results, vector_results = await asyncio.gather(
@@ -598,37 +1007,15 @@ class HybridSearchEngine:
 
             # Fuse results
             fusion_start = time.time()
-            fused_results = self._fuse_results(query, bm25_results_list, vector_results_list)
+            fused_batch = self._fuse_candidates(
+                query, bm25_results_list, vector_results_list
+            )
             metrics.fusion_time = time.time() - fusion_start
 
-            # Apply cross-encoder reranking
-            final_results = fused_results
-            if self.reranker and fused_results:
-                rerank_start = time.time()
-                final_results = self.reranker.rerank(query, fused_results, top_k)
-                metrics.rerank_time = time.time() - rerank_start
-            else:
-                # Simple sorting by hybrid score
-                final_results = sorted(
-                    fused_results, key=lambda x: x.hybrid_score, reverse=True
-                )[:top_k]
-
-            metrics.final_results = len(final_results)
-            metrics.total_time = time.time() - start_time
-
-            # Cache results
-            if self.cache and final_results:
-                self.cache.put(query, filters, top_k, final_results)
-
-            # Record metrics
-            _get_search_metrics().record_search("hybrid", metrics.total_time)
-
-            logger.info(
-                f"Hybrid search completed: {len(final_results)} results in {metrics.total_time:.3f}s"
+            return await self._finalize_results(
+                query, filters, top_k, fused_batch, metrics, start_time, cache_options
             )
 
-            return final_results, metrics
-
         except Exception as e:
             logger.error(f"Hybrid search failed: {e}")
             metrics.total_time = time.time() - start_time
@@ -660,6 +1047,309 @@ class HybridSearchEngine:
 
             return [], metrics
 
+    def _cache_options(
+        self, bm25_candidates: int, vector_candidates: int, ann_params: Optional[Any]
+    ) -> Dict[str, Any]:
+        """Everything besides query, filters and top_k that shapes results"""
+        options: Dict[str, Any] = {
+            name: self.config[name] for name in RANKING_CONFIG_KEYS
+        }
+        options["bm25_candidates"] = bm25_candidates
+        options["vector_candidates"] = vector_candidates
+        options["ann_params"] = asdict(ann_params) if ann_params is not None else None
+        return options
+
+    async def _finalize_results(
+        self,
+        query: str,
+        filters: Dict[str, Any],
+        top_k: int,
+        fused_batch: CandidateBatch,
+        metrics: SearchMetrics,
+        start_time: float,
+        cache_options: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[List[SearchResult], SearchMetrics]:
+        """Rerank fused results, cache them and record metrics"""
+        # Apply cross-encoder reranking
+        if self.reranker and len(fused_batch):
+            rerank_start = time.time()
+            final_results = await self.reranker.rerank_batch_async(
+                query, fused_batch, top_k
+            )
+            metrics.rerank_time = time.time() - rerank_start
+        else:
+            # Simple top-k by hybrid score
+            final_results = fused_batch.top_k(top_k)
+
+        metrics.final_results = len(final_results)
+        metrics.total_time = time.time() - start_time
+
+        # Cache results
+        if self.cache and final_results:
+            self.cache.put(query, filters, top_k, final_results, cache_options)
+
+        # Record metrics
+        _get_search_metrics().record_search("hybrid", metrics.total_time)
+
+        logger.info(
+            f"Hybrid search completed: {len(final_results)} results in {metrics.total_time:.3f}s"
+        )
+
+        return final_results, metrics
+
+    def _supports_server_fusion(self) -> bool:
+        """Server-side fusion needs PostgreSQL (search_tsv + pgvector)"""
+        database_url = str(_get_db_manager().engine.url)
+        return (
+            "postgresql" in database_url
+            and _get_local_vector_index().vector_search_backend(database_url)
+            == "pgvector"
+        )
+
+    def _build_server_fusion_query(
+        self,
+        filter_clause: str,
+        query_vector_param: Any,
+        exact_vector: bool = False,
+        ann_params: Optional[Any] = None,
+    ) -> Any:
+        """Build the single-statement hybrid query.
+
+        The BM25 and ANN candidate CTEs are each limited before fusion, so
+        both keep using their indexes (GIN on search_tsv, HNSW/IVFFlat on
+        embeddings.vec). Document and taxonomy metadata are joined once, for
+        the fused top rows only. ``exact_vector`` scores every filtered row
+        instead of using the ANN index (the filtered ANN "exact" plan). With
+        a two-stage (``ann_params.prefix_dims``) or halfvec ANN index,
+        :rescore_candidates rows are taken by prefix or halfvec distance and
+        the best :vector_candidates by exact distance kept.
+        """
+        vector_index = _get_vector_index()
+        metric = vector_index.get_vector_metric()
+        method = self.config["server_fusion_method"]
+
+        # doc_taxonomy is only needed in the candidate CTEs when filtering on it
+        taxonomy_join = (
+            "LEFT JOIN doc_taxonomy dt ON d.doc_id = dt.doc_id"
+            if "dt." in filter_clause
+            else ""
+        )
+
+        filtered_embeddings = f"""
+                FROM embeddings e
+                JOIN chunks c ON e.chunk_id = c.chunk_id
+                JOIN documents d ON c.doc_id = d.doc_id
+                {taxonomy_join}
+                WHERE e.vec IS NOT NULL
+                {filter_clause}"""
+        candidate_order = (
+            None if exact_vector else vector_index.candidate_distance_sql(metric, ann_params)
+        )
+        if candidate_order:
+            ann_candidates = f"""
+                SELECT chunk_id, {metric.distance_sql("vec")} AS distance
+                FROM (
+                    SELECT e.chunk_id, e.vec
+                    {filtered_embeddings}
+                    ORDER BY {candidate_order}
+                    LIMIT :rescore_candidates
+                ) rescored_candidates
+                ORDER BY distance
+                LIMIT :vector_candidates"""
+        else:
+            vector_order = (
+                f"{metric.distance_sql('e.vec')} + 0" if exact_vector else "distance"
+            )
+            ann_candidates = f"""
+                SELECT e.chunk_id, {metric.distance_sql("e.vec")} AS distance
+                {filtered_embeddings}
+                ORDER BY {vector_order}
+                LIMIT :vector_candidates"""
+
+        # Explicit casts: asyncpg infers parameter types from the expression
+        bm25_weight = "CAST(:bm25_weight AS double precision)"
+        vector_weight = "CAST(:vector_weight AS double precision)"
+        if method == "rrf":
+            rrf_k = "CAST(:rrf_k AS integer)"
+            fusion_expr = (
+                f"COALESCE({bm25_weight} / ({rrf_k} + b.rnk), 0.0)"
+                f" + COALESCE({vector_weight} / ({rrf_k} + a.rnk), 0.0)"
+            )
+        else:
+            fusion_expr = (
+                f"{bm25_weight} * COALESCE(b.norm, 0.0)"
+                f" + {vector_weight} * COALESCE(a.norm, 0.0)"
+            )
+
+        return text(
+            f"""
+            WITH bm25_candidates AS (
+                SELECT c.chunk_id, MAX(ts_rank_cd(c.search_tsv, q, 32 | 1)) AS score
+                FROM chunks c
+                JOIN documents d ON c.doc_id = d.doc_id
+                {taxonomy_join}
+                CROSS JOIN plainto_tsquery('english', :query) AS q
+                WHERE c.search_tsv @@ q
+                AND c.deleted_at IS NULL
+                {filter_clause}
+                GROUP BY c.chunk_id
+                ORDER BY score DESC
+                LIMIT :bm25_candidates
+            ),
+            ann_candidates AS ({ann_candidates}
+            ),
+            bm25 AS (
+                SELECT
+                    chunk_id,
+                    score,
+                    ROW_NUMBER() OVER (ORDER BY score DESC) AS rnk,
+                    COALESCE(
+                        (score - MIN(score) OVER ())
+                        / NULLIF(MAX(score) OVER () - MIN(score) OVER (), 0),
+                        1.0
+                    ) AS norm
+                FROM bm25_candidates
+            ),
+            ann AS (
+                SELECT
+                    chunk_id,
+                    1.0 - distance AS score,
+                    ROW_NUMBER() OVER (ORDER BY distance) AS rnk,
+                    COALESCE(
+                        (MAX(distance) OVER () - distance)
+                        / NULLIF(MAX(distance) OVER () - MIN(distance) OVER (), 0),
+                        1.0
+                    ) AS norm
+                FROM (
+                    SELECT DISTINCT ON (chunk_id) chunk_id, distance
+                    FROM ann_candidates
+                    ORDER BY chunk_id, distance
+                ) ann_unique
+            ),
+            fused AS (
+                SELECT
+                    COALESCE(b.chunk_id, a.chunk_id) AS chunk_id,
+                    COALESCE(b.score, 0.0) AS bm25_score,
+                    COALESCE(a.score, 0.0) AS vector_score,
+                    b.rnk AS bm25_rank,
+                    a.rnk AS vector_rank,
+                    {fusion_expr} AS hybrid_score
+                FROM bm25 b
+                FULL OUTER JOIN ann a ON a.chunk_id = b.chunk_id
+                ORDER BY hybrid_score DESC
+                LIMIT :top_k
+            )
+            SELECT
+                f.chunk_id,
+                c.text,
+                d.source_url as title,
+                d.source_url,
+                dt.path as taxonomy_path,
+                f.bm25_score,
+                f.vector_score,
+                f.hybrid_score,
+                f.bm25_rank,
+                f.vector_rank,
+                (SELECT COUNT(*) FROM bm25) AS bm25_total,
+                (SELECT COUNT(*) FROM ann) AS vector_total
+            FROM fused f
+            JOIN chunks c ON f.chunk_id = c.chunk_id
+            JOIN documents d ON c.doc_id = d.doc_id
+            LEFT JOIN LATERAL (
+                SELECT path FROM doc_taxonomy
+                WHERE doc_taxonomy.doc_id = d.doc_id
+                ORDER BY confidence DESC
+                LIMIT 1
+            ) dt ON TRUE
+            ORDER BY f.hybrid_score DESC
+        """
+        ).bindparams(query_vector_param)
+
+    async def _perform_server_fused_search(
+        self,
+        query: str,
+        query_embedding: List[float],
+        top_k: int,
+        bm25_candidates: int,
+        vector_candidates: int,
+        filters: Dict[str, Any],
+        ann_params: Optional[Any] = None,
+        metrics: Optional[SearchMetrics] = None,
+    ) -> List[SearchResult]:
+        """Hybrid search in one statement with RRF or min-max fusion in SQL"""
+        db_mgr = _get_db_manager()
+        vector_index = _get_vector_index()
+
+        filter_clause, filter_params = self._build_filter_clause(filters)
+        query_vector = vector_index.query_vector_param(len(query_embedding))
+        query_params = {
+            "query": query,
+            "query_vector": query_embedding,
+            "bm25_candidates": bm25_candidates,
+            "vector_candidates": vector_candidates,
+            "top_k": top_k,
+            "bm25_weight": self.score_fusion.bm25_weight,
+            "vector_weight": self.score_fusion.vector_weight,
+            **filter_params,
+        }
+        if self.config["server_fusion_method"] == "rrf":
+            query_params["rrf_k"] = self.config["rrf_k"]
+
+        async with db_mgr.async_session() as session:
+
+            async def run(plan: Any) -> Tuple[List[Any], int]:
+                fused_query = self._build_server_fusion_query(
+                    filter_clause, query_vector, plan.exact, plan.ann_params
+                )
+                if not plan.exact:
+                    await vector_index.apply_ann_params(
+                        session, self._candidate_ann_params(plan, vector_candidates)
+                    )
+                query_params["rescore_candidates"] = self._rescore_candidates(
+                    plan, vector_candidates
+                )
+                result = await session.execute(fused_query, query_params)
+                fused_rows = result.fetchall()
+                return fused_rows, int(fused_rows[0][11]) if fused_rows else 0
+
+            rows = await self._filtered_ann_search(
+                session,
+                vector_candidates,
+                filter_clause,
+                filter_params,
+                ann_params,
+                run,
+                metrics,
+            )
+
+        fusion_method = f"server_{self.config['server_fusion_method']}"
+        search_results = []
+        for row in rows:
+            search_results.append(
+                SearchResult(
+                    chunk_id=str(row[0]),
+                    text=row[1],
+                    title=row[2],
+                    source_url=row[3],
+                    taxonomy_path=row[4] if row[4] else [],
+                    bm25_score=float(row[5]),
+                    vector_score=float(row[6]),
+                    hybrid_score=float(row[7]),
+                    metadata={
+                        "search_type": "hybrid",
+                        "fusion_method": fusion_method,
+                        "bm25_rank": row[8],
+                        "vector_rank": row[9],
+                    },
+                )
+            )
+
+        if metrics is not None and rows:
+            metrics.bm25_candidates = int(rows[0][10])
+            metrics.vector_candidates = int(rows[0][11])
+
+        return search_results
+
     async def _perform_bm25_search(
         self, query: str, top_k: int, filters: Dict[str, Any]
     ) -> List[SearchResult]:
@@ -669,12 +1359,17 @@ class HybridSearchEngine:
         try:
             db_mgr = _get_db_manager()
             async with db_mgr.async_session() as session:
+                # Check if PostgreSQL or SQLite
+                postgresql = "postgresql" in str(db_mgr.engine.url)
+
                 # Build filter clause
-                filter_clause, filter_params = self._build_filter_clause(filters)
+                filter_clause, filter_params = self._build_filter_clause(
+                    filters, postgresql
+                )
 
-                # Check if PostgreSQL or SQLite
-                if "postgresql" in str(db_mgr.engine.url):
-                    # PostgreSQL full-text search with BM25-like ranking
+                if postgresql:
+                    # PostgreSQL full-text search with BM25-like ranking over the
+                    # stored, GIN-indexed search_tsv column (migration 0015)
                     bm25_query = text(
                         f"""
                         SELECT
@@ -684,14 +1379,16 @@ class HybridSearchEngine:
                             d.source_url,
                             dt.path as taxonomy_path,
                             ts_rank_cd(
-                                to_tsvector('english', c.text),
-                                plainto_tsquery('english', :query),
+                                c.search_tsv,
+                                q,
                                 32 | 1  -- normalization flags for length and term frequency
                             ) as bm25_score
                         FROM chunks c
                         JOIN documents d ON c.doc_id = d.doc_id
                         LEFT JOIN doc_taxonomy dt ON d.doc_id = dt.doc_id
-                        WHERE to_tsvector('english', c.text) @@ plainto_tsquery('english', :query)
+                        CROSS JOIN plainto_tsquery('english', :query) AS q
+                        WHERE c.search_tsv @@ q
+                        AND c.deleted_at IS NULL
                         {filter_clause}
                         ORDER BY bm25_score DESC
                         LIMIT :top_k
@@ -713,6 +1410,7 @@ class HybridSearchEngine:
                         JOIN documents d ON c.doc_id = d.doc_id
                         LEFT JOIN doc_taxonomy dt ON d.doc_id = dt.doc_id
                         WHERE chunks_fts MATCH :query
+                        AND c.deleted_at IS NULL
                         {filter_clause}
                         ORDER BY bm25_score DESC
                         LIMIT :top_k
@@ -753,69 +1451,89 @@ class HybridSearchEngine:
             return []
 
     async def _perform_vector_search(
-        self, query_embedding: List[float], top_k: int, filters: Dict[str, Any]
+        self,
+        query_embedding: List[float],
+        top_k: int,
+        filters: Dict[str, Any],
+        ann_params: Optional[Any] = None,
+        metrics: Optional[SearchMetrics] = None,
     ) -> List[SearchResult]:
-        """Perform vector similarity search using pgvector"""
+        """Perform vector similarity search using pgvector
+
+        Filtered queries run under a filtered ANN plan, so they return
+        top_k rows whenever the filtered subset has that many. Without
+        pgvector (SQLite) the in-process local vector index is searched.
+        """
         start_time = time.time()
 
         try:
             db_mgr = _get_db_manager()
             async with db_mgr.async_session() as session:
-                # Build filter clause
-                filter_clause, filter_params = self._build_filter_clause(filters)
-
                 # Check if PostgreSQL with pgvector or SQLite
-                if "postgresql" in str(db_mgr.engine.url):
-                    # Convert embedding to PostgreSQL vector format
-                    vector_str = "[" + ",".join(map(str, query_embedding)) + "]"
+                database_url = str(db_mgr.engine.url)
+                postgresql = "postgresql" in database_url
 
-                    # pgvector cosine similarity search
-                    # Note: Using string formatting for vector to avoid asyncpg named parameter issues
-                    vector_query = text(
-                        f"""
-                        SELECT
-                            c.chunk_id,
-                            c.text,
-                            d.source_url as title,
-                            d.source_url,
-                            dt.path as taxonomy_path,
-                            1 - (e.vec <=> '{vector_str}'::vector) as cosine_similarity
-                        FROM chunks c
-                        JOIN documents d ON c.doc_id = d.doc_id
-                        LEFT JOIN doc_taxonomy dt ON d.doc_id = dt.doc_id
-                        JOIN embeddings e ON c.chunk_id = e.chunk_id
-                        WHERE e.vec IS NOT NULL
-                        {filter_clause}
-                        ORDER BY e.vec <=> '{vector_str}'::vector
-                        LIMIT :top_k
-                    """
+                # Build filter clause
+                filter_clause, filter_params = self._build_filter_clause(
+                    filters, postgresql
+                )
+
+                backend = _get_local_vector_index().vector_search_backend(database_url)
+                if backend == "pgvector":
+                    vector_index = _get_vector_index()
+                    metric = vector_index.get_vector_metric()
+
+                    query_vector = vector_index.query_vector_param(len(query_embedding))
+                    query_params = {
+                        "top_k": top_k,
+                        "query_vector": query_embedding,
+                        **filter_params,
+                    }
+
+                    async def run(plan: Any) -> Tuple[List[Any], int]:
+                        # The embedding is a bound parameter: constant statement
+                        # text lets asyncpg reuse the prepared plan. "+ 0" keeps
+                        # exact plans off the ANN index.
+                        candidate_order = (
+                            None
+                            if plan.exact
+                            else vector_index.candidate_distance_sql(metric, plan.ann_params)
+                        )
+                        vector_query = text(
+                            self._vector_query_sql(
+                                metric, filter_clause, plan.exact, candidate_order
+                            )
+                        ).bindparams(query_vector)
+                        if not plan.exact:
+                            await vector_index.apply_ann_params(
+                                session, self._candidate_ann_params(plan, top_k)
+                            )
+                        query_params["rescore_candidates"] = self._rescore_candidates(
+                            plan, top_k
+                        )
+                        result = await session.execute(vector_query, query_params)
+                        vector_rows = result.fetchall()
+                        return vector_rows, len(vector_rows)
+
+                    rows = await self._filtered_ann_search(
+                        session,
+                        top_k,
+                        filter_clause,
+                        filter_params,
+                        ann_params,
+                        run,
+                        metrics,
+                        chunk_ids=lambda found: [str(row[0]) for row in found],
                     )
-                    query_params = {"top_k": top_k, **filter_params}
                 else:
-                    # SQLite vector similarity fallback using JSON
-                    vector_query = text(
-                        f"""
-                        SELECT
-                            c.chunk_id,
-                            c.text,
-                            d.source_url as title,
-                            d.source_url,
-                            dt.path as taxonomy_path,
-                            0.5 as cosine_similarity
-                        FROM chunks c
-                        JOIN documents d ON c.doc_id = d.doc_id
-                        LEFT JOIN doc_taxonomy dt ON d.doc_id = dt.doc_id
-                        JOIN embeddings e ON c.chunk_id = e.chunk_id
-                        WHERE e.vec IS NOT NULL
-                        {filter_clause}
-                        ORDER BY c.chunk_id
-                        LIMIT :top_k
-                    """
+                    rows = await self._perform_local_vector_search(
+                        session,
+                        query_embedding,
+                        top_k,
+                        filter_clause,
+                        filter_params,
+                        metrics,
                     )
-                    query_params = {"top_k": top_k, **filter_params}
-
-                result = await session.execute(vector_query, query_params)
-                rows = result.fetchall()
 
                 # Convert to SearchResult objects
                 search_results = []
@@ -846,13 +1564,199 @@ class HybridSearchEngine:
             logger.error(f"Vector search failed: {e}")
             return []
 
-    def _fuse_results(
+    @staticmethod
+    def _vector_query_sql(
+        metric: Any,
+        filter_clause: str,
+        exact: bool = False,
+        candidate_order: Optional[str] = None,
+    ) -> str:
+        """Vector-only top-k statement.
+
+        ``candidate_order`` (a prefix or halfvec distance, see
+        vector_index.candidate_distance_sql) takes :rescore_candidates rows
+        through its ANN index and re-ranks them by full-precision distance.
+        """
+        select = """
+            SELECT
+                c.chunk_id,
+                c.text,
+                d.source_url as title,
+                d.source_url,
+                dt.path as taxonomy_path,"""
+        filtered_chunks = f"""
+            FROM chunks c
+            JOIN documents d ON c.doc_id = d.doc_id
+            LEFT JOIN doc_taxonomy dt ON d.doc_id = dt.doc_id
+            JOIN embeddings e ON c.chunk_id = e.chunk_id
+            WHERE e.vec IS NOT NULL
+            {filter_clause}"""
+        if candidate_order:
+            return f"""
+                SELECT
+                    chunk_id, text, title, source_url, taxonomy_path,
+                    {metric.similarity_sql("vec")} as cosine_similarity
+                FROM ({select}
+                        e.vec
+                    {filtered_chunks}
+                    ORDER BY {candidate_order}
+                    LIMIT :rescore_candidates
+                ) rescored_candidates
+                ORDER BY {metric.distance_sql("vec")}
+                LIMIT :top_k
+            """
+        order_by = metric.distance_sql("e.vec") + (" + 0" if exact else "")
+        return f"""{select}
+                {metric.similarity_sql("e.vec")} as cosine_similarity
+            {filtered_chunks}
+            ORDER BY {order_by}
+            LIMIT :top_k
+        """
+
+    @staticmethod
+    def _candidate_ann_params(plan: Any, k: int) -> Any:
+        """The plan's ANN params, with ef_search covering the prefix or
+        halfvec candidates when results are re-scored."""
+        vector_index = _get_vector_index()
+        if not vector_index.is_rescored(plan.ann_params):
+            return plan.ann_params
+        return vector_index.candidate_ann_params(
+            plan.ann_params, HybridSearchEngine._rescore_candidates(plan, k)
+        )
+
+    @staticmethod
+    def _rescore_candidates(plan: Any, k: int) -> int:
+        vector_index = _get_vector_index()
+        oversample = vector_index.ANNSearchParams.resolve(plan.ann_params).rescore_oversample
+        return cast(int, vector_index.rescore_candidates(k, oversample))
+
+    async def _perform_local_vector_search(
+        self,
+        session: Any,
+        query_embedding: List[float],
+        top_k: int,
+        filter_clause: str,
+        filter_params: Dict[str, Any],
+        metrics: Optional[SearchMetrics] = None,
+    ) -> List[Any]:
+        """Exact top-k from the in-process vector index (no pgvector).
+
+        Filters select the allowed chunk ids in SQL; the index scores only
+        those. Returns rows shaped like the pgvector query.
+        """
+        local_vector_index = _get_local_vector_index()
+        index = await local_vector_index.load_local_vector_index(session)
+
+        allowed: Optional[List[str]] = None
+        if filter_clause:
+            result = await session.execute(
+                text(
+                    f"""
+                    SELECT DISTINCT c.chunk_id
+                    FROM chunks c
+                    JOIN documents d ON c.doc_id = d.doc_id
+                    LEFT JOIN doc_taxonomy dt ON d.doc_id = dt.doc_id
+                    WHERE 1 = 1
+                    {filter_clause}
+                """
+                ),
+                filter_params,
+            )
+            allowed = [str(row[0]) for row in result.fetchall()]
+
+        metadata_query = text(
+            """
+            SELECT
+                c.chunk_id,
+                c.text,
+                d.source_url as title,
+                d.source_url,
+                dt.path as taxonomy_path
+            FROM chunks c
+            JOIN documents d ON c.doc_id = d.doc_id
+            LEFT JOIN doc_taxonomy dt ON d.doc_id = dt.doc_id
+            WHERE c.chunk_id IN :chunk_ids
+        """
+        ).bindparams(bindparam("chunk_ids", expanding=True))
+
+        rows: List[Any] = []
+        for _ in range(2):
+            hits = await asyncio.to_thread(index.search, query_embedding, top_k, allowed)
+            if not hits:
+                break
+            result = await session.execute(
+                metadata_query, {"chunk_ids": [chunk_id for chunk_id, _ in hits]}
+            )
+            chunks: Dict[str, Any] = {}
+            for row in result.fetchall():
+                chunks.setdefault(str(row[0]), row)
+            rows = [
+                (*chunks[chunk_id], score) for chunk_id, score in hits if chunk_id in chunks
+            ]
+            stale = [chunk_id for chunk_id, _ in hits if chunk_id not in chunks]
+            if not stale:
+                break
+            # Chunks deleted behind the index's back: drop them and refill
+            await asyncio.to_thread(index.remove, stale)
+
+        if metrics is not None:
+            metrics.vector_strategy = "exact"
+            metrics.vector_selectivity = (
+                min(1.0, len(allowed) / max(1, len(index)))
+                if allowed is not None
+                else None
+            )
+            metrics.vector_rounds = 1
+            metrics.vector_recall = 1.0
+        return rows
+
+    async def _filtered_ann_search(
+        self,
+        session: Any,
+        top_k: int,
+        filter_clause: str,
+        filter_params: Dict[str, Any],
+        ann_params: Optional[Any],
+        run: Callable[[Any], Awaitable[Tuple[List[Any], int]]],
+        metrics: Optional[SearchMetrics] = None,
+        chunk_ids: Optional[Callable[[List[Any]], List[str]]] = None,
+    ) -> List[Any]:
+        """Run a vector query under a filtered ANN plan.
+
+        ``run(plan)`` executes the query for a plan and returns its rows and
+        the number of ANN candidates found. Short results widen the plan
+        until it is exact. With ``chunk_ids``, a sample of approximate
+        searches is re-run exactly to measure recall.
+        """
+        filtered_ann = _get_filtered_ann()
+        planner = filtered_ann.get_filtered_ann_planner()
+        plan = await planner.plan(
+            session, top_k, filter_clause, filter_params, ann_params
+        )
+        rows, found = await run(plan)
+        while found < plan.expected_rows(top_k) and not plan.exact:
+            plan = planner.widen(plan)
+            rows, found = await run(plan)
+
+        recall = 1.0 if plan.exact else None
+        if recall is None and chunk_ids is not None and planner.should_sample_recall():
+            exact_rows, _ = await run(planner.exact(plan))
+            recall = filtered_ann.recall_at_k(chunk_ids(rows), chunk_ids(exact_rows))
+
+        if metrics is not None:
+            metrics.vector_strategy = plan.strategy
+            metrics.vector_selectivity = plan.selectivity
+            metrics.vector_rounds = plan.rounds
+            metrics.vector_recall = recall
+        return rows
+
+    def _fuse_candidates(
         self,
         query: str,
         bm25_results: List[SearchResult],
         vector_results: List[SearchResult],
-    ) -> List[SearchResult]:
-        """Fuse BM25 and vector search results with score normalization"""
+    ) -> CandidateBatch:
+        """Merge BM25 and vector candidates and fuse their scores as arrays"""
 
         # Create a map of all unique results
         results_map = {}
@@ -871,34 +1775,31 @@ class HybridSearchEngine:
                 # Add new vector-only result
                 results_map[result.chunk_id] = result
 
-        # Get all results and extract scores
-        all_results = list(results_map.values())
-        bm25_scores = [r.bm25_score for r in all_results]
-        vector_scores = [r.vector_score for r in all_results]
+        batch = CandidateBatch.from_results(list(results_map.values()))
+        if not len(batch):
+            return batch
 
         # Analyze query characteristics for adaptive fusion
         query_characteristics = self._analyze_query(query)
 
         # Perform score fusion
-        if len(set(bm25_scores + vector_scores)) > 1:  # Check if we have varied scores
-            hybrid_scores = self.score_fusion.adaptive_fusion(
-                bm25_scores, vector_scores, query_characteristics
+        all_scores = np.concatenate((batch.bm25_scores, batch.vector_scores))
+        if np.ptp(all_scores) > 0:  # Check if we have varied scores
+            batch.hybrid_scores = self.score_fusion.adaptive_fusion_arrays(
+                batch.bm25_scores, batch.vector_scores, query_characteristics
             )
         else:
             # Fallback to simple weighted average
-            hybrid_scores = [
-                self.score_fusion.bm25_weight * bm25
-                + self.score_fusion.vector_weight * vector
-                for bm25, vector in zip(bm25_scores, vector_scores)
-            ]
-
-        # Update results with hybrid scores
-        for result, hybrid_score in zip(all_results, hybrid_scores):
-            result.hybrid_score = hybrid_score
-            result.metadata["fusion_method"] = "adaptive"
-            result.metadata["query_characteristics"] = query_characteristics
+            batch.hybrid_scores = (
+                self.score_fusion.bm25_weight * batch.bm25_scores
+                + self.score_fusion.vector_weight * batch.vector_scores
+            )
 
-        return all_results
+        batch.metadata = {
+            "fusion_method": "adaptive",
+            "query_characteristics": query_characteristics,
+        }
+        return batch
 
     def _analyze_query(self, query: str) -> Dict[str, float]:
         """Analyze query characteristics for adaptive fusion"""
@@ -919,41 +1820,50 @@ class HybridSearchEngine:
         }
 
     def _build_filter_clause(
-        self, filters: Dict[str, Any]
+        self, filters: Dict[str, Any], postgresql: bool = True
     ) -> Tuple[str, Dict[str, Any]]:
-        """Build SQL WHERE clause from filters with parameterized queries"""
+        """Build SQL WHERE clause from filters with parameterized queries
+
+        ``postgresql`` selects the SQL dialect for taxonomy filters.
+        """
         if not filters:
             return "", {}
 
         conditions = []
         params = {}
 
-        # Taxonomy path filtering (SECURE)
+        # Taxonomy subtree filtering (SECURE): one indexed predicate for
+        # all paths, pushed into the BM25 and ANN candidate queries
         if "taxonomy_paths" in filters:
             paths = filters["taxonomy_paths"]
             if paths:
-                path_conditions = []
-                for idx, path in enumerate(paths):
-                    if isinstance(path, list):
-                        valid_segments = []
-                        for segment in path:
-                            segment_str = str(segment)
-                            if (
-                                segment_str.replace("_", "")
-                                .replace("-", "")
-                                .replace(" ", "")
-                                .isalnum()
-                            ):
-                                valid_segments.append(segment_str)
-
-                        if valid_segments:
-                            param_name = f"taxonomy_path_{idx}"
-                            path_str = '{{"{0}"}}'.format('","'.join(valid_segments))
-                            params[param_name] = path_str
-                            path_conditions.append(f"dt.path = :{param_name}::text[]")
-
-                if path_conditions:
-                    conditions.append(f"({' OR '.join(path_conditions)})")
+                # A path with an invalid segment is rejected whole: dropping
+                # only the segment would widen the filter to its parent
+                valid_paths = []
+                for path in paths:
+                    if not isinstance(path, list):
+                        continue
+                    segments = [str(segment) for segment in path]
+                    if all(
+                        segment.replace("_", "")
+                        .replace("-", "")
+                        .replace(" ", "")
+                        .isalnum()
+                        for segment in segments
+                    ):
+                        valid_paths.append(segments)
+
+                taxonomy_filter = _get_taxonomy_filter()
+                path_condition, path_params = taxonomy_filter.taxonomy_subtree_condition(
+                    valid_paths, postgresql
+                )
+                if path_condition:
+                    conditions.append(path_condition)
+                    params.update(path_params)
+                else:
+                    # Every requested path was rejected: match nothing
+                    # instead of searching unfiltered
+                    conditions.append("1 = 0")
 
         # Content type filtering (SECURE with whitelist)
         if "content_types" in filters:
@@ -1042,7 +1952,11 @@ class HybridSearchEngine:
             return [], metrics
 
     async def vector_only_search(
-        self, query: str, top_k: int = 5, filters: Optional[Dict[str, Any]] = None
+        self,
+        query: str,
+        top_k: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+        ann_params: Optional[Any] = None,
     ) -> Tuple[List[SearchResult], SearchMetrics]:
         """Perform vector similarity search only"""
         start_time = time.time()
@@ -1055,7 +1969,7 @@ class HybridSearchEngine:
             metrics.embedding_time = time.time() - embedding_start
 
             results = await self._perform_vector_search(
-                query_embedding, top_k, filters or {}
+                query_embedding, top_k, filters or {}, ann_params, metrics
             )
 
             # Set hybrid scores equal to vector scores
@@ -1106,6 +2020,25 @@ class HybridSearchEngine:
             self.score_fusion.normalization = kwargs["normalization"]
             self.config["normalization"] = kwargs["normalization"]
 
+        if "fusion_mode" in kwargs:
+            if kwargs["fusion_mode"] not in FUSION_MODES:
+                raise ValueError(f"fusion_mode must be one of {FUSION_MODES}")
+            self.config["fusion_mode"] = kwargs["fusion_mode"]
+
+        if "server_fusion_method" in kwargs:
+            if kwargs["server_fusion_method"] not in SERVER_FUSION_METHODS:
+                raise ValueError(
+                    f"server_fusion_method must be one of {SERVER_FUSION_METHODS}"
+                )
+            self.config["server_fusion_method"] = kwargs["server_fusion_method"]
+
+        if "rrf_k" in kwargs:
+            self.config["rrf_k"] = int(kwargs["rrf_k"])
+
+        # Entries ranked under the old settings can no longer be hit
+        if any(name in kwargs for name in RANKING_CONFIG_KEYS):
+            self.clear_cache()
+
         logger.info(f"Search engine configuration updated: {kwargs}")
 
     # @CODE:MYPY-CONSOLIDATION-002 | Phase 3: no-untyped-def resolution
@@ -1194,10 +2127,15 @@ async def keyword_search(
 
 
 async def vector_search(
-    query: str, top_k: int = 5, filters: Optional[Dict[str, Any]] = None
+    query: str,
+    top_k: int = 5,
+    filters: Optional[Dict[str, Any]] = None,
+    ann_params: Optional[Any] = None,
 ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
     """Vector similarity search only"""
-    results, metrics = await search_engine.vector_only_search(query, top_k, filters)
+    results, metrics = await search_engine.vector_only_search(
+        query, top_k, filters, ann_params
+    )
 
     # Convert to API format
     api_results = [
@@ -21,7 +21,8 @@ import time
 import statistics
 import json
 import logging
-from typing import List, Dict, Any, Optional
+import random
+from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass, asdict
 from datetime import datetime
 import argparse
@@ -32,6 +33,23 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Scratch schema for database-level benchmarks (dropped after each run)
+BENCHMARK_SCHEMA = "search_bench"
+
+# Vocabulary for synthetic corpora
+SYNTHETIC_VOCABULARY = [
+    "retrieval", "embedding", "vector", "index", "taxonomy", "document",
+    "search", "ranking", "query", "latency", "model", "transformer",
+    "attention", "network", "classification", "cluster", "graph", "agent",
+    "pipeline", "ingestion", "chunk", "token", "semantic", "keyword",
+    "database", "postgres", "cache", "memory", "throughput", "benchmark",
+    "gradient", "training", "inference", "evaluation", "precision", "recall",
+    "knowledge", "reasoning", "language", "vision", "reinforcement", "policy",
+    "reward", "feedback", "summary", "answer", "context", "prompt",
+    "generation", "hybrid", "fusion", "rerank", "score", "filter",
+    "metadata", "schema", "migration", "partition", "shard", "replica",
+]
+
 
 @dataclass
 class BenchmarkResult:
@@ -68,6 +86,64 @@ class BenchmarkSummary:
     meets_cost_target: bool
 
 
+def _legacy_fuse_and_rerank(query: str, results: List[Any], top_k: int) -> List[Any]:
+    """Pre-vectorization fusion + heuristic rerank, kept as the micro-benchmark baseline.
+
+    Mirrors the per-result Python loops that HybridScoreFusion and
+    HybridScoreReranker used before CandidateBatch, including the diversity
+    bonus that rescanned every candidate for each result.
+    """
+
+    def min_max(scores: List[float]) -> List[float]:
+        if len(scores) <= 1:
+            return scores
+        lo, hi = min(scores), max(scores)
+        if hi == lo:
+            return [1.0] * len(scores)
+        return [(score - lo) / (hi - lo) for score in scores]
+
+    def length_penalty(text_length: int) -> float:
+        if text_length < 50:
+            return 0.7
+        if text_length > 1000:
+            return 0.8
+        if 100 <= text_length <= 500:
+            return 1.0
+        return 0.9
+
+    norm_bm25 = min_max([r.bm25_score for r in results])
+    norm_vector = min_max([r.vector_score for r in results])
+    for result, bm25, vector in zip(results, norm_bm25, norm_vector):
+        result.hybrid_score = 0.5 * bm25 + 0.5 * vector
+
+    query_lower = query.lower()
+    query_terms = set(query_lower.split())
+    for result in results:
+        text_terms = set(result.text.lower().split())
+        term_overlap = len(query_terms.intersection(text_terms)) / len(query_terms)
+        unique_sources = len(set(r.source_url for r in results if r.source_url))
+        unique_taxonomies = len(set(str(r.taxonomy_path) for r in results))
+        diversity_bonus = min(1.0, (unique_sources + unique_taxonomies) / 10.0)
+        result.rerank_score = result.hybrid_score * (
+            1.0
+            + 0.2 * term_overlap
+            + 0.1 * length_penalty(len(result.text))
+            + 0.1 * diversity_bonus
+        )
+
+    for result in results:
+        text_lower = result.text.lower()
+        position_bonus = 1.0
+        if query_lower in text_lower:
+            position = text_lower.find(query_lower)
+            position_bonus = 1.2 - (position / len(text_lower)) * 0.2
+        result.rerank_score *= position_bonus * (
+            1.0 + length_penalty(len(result.text)) * 0.1
+        )
+
+    return sorted(results, key=lambda x: x.rerank_score, reverse=True)[:top_k]
+
+
 class SearchBenchmark:
     """Search engine benchmark runner"""
 
@@ -383,6 +459,685 @@ class SearchBenchmark:
             "hybrid search algorithms",
         ]
 
+    # ------------------------------------------------------------------
+    # Database-level benchmarks on a synthetic corpus (PostgreSQL only)
+    # ------------------------------------------------------------------
+
+    def _get_db_manager(self) -> Any:
+        from ..api.database import db_manager
+
+        return db_manager
+
+    async def _build_synthetic_corpus(
+        self, session: Any, corpus_size: int, words_per_chunk: int = 60
+    ) -> None:
+        """Create the search_bench schema with a synthetic chunk corpus.
+
+        Rows are generated server-side with generate_series so building a
+        1M-chunk corpus does not stream text through the client.
+        """
+        from sqlalchemy import text
+
+        doc_count = max(1, corpus_size // 20)
+        vocabulary = sorted(
+            {word.lower() for query in self.generate_test_queries() for word in query.split()}
+            | set(SYNTHETIC_VOCABULARY)
+        )
+
+        logger.info(
+            f"Building synthetic corpus: {corpus_size:,} chunks / {doc_count:,} documents"
+        )
+        await session.execute(text(f"DROP SCHEMA IF EXISTS {BENCHMARK_SCHEMA} CASCADE"))
+        await session.execute(text(f"CREATE SCHEMA {BENCHMARK_SCHEMA}"))
+        await session.execute(
+            text(
+                f"""
+                CREATE UNLOGGED TABLE {BENCHMARK_SCHEMA}.documents (
+                    doc_id INTEGER PRIMARY KEY,
+                    title TEXT
+                )
+                """
+            )
+        )
+        await session.execute(
+            text(
+                f"""
+                CREATE UNLOGGED TABLE {BENCHMARK_SCHEMA}.chunks (
+                    chunk_id BIGINT PRIMARY KEY,
+                    doc_id INTEGER NOT NULL,
+                    text TEXT NOT NULL,
+                    search_tsv TSVECTOR
+                )
+                """
+            )
+        )
+
+        # Correlating the word subquery with g forces per-row evaluation
+        await session.execute(
+            text(
+                f"""
+                INSERT INTO {BENCHMARK_SCHEMA}.documents (doc_id, title)
+                SELECT g, (
+                    SELECT string_agg(w[1 + floor(random() * array_length(w, 1))::int], ' ')
+                    FROM generate_series(1, 4 + (g % 1))
+                )
+                FROM generate_series(1, :doc_count) AS g,
+                     (SELECT CAST(:vocab AS TEXT[]) AS w) AS v
+                """
+            ),
+            {"doc_count": doc_count, "vocab": vocabulary},
+        )
+        await session.execute(
+            text(
+                f"""
+                INSERT INTO {BENCHMARK_SCHEMA}.chunks (chunk_id, doc_id, text)
+                SELECT g, 1 + (g % :doc_count), (
+                    SELECT string_agg(w[1 + floor(random() * array_length(w, 1))::int], ' ')
+                    FROM generate_series(1, :words + (g % 1))
+                )
+                FROM generate_series(1, :corpus_size) AS g,
+                     (SELECT CAST(:vocab AS TEXT[]) AS w) AS v
+                """
+            ),
+            {
+                "doc_count": doc_count,
+                "words": words_per_chunk,
+                "corpus_size": corpus_size,
+                "vocab": vocabulary,
+            },
+        )
+        await session.commit()
+
+    async def _time_sql_variant(
+        self,
+        session: Any,
+        test_name: str,
+        search_type: str,
+        sql: str,
+        param_sets: List[Dict[str, Any]],
+        warmup: int = 2,
+    ) -> BenchmarkSummary:
+        """Time one SQL statement over a list of parameter sets."""
+        from sqlalchemy import text
+
+        statement = text(sql)
+        for params in param_sets[:warmup]:
+            await session.execute(statement, params)
+
+        variant_results = []
+        for params in param_sets:
+            start_time = time.perf_counter()
+            error = None
+            result_count = 0
+            try:
+                result = await session.execute(statement, params)
+                result_count = len(result.fetchall())
+            except Exception as e:
+                error = str(e)
+                await session.rollback()
+            latency_ms = (time.perf_counter() - start_time) * 1000
+
+            variant_results.append(
+                BenchmarkResult(
+                    test_name=test_name,
+                    query=str(params.get("query", "")),
+                    search_type=search_type,
+                    latency_ms=latency_ms,
+                    result_count=result_count,
+                    error=error,
+                )
+            )
+
+        self.results.extend(variant_results)
+        return self._calculate_summary(test_name, variant_results)
+
+    def _synthetic_queries(self, query_count: int, seed: int = 42) -> List[str]:
+        """Deterministic 1-3 term queries drawn from the synthetic vocabulary."""
+        rng = random.Random(seed)
+        return [
+            " ".join(rng.sample(SYNTHETIC_VOCABULARY, rng.randint(1, 3)))
+            for _ in range(query_count)
+        ]
+
+    async def run_bm25_tsvector_benchmark(
+        self,
+        corpus_size: int = 1_000_000,
+        query_count: int = 30,
+        top_k: int = 10,
+        keep_corpus: bool = False,
+    ) -> Dict[str, Any]:
+        """Compare per-row to_tsvector BM25 against the stored search_tsv column.
+
+        "before" mirrors the pre-0015 SearchDAO query, which re-parses
+        text || title for every candidate row. "after" queries the stored,
+        GIN-indexed weighted tsvector.
+        """
+        from sqlalchemy import text
+
+        db_manager = self._get_db_manager()
+        if "postgresql" not in str(db_manager.engine.url):
+            raise RuntimeError("BM25 tsvector benchmark requires PostgreSQL")
+
+        async with db_manager.async_session() as session:
+            await self._build_synthetic_corpus(session, corpus_size)
+
+            build_start = time.perf_counter()
+            await session.execute(
+                text(
+                    f"""
+                    UPDATE {BENCHMARK_SCHEMA}.chunks c
+                    SET search_tsv =
+                        setweight(to_tsvector('english', COALESCE(d.title, '')), 'A')
+                        || setweight(to_tsvector('english', c.text), 'B')
+                    FROM {BENCHMARK_SCHEMA}.documents d
+                    WHERE c.doc_id = d.doc_id
+                    """
+                )
+            )
+            await session.execute(
+                text(
+                    f"CREATE INDEX ON {BENCHMARK_SCHEMA}.chunks USING GIN (search_tsv)"
+                )
+            )
+            await session.execute(text(f"ANALYZE {BENCHMARK_SCHEMA}.chunks"))
+            await session.execute(text(f"ANALYZE {BENCHMARK_SCHEMA}.documents"))
+            await session.commit()
+            index_build_seconds = time.perf_counter() - build_start
+
+            param_sets = [
+                {"query": query, "topk": top_k}
+                for query in self._synthetic_queries(query_count)
+            ]
+
+            before = await self._time_sql_variant(
+                session,
+                "bm25_to_tsvector_per_row",
+                "bm25",
+                f"""
+                SELECT c.chunk_id,
+                       ts_rank_cd(
+                           to_tsvector('english', c.text || ' ' || COALESCE(d.title, '')),
+                           websearch_to_tsquery('english', :query),
+                           32
+                       ) AS bm25_score
+                FROM {BENCHMARK_SCHEMA}.chunks c
+                JOIN {BENCHMARK_SCHEMA}.documents d ON c.doc_id = d.doc_id
+                WHERE to_tsvector('english', c.text || ' ' || COALESCE(d.title, ''))
+                      @@ websearch_to_tsquery('english', :query)
+                ORDER BY bm25_score DESC
+                LIMIT :topk
+                """,
+                param_sets,
+            )
+
+            after = await self._time_sql_variant(
+                session,
+                "bm25_stored_search_tsv",
+                "bm25",
+                f"""
+                SELECT c.chunk_id, ts_rank_cd(c.search_tsv, q, 32) AS bm25_score
+                FROM {BENCHMARK_SCHEMA}.chunks c
+                JOIN {BENCHMARK_SCHEMA}.documents d ON c.doc_id = d.doc_id
+                CROSS JOIN websearch_to_tsquery('english', :query) AS q
+                WHERE c.search_tsv @@ q
+                ORDER BY bm25_score DESC
+                LIMIT :topk
+                """,
+                param_sets,
+            )
+
+            if not keep_corpus:
+                await session.execute(
+                    text(f"DROP SCHEMA IF EXISTS {BENCHMARK_SCHEMA} CASCADE")
+                )
+                await session.commit()
+
+        return {
+            "timestamp": datetime.utcnow().isoformat(),
+            "corpus_size": corpus_size,
+            "query_count": query_count,
+            "index_build_seconds": index_build_seconds,
+            "before": asdict(before),
+            "after": asdict(after),
+            "p50_speedup": before.p50_latency_ms / max(after.p50_latency_ms, 0.001),
+            "p95_speedup": before.p95_latency_ms / max(after.p95_latency_ms, 0.001),
+        }
+
+    async def run_fusion_mode_benchmark(
+        self,
+        queries: Optional[List[str]] = None,
+        top_k: int = 10,
+        server_fusion_method: str = "rrf",
+    ) -> Dict[str, Any]:
+        """Compare the two-query client fusion path with single-statement server fusion.
+
+        Runs against the configured database through the global search
+        engine with result caching disabled so every query hits PostgreSQL.
+        """
+        from .hybrid_search_engine import search_engine
+
+        queries = queries or self.generate_test_queries()
+        original_config = search_engine.get_config()
+        original_cache = search_engine.cache
+        search_engine.cache = None
+
+        summaries: Dict[str, BenchmarkSummary] = {}
+        try:
+            for mode in ("client", "server"):
+                search_engine.update_config(
+                    fusion_mode=mode, server_fusion_method=server_fusion_method
+                )
+                logger.info(f"Testing fusion mode: {mode}")
+
+                mode_results = []
+                for query in queries:
+                    start_time = time.perf_counter()
+                    error = None
+                    result_count = 0
+                    try:
+                        results, _ = await search_engine.search(query, top_k=top_k)
+                        result_count = len(results)
+                    except Exception as e:
+                        error = str(e)
+                    latency_ms = (time.perf_counter() - start_time) * 1000
+
+                    mode_results.append(
+                        BenchmarkResult(
+                            test_name=f"fusion_{mode}",
+                            query=query,
+                            search_type="hybrid",
+                            latency_ms=latency_ms,
+                            result_count=result_count,
+                            error=error,
+                            cost_krw=self.cost_per_embedding
+                            + self.cost_per_db_query * (2 if mode == "client" else 1),
+                        )
+                    )
+
+                self.results.extend(mode_results)
+                summaries[mode] = self._calculate_summary(f"fusion_{mode}", mode_results)
+        finally:
+            search_engine.cache = original_cache
+            search_engine.update_config(
+                fusion_mode=original_config["fusion_mode"],
+                server_fusion_method=original_config["server_fusion_method"],
+            )
+
+        before, after = summaries["client"], summaries["server"]
+        return {
+            "timestamp": datetime.utcnow().isoformat(),
+            "query_count": len(queries),
+            "server_fusion_method": server_fusion_method,
+            "before": asdict(before),
+            "after": asdict(after),
+            "p50_speedup": before.p50_latency_ms / max(after.p50_latency_ms, 0.001),
+            "p95_speedup": before.p95_latency_ms / max(after.p95_latency_ms, 0.001),
+        }
+
+    def _synthetic_candidates(self, count: int, seed: int = 7) -> List[Any]:
+        """In-memory SearchResult candidates for CPU-only micro-benchmarks"""
+        from .hybrid_search_engine import SearchResult
+
+        rng = random.Random(seed)
+        return [
+            SearchResult(
+                chunk_id=f"chunk-{i}",
+                text=" ".join(rng.choices(SYNTHETIC_VOCABULARY, k=rng.randint(8, 120))),
+                source_url=f"https://example.com/doc-{rng.randint(0, count // 4)}",
+                taxonomy_path=["AI", rng.choice(["ML", "NLP", "CV", "RAG"])],
+                bm25_score=rng.random() * 3.0 if rng.random() < 0.7 else 0.0,
+                vector_score=rng.random(),
+            )
+            for i in range(count)
+        ]
+
+    def run_fusion_microbenchmark(
+        self,
+        sizes: Tuple[int, ...] = (50, 500, 5000),
+        repeats: int = 5,
+        top_k: int = 10,
+    ) -> Dict[str, Any]:
+        """Time fusion + heuristic rerank: legacy Python loops vs CandidateBatch.
+
+        Pure CPU; no database or embedding calls. Candidates are rebuilt
+        outside the timed region because both paths mutate them.
+        """
+        from .hybrid_search_engine import HybridSearchEngine
+
+        engine = HybridSearchEngine(enable_caching=False, enable_reranking=True)
+        reranker = engine.reranker
+        assert reranker is not None  # Ensured by enable_reranking=True
+        query = "vector search ranking"
+        report: Dict[str, Any] = {
+            "timestamp": datetime.utcnow().isoformat(),
+            "repeats": repeats,
+            "sizes": {},
+        }
+
+        for size in sizes:
+            timings: Dict[str, List[float]] = {"legacy": [], "vectorized": []}
+            for repeat in range(repeats):
+                candidates = self._synthetic_candidates(size, seed=repeat)
+                start_time = time.perf_counter()
+                _legacy_fuse_and_rerank(query, candidates, top_k)
+                timings["legacy"].append((time.perf_counter() - start_time) * 1000)
+
+                candidates = self._synthetic_candidates(size, seed=repeat)
+                start_time = time.perf_counter()
+                batch = engine._fuse_candidates(query, candidates, [])
+                reranker.rerank_batch(query, batch, top_k)
+                timings["vectorized"].append((time.perf_counter() - start_time) * 1000)
+
+            legacy_p50 = statistics.median(timings["legacy"])
+            vectorized_p50 = statistics.median(timings["vectorized"])
+            report["sizes"][size] = {
+                "legacy_p50_ms": legacy_p50,
+                "vectorized_p50_ms": vectorized_p50,
+                "speedup": legacy_p50 / max(vectorized_p50, 0.001),
+            }
+            logger.info(
+                f"  {size} candidates: legacy {legacy_p50:.2f}ms, "
+                f"vectorized {vectorized_p50:.2f}ms"
+            )
+
+        return report
+
+    async def run_embedding_batching_benchmark(
+        self,
+        concurrency_levels: Tuple[int, ...] = (1, 10, 100),
+        requests_per_level: int = 300,
+        call_latency_ms: float = 20.0,
+        per_text_latency_ms: float = 0.5,
+        duplicate_ratio: float = 0.2,
+    ) -> Dict[str, Any]:
+        """Query-embedding throughput with and without micro-batching.
+
+        The backend is simulated as a single serialized encoder (one local
+        model on CPU, or one rate-limited API client): every call pays a fixed
+        overhead plus a per-text cost. ``duplicate_ratio`` of the queries
+        repeat a popular query, which the batcher deduplicates in flight.
+        """
+        from ..api.embedding_service import EmbeddingMicroBatcher
+
+        rng = random.Random(11)
+        popular = [f"popular query {i}" for i in range(5)]
+        queries = [
+            rng.choice(popular) if rng.random() < duplicate_ratio else f"query {i}"
+            for i in range(requests_per_level)
+        ]
+
+        report: Dict[str, Any] = {
+            "timestamp": datetime.utcnow().isoformat(),
+            "requests_per_level": requests_per_level,
+            "call_latency_ms": call_latency_ms,
+            "per_text_latency_ms": per_text_latency_ms,
+            "levels": {},
+        }
+
+        for concurrency in concurrency_levels:
+            row: Dict[str, Any] = {}
+            for mode in ("unbatched", "batched"):
+                encoder = asyncio.Lock()
+                calls = 0
+
+                async def embed_batch(texts: List[str]) -> List[List[float]]:
+                    nonlocal calls
+                    async with encoder:
+                        calls += 1
+                        await asyncio.sleep(
+                            (call_latency_ms + per_text_latency_ms * len(texts)) / 1000
+                        )
+                    return [[0.0] for _ in texts]
+
+                batcher = EmbeddingMicroBatcher(embed_batch)
+
+                async def embed_one(text: str) -> List[float]:
+                    if mode == "batched":
+                        return await batcher.embed(text)
+                    return (await embed_batch([text]))[0]
+
+                queue = list(queries)
+
+                async def user() -> None:
+                    while queue:
+                        await embed_one(queue.pop())
+
+                start_time = time.perf_counter()
+                await asyncio.gather(*(user() for _ in range(concurrency)))
+                elapsed = time.perf_counter() - start_time
+
+                row[mode] = {
+                    "throughput_qps": requests_per_level / elapsed,
+                    "backend_calls": calls,
+                    "elapsed_s": elapsed,
+                }
+            row["speedup"] = row["batched"]["throughput_qps"] / max(
+                row["unbatched"]["throughput_qps"], 0.001
+            )
+            report["levels"][concurrency] = row
+            logger.info(
+                f"  {concurrency} concurrent: unbatched "
+                f"{row['unbatched']['throughput_qps']:.0f} qps, batched "
+                f"{row['batched']['throughput_qps']:.0f} qps"
+            )
+
+        return report
+
+    def run_quantization_benchmark(
+        self,
+        rows: int = 50_000,
+        dimensions: int = 1536,
+        query_count: int = 100,
+        top_k: int = 10,
+        seed: int = 5,
+    ) -> Dict[str, Any]:
+        """Recall@k, latency and memory of the local index storage and
+        quantization options against exact float32 search.
+
+        Synthetic embeddings: a Gaussian mixture in 64 latent dimensions
+        projected to ``dimensions``, so neighbourhoods have the low intrinsic
+        dimension of real text embeddings. Queries are perturbed corpus rows.
+        """
+        import tempfile
+
+        import numpy as np
+
+        from ..api.database.utils.local_vector_index import LocalVectorIndex
+
+        rng = np.random.default_rng(seed)
+        latent = rng.normal(size=(64, 64))[rng.integers(0, 64, rows)]
+        latent += rng.normal(scale=0.5, size=(rows, 64))
+        projection = rng.normal(size=(64, dimensions)) / 8.0
+        vectors = (latent @ projection).astype(np.float32)
+        vectors += rng.normal(scale=0.05, size=vectors.shape).astype(np.float32)
+        chunk_ids = [f"chunk-{i}" for i in range(rows)]
+        queries = vectors[rng.choice(rows, query_count, replace=False)]
+        queries = queries + rng.normal(scale=0.1, size=queries.shape).astype(np.float32)
+
+        configs: List[Tuple[str, Dict[str, Any], Tuple[Optional[int], ...]]] = [
+            ("float32", {"dtype": "float32"}, (None,)),
+            ("float16", {"dtype": "float16"}, (None,)),
+            ("int8", {"dtype": "int8"}, (None,)),
+            ("int8+rescore", {"dtype": "float32", "quantization": "int8"}, (1, 2, 4, 8)),
+            ("pq+rescore", {"dtype": "float32", "quantization": "pq"}, (4, 10, 30)),
+        ]
+        report: Dict[str, Any] = {
+            "timestamp": datetime.utcnow().isoformat(),
+            "rows": rows,
+            "dimensions": dimensions,
+            "query_count": query_count,
+            "top_k": top_k,
+            "configs": [],
+        }
+
+        expected: List[set] = []
+        for name, options, oversamples in configs:
+            with tempfile.TemporaryDirectory() as directory:
+                index = LocalVectorIndex(directory, metric="cosine", **options)
+                start_time = time.perf_counter()
+                for start in range(0, rows, 10_000):
+                    index.add(chunk_ids[start : start + 10_000], vectors[start : start + 10_000])
+                build_s = time.perf_counter() - start_time
+                memory = index.memory_bytes()
+
+                for oversample in oversamples:
+                    latencies: List[float] = []
+                    found: List[set] = []
+                    for query in queries:
+                        start_time = time.perf_counter()
+                        hits = index.search(query, top_k, oversample=oversample)
+                        latencies.append((time.perf_counter() - start_time) * 1000)
+                        found.append({chunk_id for chunk_id, _ in hits})
+                    if not expected:
+                        expected = found  # exact float32 is the reference
+                    recall = statistics.mean(
+                        len(hits & truth) / top_k for hits, truth in zip(found, expected)
+                    )
+                    latencies.sort()
+                    row = {
+                        "name": name if oversample is None else f"{name} x{oversample}",
+                        "recall_at_k": recall,
+                        "p50_latency_ms": statistics.median(latencies),
+                        "p95_latency_ms": latencies[int(len(latencies) * 0.95) - 1],
+                        "scanned_mb": memory["scanned"] / 2**20,
+                        "disk_mb": (memory["vectors"] + memory["codes"]) / 2**20,
+                        "build_s": build_s,
+                    }
+                    report["configs"].append(row)
+                    logger.info(
+                        f"  {row['name']}: recall@{top_k} {recall:.3f}, "
+                        f"p50 {row['p50_latency_ms']:.1f}ms"
+                    )
+
+        return report
+
+    async def run_matryoshka_benchmark(
+        self,
+        dataset_dir: Optional[str] = None,
+        prefix_dims: Tuple[int, ...] = (128, 256, 512),
+        oversamples: Tuple[int, ...] = (2, 4, 8),
+        top_k: int = 5,
+    ) -> Dict[str, Any]:
+        """Recall of two-stage (prefix ANN + full re-rank) vector retrieval
+        on the golden datasets.
+
+        The unique golden contexts are the corpus and the questions the
+        queries, embedded with EmbeddingService (the model that fills
+        embeddings.vec). Each prefix/oversample pair takes the
+        ``top_k * oversample`` nearest contexts by prefix cosine distance and
+        re-ranks them by full cosine distance, as the 0020 prefix index
+        queries do. Reported per pair: recall@k against full-vector search,
+        the share of questions whose golden context is in the top-k, and the
+        prefix index size relative to the full index. Only models trained for
+        truncation (text-embedding-3-*) are expected to keep recall at short
+        prefixes; without OPENAI_API_KEY the embeddings are random
+        placeholders and the numbers say nothing.
+        """
+        import glob
+        import os
+
+        import numpy as np
+
+        from ..api.database.utils.embedding_service import (
+            OPENAI_API_KEY,
+            OPENAI_EMBEDDING_MODEL,
+            EmbeddingService,
+        )
+
+        if dataset_dir is None:
+            dataset_dir = os.path.join(
+                os.path.dirname(os.path.abspath(__file__)), "..", "..", "golden_datasets"
+            )
+        samples: List[Dict[str, Any]] = []
+        for path in sorted(glob.glob(os.path.join(dataset_dir, "golden_dataset_*.json"))):
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            samples.extend(data["samples"] if isinstance(data, dict) else data)
+
+        contexts = sorted({c for sample in samples for c in sample["retrieved_contexts"]})
+        if not contexts:
+            raise ValueError(f"No golden dataset samples with contexts in {dataset_dir}")
+        questions = [s for s in samples if s["retrieved_contexts"]]
+        questions = list({s["question"]: s for s in questions}.values())
+        context_index = {context: i for i, context in enumerate(contexts)}
+        gold = [{context_index[c] for c in s["retrieved_contexts"]} for s in questions]
+
+        corpus = np.asarray(
+            await EmbeddingService.generate_batch_embeddings(contexts), dtype=np.float32
+        )
+        queries = np.asarray(
+            await EmbeddingService.generate_batch_embeddings([s["question"] for s in questions]),
+            dtype=np.float32,
+        )
+        dimensions = corpus.shape[1]
+
+        def nearest(vectors: Any, query: Any, k: int, dims: int) -> Any:
+            prefix = vectors[:, :dims]
+            similarity = prefix @ query[:dims] / (
+                np.linalg.norm(prefix, axis=1) * np.linalg.norm(query[:dims]) + 1e-12
+            )
+            return np.argsort(-similarity)[:k]
+
+        full = [nearest(corpus, query, top_k, dimensions) for query in queries]
+        report: Dict[str, Any] = {
+            "timestamp": datetime.utcnow().isoformat(),
+            "embedding_model": OPENAI_EMBEDDING_MODEL if OPENAI_API_KEY else "dummy",
+            "contexts": len(contexts),
+            "questions": len(questions),
+            "dimensions": dimensions,
+            "top_k": top_k,
+            "full_hit_rate": statistics.mean(
+                bool(set(found) & truth) for found, truth in zip(full, gold)
+            ),
+            "configs": [],
+        }
+
+        for dims in prefix_dims:
+            for oversample in oversamples:
+                recalls: List[float] = []
+                hits: List[bool] = []
+                for query, expected, truth in zip(queries, full, gold):
+                    candidates = nearest(corpus, query, top_k * oversample, dims)
+                    found = candidates[nearest(corpus[candidates], query, top_k, dimensions)]
+                    recalls.append(len(set(found) & set(expected)) / len(expected))
+                    hits.append(bool(set(found) & truth))
+                row = {
+                    "name": f"prefix {dims} x{oversample}",
+                    "prefix_dims": dims,
+                    "oversample": oversample,
+                    "recall_at_k": statistics.mean(recalls),
+                    "hit_rate": statistics.mean(hits),
+                    "index_ratio": dims / dimensions,
+                }
+                report["configs"].append(row)
+                logger.info(
+                    f"  {row['name']}: recall@{top_k} {row['recall_at_k']:.3f}, "
+                    f"hit rate {row['hit_rate']:.3f}"
+                )
+
+        return report
+
+    def print_comparison(self, title: str, results: Dict[str, Any]) -> None:
+        """Print a before/after latency comparison"""
+        print("\n" + "=" * 60)
+        print(title)
+        print("=" * 60)
+        if "corpus_size" in results:
+            print(f"Corpus size: {results['corpus_size']:,} chunks")
+        print(f"Queries: {results.get('query_count', 0)}")
+        for label in ("before", "after"):
+            summary = results.get(label, {})
+            print(
+                f"  {label.upper():6} {summary.get('test_name', ''):28} "
+                f"P50: {summary.get('p50_latency_ms', 0):8.1f}ms  "
+                f"P95: {summary.get('p95_latency_ms', 0):8.1f}ms"
+            )
+        print(
+            f"  Speedup - P50: {results.get('p50_speedup', 0):.1f}x, "
+            f"P95: {results.get('p95_speedup', 0):.1f}x"
+        )
+        print("=" * 60)
+
     async def run_comprehensive_benchmark(self) -> Dict[str, Any]:
         """Run comprehensive benchmark suite"""
         logger.info("Starting comprehensive benchmark suite")
@@ -519,6 +1274,51 @@ async def main() -> int:
     )
     parser.add_argument("--output", type=str, help="Output filename for results")
     parser.add_argument("--verbose", action="store_true", help="Verbose logging")
+    parser.add_argument(
+        "--bm25-tsvector",
+        action="store_true",
+        help="Compare per-row to_tsvector BM25 with the stored search_tsv column",
+    )
+    parser.add_argument(
+        "--fusion-modes",
+        action="store_true",
+        help="Compare two-query client fusion with single-statement server fusion",
+    )
+    parser.add_argument(
+        "--fusion-micro",
+        action="store_true",
+        help="CPU micro-benchmark of fusion + rerank at 50/500/5000 candidates",
+    )
+    parser.add_argument(
+        "--embedding-batching",
+        action="store_true",
+        help="Query-embedding throughput at 1/10/100 concurrent searches, with and without micro-batching",
+    )
+    parser.add_argument(
+        "--quantization",
+        action="store_true",
+        help="Recall@10, latency and memory of local index float16/int8/PQ storage vs exact float32",
+    )
+    parser.add_argument(
+        "--matryoshka",
+        action="store_true",
+        help="Recall of two-stage prefix ANN + full re-rank retrieval on the golden datasets",
+    )
+    parser.add_argument(
+        "--fusion-method",
+        choices=["rrf", "min_max"],
+        default="rrf",
+        help="Server fusion method for --fusion-modes",
+    )
+    parser.add_argument(
+        "--corpus-size",
+        type=int,
+        default=1_000_000,
+        help="Synthetic corpus size for database-level benchmarks",
+    )
+    parser.add_argument(
+        "--queries", type=int, default=30, help="Queries per database-level variant"
+    )
 
     args = parser.parse_args()
 
@@ -527,6 +1327,82 @@ async def main() -> int:
 
     benchmark = SearchBenchmark()
 
+    if args.bm25_tsvector:
+        comparison = await benchmark.run_bm25_tsvector_benchmark(
+            corpus_size=args.corpus_size, query_count=args.queries
+        )
+        benchmark.save_results(comparison, args.output)
+        benchmark.print_comparison("BM25: PER-ROW to_tsvector vs STORED search_tsv", comparison)
+        return 0
+
+    if args.fusion_micro:
+        report = benchmark.run_fusion_microbenchmark()
+        benchmark.save_results(report, args.output)
+        print("\nFUSION + RERANK MICRO-BENCHMARK (p50)")
+        for size, row in report["sizes"].items():
+            print(
+                f"  {size:>5} candidates: legacy {row['legacy_p50_ms']:8.2f}ms  "
+                f"vectorized {row['vectorized_p50_ms']:8.2f}ms  "
+                f"speedup {row['speedup']:.1f}x"
+            )
+        return 0
+
+    if args.embedding_batching:
+        report = await benchmark.run_embedding_batching_benchmark()
+        benchmark.save_results(report, args.output)
+        print("\nQUERY EMBEDDING THROUGHPUT (simulated serialized encoder)")
+        for concurrency, row in report["levels"].items():
+            print(
+                f"  {concurrency:>4} concurrent: unbatched "
+                f"{row['unbatched']['throughput_qps']:7.1f} qps "
+                f"({row['unbatched']['backend_calls']} calls)  batched "
+                f"{row['batched']['throughput_qps']:7.1f} qps "
+                f"({row['batched']['backend_calls']} calls)  "
+                f"speedup {row['speedup']:.1f}x"
+            )
+        return 0
+
+    if args.quantization:
+        report = benchmark.run_quantization_benchmark(
+            query_count=20 if args.quick else 100
+        )
+        benchmark.save_results(report, args.output)
+        print(
+            f"\nVECTOR QUANTIZATION ({report['rows']:,} x {report['dimensions']}, "
+            f"recall@{report['top_k']} vs exact float32)"
+        )
+        for row in report["configs"]:
+            print(
+                f"  {row['name']:18} recall {row['recall_at_k']:.3f}  "
+                f"P50: {row['p50_latency_ms']:7.1f}ms  P95: {row['p95_latency_ms']:7.1f}ms  "
+                f"scanned {row['scanned_mb']:7.1f}MB  disk {row['disk_mb']:7.1f}MB"
+            )
+        return 0
+
+    if args.matryoshka:
+        report = await benchmark.run_matryoshka_benchmark()
+        benchmark.save_results(report, args.output)
+        print(
+            f"\nTWO-STAGE PREFIX RETRIEVAL ({report['questions']} questions over "
+            f"{report['contexts']} golden contexts, {report['embedding_model']} "
+            f"embeddings, recall@{report['top_k']} vs full {report['dimensions']}-d search)"
+        )
+        print(f"  {'full':18} recall 1.000  hit rate {report['full_hit_rate']:.3f}  index 1.00x")
+        for row in report["configs"]:
+            print(
+                f"  {row['name']:18} recall {row['recall_at_k']:.3f}  "
+                f"hit rate {row['hit_rate']:.3f}  index {row['index_ratio']:.2f}x"
+            )
+        return 0
+
+    if args.fusion_modes:
+        comparison = await benchmark.run_fusion_mode_benchmark(
+            server_fusion_method=args.fusion_method
+        )
+        benchmark.save_results(comparison, args.output)
+        benchmark.print_comparison("HYBRID FUSION: CLIENT (2 queries) vs SERVER (1 CTE)", comparison)
+        return 0
+
     # Run benchmark
     results = await benchmark.run_comprehensive_benchmark()
 
@@ -0,0 +1,217 @@
+"""
+Streaming JSON helpers for SecurityMiddleware
+
+- JSONFieldCounter checks request bodies chunk by chunk as they arrive,
+  so an oversized or malformed body is rejected before the rest of it is
+  read and nothing has to be parsed into Python objects just to count it.
+- skip_response_sanitization marks routes whose responses need no PII
+  masking; SecurityMiddleware passes their responses through untouched
+  (streaming responses stay streaming).
+- json_loads/json_dumps use orjson when it is installed.
+
+@CODE:AUTH-004
+"""
+
+import json
+import re
+from typing import Any, Callable, List, Optional, TypeVar, cast
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+SKIP_RESPONSE_SANITIZATION_ATTR = "__skip_response_sanitization__"
+
+# Punctuation or a bare literal (number/true/false/null) between strings;
+# whitespace is skipped
+_TOKEN = re.compile(rb"([\[\]{}:,])|([^ \t\n\r\[\]{}:,]+)")
+_LITERAL = re.compile(rb"-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?|true|false|null")
+# Longest bare literal carried over between chunks
+_MAX_LITERAL = 1024
+
+_PUNCT, _BARE, _STRING = 1, 2, 3
+
+# Parser states: what may come next
+_VALUE, _VALUE_OR_END, _KEY, _KEY_OR_END, _COLON, _COMMA_OR_END, _DONE = range(7)
+
+
+def json_loads(data: bytes) -> Any:
+    """Parse JSON bytes"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(data: Any) -> bytes:
+    """Serialize to compact JSON bytes"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def skip_response_sanitization(endpoint: F) -> F:
+    """Route decorator: return this endpoint's responses without sanitizing them
+
+    Only for endpoints whose output cannot contain user PII. Apply it
+    together with the router decorator, in either order.
+    """
+    setattr(endpoint, SKIP_RESPONSE_SANITIZATION_ATTR, True)
+    return endpoint
+
+
+def is_response_sanitization_skipped(scope: Any) -> bool:
+    """Whether the route that handled this ASGI scope is marked as safe"""
+    endpoint = scope.get("endpoint")
+    return bool(getattr(endpoint, SKIP_RESPONSE_SANITIZATION_ATTR, False))
+
+
+class JSONTooComplex(ValueError):
+    """The document has more fields or deeper nesting than allowed"""
+
+
+class JSONFieldCounter:
+    """Incremental JSON validator that counts fields.
+
+    Counts like SecurityMiddleware always has: every object key and every
+    scalar value is one field. Call :meth:`feed` with each chunk and
+    :meth:`close` at the end; both raise JSONTooComplex as soon as
+    ``max_fields`` or ``max_depth`` is exceeded and ValueError for
+    malformed JSON. Only a partial literal is held between chunks, never
+    the document.
+    """
+
+    def __init__(self, max_fields: int, max_depth: int = 10):
+        self.max_fields = max_fields
+        self.max_depth = max_depth
+        self.fields = 0
+
+        self._stack: List[bytes] = []
+        self._expect = _VALUE
+        self._literal = b""  # bare literal cut off at the end of a chunk
+        self._in_string = False  # inside a string cut off at the end of a chunk
+        self._escaped = False  # ... whose last byte was an unpaired backslash
+
+    def feed(self, chunk: bytes) -> None:
+        """Scan the next chunk of the document"""
+        buffer = self._literal + chunk if self._literal else chunk
+        self._literal = b""
+        pos = 0
+        end = len(buffer)
+
+        if self._in_string:
+            pos = self._string_end(buffer, 0)
+            if pos < 0:
+                return
+            self._token(_STRING, b"")
+
+        while pos < end:
+            # Strings are skipped with find(); only the bytes between them
+            # go through the tokenizer
+            quote = buffer.find(b'"', pos)
+            segment_end = end if quote < 0 else quote
+            for match in _TOKEN.finditer(buffer, pos, segment_end):
+                # Every alternative is a group, so lastindex is always set
+                kind = cast(int, match.lastindex)
+                if kind == _BARE and quote < 0 and match.end() == end:
+                    # May continue in the next chunk
+                    self._literal = match.group(_BARE)
+                    if len(self._literal) > _MAX_LITERAL:
+                        raise ValueError("Invalid JSON literal")
+                    return
+                self._token(kind, match.group(kind))
+            if quote < 0:
+                return
+
+            pos = self._string_end(buffer, quote + 1)
+            if pos < 0:
+                return
+            self._token(_STRING, b"")
+
+    def _string_end(self, buffer: bytes, start: int) -> int:
+        """Position after the closing quote of the string whose content
+        starts at ``start``, or -1 (and remember the state) if it is not
+        in this buffer"""
+        self._in_string = True
+        if self._escaped:
+            if start >= len(buffer):
+                return -1
+            start += 1  # the escaped byte
+            self._escaped = False
+        pos = start
+        while True:
+            quote = buffer.find(b'"', pos)
+            if quote < 0:
+                self._escaped = _backslashes_before(buffer, len(buffer), start) % 2 == 1
+                return -1
+            if _backslashes_before(buffer, quote, start) % 2 == 0:
+                self._in_string = False
+                return quote + 1
+            pos = quote + 1
+
+    def close(self) -> int:
+        """Finish the document and return its field count"""
+        if self._literal:
+            literal, self._literal = self._literal, b""
+            self._token(_BARE, literal)
+        if self._in_string or self._expect != _DONE:
+            raise ValueError("Truncated JSON document")
+        return self.fields
+
+    def _token(self, kind: Optional[int], value: bytes) -> None:
+        expect = self._expect
+        stack = self._stack
+
+        if kind == _PUNCT:
+            if value == b":":
+                if expect != _COLON:
+                    raise ValueError("Unexpected ':'")
+                self._expect = _VALUE
+            elif value == b",":
+                if expect != _COMMA_OR_END:
+                    raise ValueError("Unexpected ','")
+                self._expect = _KEY if stack[-1] == b"{" else _VALUE
+            elif value == b"{" or value == b"[":
+                self._value_start(expect)
+                stack.append(value)
+                self._expect = _KEY_OR_END if value == b"{" else _VALUE_OR_END
+            else:
+                opener = b"{" if value == b"}" else b"["
+                if not stack or stack[-1] != opener or expect not in (
+                    _KEY_OR_END if opener == b"{" else _VALUE_OR_END,
+                    _COMMA_OR_END,
+                ):
+                    raise ValueError(f"Unexpected '{value.decode()}'")
+                stack.pop()
+                self._expect = _COMMA_OR_END if stack else _DONE
+            return
+
+        # A key or a scalar value: one field
+        if kind == _STRING and (expect == _KEY or expect == _KEY_OR_END):
+            self._expect = _COLON
+        else:
+            self._value_start(expect)
+            if kind == _BARE and _LITERAL.fullmatch(value) is None:
+                raise ValueError("Invalid JSON literal")
+            self._expect = _COMMA_OR_END if stack else _DONE
+        self.fields += 1
+        if self.fields > self.max_fields:
+            raise JSONTooComplex(f"JSON has more than {self.max_fields} fields")
+
+    def _value_start(self, expect: int) -> None:
+        if expect != _VALUE and expect != _VALUE_OR_END:
+            raise ValueError("Unexpected value")
+        if len(self._stack) > self.max_depth:
+            raise JSONTooComplex(f"JSON nested deeper than {self.max_depth}")
+
+
+def _backslashes_before(buffer: bytes, pos: int, start: int) -> int:
+    """Length of the run of backslashes ending just before ``pos``"""
+    run_start = pos
+    while run_start > start and buffer[run_start - 1] == 0x5C:
+        run_start -= 1
+    return pos - run_start
@@ -6,17 +6,23 @@ Integrates with the security framework for request/response processing
 @CODE:AUTH-002
 """
 
-import json
 import logging
 import time
 from datetime import datetime
-from typing import Dict, List, Optional, Any, cast
+from typing import Dict, Optional, Any, cast
 from fastapi import Request, Response, HTTPException, status
 from fastapi.middleware.base import BaseHTTPMiddleware
 from starlette.middleware.base import RequestResponseEndpoint
 from starlette.responses import JSONResponse
 
 from ..core.security_manager import SecurityManager, SecurityException, SecurityContext
+from .json_stream import (
+    JSONFieldCounter,
+    JSONTooComplex,
+    is_response_sanitization_skipped,
+    json_dumps,
+    json_loads,
+)
 # Future implementations - not yet available
 from ..audit.audit_logger import EventType, SeverityLevel  # type: ignore[import-not-found]  # TODO: Implement audit logger module
 
@@ -118,9 +124,6 @@ class SecurityMiddleware(BaseHTTPMiddleware):
         self.blocked_ips = set(self.config.get("blocked_ips", []))
         self.allowed_ips = set(self.config.get("allowed_ips", []))  # Empty = allow all
 
-        # Request tracking
-        self._request_counts: Dict[str, List[float]] = {}
-
         logger.info("SecurityMiddleware initialized with comprehensive OWASP controls")
 
     async def dispatch(
@@ -161,8 +164,12 @@ class SecurityMiddleware(BaseHTTPMiddleware):
             # 4. Process request
             response = await call_next(request)
 
-            # 5. Output sanitization
-            if self.enable_output_sanitization and security_context:
+            # 5. Output sanitization (routes marked safe pass straight through)
+            if (
+                self.enable_output_sanitization
+                and security_context
+                and not is_response_sanitization_skipped(request.scope)
+            ):
                 response = await self._sanitize_response(
                     response, security_context, request_id
                 )
@@ -312,28 +319,39 @@ class SecurityMiddleware(BaseHTTPMiddleware):
             content_type = request.headers.get("content-type", "")
 
             if "application/json" in content_type:
-                # Get request body
-                body = await request.body()
-                if body:
-                    try:
-                        json_data = json.loads(body)
-
-                        # Check JSON complexity
-                        if self._count_json_fields(json_data) > self.max_json_fields:
-                            raise SecurityException("JSON too complex")
+                try:
+                    # Check size and JSON complexity while the body streams in,
+                    # stopping at the first chunk that breaks a limit
+                    counter = JSONFieldCounter(self.max_json_fields)
+                    chunks = []
+                    size = 0
+                    async for chunk in request.stream():
+                        size += len(chunk)
+                        if size > self.max_request_size:
+                            raise SecurityException("Request too large")
+                        counter.feed(chunk)
+                        chunks.append(chunk)
+
+                    body = b"".join(chunks)
+                    # Hand the buffered body on to the endpoint
+                    request._body = body
+                    if body:
+                        counter.close()
 
                         # Sanitize JSON data
                         if security_context:
                             sanitized_data = (
                                 await self.security_manager.sanitize_request_data(
-                                    json_data, security_context
+                                    json_loads(body), security_context
                                 )
                             )
                             # Store sanitized data for use by endpoint
                             request.state.sanitized_data = sanitized_data
 
-                    except json.JSONDecodeError:
-                        raise SecurityException("Invalid JSON format")
+                except JSONTooComplex:
+                    raise SecurityException("JSON too complex")
+                except ValueError:
+                    raise SecurityException("Invalid JSON format")
 
             # Validate query parameters
             query_params = dict(request.query_params)
@@ -356,32 +374,55 @@ class SecurityMiddleware(BaseHTTPMiddleware):
 
         try:
             # Only sanitize JSON responses
-            if response.headers.get("content-type", "").startswith("application/json"):
-                body = response.body
-                if body:
-                    try:
-                        response_data = json.loads(body)
-                        sanitized_data = (
-                            await self.security_manager.sanitize_response_data(
-                                response_data, security_context
-                            )
-                        )
-
-                        # Update response body
-                        sanitized_body = json.dumps(sanitized_data).encode()
-                        response.body = sanitized_body
-                        response.headers["content-length"] = str(len(sanitized_body))
-
-                    except (json.JSONDecodeError, UnicodeDecodeError):
-                        # If we can't parse the JSON, leave it as-is
-                        pass
+            if not response.headers.get("content-type", "").startswith(
+                "application/json"
+            ):
+                return response
+
+            body = getattr(response, "body", None)
+            if body is None:
+                # Responses from call_next are streamed; collect the body
+                body = b"".join(
+                    [chunk async for chunk in response.body_iterator]  # type: ignore[attr-defined]
+                )
+                response = self._with_body(response, body)
+            if not body:
+                return response
+
+            try:
+                response_data = json_loads(body)
+            except ValueError:
+                # If we can't parse the JSON, leave it as-is
+                return response
+
+            sanitized_data = await self.security_manager.sanitize_response_data(
+                response_data, security_context
+            )
+            if sanitized_data is response_data:
+                # Nothing masked: keep the original bytes
+                return response
 
-            return response
+            return self._with_body(response, json_dumps(sanitized_data))
 
         except Exception as e:
             logger.error(f"Response sanitization failed: {e}")
             return response
 
+    @staticmethod
+    def _with_body(response: Response, body: bytes) -> Response:
+        """Copy of a response with a new body and matching content-length"""
+        new_response = Response(
+            content=body,
+            status_code=response.status_code,
+            background=getattr(response, "background", None),
+        )
+        new_response.raw_headers = [
+            (name, value)
+            for name, value in response.raw_headers
+            if name != b"content-length"
+        ] + [(b"content-length", str(len(body)).encode())]
+        return new_response
+
     # @CODE:MYPY-CONSOLIDATION-002 | Phase 3: no-untyped-def resolution
     def _add_security_headers(self, response: Response) -> None:
         """Add security headers to response"""
@@ -398,27 +439,16 @@ class SecurityMiddleware(BaseHTTPMiddleware):
 
     async def _check_rate_limit(self, identifier: str) -> bool:
         """Check rate limiting for IP or user"""
-
-        current_time = time.time()
-        window_start = current_time - self.rate_limit_window
-
-        if identifier not in self._request_counts:
-            self._request_counts[identifier] = []
-
-        # Clean old requests
-        self._request_counts[identifier] = [
-            req_time
-            for req_time in self._request_counts[identifier]
-            if req_time > window_start
-        ]
-
-        # Check limit
-        if len(self._request_counts[identifier]) >= self.rate_limit_requests:
-            return False
-
-        # Add current request
-        self._request_counts[identifier].append(current_time)
-        return True
+        from apps.api.middleware.rate_limiter import rate_limiter
+
+        # Shared with the API rate limiter; enforced per process without Redis
+        decision = await rate_limiter.check_rate_limit(
+            f"security:{identifier}",
+            self.rate_limit_requests,
+            self.rate_limit_window,
+            local_fallback=True,
+        )
+        return decision.allowed
 
     def _get_client_ip(self, request: Request) -> str:
         """Get client IP address from request"""
@@ -478,26 +508,6 @@ class SecurityMiddleware(BaseHTTPMiddleware):
         user_agent_lower = user_agent.lower()
         return any(pattern in user_agent_lower for pattern in suspicious_patterns)
 
-    def _count_json_fields(self, data: Any, depth: int = 0) -> int:
-        """Count fields in JSON data recursively"""
-
-        if depth > 10:  # Prevent deep recursion
-            return 1000  # Return high count to trigger limit
-
-        count = 0
-
-        if isinstance(data, dict):
-            count = len(data)
-            for value in data.values():
-                count += self._count_json_fields(value, depth + 1)
-        elif isinstance(data, list):
-            for item in data:
-                count += self._count_json_fields(item, depth + 1)
-        else:
-            count = 1
-
-        return count
-
     def _create_error_response(
         self, status_code: int, message: str, request_id: str
     ) -> JSONResponse:
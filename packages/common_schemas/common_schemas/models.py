@@ -39,6 +39,8 @@ class SearchRequest(BaseModel):
     include_highlights: bool = Field(True, description="Include highlighted text snippets")
     search_mode: Optional[str] = Field("hybrid", description="Search mode: hybrid, bm25, vector")
     use_neural: bool = Field(False, description="Enable neural vector search (SPEC-NEURAL-001)")
+    ef_search: Optional[int] = Field(None, description="HNSW ef_search for this request (higher = better recall, slower)", ge=1, le=1000)
+    probes: Optional[int] = Field(None, description="IVFFlat probes for this request (higher = better recall, slower)", ge=1, le=32768)
 
 
 class SearchResponse(BaseModel):
@@ -229,3 +229,44 @@ Overlap should be approximately 128 tokens."""
         if len(chunks) > 1:
             for i in range(len(chunks) - 1):
                 assert chunks[i].token_count <= 50
+
+    def test_chunker_positions_are_character_offsets(self):
+        chunker = IntelligentChunker(chunk_size=20, overlap_size=5)
+
+        text = "Alpha beta gamma. Delta epsilon zeta!\n\nEta theta iota. Kappa lambda."
+
+        for chunk in chunker.chunk_text(text):
+            source = text[chunk.start_position : chunk.end_position]
+            assert source.split() == chunk.text.split()
+            assert chunk.token_count <= 20
+
+    def test_chunker_stream_matches_chunk_text(self):
+        chunker = IntelligentChunker(chunk_size=30, overlap_size=8)
+
+        text = "\n\n".join(
+            ". ".join(f"Paragraph {p} sentence {i}" for i in range(12)) + "."
+            for p in range(5)
+        )
+        pieces = [text[i : i + 13] for i in range(0, len(text), 13)]
+
+        streamed = list(chunker.iter_chunks(pieces))
+
+        assert streamed == chunker.chunk_text(text)
+
+    def test_chunker_encodes_each_paragraph_once(self, monkeypatch):
+        chunker = IntelligentChunker(chunk_size=50, overlap_size=10)
+        calls = []
+        encode = chunker.encoding.encode_ordinary
+
+        def counting_encode(text):
+            calls.append(text)
+            return encode(text)
+
+        monkeypatch.setattr(chunker.encoding, "encode_ordinary", counting_encode)
+
+        text = "\n\n".join(" ".join(["word"] * 120) + ". Short one." for _ in range(3))
+        chunks = chunker.chunk_text(text)
+
+        assert len(calls) == 3
+        assert any(not c.sentence_boundary_preserved for c in chunks)
+        assert all(c.token_count <= 50 for c in chunks)
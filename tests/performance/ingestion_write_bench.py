@@ -0,0 +1,146 @@
+"""
+Ingestion write-path benchmark: ORM unit-of-work vs bulk writer.
+
+Column types are chosen from DATABASE_URL at import time, so this runs as a
+separate process per database:
+
+    python -m tests.performance.ingestion_write_bench sqlite+aiosqlite:///bench.db
+
+Prints one JSON object with docs/sec and chunks/sec per write path.
+
+@TEST:INGESTION-005
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import datetime
+
+
+def _document_rows(docs, chunks_per_doc, dims):
+    vector = [0.001 * i for i in range(dims)]
+    for _ in range(docs):
+        doc_id = uuid.uuid4()
+        chunks = [
+            {
+                "chunk_id": uuid.uuid4(),
+                "doc_id": doc_id,
+                "text": f"Benchmark chunk {idx} " * 40,
+                "span": f"{idx},{idx + 800}",
+                "chunk_index": idx,
+                "chunk_metadata": {"language": "en"},
+                "token_count": 160,
+                "has_pii": False,
+                "pii_types": [],
+                "content_hash": uuid.uuid4().hex + uuid.uuid4().hex,
+                "created_at": datetime.utcnow(),
+            }
+            for idx in range(chunks_per_doc)
+        ]
+        document = {
+            "doc_id": doc_id,
+            "source_url": f"bench://{doc_id}",
+            "title": "bench.txt",
+            "content_type": "application/txt",
+            "checksum": uuid.uuid4().hex + uuid.uuid4().hex,
+            "doc_metadata": {},
+            "processed_at": datetime.utcnow(),
+            "created_at": datetime.utcnow(),
+        }
+        yield document, chunks, vector
+
+
+async def _run_orm(async_session, rows, model_name):
+    from apps.api.database import Document, DocumentChunk, Embedding
+
+    for document, chunks, vector in rows:
+        async with async_session() as session:
+            session.add(Document(**document))
+            for chunk in chunks:
+                session.add(DocumentChunk(**chunk))
+                session.add(
+                    Embedding(
+                        embedding_id=uuid.uuid4(),
+                        chunk_id=chunk["chunk_id"],
+                        vec=vector,
+                        model_name=model_name,
+                    )
+                )
+            await session.commit()
+
+
+async def _run_bulk(async_session, rows, model_name, docs_per_transaction):
+    from apps.ingestion.batch.writer import DocumentWrite, apply_document_writes
+
+    writes = [
+        DocumentWrite(
+            doc_id=document["doc_id"],
+            document=document,
+            chunks=chunks,
+            embeddings=[(chunk["chunk_id"], vector) for chunk in chunks],
+            model_name=model_name,
+        )
+        for document, chunks, vector in rows
+    ]
+    for start in range(0, len(writes), docs_per_transaction):
+        async with async_session() as session:
+            await apply_document_writes(
+                session, writes[start : start + docs_per_transaction]
+            )
+            await session.commit()
+
+
+async def run(docs, chunks_per_doc, dims, docs_per_transaction):
+    from apps.core.db_session import async_session, engine
+    from apps.api.database import Base, Document, DocumentChunk, Embedding
+
+    tables = [Document.__table__, DocumentChunk.__table__, Embedding.__table__]
+    async with engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            await conn.exec_driver_sql("CREATE EXTENSION IF NOT EXISTS vector")
+        await conn.run_sync(lambda sync_conn: Base.metadata.create_all(sync_conn, tables=tables))
+
+    model_name = "bench-model"
+    results = {"dialect": engine.dialect.name, "docs": docs, "chunks_per_doc": chunks_per_doc}
+    doc_ids = []
+    try:
+        for name, runner in (
+            ("orm", lambda rows: _run_orm(async_session, rows, model_name)),
+            (
+                "bulk",
+                lambda rows: _run_bulk(async_session, rows, model_name, docs_per_transaction),
+            ),
+        ):
+            rows = list(_document_rows(docs, chunks_per_doc, dims))
+            doc_ids.extend(document["doc_id"] for document, _, _ in rows)
+            started = time.perf_counter()
+            await runner(rows)
+            elapsed = time.perf_counter() - started
+            results[name] = {
+                "seconds": elapsed,
+                "docs_per_sec": docs / elapsed,
+                "chunks_per_sec": docs * chunks_per_doc / elapsed,
+            }
+    finally:
+        async with engine.begin() as conn:
+            doc_table = Document.__table__
+            chunk_table = DocumentChunk.__table__
+            chunk_ids = chunk_table.select().with_only_columns(chunk_table.c.chunk_id).where(
+                chunk_table.c.doc_id.in_(doc_ids)
+            )
+            await conn.execute(
+                Embedding.__table__.delete().where(Embedding.__table__.c.chunk_id.in_(chunk_ids))
+            )
+            await conn.execute(chunk_table.delete().where(chunk_table.c.doc_id.in_(doc_ids)))
+            await conn.execute(doc_table.delete().where(doc_table.c.doc_id.in_(doc_ids)))
+        await engine.dispose()
+    return results
+
+
+if __name__ == "__main__":
+    os.environ["DATABASE_URL"] = sys.argv[1]
+    docs, chunks_per_doc, dims, per_tx = (int(arg) for arg in sys.argv[2:6])
+    print(json.dumps(asyncio.run(run(docs, chunks_per_doc, dims, per_tx))))
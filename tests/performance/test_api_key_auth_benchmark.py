@@ -0,0 +1,121 @@
+"""
+API key authentication overhead per request
+
+Compares the previous verification path - row lookup, PBKDF2, loading the
+last hour's usage rows to count them, then a usage insert and commit on
+every request - with APIKeyManager.verify_api_key in front of the verified
+key cache, Redis/in-memory rate counters and the batched usage writer.
+Runs against a SQLite database file.
+
+@TEST:AUTH-003
+"""
+
+import hashlib
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from apps.api.security.api_key_cache import VerifiedKeyCache
+from apps.api.security.api_key_generator import SecureAPIKeyGenerator
+from apps.api.security.api_key_storage import APIKey, APIKeyManager, APIKeyUsage, Base
+from apps.api.security.api_key_usage import KeyRateLimiter, UsageLogWriter
+
+PLAINTEXT_KEY = "write_Zm9vYmFyYmF6cXV4cXV1eGNvcmdlZ3JhdWx0Z2FycGx5"
+REQUESTS = 200
+
+
+async def legacy_verify(session, plaintext_key, client_ip, endpoint, method):
+    """verify_api_key as it was before the cache"""
+    key_id = hashlib.md5(plaintext_key.encode()).hexdigest()[:16]
+    result = await session.execute(
+        select(APIKey).where(and_(APIKey.key_id == key_id, APIKey.is_active))
+    )
+    api_key = result.scalar_one_or_none()
+    assert SecureAPIKeyGenerator.verify_key_hash(plaintext_key, api_key.key_hash)
+
+    one_hour_ago = datetime.now(timezone.utc) - timedelta(hours=1)
+    result = await session.execute(
+        select(APIKeyUsage).where(
+            and_(APIKeyUsage.key_id == key_id, APIKeyUsage.timestamp > one_hour_ago)
+        )
+    )
+    assert len(result.scalars().all()) < api_key.rate_limit
+
+    api_key.total_requests += 1
+    api_key.last_used_at = datetime.now(timezone.utc)
+    session.add(
+        APIKeyUsage(
+            key_id=key_id,
+            endpoint=endpoint,
+            method=method,
+            client_ip=client_ip,
+            status_code=200,
+        )
+    )
+    await session.commit()
+
+
+async def time_requests(session_factory, verify):
+    started = time.perf_counter()
+    for _ in range(REQUESTS):
+        # A session per request, as in apps.api.deps.verify_api_key
+        async with session_factory() as session:
+            await verify(session)
+    return (time.perf_counter() - started) * 1000 / REQUESTS
+
+
+class TestAPIKeyAuthBenchmark:
+    """Per-request authentication cost, before and after the key cache"""
+
+    @pytest.mark.slow
+    @pytest.mark.benchmark
+    async def test_auth_overhead_per_request(self, tmp_path):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'auth.db'}")
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with session_factory() as session:
+            session.add(
+                APIKey(
+                    key_id=hashlib.md5(PLAINTEXT_KEY.encode()).hexdigest()[:16],
+                    key_hash=SecureAPIKeyGenerator.generate_secure_hash(PLAINTEXT_KEY),
+                    name="bench",
+                    rate_limit=100000,
+                )
+            )
+            await session.commit()
+
+        try:
+            legacy_ms = await time_requests(
+                session_factory,
+                lambda s: legacy_verify(s, PLAINTEXT_KEY, "10.0.0.1", "/search", "GET"),
+            )
+
+            cache = VerifiedKeyCache(ttl_s=60)
+            cache.start_listener = lambda: None  # no Redis here
+            limiter = KeyRateLimiter()
+            limiter._retry_redis_at = float("inf")
+            writer = UsageLogWriter(session_factory)
+
+            async def cached_verify(session):
+                manager = APIKeyManager(
+                    session, key_cache=cache, rate_limiter=limiter, usage_writer=writer
+                )
+                info = await manager.verify_api_key(PLAINTEXT_KEY, "10.0.0.1", "/search", "GET")
+                assert info is not None
+
+            cached_ms = await time_requests(session_factory, cached_verify)
+            await writer.flush()
+        finally:
+            await engine.dispose()
+
+        print(f"\nAPI key auth overhead ({REQUESTS} requests, SQLite):")
+        print(f"  before (DB + PBKDF2 + row count + commit): {legacy_ms:8.3f} ms/request")
+        print(f"  after  (verified key cache):               {cached_ms:8.3f} ms/request")
+        print(f"  usage rows written in {writer.stats['batches']} batch(es)")
+
+        assert writer.stats["written"] == REQUESTS
+        assert cached_ms * 10 < legacy_ms
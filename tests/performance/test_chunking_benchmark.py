@@ -9,6 +9,9 @@ Tests performance metrics for intelligent chunking:
 @TEST:PERFORMANCE-001
 """
 
+import time
+import tracemalloc
+
 import pytest
 from apps.ingestion.chunking.intelligent_chunker import IntelligentChunker
 
@@ -254,3 +257,54 @@ class TestChunkingPerformanceBenchmark:
             print(
                 f"{name:<15} | {len(chunks):<8} | {boundary_rate * 100:.2f}%{'':<10} | {'≥90%':<8} | {status:<8}"
             )
+
+    @pytest.mark.slow
+    @pytest.mark.benchmark
+    def test_streaming_10mb(self):
+        paragraph = (
+            "Natural language processing is a field of artificial intelligence. "
+            "It focuses on the interaction between computers and humans! "
+            "Does chunking keep sentence boundaries? It should, almost always.\n"
+        ) * 6
+        repeats = (10 * 1024 * 1024) // (len(paragraph) + 1) + 1
+
+        def stream():
+            for _ in range(repeats):
+                yield paragraph
+                yield "\n"
+
+        encode_calls = 0
+        encode = self.chunker.encoding.encode_ordinary
+
+        def counting_encode(text):
+            nonlocal encode_calls
+            encode_calls += 1
+            return encode(text)
+
+        self.chunker.encoding.encode_ordinary = counting_encode
+        try:
+            tracemalloc.start()
+            start = time.perf_counter()
+            chunk_count = 0
+            max_tokens = 0
+            for chunk in self.chunker.iter_chunks(stream()):
+                chunk_count += 1
+                max_tokens = max(max_tokens, chunk.token_count)
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        finally:
+            del self.chunker.encoding.encode_ordinary
+
+        size_mb = repeats * (len(paragraph) + 1) / (1024 * 1024)
+        print(f"\n10MB streaming test:")
+        print(f"  Input: {size_mb:.1f} MB in {repeats} paragraphs")
+        print(f"  Chunks: {chunk_count}")
+        print(f"  tiktoken calls: {encode_calls}")
+        print(f"  Time: {elapsed:.2f}s ({size_mb / elapsed:.1f} MB/s)")
+        print(f"  Peak traced memory: {peak / (1024 * 1024):.1f} MB")
+
+        assert encode_calls == repeats
+        assert max_tokens <= 500
+        # Streaming: memory is bounded by a paragraph plus a chunk, not the input
+        assert peak < 5 * 1024 * 1024
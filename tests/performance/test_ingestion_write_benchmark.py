@@ -0,0 +1,79 @@
+"""
+Ingestion write-path benchmarks (docs/sec, chunks/sec)
+
+Runs tests/performance/ingestion_write_bench.py against SQLite and, when
+INGESTION_BENCH_POSTGRES_URL points at a local PostgreSQL with pgvector
+(e.g. the docker-compose test database), against PostgreSQL.
+
+@TEST:INGESTION-005
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def run_bench(url, docs, chunks_per_doc, dims=1536, docs_per_transaction=8):
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "tests.performance.ingestion_write_bench",
+            url,
+            str(docs),
+            str(chunks_per_doc),
+            str(dims),
+            str(docs_per_transaction),
+        ],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+        timeout=600,
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+
+    print(f"\nIngestion writes ({result['dialect']}, {docs} docs x {chunks_per_doc} chunks):")
+    for path in ("orm", "bulk"):
+        stats = result[path]
+        print(
+            f"  {path:<5} {stats['docs_per_sec']:>8.1f} docs/s "
+            f"{stats['chunks_per_sec']:>10.1f} chunks/s ({stats['seconds']:.2f}s)"
+        )
+    return result
+
+
+class TestIngestionWriteBenchmark:
+    """Bulk writer vs per-object ORM inserts"""
+
+    @pytest.mark.slow
+    @pytest.mark.benchmark
+    @pytest.mark.parametrize(
+        "docs,chunks_per_doc", [(200, 10), (4, 1000)], ids=["small-docs", "large-docs"]
+    )
+    def test_sqlite(self, tmp_path, docs, chunks_per_doc):
+        result = run_bench(
+            f"sqlite+aiosqlite:///{tmp_path / 'bench.db'}", docs, chunks_per_doc
+        )
+
+        assert result["bulk"]["chunks_per_sec"] > result["orm"]["chunks_per_sec"]
+
+    @pytest.mark.slow
+    @pytest.mark.benchmark
+    @pytest.mark.parametrize(
+        "docs,chunks_per_doc", [(200, 10), (4, 1000)], ids=["small-docs", "large-docs"]
+    )
+    def test_postgres(self, docs, chunks_per_doc):
+        url = os.getenv("INGESTION_BENCH_POSTGRES_URL")
+        if not url:
+            pytest.skip("INGESTION_BENCH_POSTGRES_URL not set")
+
+        result = run_bench(url, docs, chunks_per_doc)
+
+        assert result["bulk"]["chunks_per_sec"] > result["orm"]["chunks_per_sec"]
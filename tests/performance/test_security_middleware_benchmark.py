@@ -0,0 +1,115 @@
+"""
+SecurityMiddleware JSON handling on ~1MB search responses
+
+Latency and peak allocation of what the middleware used to do with a body
+(json.loads, a recursive field count, json.dumps) against the streaming
+field counter, the orjson round trip used when a response is masked, and
+the identity check that keeps the original bytes when nothing is masked.
+Routes marked with skip_response_sanitization do none of this.
+
+@TEST:AUTH-004
+"""
+
+import json
+import time
+import tracemalloc
+
+import pytest
+
+from apps.security.middleware.json_stream import (
+    ORJSON_AVAILABLE,
+    JSONFieldCounter,
+    json_dumps,
+    json_loads,
+)
+
+CHUNK_SIZE = 64 * 1024
+ROUNDS = 5
+
+
+def search_response(target_bytes=1024 * 1024):
+    """Search API shaped payload: hits carrying full chunk texts"""
+    text = "Dynamic taxonomy RAG retrieves chunks by meaning and by path. " * 80
+    hits = []
+    while len(json.dumps(hits)) < target_bytes:
+        hits.append(
+            {
+                "chunk_id": f"chunk-{len(hits)}",
+                "doc_id": f"doc-{len(hits) // 4}",
+                "text": text,
+                "score": 0.8123,
+                "taxonomy_path": ["AI", "RAG", "Retrieval"],
+                "metadata": {"source": "upload", "page": len(hits) % 30},
+            }
+        )
+    return {"hits": hits, "total": len(hits), "latency": 0.042}
+
+
+def count_fields(data):
+    if isinstance(data, dict):
+        return len(data) + sum(count_fields(value) for value in data.values())
+    if isinstance(data, list):
+        return sum(count_fields(item) for item in data)
+    return 1
+
+
+def measure(func):
+    """Best wall time (ms) and peak traced allocation (KB) of func()"""
+    best = float("inf")
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best * 1000, peak / 1024
+
+
+class TestSecurityMiddlewareBenchmark:
+    """JSON work per 1MB body, before and after streaming/orjson"""
+
+    @pytest.mark.slow
+    @pytest.mark.benchmark
+    def test_one_megabyte_response(self):
+        data = search_response()
+        body = json.dumps(data).encode()
+        chunks = [body[i : i + CHUNK_SIZE] for i in range(0, len(body), CHUNK_SIZE)]
+        fields = count_fields(data)
+
+        def legacy_count():
+            assert count_fields(json.loads(body)) == fields
+
+        def streaming_count():
+            counter = JSONFieldCounter(max_fields=fields)
+            for chunk in chunks:
+                counter.feed(chunk)
+            assert counter.close() == fields
+
+        def legacy_round_trip():
+            json.dumps(json.loads(body)).encode()
+
+        def round_trip():
+            json_dumps(json_loads(body))
+
+        def unmasked():
+            json_loads(body)  # sanitizer returned it unchanged: original bytes go out
+
+        results = {
+            "json.loads + field count": measure(legacy_count),
+            "streaming field counter": measure(streaming_count),
+            "json loads + dumps": measure(legacy_round_trip),
+            "json_loads + json_dumps": measure(round_trip),
+            "json_loads, bytes reused": measure(unmasked),
+        }
+
+        print(f"\n{len(body) / 1024:.0f}KB response, {fields} fields, orjson={ORJSON_AVAILABLE}:")
+        for name, (ms, kb) in results.items():
+            print(f"  {name:28s} {ms:8.2f} ms  peak {kb:9.1f} KB")
+
+        # The counter holds no parsed objects, only the current token
+        assert results["streaming field counter"][1] * 10 < results["json.loads + field count"][1]
+        if ORJSON_AVAILABLE:
+            assert results["json_loads + json_dumps"][0] < results["json loads + dumps"][0]
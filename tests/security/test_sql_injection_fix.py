@@ -134,7 +134,8 @@ class TestSQLInjectionPrevention:
         filter_clause, params = engine._build_filter_clause(mixed_filters)
 
         assert "DROP" not in filter_clause
-        assert len([k for k in params.keys() if k.startswith("taxonomy_path_")]) == 2
+        # The path with an invalid segment is rejected whole, not truncated
+        assert len([k for k in params.keys() if k.startswith("taxonomy_path_")]) == 1
         param_values = [str(v) for v in params.values()]
         assert all("DROP" not in val for val in param_values)
 
@@ -0,0 +1,235 @@
+"""
+Unit tests for the verified API key cache, per-key rate limits and batched
+usage logging
+
+@TEST:AUTH-003
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from apps.api.security.api_key_cache import VerifiedKeyCache
+from apps.api.security.api_key_generator import SecureAPIKeyGenerator
+from apps.api.security.api_key_storage import APIKey, APIKeyManager
+from apps.api.security.api_key_usage import KeyRateLimiter, UsageLogWriter
+
+PLAINTEXT_KEY = "write_Zm9vYmFyYmF6cXV4cXV1eGNvcmdlZ3JhdWx0Z2FycGx5"
+
+
+class RecordingWriter:
+    def __init__(self):
+        self.rows = []
+
+    def record(self, **row):
+        self.rows.append(row)
+
+
+def make_manager(api_key):
+    session = MagicMock()
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = api_key
+    session.execute = AsyncMock(return_value=result)
+    session.commit = AsyncMock()
+    cache = VerifiedKeyCache(ttl_s=60)
+    cache.start_listener = MagicMock()
+    limiter = KeyRateLimiter()
+    limiter._retry_redis_at = float("inf")  # in-memory counters only
+    manager = APIKeyManager(
+        session, key_cache=cache, rate_limiter=limiter, usage_writer=RecordingWriter()
+    )
+    return manager, session
+
+
+def stored_key(**overrides):
+    values = dict(
+        key_id="k1",
+        key_hash=SecureAPIKeyGenerator.generate_secure_hash(PLAINTEXT_KEY),
+        name="key",
+        description=None,
+        scope="write",
+        permissions="[]",
+        allowed_ips=None,
+        rate_limit=100,
+        is_active=True,
+        expires_at=None,
+        created_at=datetime.now(timezone.utc),
+        last_used_at=None,
+        total_requests=0,
+        failed_requests=0,
+    )
+    values.update(overrides)
+    return APIKey(**values)
+
+
+class TestVerifiedKeyCache:
+    """Test cases for VerifiedKeyCache"""
+
+    @pytest.mark.unit
+    def test_hit_until_ttl_expires(self):
+        cache = VerifiedKeyCache(ttl_s=60)
+        cache.put("secret-key", "k1", "info", cache.generation)
+
+        assert cache.get("secret-key") == "info"
+        assert cache.get("other-key") is None
+
+        with patch("apps.api.security.api_key_cache.time.monotonic", return_value=1e12):
+            assert cache.get("secret-key") is None
+
+    @pytest.mark.unit
+    def test_does_not_store_plaintext_keys(self):
+        cache = VerifiedKeyCache(ttl_s=60)
+        cache.put("secret-key", "k1", "info", cache.generation)
+
+        assert all(b"secret-key" not in fingerprint for fingerprint in cache._entries)
+
+    @pytest.mark.unit
+    def test_invalidate_drops_every_entry_of_a_key(self):
+        cache = VerifiedKeyCache(ttl_s=60)
+        cache.put("key-a", "k1", "a", cache.generation)
+        cache.put("key-b", "k2", "b", cache.generation)
+
+        cache.invalidate("k1")
+
+        assert cache.get("key-a") is None
+        assert cache.get("key-b") == "b"
+
+    @pytest.mark.unit
+    def test_result_read_before_invalidation_is_not_cached(self):
+        cache = VerifiedKeyCache(ttl_s=60)
+        generation = cache.generation
+        cache.invalidate("k1")  # e.g. revoked while we were reading the row
+
+        cache.put("key-a", "k1", "stale", generation)
+
+        assert cache.get("key-a") is None
+
+    @pytest.mark.unit
+    def test_evicts_least_recently_used(self):
+        cache = VerifiedKeyCache(ttl_s=60, max_size=2)
+        cache.put("key-a", "k1", "a", cache.generation)
+        cache.put("key-b", "k2", "b", cache.generation)
+        cache.get("key-a")
+
+        cache.put("key-c", "k3", "c", cache.generation)
+
+        assert cache.get("key-b") is None
+        assert cache.get("key-a") == "a"
+
+
+class TestKeyRateLimiter:
+    """Test cases for KeyRateLimiter"""
+
+    @pytest.mark.unit
+    async def test_in_memory_limit(self):
+        limiter = KeyRateLimiter()
+        limiter._retry_redis_at = float("inf")
+
+        results = [await limiter.allow("k1", 3) for _ in range(4)]
+
+        assert results == [True, True, True, False]
+        assert await limiter.allow("k2", 3)
+
+    @pytest.mark.unit
+    async def test_redis_counters_are_shared_between_processes(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        server = fakeredis.FakeServer()
+        first = KeyRateLimiter(fakeredis.aioredis.FakeRedis(server=server))
+        second = KeyRateLimiter(fakeredis.aioredis.FakeRedis(server=server))
+
+        assert await first.allow("k1", 2)
+        assert await second.allow("k1", 2)
+        assert not await first.allow("k1", 2)
+
+
+class TestAPIKeyManagerVerification:
+    """verify_api_key with the cache in front of the database"""
+
+    @pytest.mark.unit
+    async def test_repeat_verification_skips_database_and_hash(self):
+        manager, session = make_manager(stored_key())
+
+        with patch.object(
+            SecureAPIKeyGenerator,
+            "verify_key_hash",
+            wraps=SecureAPIKeyGenerator.verify_key_hash,
+        ) as verify_hash:
+            for _ in range(3):
+                info = await manager.verify_api_key(PLAINTEXT_KEY, "10.0.0.1", "/search", "GET")
+                assert info.key_id == "k1"
+
+        assert session.execute.await_count == 1
+        assert verify_hash.call_count == 1
+        session.commit.assert_not_awaited()
+        assert [row["status_code"] for row in manager.usage_writer.rows] == [200] * 3
+
+    @pytest.mark.unit
+    async def test_wrong_key_is_not_cached(self):
+        manager, session = make_manager(stored_key())
+
+        for _ in range(2):
+            assert await manager.verify_api_key("wrong-key", "10.0.0.1", "/", "GET") is None
+
+        assert session.execute.await_count == 2
+        assert manager.usage_writer.rows[0]["failed"] is True
+
+    @pytest.mark.unit
+    async def test_cached_key_still_checks_ip_and_rate_limit(self):
+        manager, _ = make_manager(stored_key(allowed_ips='["10.0.0.1"]', rate_limit=2))
+
+        assert await manager.verify_api_key(PLAINTEXT_KEY, "10.0.0.1", "/", "GET")
+        assert await manager.verify_api_key(PLAINTEXT_KEY, "10.0.0.2", "/", "GET") is None
+        assert await manager.verify_api_key(PLAINTEXT_KEY, "10.0.0.1", "/", "GET")
+        assert await manager.verify_api_key(PLAINTEXT_KEY, "10.0.0.1", "/", "GET") is None
+
+        statuses = [row["status_code"] for row in manager.usage_writer.rows]
+        assert statuses == [200, 403, 200, 429]
+
+
+class FakeSession:
+    def __init__(self, statements):
+        self.statements = statements
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement, params=None):
+        self.statements.append((statement, params))
+
+    async def commit(self):
+        self.statements.append(("commit", None))
+
+
+class TestUsageLogWriter:
+    """Test cases for UsageLogWriter"""
+
+    @pytest.mark.unit
+    async def test_rows_are_written_in_one_transaction(self):
+        statements = []
+        writer = UsageLogWriter(lambda: FakeSession(statements), batch_size=100, flush_ms=5)
+
+        for status in (200, 200, 401):
+            writer.record("k1", "/", "GET", "10.0.0.1", status, used=status == 200)
+        await asyncio.sleep(0.05)
+
+        inserts = [params for _, params in statements if isinstance(params, list)]
+        assert len(inserts) == 1 and len(inserts[0]) == 3
+        # insert, one counter update for k1, commit
+        assert len(statements) == 3
+        assert writer.stats["written"] == 3
+
+    @pytest.mark.unit
+    async def test_drops_rows_when_backlog_is_full(self):
+        writer = UsageLogWriter(lambda: FakeSession([]), flush_ms=10_000, max_pending=2)
+
+        for _ in range(3):
+            writer.record("k1", "/", "GET", "10.0.0.1", 200)
+
+        assert writer.stats["dropped"] == 1
+        await writer.flush()
+        assert writer.stats["written"] == 2
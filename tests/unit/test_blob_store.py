@@ -0,0 +1,142 @@
+"""
+Unit tests for the content-addressed blob store and blob-backed ingestion jobs
+
+@TEST:INGESTION-003
+"""
+
+import hashlib
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from apps.ingestion.contracts.signals import ChunkV1
+from apps.ingestion.preprocess.worker import PreprocessedDocument
+from apps.ingestion.storage import BlobStoreError, FilesystemBlobStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return FilesystemBlobStore(str(tmp_path / "blobs"))
+
+
+class CountingPool:
+    """Preprocess pool stand-in that records what it was asked to read"""
+
+    chunk_size = 500
+    overlap_size = 128
+
+    def __init__(self):
+        self.sources = []
+
+    async def run(self, file_content, file_name, file_format, timeout=None):
+        self.sources.append(file_content)
+        with open(file_content, "rb") as f:
+            text = f.read().decode("utf-8")
+        return PreprocessedDocument(
+            parsed_chars=len(text),
+            chunks=[ChunkV1(text=text, token_count=1, position=0)],
+            total_tokens=1,
+            stage_ms={"parse": 1.0},
+        )
+
+
+class TestFilesystemBlobStore:
+    """Test cases for FilesystemBlobStore"""
+
+    @pytest.mark.unit
+    async def test_put_is_keyed_by_sha256(self, store):
+        key = await store.put(b"hello")
+
+        assert key == hashlib.sha256(b"hello").hexdigest()
+        assert await store.get(key) == b"hello"
+        assert (await store.local_path(key)).read_bytes() == b"hello"
+
+    @pytest.mark.unit
+    async def test_identical_content_is_stored_once(self, store):
+        first = await store.put(b"same bytes")
+        mtime = (await store.local_path(first)).stat().st_mtime_ns
+
+        second = await store.put(b"same bytes")
+
+        assert first == second
+        assert (await store.local_path(second)).stat().st_mtime_ns == mtime
+        assert len(list(store.root.rglob("*"))) == 3  # two shard dirs + blob
+
+    @pytest.mark.unit
+    async def test_derived_artifacts_round_trip(self, store):
+        key = await store.put(b"doc")
+
+        assert await store.get_derived(key, "chunks.json") is None
+        await store.put_derived(key, "chunks.json", b"[]")
+        assert await store.get_derived(key, "chunks.json") == b"[]"
+
+        await store.delete(key)
+        assert not await store.exists(key)
+        assert await store.get_derived(key, "chunks.json") is None
+
+    @pytest.mark.unit
+    async def test_rejects_keys_that_are_not_digests(self, store):
+        with pytest.raises(BlobStoreError):
+            await store.local_path("../../etc/passwd")
+        with pytest.raises(BlobStoreError):
+            await store.local_path("0" * 64)
+
+
+class TestBlobBackedJobs:
+    """JobOrchestrator jobs reference blobs instead of carrying file bytes"""
+
+    @pytest.fixture
+    def orchestrator(self, store):
+        from apps.ingestion.batch.job_orchestrator import JobOrchestrator
+
+        job_queue = MagicMock()
+        job_queue.enqueue_job = AsyncMock(return_value=True)
+        orchestrator = JobOrchestrator(
+            job_queue=job_queue,
+            embedding_service=MagicMock(),
+            max_workers=1,
+            blob_store=store,
+        )
+        orchestrator.preprocess_pool = CountingPool()
+        return orchestrator
+
+    @pytest.mark.unit
+    async def test_submitted_job_carries_only_blob_reference(self, orchestrator, store):
+        from apps.ingestion.contracts.signals import DocumentUploadCommandV1
+
+        command = DocumentUploadCommandV1(
+            file_name="a.txt",
+            file_content=b"hello world",
+            file_format="txt",
+            taxonomy_path=["AI"],
+        )
+        await orchestrator.submit_job(command)
+
+        job_data = orchestrator.job_queue.enqueue_job.call_args.kwargs["job_data"]
+        assert "file_content_hex" not in job_data
+        assert job_data["file_size"] == 11
+        assert await store.get(job_data["blob_sha256"]) == b"hello world"
+
+    @pytest.mark.unit
+    async def test_reupload_of_identical_content_skips_parsing(self, orchestrator, store):
+        key = await store.put(b"hello world")
+        job_data = {"blob_sha256": key, "file_name": "a.txt", "file_format": "txt"}
+
+        first = await orchestrator._preprocess(job_data)
+        second = await orchestrator._preprocess(dict(job_data, file_name="b.txt"))
+
+        assert orchestrator.preprocess_pool.sources == [await store.local_path(key)]
+        assert [c.text for c in second.chunks] == [c.text for c in first.chunks]
+        assert second.total_tokens == first.total_tokens
+
+    @pytest.mark.unit
+    async def test_legacy_hex_jobs_are_still_processed(self, orchestrator):
+        orchestrator.preprocess_pool.run = AsyncMock(
+            return_value=PreprocessedDocument(parsed_chars=6, chunks=[], total_tokens=0)
+        )
+
+        await orchestrator._preprocess(
+            {"file_content_hex": b"legacy".hex(), "file_name": "a.txt", "file_format": "txt"}
+        )
+
+        assert orchestrator.preprocess_pool.run.call_args.args[0] == b"legacy"
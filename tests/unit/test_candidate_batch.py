@@ -0,0 +1,85 @@
+"""
+Unit tests for the vectorized fusion/rerank pipeline (CandidateBatch)
+
+@TEST:SEARCH-001
+"""
+
+import numpy as np
+import pytest
+
+from apps.search.hybrid_search_engine import (
+    CandidateBatch,
+    HybridScoreReranker,
+    HybridSearchEngine,
+    ScoreNormalizer,
+    SearchResult,
+)
+
+
+class TestCandidateBatch:
+    """Test cases for CandidateBatch"""
+
+    @pytest.mark.unit
+    def test_top_k_orders_by_score_with_stable_ties(self):
+        scores = np.array([0.2, 0.9, 0.5, 0.9, 0.1])
+        assert CandidateBatch.top_k_indices(scores, 3).tolist() == [1, 3, 2]
+        assert CandidateBatch.top_k_indices(scores, 10).tolist() == [1, 3, 2, 0, 4]
+        assert CandidateBatch.top_k_indices(scores, 0).tolist() == []
+
+    @pytest.mark.unit
+    def test_only_selected_results_are_written_back(self):
+        results = [SearchResult(chunk_id=str(i), text="t") for i in range(4)]
+        batch = CandidateBatch.from_results(results)
+        batch.hybrid_scores = np.array([0.1, 0.4, 0.3, 0.2])
+        batch.metadata = {"fusion_method": "adaptive"}
+
+        top = batch.top_k(2)
+
+        assert [r.chunk_id for r in top] == ["1", "2"]
+        assert top[0].hybrid_score == pytest.approx(0.4)
+        assert results[0].hybrid_score == 0.0
+        assert "fusion_method" not in results[0].metadata
+
+
+class TestVectorizedPipeline:
+    """Test cases for array-based fusion and reranking"""
+
+    @pytest.mark.unit
+    def test_array_kernels_match_list_api(self):
+        scores = [0.3, 0.9, 0.1]
+        assert ScoreNormalizer.min_max_normalize(scores) == pytest.approx([0.25, 1.0, 0.0])
+        assert ScoreNormalizer.reciprocal_rank_normalize(scores) == pytest.approx(
+            [1 / 61, 1 / 60, 1 / 62]
+        )
+        assert ScoreNormalizer.min_max_normalize([0.5, 0.5]) == [1.0, 1.0]
+
+    @pytest.mark.unit
+    def test_fuse_candidates_merges_and_scores(self):
+        engine = HybridSearchEngine(enable_caching=False, enable_reranking=False)
+        bm25 = [
+            SearchResult(chunk_id="a", text="alpha", bm25_score=2.0),
+            SearchResult(chunk_id="b", text="beta", bm25_score=1.0),
+        ]
+        vector = [
+            SearchResult(chunk_id="b", text="beta", vector_score=0.9),
+            SearchResult(chunk_id="c", text="gamma", vector_score=0.5),
+        ]
+
+        batch = engine._fuse_candidates("alpha beta", bm25, vector)
+
+        assert [r.chunk_id for r in batch.results] == ["a", "b", "c"]
+        assert batch.vector_scores.tolist() == [0.0, 0.9, 0.5]
+        assert batch.top_k(1)[0].chunk_id == "b"
+
+    @pytest.mark.unit
+    def test_rerank_prefers_term_overlap(self):
+        reranker = HybridScoreReranker()
+        results = [
+            SearchResult(chunk_id="1", text="unrelated " * 20, hybrid_score=0.5),
+            SearchResult(chunk_id="2", text="hybrid search ranking " * 8, hybrid_score=0.5),
+        ]
+
+        reranked = reranker.rerank("hybrid search", results, top_k=2)
+
+        assert [r.chunk_id for r in reranked] == ["2", "1"]
+        assert reranked[0].rerank_score > reranked[1].rerank_score > 0
@@ -0,0 +1,242 @@
+"""
+Unit tests for the cross-encoder reranking stage
+
+@TEST:SEARCH-001
+"""
+
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from apps.api.database.utils import cross_encoder
+from apps.api.database.utils.cross_encoder import (
+    CrossEncoderStage,
+    RerankerBackend,
+    RerankScoreCache,
+)
+from apps.api.database.utils.reranker import CrossEncoderReranker
+from apps.search.hybrid_search_engine import (
+    CandidateBatch,
+    HybridScoreReranker,
+    SearchResult,
+)
+
+
+class FakeBackend(RerankerBackend):
+    """Scores a pair by its text length; records every predict call."""
+
+    model_name = "fake-ce"
+
+    def __init__(self, gate=None):
+        self.calls = []
+        self.gate = gate
+
+    def predict(self, pairs):
+        if self.gate is not None:
+            self.gate.wait(timeout=5)
+        self.calls.append(list(pairs))
+        return np.array([float(len(text)) for _, text in pairs], dtype=np.float32)
+
+
+@pytest.fixture
+def stage_factory():
+    stages = []
+
+    def make(backend, **kwargs):
+        stage = CrossEncoderStage(backend, **kwargs)
+        stages.append(stage)
+        return stage
+
+    yield make
+    for stage in stages:
+        stage.shutdown(wait=True)
+
+
+class TestCrossEncoderStage:
+    """Test cases for CrossEncoderStage"""
+
+    @pytest.mark.unit
+    async def test_all_pairs_scored_in_one_batch(self, stage_factory):
+        backend = FakeBackend()
+        stage = stage_factory(backend, latency_budget_ms=1000)
+
+        scores = await stage.score("q", [("a", "xx"), ("b", "xxxx"), ("c", "x")])
+
+        assert scores.tolist() == [2.0, 4.0, 1.0]
+        assert len(backend.calls) == 1
+        assert len(backend.calls[0]) == 3
+
+    @pytest.mark.unit
+    async def test_cached_pairs_skip_inference(self, stage_factory):
+        backend = FakeBackend()
+        stage = stage_factory(backend, latency_budget_ms=1000)
+
+        await stage.score("q", [("a", "xx"), ("b", "xxxx")])
+        scores = await stage.score("Q ", [("b", "xxxx"), ("c", "xxx")])
+
+        assert scores.tolist() == [4.0, 3.0]
+        assert backend.calls[1] == [("Q ", "xxx")]
+        assert stage.metrics.cache_hits == 1
+
+    @pytest.mark.unit
+    async def test_budget_exceeded_returns_none_and_fills_cache_late(self, stage_factory):
+        gate = threading.Event()
+        stage = stage_factory(FakeBackend(gate), latency_budget_ms=20)
+
+        assert await stage.score("q", [("a", "xx")]) is None
+        assert stage.metrics.budget_exceeded == 1
+
+        gate.set()
+        stage.shutdown(wait=True)
+        # Let the loop run the done-callback of the late result
+        for _ in range(5):
+            if len(stage.cache):
+                break
+            await asyncio.sleep(0.01)
+        key = (RerankScoreCache.query_hash("q"), "a", "fake-ce")
+        assert stage.cache.get(key) == 2.0
+
+    @pytest.mark.unit
+    def test_cache_evicts_least_recently_used(self):
+        cache = RerankScoreCache(max_entries=2)
+        cache.put(("q", "a", "m"), 1.0)
+        cache.put(("q", "b", "m"), 2.0)
+        cache.get(("q", "a", "m"))
+        cache.put(("q", "c", "m"), 3.0)
+
+        assert cache.get(("q", "b", "m")) is None
+        assert cache.get(("q", "a", "m")) == 1.0
+
+    @pytest.mark.unit
+    def test_heuristic_backend_disables_stage(self, monkeypatch):
+        monkeypatch.setenv("SEARCH_RERANKER_BACKEND", "heuristic")
+        cross_encoder.shutdown_cross_encoder_stage()
+        try:
+            assert cross_encoder.get_cross_encoder_stage() is None
+        finally:
+            cross_encoder.shutdown_cross_encoder_stage()
+
+
+class TestRerankerIntegration:
+    """Cross-encoder use in the engine and DAO rerankers"""
+
+    @pytest.fixture
+    def configured_stage(self, monkeypatch, stage_factory):
+        def configure(backend, **kwargs):
+            stage = stage_factory(backend, **kwargs)
+            monkeypatch.setattr(cross_encoder, "_cross_encoder_stage", stage)
+            monkeypatch.setattr(cross_encoder, "_cross_encoder_initialized", True)
+            return stage
+
+        return configure
+
+    @pytest.mark.unit
+    async def test_engine_uses_cross_encoder_scores(self, configured_stage):
+        configured_stage(FakeBackend(), latency_budget_ms=1000, max_batch=2)
+        results = [
+            SearchResult(chunk_id="a", text="x" * 10, hybrid_score=0.9),
+            SearchResult(chunk_id="b", text="x" * 30, hybrid_score=0.8),
+            SearchResult(chunk_id="c", text="x" * 90, hybrid_score=0.1),
+        ]
+
+        top = await HybridScoreReranker().rerank_batch_async(
+            "q", CandidateBatch.from_results(results), top_k=3
+        )
+
+        # "c" is outside the max_batch pool by hybrid score
+        assert [r.chunk_id for r in top] == ["b", "a"]
+        assert top[0].metadata["reranker"] == "fake-ce"
+        assert 0.0 < top[1].rerank_score < top[0].rerank_score <= 1.0
+
+    @pytest.mark.unit
+    async def test_engine_falls_back_to_heuristic_on_budget(self, configured_stage):
+        gate = threading.Event()
+        configured_stage(FakeBackend(gate), latency_budget_ms=10)
+        results = [
+            SearchResult(chunk_id="a", text="alpha beta", hybrid_score=0.9),
+            SearchResult(chunk_id="b", text="gamma", hybrid_score=0.1),
+        ]
+
+        top = await HybridScoreReranker().rerank_batch_async(
+            "alpha", CandidateBatch.from_results(results), top_k=2
+        )
+
+        gate.set()
+
+        assert [r.chunk_id for r in top] == ["a", "b"]
+        assert "reranker" not in top[0].metadata
+
+    @pytest.mark.unit
+    async def test_dao_reranker_uses_cross_encoder(self, configured_stage):
+        configured_stage(FakeBackend(), latency_budget_ms=1000)
+        results = [
+            {"chunk_id": "a", "text": "short", "score": 0.9, "metadata": {}},
+            {"chunk_id": "b", "text": "much longer text", "score": 0.1, "metadata": {}},
+        ]
+
+        top = await CrossEncoderReranker.rerank_results_async("q", results, top_k=1)
+
+        assert [r["chunk_id"] for r in top] == ["b"]
+        assert top[0]["metadata"]["rerank_model"] == "fake-ce"
+
+
+LOGITS = np.array([-2.0, 0.5, 3.0], dtype=np.float32)
+
+
+def _sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+class FakeCrossEncoderV2:
+    """sentence-transformers < 4: sigmoid unless activation_fct is given"""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def predict(self, sentences, activation_fct=None, **kwargs):
+        return (activation_fct or _sigmoid)(LOGITS[: len(sentences)])
+
+
+class FakeCrossEncoderV4(FakeCrossEncoderV2):
+    """sentence-transformers >= 4 renamed the argument to activation_fn"""
+
+    def predict(self, sentences, activation_fn=None, **kwargs):
+        return (activation_fn or _sigmoid)(LOGITS[: len(sentences)])
+
+
+class FakeONNXSession:
+    def run(self, output_names, feeds):
+        return [LOGITS[: len(feeds["input_ids"])].reshape(-1, 1)]
+
+
+def _onnx_backend():
+    backend = object.__new__(cross_encoder.ONNXCrossEncoderBackend)
+    backend.max_length = 512
+    backend._input_names = {"input_ids"}
+    backend._session = FakeONNXSession()
+    backend._tokenizer = lambda queries, texts, **kwargs: {
+        "input_ids": np.zeros((len(queries), 4))
+    }
+    return backend
+
+
+class TestBackendScores:
+    """Every backend returns raw logits, so relevance matches across them"""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("model_class", [FakeCrossEncoderV2, FakeCrossEncoderV4])
+    def test_backends_agree_on_relevance(self, monkeypatch, model_class):
+        monkeypatch.setattr(cross_encoder, "SENTENCE_TRANSFORMERS_AVAILABLE", True)
+        monkeypatch.setattr(cross_encoder, "CrossEncoder", model_class)
+        pairs = [("q", "a"), ("q", "b"), ("q", "c")]
+
+        st_scores = cross_encoder.SentenceTransformersBackend("fake").predict(pairs)
+        onnx_scores = _onnx_backend().predict(pairs)
+
+        np.testing.assert_allclose(st_scores, LOGITS)
+        np.testing.assert_allclose(
+            cross_encoder.relevance_from_logits(st_scores),
+            cross_encoder.relevance_from_logits(onnx_scores),
+        )
@@ -466,31 +466,36 @@ class TestSearchDAO:
     @pytest.mark.unit
     def test_build_filter_clause_empty_filters(self):
         """Test filter clause building with no filters"""
-        clause = SearchDAO._build_filter_clause(None)
+        clause, params = SearchDAO._build_filter_clause(None)
         assert clause == ""
+        assert params == {}
 
-        clause = SearchDAO._build_filter_clause({})
+        clause, params = SearchDAO._build_filter_clause({})
         assert clause == ""
+        assert params == {}
 
     @pytest.mark.unit
     def test_build_filter_clause_canonical_in_filter(self):
         """Test filter clause building with canonical_in filter"""
         filters = {"canonical_in": [["AI", "RAG"], ["AI", "ML"]]}
 
-        clause = SearchDAO._build_filter_clause(filters)
+        clause, params = SearchDAO._build_filter_clause(filters)
 
         assert "AND" in clause
         assert "dt.path" in clause
+        assert len(params) == 2
+        assert "RAG" not in clause
 
     @pytest.mark.unit
     def test_build_filter_clause_doc_type_filter(self):
         """Test filter clause building with doc_type filter"""
         filters = {"doc_type": ["text/plain", "application/pdf"]}
 
-        clause = SearchDAO._build_filter_clause(filters)
+        clause, params = SearchDAO._build_filter_clause(filters)
 
         assert "AND" in clause
         assert "d.content_type" in clause
+        assert sorted(params.values()) == ["application/pdf", "text/plain"]
 
     @pytest.mark.unit
     def test_combine_search_results_basic(self):
@@ -0,0 +1,96 @@
+"""
+Unit tests for group-committed ingestion writes
+
+@TEST:INGESTION-005
+"""
+
+import asyncio
+
+import pytest
+
+from apps.ingestion.batch import writer
+from apps.ingestion.batch.writer import DocumentWrite, DocumentWriteBatcher
+
+
+class FakeSession:
+    def __init__(self, log):
+        self.log = log
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def commit(self):
+        self.log.append("commit")
+
+    async def rollback(self):
+        self.log.append("rollback")
+
+
+@pytest.fixture
+def transactions(monkeypatch):
+    """Record the doc ids applied in each transaction; doc id "bad" fails"""
+    applied = []
+
+    async def fake_apply(session, writes):
+        if any(w.doc_id == "bad" for w in writes):
+            raise RuntimeError("constraint violation")
+        applied.append([w.doc_id for w in writes])
+
+    monkeypatch.setattr(writer, "apply_document_writes", fake_apply)
+    return applied
+
+
+def make_batcher(log, **kwargs):
+    return DocumentWriteBatcher(lambda: FakeSession(log), **kwargs)
+
+
+class TestDocumentWriteBatcher:
+    """Test cases for DocumentWriteBatcher"""
+
+    @pytest.mark.unit
+    async def test_concurrent_documents_share_one_transaction(self, transactions):
+        log = []
+        batcher = make_batcher(log, max_batch_docs=8, max_wait_ms=5)
+
+        await asyncio.gather(
+            *(batcher.write(DocumentWrite(doc_id=i, document={})) for i in range(5))
+        )
+
+        assert transactions == [[0, 1, 2, 3, 4]]
+        assert log == ["commit"]
+        assert batcher.stats["transactions"] == 1
+
+    @pytest.mark.unit
+    async def test_full_batch_commits_without_waiting(self, transactions):
+        batcher = make_batcher([], max_batch_docs=2, max_wait_ms=10_000)
+
+        await asyncio.wait_for(
+            asyncio.gather(
+                batcher.write(DocumentWrite(doc_id="a", document={})),
+                batcher.write(DocumentWrite(doc_id="b", document={})),
+            ),
+            timeout=1,
+        )
+
+        assert transactions == [["a", "b"]]
+
+    @pytest.mark.unit
+    async def test_failed_batch_is_retried_per_document(self, transactions):
+        log = []
+        batcher = make_batcher(log, max_batch_docs=8, max_wait_ms=5)
+
+        results = await asyncio.gather(
+            batcher.write(DocumentWrite(doc_id="ok-1", document={})),
+            batcher.write(DocumentWrite(doc_id="bad", document={})),
+            batcher.write(DocumentWrite(doc_id="ok-2", document={})),
+            return_exceptions=True,
+        )
+
+        assert results[0] is None and results[2] is None
+        assert isinstance(results[1], RuntimeError)
+        assert transactions == [["ok-1"], ["ok-2"]]
+        assert log.count("rollback") == 2
+        assert batcher.stats["fallbacks"] == 1
@@ -0,0 +1,105 @@
+"""
+Unit tests for concurrent, rate-limited batch embedding
+
+@TEST:EMBED-003
+"""
+
+import asyncio
+
+import pytest
+
+from apps.api.cache.embedding_cache import EmbeddingCache
+from apps.api.embedding_service import EmbeddingService, TokenBucket
+
+
+class StatusError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+@pytest.fixture
+def service():
+    service = EmbeddingService()
+    service.cache = EmbeddingCache(redis_enabled=False)
+    service.retry_base_delay = 0.0
+    return service
+
+
+class TestTokenBucket:
+    """Test cases for TokenBucket"""
+
+    @pytest.mark.unit
+    async def test_waits_for_refill_when_empty(self):
+        bucket = TokenBucket(rate_per_minute=6000, capacity=1)
+        await bucket.acquire(1)
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await bucket.acquire(1)
+
+        # 100 tokens/s -> ~10ms for one token
+        assert loop.time() - start >= 0.005
+
+    @pytest.mark.unit
+    async def test_oversized_request_is_clamped_to_capacity(self):
+        bucket = TokenBucket(rate_per_minute=60, capacity=10)
+
+        await asyncio.wait_for(bucket.acquire(1000), timeout=1)
+
+
+class TestBatchGenerateEmbeddings:
+    """batch_generate_embeddings concurrency and retries"""
+
+    @pytest.mark.unit
+    async def test_batches_run_concurrently_up_to_limit(self, service, monkeypatch):
+        service.max_concurrency = 2
+        active = 0
+        peak = 0
+
+        async def fake_embed(batch_texts):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return [[float(len(t))] for t in batch_texts]
+
+        monkeypatch.setattr(service, "_embed_batch", fake_embed)
+
+        texts = [f"text {i}" for i in range(10)]
+        result = await service.batch_generate_embeddings(texts, batch_size=2)
+
+        assert result == [[float(len(t))] for t in texts]
+        assert peak == 2
+
+    @pytest.mark.unit
+    async def test_rate_limit_errors_are_retried(self, service, monkeypatch):
+        calls = 0
+
+        async def flaky_embed(batch_texts):
+            nonlocal calls
+            calls += 1
+            if calls < 3:
+                raise StatusError(429)
+            return [[1.0] for _ in batch_texts]
+
+        monkeypatch.setattr(service, "_embed_batch", flaky_embed)
+
+        assert await service.batch_generate_embeddings(["a"]) == [[1.0]]
+        assert calls == 3
+
+    @pytest.mark.unit
+    async def test_client_errors_are_not_retried(self, service, monkeypatch):
+        calls = 0
+
+        async def bad_request(batch_texts):
+            nonlocal calls
+            calls += 1
+            raise StatusError(400)
+
+        monkeypatch.setattr(service, "_embed_batch", bad_request)
+
+        with pytest.raises(StatusError):
+            await service._embed_batch_with_retry(["a"])
+        assert calls == 1
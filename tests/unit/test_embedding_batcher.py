@@ -0,0 +1,88 @@
+"""
+Unit tests for the query-embedding micro-batcher
+
+@TEST:EMBED-002
+"""
+
+import asyncio
+
+import pytest
+
+from apps.api.embedding_service import EmbeddingMicroBatcher
+
+
+class RecordingBackend:
+    """Batch embedder that records every call."""
+
+    def __init__(self, fail: bool = False):
+        self.calls = []
+        self.fail = fail
+
+    async def __call__(self, texts):
+        self.calls.append(list(texts))
+        await asyncio.sleep(0)
+        if self.fail:
+            raise RuntimeError("backend down")
+        return [[float(len(text))] for text in texts]
+
+
+class TestEmbeddingMicroBatcher:
+    """Test cases for EmbeddingMicroBatcher"""
+
+    @pytest.mark.unit
+    async def test_concurrent_requests_share_one_call(self):
+        backend = RecordingBackend()
+        batcher = EmbeddingMicroBatcher(backend, max_batch_size=64, max_wait_ms=5)
+
+        results = await asyncio.gather(*(batcher.embed("x" * i) for i in range(1, 11)))
+
+        assert results == [[float(i)] for i in range(1, 11)]
+        assert len(backend.calls) == 1
+        assert batcher.stats["batches"] == 1
+
+    @pytest.mark.unit
+    async def test_identical_texts_are_deduplicated(self):
+        backend = RecordingBackend()
+        batcher = EmbeddingMicroBatcher(backend, max_batch_size=64, max_wait_ms=5)
+
+        results = await asyncio.gather(*(batcher.embed("same") for _ in range(5)))
+
+        assert results == [[4.0]] * 5
+        assert backend.calls == [["same"]]
+        assert batcher.stats["deduplicated"] == 4
+
+    @pytest.mark.unit
+    async def test_full_batch_flushes_without_waiting(self):
+        backend = RecordingBackend()
+        batcher = EmbeddingMicroBatcher(backend, max_batch_size=2, max_wait_ms=10_000)
+
+        results = await asyncio.wait_for(
+            asyncio.gather(batcher.embed("a"), batcher.embed("bb")), timeout=1
+        )
+
+        assert results == [[1.0], [2.0]]
+        assert backend.calls == [["a", "bb"]]
+
+    @pytest.mark.unit
+    async def test_backend_error_reaches_every_waiter(self):
+        batcher = EmbeddingMicroBatcher(
+            RecordingBackend(fail=True), max_batch_size=64, max_wait_ms=1
+        )
+
+        results = await asyncio.gather(
+            batcher.embed("a"), batcher.embed("b"), return_exceptions=True
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    @pytest.mark.unit
+    async def test_cancelled_caller_does_not_cancel_shared_result(self):
+        backend = RecordingBackend()
+        batcher = EmbeddingMicroBatcher(backend, max_batch_size=64, max_wait_ms=5)
+
+        first = asyncio.ensure_future(batcher.embed("shared"))
+        second = asyncio.ensure_future(batcher.embed("shared"))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        assert await second == [6.0]
@@ -0,0 +1,142 @@
+"""
+Unit tests for the two-tier embedding cache
+
+@TEST:EMBED-001
+"""
+
+import numpy as np
+import pytest
+
+from apps.api.cache.embedding_cache import EmbeddingCache
+
+
+class FakeRedis:
+    """Minimal async Redis client storing raw bytes."""
+
+    def __init__(self):
+        self.store = {}
+        self.mget_calls = 0
+
+    async def mget(self, keys):
+        self.mget_calls += 1
+        return [self.store.get(key) for key in keys]
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.pending = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def setex(self, key, ttl, value):
+        self.pending[key] = value
+
+    async def execute(self):
+        self.redis.store.update(self.pending)
+
+
+@pytest.fixture
+def redis_cache(monkeypatch):
+    cache = EmbeddingCache(max_entries=2, redis_enabled=True)
+    fake = FakeRedis()
+
+    async def client():
+        return fake
+
+    monkeypatch.setattr(cache, "_get_redis_client", client)
+    return cache, fake
+
+
+class TestEmbeddingCache:
+    """Test cases for EmbeddingCache"""
+
+    @pytest.mark.unit
+    def test_key_uses_model_and_normalized_text(self):
+        cache = EmbeddingCache(redis_enabled=False)
+
+        assert cache.make_key("m", "hello   world ") == cache.make_key("m", " hello world")
+        assert cache.make_key("m", "hello") != cache.make_key("other", "hello")
+
+    @pytest.mark.unit
+    async def test_l1_hit_without_redis(self):
+        cache = EmbeddingCache(redis_enabled=False)
+        await cache.set("m", "text", [0.5, 0.25])
+
+        assert await cache.get("m", "text") == [0.5, 0.25]
+        stats = cache.get_stats()
+        assert stats["l1_hits"] == 1
+        assert stats["l1_entries"] == 1
+
+    @pytest.mark.unit
+    async def test_l2_stores_packed_float32_and_promotes(self, redis_cache):
+        cache, fake = redis_cache
+        await cache.set("m", "text", [0.5, -1.0, 2.0])
+
+        payload = next(iter(fake.store.values()))
+        assert isinstance(payload, bytes)
+        assert np.frombuffer(payload, dtype="<f4").tolist() == [0.5, -1.0, 2.0]
+
+        cache.clear_local()
+        assert await cache.get("m", "text") == [0.5, -1.0, 2.0]
+        assert cache.metrics.l2_hits == 1
+        # Promoted back into L1
+        assert await cache.get("m", "text") == [0.5, -1.0, 2.0]
+        assert cache.metrics.l1_hits == 1
+
+    @pytest.mark.unit
+    async def test_get_many_fetches_l1_misses_in_one_round_trip(self, redis_cache):
+        cache, fake = redis_cache
+        await cache.set_many("m", ["a", "b"], [[1.0], [2.0]])
+        cache.clear_local()
+        await cache.set("m", "c", [3.0])
+
+        found = await cache.get_many("m", ["a", "b", "c", "d"])
+
+        assert found == [[1.0], [2.0], [3.0], None]
+        assert fake.mget_calls == 1
+        assert cache.metrics.l2_misses == 1
+
+    @pytest.mark.unit
+    async def test_l1_is_bounded_lru(self):
+        cache = EmbeddingCache(max_entries=2, redis_enabled=False)
+        await cache.set("m", "a", [1.0])
+        await cache.set("m", "b", [2.0])
+        await cache.get("m", "a")
+        await cache.set("m", "c", [3.0])
+
+        assert await cache.get("m", "b") is None
+        assert await cache.get("m", "a") == [1.0]
+
+
+class TestEmbeddingServiceCache:
+    """EmbeddingService uses the shared cache"""
+
+    @pytest.mark.unit
+    async def test_batch_skips_cached_texts(self, monkeypatch):
+        from apps.api.embedding_service import EmbeddingService
+
+        service = EmbeddingService()
+        service.cache = EmbeddingCache(redis_enabled=False)
+        await service.cache.set(service.model_name, "cached", [1.0, 0.0])
+
+        embedded = []
+
+        async def fake_embed(batch_texts):
+            embedded.append(list(batch_texts))
+            return [[0.0, 1.0] for _ in batch_texts]
+
+        monkeypatch.setattr(service, "_embed_batch", fake_embed)
+
+        result = await service.batch_generate_embeddings(["cached", "new"])
+
+        assert result == [[1.0, 0.0], [0.0, 1.0]]
+        assert embedded == [["new"]]
+        assert await service.cache.get(service.model_name, "new") == [0.0, 1.0]
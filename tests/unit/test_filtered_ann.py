@@ -0,0 +1,178 @@
+"""
+Unit tests for filtered ANN planning
+
+@TEST:DATABASE-PKG-023
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from apps.api.database.utils.filtered_ann import FilteredANNPlanner, recall_at_k
+from apps.api.database.utils.vector_index import (
+    MAX_EF_SEARCH,
+    ANNSearchParams,
+    query_vector_param,
+)
+from apps.search.hybrid_search_engine import HybridSearchEngine, SearchMetrics
+
+
+@pytest.fixture
+def planner(monkeypatch):
+    monkeypatch.delenv("VECTOR_HNSW_EF_SEARCH", raising=False)
+    monkeypatch.delenv("VECTOR_IVFFLAT_PROBES", raising=False)
+    return FilteredANNPlanner(
+        exact_max_rows=1000, oversample=2.0, max_rounds=3, count_cap=50_000, stats_ttl=60
+    )
+
+
+def count_session(filtered_rows, total_rows):
+    """Session answering the subset COUNT and the reltuples lookup"""
+    session = MagicMock()
+    session.execute = AsyncMock(
+        side_effect=lambda *args: MagicMock(
+            scalar=MagicMock(
+                return_value=filtered_rows if "LIMIT :count_cap" in str(args[0]) else total_rows
+            )
+        )
+    )
+    return session
+
+
+class TestFilteredANNPlanner:
+    """Test cases for FilteredANNPlanner"""
+
+    @pytest.mark.unit
+    def test_unfiltered_query_uses_ann(self, planner):
+        plan = planner.choose(10)
+        assert plan.strategy == "ann" and plan.ann_params is None
+        assert plan.selectivity is None
+
+        # ef_search below k could never return k rows
+        plan = planner.choose(100)
+        assert plan.strategy == "ann" and plan.ann_params.ef_search == 100
+
+    @pytest.mark.unit
+    def test_small_subset_is_scanned_exactly(self, planner):
+        plan = planner.choose(10, filtered_rows=800, total_rows=1_000_000)
+
+        assert plan.strategy == "exact"
+        assert plan.expected_rows(10) == 10
+        assert planner.choose(10, filtered_rows=3, total_rows=100).expected_rows(10) == 3
+
+    @pytest.mark.unit
+    def test_selectivity_scales_ef_search(self, planner):
+        broad = planner.choose(10, filtered_rows=600_000, total_rows=1_000_000)
+        assert broad.strategy == "ann" and broad.ann_params is None
+
+        narrow = planner.choose(10, filtered_rows=50_000, total_rows=1_000_000)
+        assert narrow.strategy == "iterative"
+        assert narrow.selectivity == pytest.approx(0.05)
+        assert narrow.ann_params.ef_search == 400  # 10 * 2.0 / 0.05
+        assert narrow.ann_params.probes == 10
+
+    @pytest.mark.unit
+    def test_ef_search_beyond_cap_goes_exact(self, planner):
+        plan = planner.choose(50, filtered_rows=20_000, total_rows=1_000_000)
+        assert plan.strategy == "exact"
+
+        # ...unless the count was capped: only a lower bound, too many rows
+        capped = planner.choose(50, filtered_rows=20_000, total_rows=10_000_000, capped=True)
+        assert capped.strategy == "iterative"
+        assert capped.ann_params.ef_search == MAX_EF_SEARCH
+
+    @pytest.mark.unit
+    def test_widen_doubles_then_falls_back_to_exact(self, planner):
+        plan = planner.choose(
+            10,
+            filtered_rows=50_000,
+            total_rows=1_000_000,
+            ann_params=ANNSearchParams(probes=4, prefix_dims=256),
+        )
+        widened = planner.widen(plan)
+        assert (widened.ann_params.ef_search, widened.ann_params.probes) == (800, 80)
+        assert widened.ann_params.prefix_dims == 256
+        assert widened.rounds == 2
+
+        last = planner.widen(planner.widen(widened))
+        assert last.strategy == "exact" and last.rounds == 4
+        assert planner.widen(last) is last
+
+    @pytest.mark.unit
+    async def test_subset_counts_are_cached_per_filter(self, planner):
+        session = count_session(filtered_rows=5_000, total_rows=100_000)
+
+        plan = await planner.plan(session, 10, " AND d.doc_type = :doc_type", {"doc_type": "a"})
+        again = await planner.plan(session, 10, " AND d.doc_type = :doc_type", {"doc_type": "a"})
+        await planner.plan(session, 10, " AND d.doc_type = :doc_type", {"doc_type": "b"})
+
+        assert plan.strategy == again.strategy == "iterative"
+        assert plan.filtered_rows == 5_000 and plan.total_rows == 100_000
+        assert session.execute.await_count == 4  # two statements per distinct filter
+
+    @pytest.mark.unit
+    def test_recall_at_k(self):
+        assert recall_at_k(["a", "b", "x"], ["a", "b", "c"]) == pytest.approx(2 / 3)
+        assert recall_at_k([], []) == 1.0
+
+
+class TestFilteredVectorSearch:
+    """Filtered ANN plans in HybridSearchEngine"""
+
+    @pytest.mark.unit
+    def test_exact_fused_query_bypasses_ann_index(self):
+        engine = HybridSearchEngine(enable_caching=False, enable_reranking=False)
+
+        ann_sql = str(engine._build_server_fusion_query("", query_vector_param(3)))
+        exact_sql = str(
+            engine._build_server_fusion_query("", query_vector_param(3), exact_vector=True)
+        )
+
+        assert "ORDER BY distance\n" in ann_sql
+        assert "AS vector)) + 0" in exact_sql and "ORDER BY distance\n" not in exact_sql
+
+    @pytest.mark.unit
+    async def test_short_results_widen_until_top_k(self, planner, monkeypatch):
+        monkeypatch.setattr(
+            "apps.api.database.utils.filtered_ann._planner", planner
+        )
+        engine = HybridSearchEngine(enable_caching=False, enable_reranking=False)
+        session = count_session(filtered_rows=40_000, total_rows=1_000_000)
+        plans = []
+
+        async def run(plan):
+            plans.append(plan)
+            # The ANN index loses filtered rows until the scan is exact
+            rows = [(f"chunk-{i}",) for i in range(10 if plan.exact else 3)]
+            return rows, len(rows)
+
+        metrics = SearchMetrics()
+        rows = await engine._filtered_ann_search(
+            session, 10, " AND d.doc_type = :doc_type", {"doc_type": "a"}, None, run, metrics
+        )
+
+        assert len(rows) == 10
+        assert [plan.strategy for plan in plans] == ["iterative"] * 3 + ["exact"]
+        assert metrics.vector_strategy == "exact"
+        assert metrics.vector_selectivity == pytest.approx(0.04)
+        assert metrics.vector_rounds == 4
+        assert metrics.vector_recall == 1.0
+
+    @pytest.mark.unit
+    async def test_sampled_recall_is_measured(self, monkeypatch):
+        planner = FilteredANNPlanner(recall_sample_rate=1.0)
+        monkeypatch.setattr("apps.api.database.utils.filtered_ann._planner", planner)
+        engine = HybridSearchEngine(enable_caching=False, enable_reranking=False)
+
+        async def run(plan):
+            rows = [("a",), ("b",), ("c",)] if plan.exact else [("a",), ("b",), ("x",)]
+            return rows, len(rows)
+
+        metrics = SearchMetrics()
+        rows = await engine._filtered_ann_search(
+            MagicMock(), 3, "", {}, None, run, metrics, chunk_ids=lambda r: [x[0] for x in r]
+        )
+
+        assert [row[0] for row in rows] == ["a", "b", "x"]
+        assert metrics.vector_strategy == "ann"
+        assert metrics.vector_recall == pytest.approx(2 / 3)
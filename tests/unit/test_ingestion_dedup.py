@@ -0,0 +1,279 @@
+"""
+Unit tests for content hashing and incremental re-ingestion planning
+
+@TEST:INGESTION-004
+"""
+
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from apps.ingestion.batch.dedup import (
+    content_hash,
+    document_hash,
+    normalize_text,
+    plan_chunk_changes,
+)
+from apps.ingestion.contracts.signals import ChunkV1
+from apps.ingestion.preprocess.worker import PreprocessedDocument
+
+
+class TestContentHash:
+    """Test cases for normalized content hashes"""
+
+    @pytest.mark.unit
+    def test_whitespace_and_unicode_forms_do_not_change_hash(self):
+        assert normalize_text("  Hello\n\t world  ") == "Hello world"
+        assert content_hash("Ｈello  world") == content_hash("Hello world\n")
+
+    @pytest.mark.unit
+    def test_text_changes_change_hash(self):
+        assert content_hash("Hello world") != content_hash("Hello World")
+
+    @pytest.mark.unit
+    def test_document_hash_depends_on_chunk_order(self):
+        a, b = content_hash("a"), content_hash("b")
+
+        assert document_hash([a, b]) == document_hash([a, b])
+        assert document_hash([a, b]) != document_hash([b, a])
+
+
+class TestPlanChunkChanges:
+    """Test cases for plan_chunk_changes"""
+
+    @pytest.mark.unit
+    def test_new_document_inserts_everything(self):
+        plan = plan_chunk_changes([], ["h1", "h2"])
+
+        assert plan.kept == []
+        assert plan.inserted == [0, 1]
+        assert plan.tombstoned == []
+
+    @pytest.mark.unit
+    def test_edit_keeps_unchanged_and_tombstones_removed(self):
+        existing = [("c1", "h1"), ("c2", "h2"), ("c3", "h3")]
+
+        plan = plan_chunk_changes(existing, ["h1", "h4", "h3"])
+
+        assert plan.kept == [(0, "c1"), (2, "c3")]
+        assert plan.inserted == [1]
+        assert plan.tombstoned == ["c2"]
+
+    @pytest.mark.unit
+    def test_reordered_chunks_are_kept(self):
+        plan = plan_chunk_changes([("c1", "h1"), ("c2", "h2")], ["h2", "h1"])
+
+        assert plan.kept == [(0, "c2"), (1, "c1")]
+        assert plan.inserted == []
+        assert plan.tombstoned == []
+
+    @pytest.mark.unit
+    def test_repeated_content_is_matched_one_to_one(self):
+        plan = plan_chunk_changes([("c1", "h"), ("c2", "h")], ["h", "x", "h", "h"])
+
+        assert plan.kept == [(0, "c1"), (2, "c2")]
+        assert plan.inserted == [1, 3]
+        assert plan.tombstoned == []
+
+
+TEXTS = ["Alpha paragraph about retrieval", "Obsolete paragraph about zebras"]
+
+
+def preprocessed(texts):
+    chunks = [
+        ChunkV1(text=chunk_text, token_count=4, position=i * 100)
+        for i, chunk_text in enumerate(texts)
+    ]
+    return PreprocessedDocument(parsed_chars=100, chunks=chunks, total_tokens=8)
+
+
+class FakeSession:
+    """Read session whose DocTaxonomy lookups find ``assigned`` rows"""
+
+    def __init__(self, assigned=()):
+        self.assigned = set(assigned)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def get(self, model, key):
+        return object() if key in self.assigned else None
+
+
+class TestReuploadMatching:
+    """How JobOrchestrator matches an upload against stored documents"""
+
+    @pytest.fixture
+    def orchestrator(self, monkeypatch):
+        from apps.ingestion.batch import job_orchestrator
+        from apps.ingestion.batch.job_orchestrator import JobOrchestrator
+
+        monkeypatch.setattr(job_orchestrator, "_invalidate_search_cache", AsyncMock())
+        embedding_service = MagicMock(model_name="test-model")
+        embedding_service.batch_generate_embeddings = AsyncMock(return_value=[])
+        orchestrator = JobOrchestrator(
+            job_queue=MagicMock(), embedding_service=embedding_service, max_workers=1
+        )
+        orchestrator.write_batcher.write = AsyncMock()
+        orchestrator._taxonomy_node_id = AsyncMock(return_value="node-ai")
+        # Every chunk's content is already embedded under another document
+        orchestrator._find_reusable_embeddings = AsyncMock(
+            return_value={content_hash(t): [0.1] for t in TEXTS}
+        )
+        return orchestrator
+
+    def stored(self, orchestrator, monkeypatch, document, assigned=()):
+        from apps.ingestion.batch import job_orchestrator
+
+        orchestrator._find_stored_document = AsyncMock(return_value=document)
+        monkeypatch.setattr(job_orchestrator, "async_session", lambda: FakeSession(assigned))
+
+    @pytest.mark.unit
+    async def test_same_content_under_new_source_creates_document(
+        self, orchestrator, monkeypatch
+    ):
+        self.stored(orchestrator, monkeypatch, None)
+        job_data = {
+            "file_name": "copy.txt",
+            "file_format": "txt",
+            "source_url": "https://example.com/copy",
+            "taxonomy_path": ["AI"],
+        }
+
+        event = await orchestrator._process_document("cmd", job_data, preprocessed(TEXTS))
+
+        write = orchestrator.write_batcher.write.await_args.args[0]
+        assert write.is_new and event.document_id == str(write.doc_id)
+        assert write.document["source_url"] == "https://example.com/copy"
+        assert write.doc_taxonomy["node_id"] == "node-ai"
+        assert [vec for _, vec in write.embeddings] == [[0.1], [0.1]]
+        orchestrator.embedding_service.batch_generate_embeddings.assert_awaited_once_with(
+            [], batch_size=50, show_progress=True
+        )
+        assert event.embedding_calls_saved == 2
+
+    @pytest.mark.unit
+    async def test_unchanged_document_gets_newly_requested_taxonomy(
+        self, orchestrator, monkeypatch
+    ):
+        doc_id = uuid.uuid4()
+        hashes = [content_hash(t) for t in TEXTS]
+        document = MagicMock(doc_id=doc_id, checksum=document_hash(hashes))
+        self.stored(orchestrator, monkeypatch, document)
+        session_execute = AsyncMock(
+            return_value=MagicMock(
+                all=lambda: [(f"c{i}", h, t) for i, (h, t) in enumerate(zip(hashes, TEXTS))]
+            )
+        )
+        monkeypatch.setattr(FakeSession, "execute", session_execute, raising=False)
+        job_data = {"file_name": "a.txt", "file_format": "txt", "taxonomy_path": ["AI"]}
+
+        await orchestrator._process_document("cmd", job_data, preprocessed(TEXTS))
+
+        write = orchestrator.write_batcher.write.await_args.args[0]
+        assert not write.is_new and write.doc_id == doc_id
+        assert write.doc_taxonomy["node_id"] == "node-ai"
+        assert write.chunks == [] and len(write.kept) == 2
+
+    @pytest.mark.unit
+    async def test_unchanged_document_with_its_taxonomy_is_skipped(
+        self, orchestrator, monkeypatch
+    ):
+        doc_id = uuid.uuid4()
+        checksum = document_hash([content_hash(t) for t in TEXTS])
+        document = MagicMock(doc_id=doc_id, checksum=checksum)
+        self.stored(orchestrator, monkeypatch, document, [(doc_id, "node-ai", "1.0.0")])
+        job_data = {"file_name": "a.txt", "file_format": "txt", "taxonomy_path": ["AI"]}
+
+        event = await orchestrator._process_document("cmd", job_data, preprocessed(TEXTS))
+
+        orchestrator.write_batcher.write.assert_not_awaited()
+        assert event.document_id == str(doc_id) and event.chunks_reused == 2
+
+    @pytest.mark.unit
+    async def test_stored_document_is_matched_by_source_url_only(self):
+        from apps.ingestion.batch.job_orchestrator import JobOrchestrator
+
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=MagicMock())
+        assert await JobOrchestrator._find_stored_document(session, None) is None
+        session.execute.assert_not_awaited()
+
+        await JobOrchestrator._find_stored_document(session, "https://example.com/a")
+        statement = str(session.execute.await_args.args[0])
+        assert "documents.source_url" in statement and "checksum =" not in statement
+
+
+@pytest.fixture
+async def sqlite_session(monkeypatch):
+    """SQLite store with one two-chunk document, searched through SearchDAO"""
+    from apps.api.database.daos import search_dao
+
+    monkeypatch.setattr(search_dao, "DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    doc_id = uuid.uuid4()
+    chunk_ids = [uuid.uuid4() for _ in TEXTS]
+    async with engine.begin() as conn:
+        for statement in (
+            "CREATE TABLE documents (doc_id TEXT PRIMARY KEY, title TEXT, source_url TEXT)",
+            "CREATE TABLE chunks (chunk_id TEXT PRIMARY KEY, doc_id TEXT, text TEXT, "
+            "content_hash TEXT, deleted_at TIMESTAMP)",
+            "CREATE TABLE doc_taxonomy (doc_id TEXT, path TEXT)",
+            "CREATE TABLE embeddings (chunk_id TEXT UNIQUE, vec TEXT)",
+        ):
+            await conn.execute(text(statement))
+        await conn.execute(
+            text("INSERT INTO documents VALUES (:doc, 'a.txt', 'https://example.com/a')"),
+            {"doc": doc_id.hex},
+        )
+        for chunk_id, chunk_text in zip(chunk_ids, TEXTS):
+            await conn.execute(
+                text("INSERT INTO chunks VALUES (:chunk, :doc, :text, :hash, NULL)"),
+                {
+                    "chunk": chunk_id.hex,
+                    "doc": doc_id.hex,
+                    "text": chunk_text,
+                    "hash": content_hash(chunk_text),
+                },
+            )
+            await conn.execute(
+                text("INSERT INTO embeddings VALUES (:chunk, '[0.1]')"),
+                {"chunk": chunk_id.hex},
+            )
+    async with AsyncSession(engine) as session:
+        yield session, doc_id, chunk_ids
+    await engine.dispose()
+
+
+class TestTombstonedChunks:
+    """Chunks dropped by a re-upload disappear from search"""
+
+    @pytest.mark.unit
+    async def test_reupload_hides_dropped_chunk_from_search(self, sqlite_session):
+        from apps.api.database.daos.search_dao import SearchDAO
+        from apps.ingestion.batch.writer import DocumentWrite, apply_document_writes
+
+        session, doc_id, chunk_ids = sqlite_session
+        assert await SearchDAO._perform_bm25_search(session, "zebras", 5)
+
+        # Re-upload under a new name without the second paragraph
+        plan = plan_chunk_changes(
+            [(chunk_id, content_hash(t)) for chunk_id, t in zip(chunk_ids, TEXTS)],
+            [content_hash(TEXTS[0])],
+        )
+        write = DocumentWrite(
+            doc_id=doc_id, document={"title": "b.txt"}, is_new=False, tombstoned=plan.tombstoned
+        )
+        await apply_document_writes(session, [write])
+        await session.commit()
+
+        assert await SearchDAO._perform_bm25_search(session, "zebras", 5) == []
+        vector_hits = await SearchDAO._perform_vector_search(session, [0.1], 5)
+        assert [hit["text"] for hit in vector_hits] == [TEXTS[0]]
+        assert await SearchDAO._perform_bm25_search(session, "retrieval", 5)
@@ -0,0 +1,139 @@
+"""
+Unit tests for the streaming JSON helpers used by SecurityMiddleware
+
+@TEST:AUTH-004
+"""
+
+import json
+
+import pytest
+
+from apps.security.middleware.json_stream import (
+    JSONFieldCounter,
+    JSONTooComplex,
+    is_response_sanitization_skipped,
+    json_dumps,
+    json_loads,
+    skip_response_sanitization,
+)
+
+DOCUMENT = {
+    "query": 'say "hi" \\ é中',
+    "filters": {"taxonomy": ["AI", "RAG"], "min_score": -1.5e-3, "strict": True},
+    "empty": {},
+    "none": [],
+    "limit": 10,
+    "cursor": None,
+}
+
+
+def count_fields(data):
+    """What SecurityMiddleware counted after json.loads"""
+    if isinstance(data, dict):
+        return len(data) + sum(count_fields(value) for value in data.values())
+    if isinstance(data, list):
+        return sum(count_fields(item) for item in data)
+    return 1
+
+
+def feed_in_chunks(body, size, max_fields=1000):
+    counter = JSONFieldCounter(max_fields)
+    for start in range(0, len(body), size):
+        counter.feed(body[start : start + size])
+    return counter.close()
+
+
+class TestJSONFieldCounter:
+    """Test cases for JSONFieldCounter"""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 10_000])
+    def test_counts_like_parsing_at_any_chunk_size(self, size):
+        body = json.dumps(DOCUMENT, ensure_ascii=False, indent=1).encode()
+
+        assert feed_in_chunks(body, size) == count_fields(DOCUMENT)
+
+    @pytest.mark.unit
+    def test_aborts_before_the_rest_of_the_body(self):
+        counter = JSONFieldCounter(max_fields=5)
+        counter.feed(b'{"a": 1, "b": 2,')
+
+        with pytest.raises(JSONTooComplex):
+            counter.feed(b' "c": 3, "d": 4')
+
+    @pytest.mark.unit
+    def test_rejects_deep_nesting(self):
+        with pytest.raises(JSONTooComplex):
+            feed_in_chunks(b"[" * 12 + b"]" * 12, 4)
+        assert feed_in_chunks(b"[" * 11 + b"]" * 11, 4) == 0
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        "body",
+        [
+            b'{"a" 1}',
+            b'{"a": 1,}',
+            b"[1 2]",
+            b'{"a": [1}',
+            b'{"a": tru}',
+            b'{"a": "unterminated}',
+            b"[1] [2]",
+            b"   ",
+        ],
+    )
+    def test_rejects_malformed_json(self, body):
+        with pytest.raises(ValueError):
+            feed_in_chunks(body, 3)
+
+
+class TestHelpers:
+    """Test cases for the route marker and JSON codecs"""
+
+    @pytest.mark.unit
+    def test_route_marker(self):
+        @skip_response_sanitization
+        async def search():
+            return {}
+
+        async def profile():
+            return {}
+
+        assert is_response_sanitization_skipped({"endpoint": search})
+        assert not is_response_sanitization_skipped({"endpoint": profile})
+        assert not is_response_sanitization_skipped({})
+
+    @pytest.mark.unit
+    def test_marked_route_is_seen_by_middleware(self):
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+        from starlette.middleware.base import BaseHTTPMiddleware
+
+        from apps.api.routers.health import router as health_router
+
+        skipped = {}
+
+        class RecordingMiddleware(BaseHTTPMiddleware):
+            async def dispatch(self, request, call_next):
+                response = await call_next(request)
+                skipped[request.url.path] = is_response_sanitization_skipped(
+                    request.scope
+                )
+                return response
+
+        app = FastAPI()
+        app.include_router(health_router)
+
+        @app.get("/profile")
+        async def profile():
+            return {}
+
+        app.add_middleware(RecordingMiddleware)
+        client = TestClient(app)
+        client.get("/healthz")
+        client.get("/profile")
+
+        assert skipped == {"/healthz": True, "/profile": False}
+
+    @pytest.mark.unit
+    def test_round_trip(self):
+        assert json_loads(json_dumps(DOCUMENT)) == DOCUMENT
@@ -0,0 +1,259 @@
+"""
+Unit tests for the in-process local vector index
+
+@TEST:DATABASE-PKG-021
+"""
+
+import json
+
+import numpy as np
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from apps.api.database.utils.local_vector_index import (
+    LocalVectorIndex,
+    load_local_vector_index,
+    vector_search_backend,
+)
+from apps.search.hybrid_search_engine import HybridSearchEngine, SearchMetrics
+
+DIMENSIONS = 32
+
+
+@pytest.fixture
+def vectors():
+    rng = np.random.default_rng(7)
+    return rng.normal(size=(500, DIMENSIONS)).astype(np.float32)
+
+
+def chunk_ids(count):
+    return [f"chunk-{i:04d}" for i in range(count)]
+
+
+def exact_top_k(vectors, query, k):
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    order = np.argsort(-(normalized @ (query / np.linalg.norm(query))))
+    return [f"chunk-{i:04d}" for i in order[:k]]
+
+
+class TestLocalVectorIndex:
+    """Test cases for LocalVectorIndex"""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("dtype", ["float32", "float16", "int8"])
+    def test_matches_brute_force(self, tmp_path, vectors, dtype):
+        index = LocalVectorIndex(str(tmp_path), dtype=dtype, metric="cosine", block_rows=64)
+        index.add(chunk_ids(300), vectors[:300])
+        index.add(chunk_ids(500)[300:], vectors[300:])
+        query = vectors[17] + 0.1
+
+        found = [chunk_id for chunk_id, _ in index.search(query, 10)]
+
+        assert len(index) == 500
+        expected = exact_top_k(vectors, query, 10)
+        if dtype == "float32":
+            assert found == expected
+        else:
+            assert len(set(found) & set(expected)) >= 9
+
+    @pytest.mark.unit
+    def test_l2_similarity_is_one_minus_distance(self, tmp_path, vectors):
+        index = LocalVectorIndex(str(tmp_path), metric="l2")
+        index.add(chunk_ids(500), vectors)
+        query = vectors[3] + 0.01
+
+        chunk_id, similarity = index.search(query, 1)[0]
+
+        assert chunk_id == "chunk-0003"
+        assert similarity == pytest.approx(1.0 - np.linalg.norm(vectors[3] - query), abs=1e-4)
+
+    @pytest.mark.unit
+    def test_filtered_search_scores_only_allowed_chunks(self, tmp_path, vectors):
+        index = LocalVectorIndex(str(tmp_path))
+        index.add(chunk_ids(500), vectors)
+        allowed = chunk_ids(500)[100:110]
+
+        found = [chunk_id for chunk_id, _ in index.search(vectors[0], 20, allowed + ["unknown"])]
+
+        assert sorted(found) == allowed
+
+    @pytest.mark.unit
+    def test_replace_and_remove(self, tmp_path, vectors):
+        index = LocalVectorIndex(str(tmp_path))
+        index.add(chunk_ids(500), vectors)
+
+        index.add(["chunk-0001"], [vectors[2]])  # re-embedded chunk supersedes its row
+        index.remove(["chunk-0002", "missing"])
+        found = index.search(vectors[2], 2)
+
+        assert found[0][0] == "chunk-0001" and found[0][1] == pytest.approx(1.0)
+        assert "chunk-0002" not in dict(found)
+        assert len(index) == 499
+
+    @pytest.mark.unit
+    def test_other_processes_see_appends_and_compaction(self, tmp_path, vectors):
+        writer = LocalVectorIndex(str(tmp_path))
+        reader = LocalVectorIndex(str(tmp_path))
+        writer.add(chunk_ids(400), vectors[:400])
+        assert len(reader) == 400
+
+        writer.add(chunk_ids(500)[400:], vectors[400:])
+        writer.remove(chunk_ids(500)[:10])
+        assert reader.search(vectors[450], 1)[0][0] == "chunk-0450"
+        assert len(reader) == 490
+
+        writer.remove(chunk_ids(500)[10:400])
+        writer.compact()
+        reopened = LocalVectorIndex(str(tmp_path))
+        assert writer._rows == len(writer) == len(reader) == len(reopened) == 100
+        assert reader.search(vectors[450], 1)[0][0] == "chunk-0450"
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("quantization", ["int8", "pq"])
+    def test_quantized_candidates_are_rescored_exactly(self, tmp_path, quantization):
+        rng = np.random.default_rng(3)
+        corpus = rng.normal(size=(2000, DIMENSIONS)).astype(np.float32)
+        index = LocalVectorIndex(
+            str(tmp_path), quantization=quantization, pq_train_rows=1024, block_rows=256
+        )
+        index.add(chunk_ids(2000), corpus)
+        normalized = corpus / np.linalg.norm(corpus, axis=1, keepdims=True)
+
+        memory = index.memory_bytes()
+        assert 0 < memory["codes"] == memory["scanned"] < memory["vectors"]
+        found = index.search(corpus[42], 10, oversample=20)
+        assert found[0] == ("chunk-0042", pytest.approx(1.0))
+        for chunk_id, similarity in found:
+            row = int(chunk_id.split("-")[1])
+            assert similarity == pytest.approx(float(normalized[row] @ normalized[42]), abs=1e-5)
+
+        query = corpus[7] + rng.normal(scale=0.3, size=DIMENSIONS).astype(np.float32)
+        expected = exact_top_k(corpus, query, 10)
+        found_ids = [chunk_id for chunk_id, _ in index.search(query, 10, oversample=20)]
+        assert len(set(found_ids) & set(expected)) >= 8
+
+    @pytest.mark.unit
+    def test_pq_codebook_is_trained_once_enough_rows_exist(self, tmp_path):
+        rng = np.random.default_rng(4)
+        corpus = rng.normal(size=(1100, DIMENSIONS)).astype(np.float32)
+        index = LocalVectorIndex(str(tmp_path), quantization="pq", pq_train_rows=1024)
+
+        index.add(chunk_ids(1000), corpus[:1000])
+        assert index.memory_bytes()["codes"] == 0  # exact until trained
+        assert index.search(corpus[5], 1)[0][0] == "chunk-0005"
+
+        index.add(chunk_ids(1100)[1000:], corpus[1000:])
+        reopened = LocalVectorIndex(str(tmp_path), quantization="pq")
+        subvectors = DIMENSIONS // 4
+        assert reopened.memory_bytes()["codes"] == 1100 * subvectors
+        assert reopened.search(corpus[1050], 1)[0][0] == "chunk-1050"
+
+        # Changing the quantization starts over (rebuilt from the database)
+        assert len(LocalVectorIndex(str(tmp_path), quantization="int8")) == 0
+
+    @pytest.mark.unit
+    def test_backend_selection(self, monkeypatch):
+        monkeypatch.delenv("VECTOR_SEARCH_BACKEND", raising=False)
+        assert vector_search_backend("postgresql+asyncpg://db/rag") == "pgvector"
+        assert vector_search_backend("sqlite+aiosqlite:///./dt_rag.db") == "local"
+
+        monkeypatch.setenv("VECTOR_SEARCH_BACKEND", "local")
+        assert vector_search_backend("postgresql+asyncpg://db/rag") == "local"
+        monkeypatch.setenv("VECTOR_SEARCH_BACKEND", "faiss")
+        with pytest.raises(ValueError):
+            vector_search_backend("sqlite+aiosqlite:///./dt_rag.db")
+
+
+@pytest.fixture
+async def sqlite_session(vectors):
+    """SQLite store with documents in two taxonomy subtrees"""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        for statement in (
+            "CREATE TABLE documents (doc_id TEXT PRIMARY KEY, source_url TEXT)",
+            "CREATE TABLE chunks (chunk_id TEXT PRIMARY KEY, doc_id TEXT, text TEXT)",
+            "CREATE TABLE doc_taxonomy (doc_id TEXT, path TEXT)",
+            "CREATE TABLE embeddings (chunk_id TEXT UNIQUE, vec TEXT)",
+        ):
+            await conn.execute(text(statement))
+        for doc, path in (("doc-a", ["AI"]), ("doc-b", ["Science"])):
+            await conn.execute(
+                text("INSERT INTO documents VALUES (:doc, :url)"),
+                {"doc": doc, "url": f"https://example.com/{doc}"},
+            )
+            await conn.execute(
+                text("INSERT INTO doc_taxonomy VALUES (:doc, :path)"),
+                {"doc": doc, "path": json.dumps(path)},
+            )
+        await conn.execute(
+            text("INSERT INTO chunks VALUES (:chunk_id, :doc, :text)"),
+            [
+                {"chunk_id": chunk_id, "doc": "doc-a" if i < 250 else "doc-b", "text": chunk_id}
+                for i, chunk_id in enumerate(chunk_ids(500))
+            ],
+        )
+        await conn.execute(
+            text("INSERT INTO embeddings VALUES (:chunk_id, :vec)"),
+            [
+                {"chunk_id": chunk_id, "vec": json.dumps(vectors[i].tolist())}
+                for i, chunk_id in enumerate(chunk_ids(500))
+            ],
+        )
+    async with AsyncSession(engine) as session:
+        yield session
+    await engine.dispose()
+
+
+class TestLocalVectorSearch:
+    """The local index as HybridSearchEngine's vector backend"""
+
+    @pytest.mark.unit
+    async def test_index_is_rebuilt_from_embeddings(self, tmp_path, sqlite_session, vectors):
+        index = LocalVectorIndex(str(tmp_path))
+        index.add(["stale"], [vectors[0]])
+
+        await load_local_vector_index(sqlite_session, index)
+
+        assert index.synced and len(index) == 500
+        assert index.search(vectors[42], 1)[0][0] == "chunk-0042"
+
+    @pytest.mark.unit
+    async def test_filtered_top_k_with_real_scores(
+        self, tmp_path, sqlite_session, vectors, monkeypatch
+    ):
+        index = LocalVectorIndex(str(tmp_path))
+        monkeypatch.setattr("apps.api.database.utils.local_vector_index._index", index)
+        engine = HybridSearchEngine(enable_caching=False, enable_reranking=False)
+        filter_clause, filter_params = engine._build_filter_clause(
+            {"taxonomy_paths": [["Science"]]}, postgresql=False
+        )
+        query = vectors[300] + 0.05
+        metrics = SearchMetrics()
+
+        rows = await engine._perform_local_vector_search(
+            sqlite_session, query.tolist(), 5, filter_clause, filter_params, metrics
+        )
+
+        expected = [c for c in exact_top_k(vectors, query, 500) if c >= "chunk-0250"][:5]
+        assert [row[0] for row in rows] == expected
+        assert rows[0][5] > rows[-1][5]  # similarity, not a constant
+        assert metrics.vector_strategy == "exact"
+        assert metrics.vector_selectivity == pytest.approx(0.5)
+
+    @pytest.mark.unit
+    async def test_chunks_missing_from_the_database_are_dropped(
+        self, tmp_path, sqlite_session, vectors, monkeypatch
+    ):
+        index = LocalVectorIndex(str(tmp_path))
+        monkeypatch.setattr("apps.api.database.utils.local_vector_index._index", index)
+        await load_local_vector_index(sqlite_session, index)
+        await sqlite_session.execute(text("DELETE FROM chunks WHERE chunk_id = 'chunk-0010'"))
+        engine = HybridSearchEngine(enable_caching=False, enable_reranking=False)
+
+        rows = await engine._perform_local_vector_search(
+            sqlite_session, vectors[10].tolist(), 3, "", {}
+        )
+
+        assert len(rows) == 3 and "chunk-0010" not in [row[0] for row in rows]
+        assert len(index) == 499
@@ -0,0 +1,235 @@
+"""
+Unit tests for search optimization modules (apps.api.optimization)
+
+Covers the async execution optimizer, GC-pause-aware context and the
+per-operation concurrency controller used by SearchDAO.hybrid_search.
+
+@TEST:OPTIMIZATION-001
+"""
+
+import asyncio
+import gc
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from apps.api.optimization import (
+    AsyncExecutionOptimizer,
+    ConcurrencyController,
+    ConcurrencyLimitExceeded,
+    ExecutionMetrics,
+    GCOptimizer,
+)
+
+
+class TestAsyncExecutionOptimizer:
+    """Test cases for AsyncExecutionOptimizer"""
+
+    @pytest.mark.unit
+    async def test_parallel_search_uses_separate_sessions(self):
+        """BM25 runs on the caller session, vector on a pooled session"""
+        caller_session = AsyncMock(name="caller")
+        pooled_session = AsyncMock(name="pooled")
+        seen_sessions = {}
+
+        async def fake_bm25(session, query, topk, filters):
+            seen_sessions["bm25"] = session
+            await asyncio.sleep(0.05)
+            return [{"chunk_id": "1"}]
+
+        async def fake_vector(session, embedding, topk, filters, ann_params=None):
+            seen_sessions["vector"] = session
+            await asyncio.sleep(0.05)
+            return [{"chunk_id": "2"}, {"chunk_id": "3"}]
+
+        @asynccontextmanager
+        async def fake_session_factory():
+            yield pooled_session
+
+        optimizer = AsyncExecutionOptimizer(max_workers=2)
+        with patch(
+            "apps.api.database.daos.search_dao.SearchDAO._perform_bm25_search",
+            side_effect=fake_bm25,
+        ), patch(
+            "apps.api.database.daos.search_dao.SearchDAO._perform_vector_search",
+            side_effect=fake_vector,
+        ), patch(
+            "apps.api.database.daos.database_manager.db_manager.async_session",
+            side_effect=fake_session_factory,
+        ):
+            bm25, vector, metrics = await optimizer.execute_parallel_search(
+                caller_session, "query", [0.1] * 4, {"bm25_topk": 5, "vector_topk": 5}
+            )
+
+        optimizer.shutdown()
+
+        assert seen_sessions["bm25"] is caller_session
+        assert seen_sessions["vector"] is pooled_session
+        assert len(bm25) == 1 and len(vector) == 2
+        assert isinstance(metrics, ExecutionMetrics)
+        assert metrics.bm25_candidates == 1
+        assert metrics.vector_candidates == 2
+        # Ran concurrently: wall time well below the sequential 0.1s
+        assert metrics.parallel_time < 0.09
+
+    @pytest.mark.unit
+    async def test_parallel_search_isolates_branch_failure(self):
+        """A failing branch is reported in metrics without losing the other"""
+
+        async def failing_vector(*args, **kwargs):
+            raise RuntimeError("pgvector unavailable")
+
+        @asynccontextmanager
+        async def fake_session_factory():
+            yield AsyncMock()
+
+        optimizer = AsyncExecutionOptimizer(max_workers=1)
+        with patch(
+            "apps.api.database.daos.search_dao.SearchDAO._perform_bm25_search",
+            AsyncMock(return_value=[{"chunk_id": "1"}]),
+        ), patch(
+            "apps.api.database.daos.search_dao.SearchDAO._perform_vector_search",
+            side_effect=failing_vector,
+        ), patch(
+            "apps.api.database.daos.database_manager.db_manager.async_session",
+            side_effect=fake_session_factory,
+        ):
+            bm25, vector, metrics = await optimizer.execute_parallel_search(
+                AsyncMock(), "query", [0.1], {}
+            )
+
+        optimizer.shutdown()
+
+        assert bm25 == [{"chunk_id": "1"}]
+        assert vector == []
+        assert metrics.vector_error == "pgvector unavailable"
+
+    @pytest.mark.unit
+    async def test_fusion_runs_in_thread_pool(self):
+        """Fusion honours weights and candidate limits"""
+        optimizer = AsyncExecutionOptimizer(max_workers=1)
+        bm25 = [
+            {"chunk_id": "a", "score": 1.0, "metadata": {"bm25_score": 1.0, "vector_score": 0.0}},
+        ]
+        vector = [
+            {"chunk_id": "a", "score": 0.5, "metadata": {"bm25_score": 0.0, "vector_score": 0.5}},
+            {"chunk_id": "b", "score": 0.9, "metadata": {"bm25_score": 0.0, "vector_score": 0.9}},
+        ]
+
+        fused = await optimizer.execute_fusion_with_concurrency_control(
+            bm25, vector, {"bm25_weight": 0.2, "vector_weight": 0.8, "max_candidates": 1}
+        )
+        optimizer.shutdown()
+
+        assert len(fused) == 1
+        assert fused[0]["chunk_id"] == "b"
+        assert optimizer.get_stats()["cpu_tasks"] == 1
+
+
+class TestGCOptimizer:
+    """Test cases for GCOptimizer"""
+
+    @pytest.mark.unit
+    async def test_thresholds_raised_and_restored(self):
+        """Gen0 threshold is raised only while contexts are active"""
+        original = gc.get_threshold()
+        optimizer = GCOptimizer(gen0_threshold=original[0] * 10, enabled=True)
+        try:
+            async with optimizer.optimized_gc_context():
+                async with optimizer.optimized_gc_context():
+                    assert gc.get_threshold()[0] == original[0] * 10
+                    assert optimizer.get_metrics().active_contexts == 2
+                assert gc.get_threshold()[0] == original[0] * 10
+            assert gc.get_threshold() == original
+        finally:
+            optimizer.close()
+
+    @pytest.mark.unit
+    async def test_gc_pauses_are_recorded(self):
+        """Collections inside a context are attributed to requests"""
+        optimizer = GCOptimizer(enabled=True)
+        try:
+            async with optimizer.optimized_gc_context():
+                gc.collect()
+            metrics = optimizer.get_metrics()
+            assert metrics.collections >= 1
+            assert metrics.pauses_during_requests >= 1
+            assert metrics.max_pause_time >= 0.0
+        finally:
+            optimizer.close()
+
+
+class TestConcurrencyController:
+    """Test cases for ConcurrencyController"""
+
+    @pytest.mark.unit
+    async def test_limits_in_flight_operations(self):
+        """No more than the configured limit runs at once"""
+        controller = ConcurrencyController(limits={"op": 2}, queue_timeout=5)
+        running = 0
+        peak = 0
+
+        async def worker():
+            nonlocal running, peak
+            async with controller.controlled_execution("op"):
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+
+        await asyncio.gather(*(worker() for _ in range(8)))
+
+        metrics = controller.get_metrics("op")
+        assert peak == 2
+        assert metrics["completed"] == 8
+        assert metrics["peak_in_flight"] == 2
+        assert metrics["in_flight"] == 0
+
+    @pytest.mark.unit
+    async def test_queue_timeout_rejects(self):
+        """Waiting past the queue timeout raises ConcurrencyLimitExceeded"""
+        controller = ConcurrencyController(limits={"op": 1}, queue_timeout=0.01)
+
+        async with controller.controlled_execution("op"):
+            with pytest.raises(ConcurrencyLimitExceeded):
+                async with controller.controlled_execution("op"):
+                    pass
+
+        assert controller.get_metrics("op")["rejected"] == 1
+
+    @pytest.mark.unit
+    async def test_operations_are_isolated(self):
+        """A saturated operation does not block a different one"""
+        controller = ConcurrencyController(
+            limits={"slow": 1, "fast": 1}, queue_timeout=0.01
+        )
+
+        async with controller.controlled_execution("slow"):
+            async with controller.controlled_execution("fast"):
+                pass
+
+        assert controller.get_metrics("fast")["completed"] == 1
+
+    @pytest.mark.unit
+    async def test_hybrid_search_surfaces_overload(self):
+        """A rejected hybrid search raises instead of returning fallback results"""
+        from apps.api.database.daos.search_dao import SearchDAO
+
+        controller = ConcurrencyController(
+            limits={"hybrid_search": 1}, queue_timeout=0.01
+        )
+        fallback = AsyncMock(return_value=[{"chunk_id": "fallback"}])
+
+        with patch(
+            "apps.api.optimization.concurrency_control.get_concurrency_controller",
+            return_value=controller,
+        ), patch(
+            "apps.api.optimization.async_executor.get_async_optimizer",
+            AsyncMock(),
+        ), patch.object(SearchDAO, "_get_fallback_search", fallback):
+            async with controller.controlled_execution("hybrid_search"):
+                with pytest.raises(ConcurrencyLimitExceeded):
+                    await SearchDAO.hybrid_search("query")
+
+        fallback.assert_not_called()
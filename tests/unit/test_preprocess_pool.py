@@ -0,0 +1,81 @@
+"""
+Unit tests for the ingestion preprocess pool
+
+@TEST:INGESTION-002
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from apps.ingestion.preprocess import pool as pool_module
+from apps.ingestion.preprocess import PreprocessPool, PreprocessTimeoutError
+from apps.ingestion.preprocess.worker import PreprocessedDocument
+
+
+def fake_preprocess(file_content, file_name, file_format, chunk_size, overlap_size):
+    if file_content == b"slow":
+        time.sleep(0.2)
+    return PreprocessedDocument(
+        parsed_chars=len(file_content),
+        chunks=[],
+        total_tokens=0,
+        stage_ms={"parse": 1.0, "chunk": 2.0, "pii": 3.0},
+    )
+
+
+@pytest.fixture
+def thread_pool(monkeypatch):
+    monkeypatch.setattr(pool_module, "preprocess_document", fake_preprocess)
+    pool = PreprocessPool(mode="thread", binary_workers=1, text_workers=1)
+    yield pool
+    pool.shutdown()
+
+
+class TestPreprocessPool:
+    """Test cases for PreprocessPool"""
+
+    @pytest.mark.unit
+    def test_formats_are_routed_to_lanes(self):
+        assert PreprocessPool.lane_for("PDF") == "binary"
+        assert PreprocessPool.lane_for("docx") == "binary"
+        assert PreprocessPool.lane_for("txt") == "text"
+        assert PreprocessPool.lane_for("md") == "text"
+
+    @pytest.mark.unit
+    def test_rejects_unknown_mode(self):
+        with pytest.raises(ValueError):
+            PreprocessPool(mode="inline")
+
+    @pytest.mark.unit
+    async def test_slow_pdf_does_not_block_text_lane(self, thread_pool):
+        slow = asyncio.ensure_future(thread_pool.run(b"slow", "a.pdf", "pdf"))
+        await asyncio.sleep(0.01)
+
+        result = await asyncio.wait_for(
+            thread_pool.run(b"quick", "b.txt", "txt"), timeout=0.1
+        )
+
+        assert result.parsed_chars == 5
+        assert thread_pool.get_stats()["lanes"]["binary"]["queue_depth"] == 1
+        await slow
+
+    @pytest.mark.unit
+    async def test_timeout_raises_and_recycles_lane(self, thread_pool):
+        with pytest.raises(PreprocessTimeoutError):
+            await thread_pool.run(b"slow", "a.pdf", "pdf", timeout=0.01)
+
+        stats = thread_pool.get_stats()["lanes"]["binary"]
+        assert stats["timeouts"] == 1
+        assert stats["recycles"] == 1
+        assert stats["queue_depth"] == 0
+
+    @pytest.mark.unit
+    async def test_stage_latencies_are_aggregated(self, thread_pool):
+        await thread_pool.run(b"one", "a.txt", "txt")
+        await thread_pool.run(b"two", "b.txt", "txt")
+
+        stats = thread_pool.get_stats()["lanes"]["text"]
+        assert stats["completed"] == 2
+        assert stats["avg_stage_ms"] == {"parse": 1.0, "chunk": 2.0, "pii": 3.0}
@@ -0,0 +1,148 @@
+"""
+Unit tests for the GCRA rate limiter with locally leased tokens
+
+Each RedisRateLimiter below stands for one API process; they share a
+fakeredis server (with Lua support) the way processes share Redis.
+
+@TEST:RATE-LIMIT-002
+"""
+
+import pytest
+
+from apps.api.middleware.rate_limiter import (
+    RATE_LIMIT_ADMIN,
+    RATE_LIMIT_READ,
+    RATE_LIMIT_WRITE,
+    RedisRateLimiter,
+    get_rate_limit_for_method,
+)
+
+
+@pytest.fixture
+def redis_server():
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    return fakeredis.FakeServer()
+
+
+def make_limiter(server=None, **overrides):
+    client = None
+    if server is not None:
+        import fakeredis
+
+        client = fakeredis.aioredis.FakeRedis(server=server, decode_responses=True)
+    limiter = RedisRateLimiter(client)
+    limiter.enabled = True
+    for name, value in overrides.items():
+        setattr(limiter, name, value)
+    return limiter
+
+
+class TestRedisRateLimiter:
+    """Test cases for RedisRateLimiter"""
+
+    @pytest.mark.unit
+    async def test_limit_is_exact_with_leases(self, redis_server):
+        limiter = make_limiter(redis_server)
+
+        decisions = [await limiter.check_rate_limit("ip:a", 40, 60) for _ in range(45)]
+
+        assert [d.allowed for d in decisions] == [True] * 40 + [False] * 5
+        assert decisions[0].remaining == 39
+        # Two requests leased per round trip (5% of 40), denial cached locally
+        assert limiter.stats["redis"] == 21
+        assert 0 < decisions[-1].retry_after <= 1.5
+
+    @pytest.mark.unit
+    async def test_processes_share_the_limit(self, redis_server):
+        first = make_limiter(redis_server, local_burst=1)
+        second = make_limiter(redis_server, local_burst=1)
+
+        for _ in range(3):
+            assert (await first.check_rate_limit("ip:a", 5, 60)).allowed
+        for _ in range(2):
+            assert (await second.check_rate_limit("ip:a", 5, 60)).allowed
+
+        assert not (await first.check_rate_limit("ip:a", 5, 60)).allowed
+        assert not (await second.check_rate_limit("ip:a", 5, 60)).allowed
+        assert (await second.check_rate_limit("ip:b", 5, 60)).allowed
+
+    @pytest.mark.unit
+    async def test_fails_open_without_redis(self):
+        limiter = make_limiter()
+
+        decisions = [
+            await limiter.check_rate_limit("ip:a", 2, 60, local_fallback=False)
+            for _ in range(5)
+        ]
+
+        assert all(d.allowed for d in decisions)
+
+    @pytest.mark.unit
+    async def test_local_fallback_enforces_limit(self):
+        limiter = make_limiter()
+
+        decisions = [
+            await limiter.check_rate_limit("ip:a", 3, 60, local_fallback=True)
+            for _ in range(4)
+        ]
+
+        assert [d.allowed for d in decisions] == [True, True, True, False]
+        assert [d.remaining for d in decisions] == [2, 1, 0, 0]
+        assert decisions[-1].retry_after == pytest.approx(20, abs=0.5)
+
+    @pytest.mark.unit
+    async def test_evicts_idle_clients(self):
+        limiter = make_limiter()
+
+        for identifier in ("ip:a", "ip:b", "ip:c"):
+            await limiter.check_rate_limit(identifier, 10, 60, local_fallback=False)
+
+        # Nothing was leased or denied, so only the latest entry is kept
+        assert list(limiter._local) == ["ip:c:10/60"]
+
+    @pytest.mark.unit
+    async def test_caps_tracked_clients(self):
+        limiter = make_limiter(max_clients=2)
+
+        for identifier in ("ip:a", "ip:b", "ip:c"):
+            await limiter.check_rate_limit(identifier, 10, 60, local_fallback=True)
+
+        assert list(limiter._local) == ["ip:b:10/60", "ip:c:10/60"]
+        assert limiter.stats["evicted"] == 1
+
+    @pytest.mark.unit
+    async def test_tiers_do_not_share_state(self, redis_server):
+        limiter = make_limiter(redis_server, local_burst=1)
+
+        for _ in range(2):
+            assert (await limiter.check_rate_limit("ip:a", 2, 60)).allowed
+        assert not (await limiter.check_rate_limit("ip:a", 2, 60)).allowed
+
+        # The write denial is cached, but reads have their own limit
+        decision = await limiter.check_rate_limit("ip:a", 4, 60)
+        assert decision.allowed
+        assert decision.remaining == 3
+
+    @pytest.mark.unit
+    async def test_local_fallback_tiers_do_not_share_state(self):
+        limiter = make_limiter()
+
+        for _ in range(2):
+            await limiter.check_rate_limit("ip:a", 2, 60, local_fallback=True)
+        assert not (
+            await limiter.check_rate_limit("ip:a", 2, 60, local_fallback=True)
+        ).allowed
+
+        assert (await limiter.check_rate_limit("ip:a", 4, 60, local_fallback=True)).allowed
+
+
+class TestRateLimitTiers:
+    """Test cases for get_rate_limit_for_method"""
+
+    @pytest.mark.unit
+    def test_scope_overrides_method(self):
+        assert get_rate_limit_for_method("GET") == RATE_LIMIT_READ
+        assert get_rate_limit_for_method("POST") == RATE_LIMIT_WRITE
+        assert get_rate_limit_for_method("POST", "admin") == RATE_LIMIT_ADMIN
+        assert get_rate_limit_for_method("POST", "unknown") == RATE_LIMIT_WRITE
@@ -0,0 +1,179 @@
+"""
+Unit tests for the search ResultCache (LRU + TTL + generation)
+
+@TEST:SEARCH-001
+"""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from apps.search import hybrid_search_engine as engine
+from apps.search.hybrid_search_engine import (
+    ResultCache,
+    SearchResult,
+    bump_cache_generation,
+)
+
+
+def _results(chunk_id="a"):
+    return [SearchResult(chunk_id=chunk_id, text=f"text {chunk_id}", rerank_score=0.5)]
+
+
+class TestResultCache:
+    """Test cases for ResultCache"""
+
+    @pytest.mark.unit
+    def test_hit_rate_counts_hits_and_misses(self):
+        cache = ResultCache(max_size=10)
+        assert cache.get("q", {}, 5) is None
+        cache.put("q", {}, 5, _results())
+        assert cache.get("q", {}, 5) is not None
+
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == pytest.approx(0.5)
+
+    @pytest.mark.unit
+    def test_cached_payload_is_immutable(self):
+        cache = ResultCache(max_size=10)
+        results = _results()
+        cache.put("q", {}, 5, results)
+
+        results[0].rerank_score = 9.0
+        first = cache.get("q", {}, 5)
+        first[0].metadata["mutated"] = True
+
+        second = cache.get("q", {}, 5)
+        assert second[0].rerank_score == 0.5
+        assert second[0].metadata == {}
+
+    @pytest.mark.unit
+    def test_lru_eviction_respects_recent_access(self):
+        cache = ResultCache(max_size=2)
+        cache.put("q0", {}, 5, _results("0"))
+        cache.put("q1", {}, 5, _results("1"))
+        cache.get("q0", {}, 5)
+        cache.put("q2", {}, 5, _results("2"))
+
+        assert cache.get("q1", {}, 5) is None
+        assert cache.get("q0", {}, 5) is not None
+        assert cache.get_stats()["evictions"] == 1
+
+    @pytest.mark.unit
+    def test_byte_budget_bounds_cache(self):
+        cache = ResultCache(max_size=100)
+        cache.put("q0", {}, 5, _results("0"))
+        entry_bytes = cache.size_bytes
+        cache.max_bytes = entry_bytes * 2
+
+        for i in range(1, 4):
+            cache.put(f"q{i}", {}, 5, _results(str(i)))
+
+        assert len(cache.cache) == 2
+        assert cache.size_bytes <= cache.max_bytes
+        cache.clear()
+        assert cache.size_bytes == 0
+
+    @pytest.mark.unit
+    def test_ttl_expiry(self, monkeypatch):
+        cache = ResultCache(max_size=10, ttl_seconds=60)
+        clock = [1000.0]
+        monkeypatch.setattr("apps.search.hybrid_search_engine.time.time", lambda: clock[0])
+        cache.put("q", {}, 5, _results())
+
+        clock[0] += 61
+        assert cache.get("q", {}, 5) is None
+        assert cache.get_stats()["expirations"] == 1
+
+    @pytest.mark.unit
+    def test_generation_bump_invalidates_entries(self):
+        cache = ResultCache(max_size=10)
+        cache.put("q", {}, 5, _results())
+
+        bump_cache_generation()
+
+        assert cache.get("q", {}, 5) is None
+        assert cache.get_stats()["invalidations"] == 1
+        cache.put("q", {}, 5, _results())
+        assert cache.get("q", {}, 5) is not None
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.value = 0
+        self.published = []
+
+    async def incr(self, key):
+        self.value += 1
+        return self.value
+
+    async def publish(self, channel, message):
+        self.published.append((channel, message))
+
+
+class TestSharedCacheGeneration:
+    """Cache invalidation across API processes"""
+
+    @pytest.mark.unit
+    def test_result_shaping_options_are_part_of_key(self):
+        cache = ResultCache(max_size=10)
+        options = {"bm25_candidates": 50, "vector_candidates": 50, "ann_params": None}
+        cache.put("q", {}, 5, _results(), options)
+
+        assert cache.get("q", {}, 5, dict(options)) is not None
+        assert cache.get("q", {}, 5, {**options, "vector_candidates": 200}) is None
+        assert cache.get("q", {}, 5, {**options, "ann_params": {"ef_search": 400}}) is None
+
+    @pytest.mark.unit
+    async def test_publish_increments_shared_generation(self, monkeypatch):
+        redis = _FakeRedis()
+        monkeypatch.setattr(engine, "_get_redis_client", AsyncMock(return_value=redis))
+        cache = ResultCache(max_size=10)
+        cache.put("q", {}, 5, _results())
+
+        await engine.publish_cache_invalidation()
+
+        assert cache.get("q", {}, 5) is None
+        assert redis.published == [(engine.CACHE_INVALIDATION_CHANNEL, redis.value)]
+
+        # Our own message comes back from the channel; it must not bump again
+        generation = engine.get_cache_generation()
+        engine._invalidation_listener.apply(redis.value)
+        assert engine.get_cache_generation() == generation
+
+    @pytest.mark.unit
+    def test_generation_from_other_process_invalidates_entries(self):
+        cache = ResultCache(max_size=10)
+        cache.put("q", {}, 5, _results())
+
+        engine._invalidation_listener.apply(engine._invalidation_listener.shared_generation + 1)
+
+        assert cache.get("q", {}, 5) is None
+
+    @pytest.mark.unit
+    async def test_publish_without_redis_invalidates_locally(self, monkeypatch):
+        monkeypatch.setattr(engine, "_get_redis_client", AsyncMock(return_value=None))
+        cache = ResultCache(max_size=10)
+        cache.put("q", {}, 5, _results())
+
+        await engine.publish_cache_invalidation()
+
+        assert cache.get("q", {}, 5) is None
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        "change", [{"bm25_weight": 0.8}, {"normalization": "z_score"}, {"rrf_k": 30}]
+    )
+    def test_config_update_misses_cached_results(self, change):
+        search_engine = engine.HybridSearchEngine(enable_reranking=False)
+        search_engine.cache.put(
+            "q", {}, 5, _results(), search_engine._cache_options(50, 50, None)
+        )
+
+        search_engine.update_config(**change)
+
+        assert search_engine.cache.get(
+            "q", {}, 5, search_engine._cache_options(50, 50, None)
+        ) is None
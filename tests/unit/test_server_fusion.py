@@ -0,0 +1,125 @@
+"""
+Unit tests for server-side (single statement) hybrid fusion
+
+@TEST:SEARCH-001
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from apps.api.database.utils.vector_index import query_vector_param
+from apps.search.hybrid_search_engine import HybridSearchEngine, SearchResult
+
+
+def _engine(**kwargs):
+    return HybridSearchEngine(enable_caching=False, enable_reranking=False, **kwargs)
+
+
+class TestServerFusionConfig:
+    """Test cases for fusion mode configuration"""
+
+    @pytest.mark.unit
+    def test_fusion_mode_selectable_via_update_config(self):
+        engine = _engine()
+        assert engine.get_config()["fusion_mode"] == "client"
+
+        engine.update_config(fusion_mode="server", server_fusion_method="min_max", rrf_k=30)
+
+        config = engine.get_config()
+        assert config["fusion_mode"] == "server"
+        assert config["server_fusion_method"] == "min_max"
+        assert config["rrf_k"] == 30
+
+    @pytest.mark.unit
+    def test_invalid_modes_rejected(self):
+        engine = _engine()
+        with pytest.raises(ValueError):
+            engine.update_config(fusion_mode="remote")
+        with pytest.raises(ValueError):
+            engine.update_config(server_fusion_method="borda")
+        with pytest.raises(ValueError):
+            HybridSearchEngine(fusion_mode="remote")
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        "change",
+        [{"fusion_mode": "server"}, {"server_fusion_method": "min_max"}, {"rrf_k": 30}],
+    )
+    def test_fusion_settings_are_part_of_cache_key(self, change):
+        engine = _engine()
+        before = engine._cache_options(50, 50, None)
+
+        engine.update_config(**change)
+
+        assert engine._cache_options(50, 50, None) != before
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("method", ["rrf", "min_max"])
+    def test_query_is_single_statement(self, method):
+        engine = _engine(server_fusion_method=method)
+        query = engine._build_server_fusion_query("", query_vector_param(3))
+        sql = str(query.compile(dialect=postgresql.asyncpg.dialect()))
+
+        assert sql.strip().startswith("WITH bm25_candidates AS")
+        assert "FULL OUTER JOIN ann" in sql
+        assert "doc_taxonomy dt ON d.doc_id" not in sql  # no filter, no CTE join
+        if method == "rrf":
+            assert "rrf_k" not in sql  # bound, not inlined
+            assert "b.rnk" in sql
+        else:
+            assert "b.norm" in sql
+
+
+class TestServerFusionSearch:
+    """Test cases for HybridSearchEngine.search in server fusion mode"""
+
+    @pytest.mark.unit
+    async def test_server_mode_uses_single_query(self):
+        engine = _engine(fusion_mode="server")
+        fused = [
+            SearchResult(chunk_id="a", text="alpha", hybrid_score=0.9),
+            SearchResult(chunk_id="b", text="beta", hybrid_score=0.4),
+        ]
+
+        with patch(
+            "apps.search.hybrid_search_engine.embedding_service.generate_embedding",
+            AsyncMock(return_value=[0.1, 0.2, 0.3]),
+        ), patch.object(
+            engine, "_supports_server_fusion", return_value=True
+        ), patch.object(
+            engine, "_perform_server_fused_search", AsyncMock(return_value=fused)
+        ) as server_search, patch.object(
+            engine, "_perform_bm25_search", AsyncMock()
+        ) as bm25_search:
+            results, metrics = await engine.search("alpha", top_k=1)
+
+        server_search.assert_awaited_once()
+        bm25_search.assert_not_awaited()
+        assert [r.chunk_id for r in results] == ["a"]
+        assert metrics.final_results == 1
+
+    @pytest.mark.unit
+    async def test_server_failure_falls_back_to_client_fusion(self):
+        engine = _engine(fusion_mode="server")
+
+        with patch(
+            "apps.search.hybrid_search_engine.embedding_service.generate_embedding",
+            AsyncMock(return_value=[0.1, 0.2, 0.3]),
+        ), patch.object(
+            engine, "_supports_server_fusion", return_value=True
+        ), patch.object(
+            engine,
+            "_perform_server_fused_search",
+            AsyncMock(side_effect=RuntimeError("no search_tsv")),
+        ), patch.object(
+            engine,
+            "_perform_bm25_search",
+            AsyncMock(return_value=[SearchResult(chunk_id="a", text="alpha", bm25_score=1.0)]),
+        ), patch.object(
+            engine, "_perform_vector_search", AsyncMock(return_value=[])
+        ):
+            results, _ = await engine.search("alpha", top_k=1)
+
+        assert [r.chunk_id for r in results] == ["a"]
@@ -0,0 +1,115 @@
+"""
+Unit tests for the Redis Streams ingestion queue
+
+Each StreamJobQueue below stands for one worker process; they share a
+fakeredis server the way processes on different hosts share Redis.
+
+@TEST:INGESTION-006
+"""
+
+import asyncio
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from apps.api.cache.redis_manager import RedisManager
+from apps.ingestion.batch.stream_queue import StreamJobQueue
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+def make_queue(server, consumer, **kwargs):
+    manager = RedisManager()
+    manager.client = fakeredis.aioredis.FakeRedis(server=server)
+    manager.is_connected = True
+    kwargs.setdefault("visibility_timeout_s", 60)
+    return StreamJobQueue(redis_manager=manager, consumer=consumer, **kwargs)
+
+
+async def enqueue(queue, job_id, priority=5):
+    assert await queue.enqueue_job(job_id, f"cmd-{job_id}", {"n": job_id}, priority)
+
+
+class TestStreamJobQueue:
+    """Test cases for StreamJobQueue"""
+
+    @pytest.mark.unit
+    async def test_dequeues_by_priority_and_ack_removes_entry(self, server):
+        queue = make_queue(server, "worker-1")
+        await enqueue(queue, "low", priority=9)
+        await enqueue(queue, "high", priority=1)
+
+        first = await queue.dequeue_job(timeout=0)
+        second = await queue.dequeue_job(timeout=0)
+
+        assert [first["job_id"], second["job_id"]] == ["high", "low"]
+        assert await queue.get_queue_size() == 2
+        await queue.ack_job(first)
+        await queue.ack_job(second)
+        assert await queue.get_queue_size() == 0
+        assert await queue.dequeue_job(timeout=0) is None
+
+    @pytest.mark.unit
+    async def test_consumers_share_work_without_duplicates(self, server):
+        workers = [make_queue(server, f"worker-{i}") for i in range(3)]
+        for i in range(6):
+            await enqueue(workers[0], f"job-{i}")
+
+        received = []
+        for _ in range(2):
+            for worker in workers:
+                received.append((await worker.dequeue_job(timeout=0))["job_id"])
+
+        assert sorted(received) == [f"job-{i}" for i in range(6)]
+
+    @pytest.mark.unit
+    async def test_job_of_dead_worker_is_redelivered(self, server):
+        dead = make_queue(server, "dead", visibility_timeout_s=0.05)
+        alive = make_queue(server, "alive", visibility_timeout_s=0.05)
+        await enqueue(dead, "job-1")
+        assert (await dead.dequeue_job(timeout=0))["job_id"] == "job-1"
+        assert await alive.dequeue_job(timeout=0) is None
+
+        await asyncio.sleep(0.1)
+        alive._next_reclaim = 0.0
+        job = await alive.dequeue_job(timeout=0)
+
+        assert job["job_id"] == "job-1"
+        assert job["redelivered"] is True
+        assert alive.stats["reclaimed"] == 1
+
+    @pytest.mark.unit
+    async def test_touched_job_is_not_reclaimed(self, server):
+        running = make_queue(server, "running", visibility_timeout_s=0.2)
+        other = make_queue(server, "other", visibility_timeout_s=0.2)
+        await enqueue(running, "job-1")
+        job = await running.dequeue_job(timeout=0)
+
+        await asyncio.sleep(0.15)
+        await running.touch_job(job)
+        await asyncio.sleep(0.1)
+        other._next_reclaim = 0.0
+
+        assert await other.dequeue_job(timeout=0) is None
+
+    @pytest.mark.unit
+    async def test_poison_job_goes_to_dead_letter_stream(self, server):
+        queue = make_queue(server, "worker", visibility_timeout_s=0.01, max_deliveries=2)
+        await enqueue(queue, "poison")
+        assert await queue.dequeue_job(timeout=0) is not None
+
+        for _ in range(2):
+            await asyncio.sleep(0.02)
+            queue._next_reclaim = 0.0
+            await queue.dequeue_job(timeout=0)
+
+        client = queue.redis_manager.client
+        assert queue.stats["dead_lettered"] == 1
+        assert await client.xlen(StreamJobQueue.DEAD_LETTER_KEY) == 1
+        assert await queue.get_queue_size() == 0
+        status = await queue.get_job_status("poison")
+        assert status["status"] == "failed"
@@ -0,0 +1,135 @@
+"""
+Unit tests for taxonomy subtree filters
+
+@TEST:DATABASE-PKG-022
+"""
+
+import json
+import sqlite3
+
+import pytest
+
+from apps.api.database.utils.taxonomy_filter import (
+    PATH_KEY_SEPARATOR,
+    taxonomy_path_key,
+    taxonomy_subtree_condition,
+)
+from apps.api.database.utils.vector_index import query_vector_param
+from apps.search.hybrid_search_engine import HybridSearchEngine
+
+STORED_PATHS = [
+    ["AI"],
+    ["AI", "RAG"],
+    ["ai", "ML", "Transformers"],
+    ["AIOps"],
+    ["Machine_Learning"],
+    ["MachineXLearning"],
+    ["Other", "AI"],
+]
+
+
+def ancestor_keys(path):
+    """What migration 0018's taxonomy_path_prefixes() stores for a path"""
+    return [taxonomy_path_key(path[: i + 1]) for i in range(len(path))]
+
+
+def sqlite_matches(filter_paths):
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE doc_taxonomy (doc_id INTEGER, path TEXT)")
+    conn.executemany(
+        "INSERT INTO doc_taxonomy VALUES (?, ?)",
+        [(idx, json.dumps(path)) for idx, path in enumerate(STORED_PATHS)],
+    )
+    condition, params = taxonomy_subtree_condition(filter_paths, postgresql=False)
+    rows = conn.execute(
+        f"SELECT doc_id FROM doc_taxonomy dt WHERE {condition} ORDER BY doc_id", params
+    ).fetchall()
+    return [STORED_PATHS[doc_id] for (doc_id,) in rows]
+
+
+class TestTaxonomySubtreeCondition:
+    """Test cases for taxonomy_subtree_condition"""
+
+    @pytest.mark.unit
+    def test_postgresql_is_one_overlap_predicate(self):
+        condition, params = taxonomy_subtree_condition(
+            [["AI", "RAG"], ["Science"]], postgresql=True
+        )
+
+        assert condition.count("&&") == 1 and " OR " not in condition
+        assert "dt.path_prefixes" in condition
+        assert params == {
+            "taxonomy_path_0": f"ai{PATH_KEY_SEPARATOR}rag",
+            "taxonomy_path_1": "science",
+        }
+
+    @pytest.mark.unit
+    def test_postgresql_keys_match_stored_ancestors(self):
+        _, params = taxonomy_subtree_condition([["AI"]], postgresql=True)
+        matching = [
+            path for path in STORED_PATHS if set(params.values()) & set(ancestor_keys(path))
+        ]
+
+        assert matching == [["AI"], ["AI", "RAG"], ["ai", "ML", "Transformers"]]
+
+    @pytest.mark.unit
+    def test_sqlite_matches_subtrees(self):
+        assert sqlite_matches([["AI"]]) == [
+            ["AI"],
+            ["AI", "RAG"],
+            ["ai", "ML", "Transformers"],
+        ]
+        assert sqlite_matches([["AI", "RAG"], ["Machine_Learning"]]) == [
+            ["AI", "RAG"],
+            ["Machine_Learning"],
+        ]
+
+    @pytest.mark.unit
+    def test_no_paths_no_condition(self):
+        assert taxonomy_subtree_condition([], postgresql=True) == ("", {})
+        assert taxonomy_subtree_condition([[]], postgresql=False) == ("", {})
+
+
+class TestHybridSearchTaxonomyFilter:
+    """Taxonomy filters in HybridSearchEngine queries"""
+
+    @pytest.mark.unit
+    def test_filter_is_pushed_into_candidate_queries(self):
+        engine = HybridSearchEngine(enable_caching=False, enable_reranking=False)
+        filter_clause, params = engine._build_filter_clause(
+            {"taxonomy_paths": [["AI"], ["Science", "Physics"]]}
+        )
+
+        query = engine._build_server_fusion_query(filter_clause, query_vector_param(3))
+        sql = str(query)
+
+        assert sql.count("dt.path_prefixes &&") == 2  # BM25 and ANN CTEs
+        assert params == {
+            "taxonomy_path_0": "ai",
+            "taxonomy_path_1": f"science{PATH_KEY_SEPARATOR}physics",
+        }
+
+    @pytest.mark.unit
+    def test_invalid_segment_rejects_whole_path(self):
+        engine = HybridSearchEngine(enable_caching=False, enable_reranking=False)
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE doc_taxonomy (doc_id INTEGER, path TEXT)")
+        conn.executemany(
+            "INSERT INTO doc_taxonomy VALUES (?, ?)",
+            [(idx, json.dumps(path)) for idx, path in enumerate(STORED_PATHS)],
+        )
+
+        def matches(filter_paths):
+            filter_clause, params = engine._build_filter_clause(
+                {"taxonomy_paths": filter_paths}, postgresql=False
+            )
+            rows = conn.execute(
+                f"SELECT doc_id FROM doc_taxonomy dt WHERE 1 = 1{filter_clause}"
+                " ORDER BY doc_id",
+                params,
+            ).fetchall()
+            return [STORED_PATHS[doc_id] for (doc_id,) in rows]
+
+        # ["AI", "R&D"] must not become ["AI"] and match its siblings
+        assert matches([["AI", "R&D"]]) == []
+        assert matches([["AI", "R&D"], ["AIOps"]]) == [["AIOps"]]
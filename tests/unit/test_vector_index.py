@@ -0,0 +1,246 @@
+"""
+Unit tests for pgvector query helpers (apps.api.database.utils.vector_index)
+
+@TEST:DATABASE-PKG-018
+"""
+
+from unittest.mock import AsyncMock
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+from apps.api.database.utils.vector_index import (
+    MAX_EF_SEARCH,
+    ANNSearchParams,
+    ann_index_sql,
+    apply_ann_params,
+    candidate_ann_params,
+    candidate_distance_sql,
+    get_prefix_index_dims,
+    get_vector_metric,
+    get_vector_quantization,
+    query_vector_param,
+    rescore_candidates,
+)
+from apps.search.hybrid_search_engine import HybridSearchEngine
+
+
+class TestVectorMetric:
+    """Test cases for distance metric resolution"""
+
+    @pytest.mark.unit
+    def test_metric_operator_matches_opclass(self, monkeypatch):
+        monkeypatch.delenv("VECTOR_DISTANCE_METRIC", raising=False)
+        cosine = get_vector_metric()
+        assert (cosine.operator, cosine.opclass) == ("<=>", "vector_cosine_ops")
+
+        monkeypatch.setenv("VECTOR_DISTANCE_METRIC", "l2")
+        l2 = get_vector_metric()
+        assert (l2.operator, l2.opclass) == ("<->", "vector_l2_ops")
+        assert "vector_l2_ops" in ann_index_sql("ivfflat")
+
+    @pytest.mark.unit
+    def test_unknown_metric_rejected(self):
+        with pytest.raises(ValueError):
+            get_vector_metric("hamming")
+
+    @pytest.mark.unit
+    def test_query_vector_is_bound_not_inlined(self):
+        """Statement text is identical for different embeddings"""
+        metric = get_vector_metric("cosine")
+        query = text(
+            f"SELECT {metric.similarity_sql('e.vec')} FROM embeddings e "
+            f"ORDER BY {metric.distance_sql('e.vec')}"
+        ).bindparams(query_vector_param(3))
+
+        compiled = str(query.compile(dialect=postgresql.asyncpg.dialect()))
+        assert "CAST($1 AS vector)" in compiled
+        assert "0." not in compiled
+
+
+class TestANNSearchParams:
+    """Test cases for per-request ANN tuning"""
+
+    @pytest.mark.unit
+    def test_out_of_range_values_rejected(self):
+        with pytest.raises(ValueError):
+            ANNSearchParams(ef_search=0)
+        with pytest.raises(ValueError):
+            ANNSearchParams(probes=100000)
+
+    @pytest.mark.unit
+    def test_request_values_override_env_defaults(self, monkeypatch):
+        monkeypatch.setenv("VECTOR_HNSW_EF_SEARCH", "40")
+        monkeypatch.setenv("VECTOR_IVFFLAT_PROBES", "10")
+
+        resolved = ANNSearchParams.resolve(ANNSearchParams(ef_search=200))
+        assert resolved.ef_search == 200
+        assert resolved.probes == 10
+
+    @pytest.mark.unit
+    async def test_apply_uses_set_local(self, monkeypatch):
+        monkeypatch.delenv("VECTOR_HNSW_EF_SEARCH", raising=False)
+        monkeypatch.delenv("VECTOR_IVFFLAT_PROBES", raising=False)
+        session = AsyncMock()
+
+        await apply_ann_params(session, ANNSearchParams(ef_search=120, probes=8))
+
+        statements = [str(call.args[0]) for call in session.execute.await_args_list]
+        assert statements == [
+            "SET LOCAL hnsw.ef_search = 120",
+            "SET LOCAL ivfflat.probes = 8",
+        ]
+
+    @pytest.mark.unit
+    async def test_apply_is_noop_without_settings(self, monkeypatch):
+        monkeypatch.delenv("VECTOR_HNSW_EF_SEARCH", raising=False)
+        monkeypatch.delenv("VECTOR_IVFFLAT_PROBES", raising=False)
+        session = AsyncMock()
+
+        await apply_ann_params(session, None)
+
+        session.execute.assert_not_awaited()
+
+
+class TestHalfvecQuantization:
+    """halfvec ANN index with full-precision re-scoring"""
+
+    @pytest.mark.unit
+    def test_index_is_built_over_halfvec_cast(self):
+        sql = ann_index_sql("hnsw", "cosine", "halfvec")
+        assert "idx_embeddings_vec_halfvec_hnsw" in sql
+        assert "(CAST(vec AS halfvec(1536))) halfvec_cosine_ops" in sql
+        assert "halfvec_l2_ops" in ann_index_sql("ivfflat", "l2", "halfvec")
+        assert "USING hnsw (vec vector_cosine_ops)" in ann_index_sql("hnsw", "cosine", "none")
+        with pytest.raises(ValueError):
+            get_vector_quantization("pq")
+
+    @pytest.mark.unit
+    def test_ef_search_covers_rescore_candidates(self, monkeypatch):
+        monkeypatch.delenv("VECTOR_HNSW_EF_SEARCH", raising=False)
+        monkeypatch.delenv("VECTOR_RESCORE_OVERSAMPLE", raising=False)
+        assert rescore_candidates(10) == 40
+        assert rescore_candidates(10, oversample=0) == 10
+
+        assert candidate_ann_params(None, 40) is None  # pgvector default ef_search
+        params = candidate_ann_params(ANNSearchParams(probes=4), 200)
+        assert (params.ef_search, params.probes) == (200, 4)
+        assert candidate_ann_params(None, 5000).ef_search == MAX_EF_SEARCH
+
+    @pytest.mark.unit
+    def test_candidates_by_halfvec_are_reranked_by_full_distance(self, monkeypatch):
+        monkeypatch.setenv("VECTOR_QUANTIZATION", "halfvec")
+        monkeypatch.delenv("VECTOR_PREFIX_DIMS", raising=False)
+        engine = HybridSearchEngine(enable_caching=False, enable_reranking=False)
+        metric = get_vector_metric("cosine")
+        halfvec_order = "ORDER BY (CAST(e.vec AS halfvec(1536)) <=> CAST(:query_vector AS halfvec(1536)))"
+
+        vector_sql = engine._vector_query_sql(
+            metric, "", candidate_order=candidate_distance_sql(metric)
+        )
+        fused_sql = str(engine._build_server_fusion_query("", query_vector_param(3)))
+        exact_sql = str(
+            engine._build_server_fusion_query("", query_vector_param(3), exact_vector=True)
+        )
+
+        for sql in (vector_sql, fused_sql):
+            candidates = sql.index(halfvec_order)
+            rescored = sql.index(") rescored_candidates")
+            assert candidates < sql.index("LIMIT :rescore_candidates") < rescored
+            assert "(vec <=> CAST(:query_vector AS vector))" in sql
+            assert "ORDER BY" in sql[rescored:]
+        assert "halfvec" not in exact_sql
+
+
+class TestTwoStagePrefixRetrieval:
+    """ANN over a vector prefix, re-ranked with the full vector"""
+
+    @pytest.mark.unit
+    def test_params_from_agent_retrieval_config(self, monkeypatch):
+        monkeypatch.delenv("VECTOR_PREFIX_DIMS", raising=False)
+        monkeypatch.setenv("VECTOR_RESCORE_OVERSAMPLE", "4")
+        assert ANNSearchParams.from_retrieval_config({"top_k": 5}) is None
+        assert ANNSearchParams.from_retrieval_config(None) is None
+
+        params = ANNSearchParams.from_retrieval_config(
+            {"top_k": 5, "vector_prefix_dims": "256", "ef_search": 80}
+        )
+        assert (params.prefix_dims, params.ef_search, params.probes) == (256, 80, None)
+        resolved = ANNSearchParams.resolve(params)
+        assert (resolved.prefix_dims, resolved.rescore_oversample) == (256, 4)
+
+        # Raising ef_search for the candidates keeps the two-stage settings
+        widened = candidate_ann_params(params, 400)
+        assert (widened.ef_search, widened.prefix_dims) == (400, 256)
+
+        with pytest.raises(ValueError):
+            ANNSearchParams.from_retrieval_config({"vector_prefix_dims": 1536})
+        with pytest.raises(ValueError):
+            ANNSearchParams(rescore_oversample=0)
+
+    @pytest.mark.unit
+    def test_repository_search_params(self, caplog):
+        from apps.api.data.repositories.search_repository_impl import (
+            SearchRepositoryImpl,
+        )
+        from apps.api.domain.repositories.search_repository import SearchParams
+
+        assert SearchRepositoryImpl._ann_params(SearchParams(query="q")) is None
+        params = SearchRepositoryImpl._ann_params(
+            SearchParams(query="q", ef_search=80, probes=4, vector_prefix_dims=256)
+        )
+        assert (params.ef_search, params.probes, params.prefix_dims) == (80, 4, 256)
+
+        # Invalid settings are logged and the search runs with the defaults
+        invalid = SearchParams(query="q", vector_prefix_dims=1536)
+        assert SearchRepositoryImpl._ann_params(invalid) is None
+        assert "Ignoring invalid ANN settings" in caplog.text
+
+    @pytest.mark.unit
+    def test_prefix_index_sql(self, monkeypatch):
+        sql = ann_index_sql("hnsw", "cosine", prefix_dims=256)
+        assert "idx_embeddings_vec_prefix256_hnsw" in sql
+        assert "(CAST(subvector(vec, 1, 256) AS vector(256))) vector_cosine_ops" in sql
+        assert "vector_l2_ops" in ann_index_sql("ivfflat", "l2", prefix_dims=128)
+
+        monkeypatch.setenv("VECTOR_PREFIX_INDEX_DIMS", "512, 128,")
+        assert get_prefix_index_dims() == [128, 512]
+
+    @pytest.mark.unit
+    def test_prefix_candidates_are_reranked_by_full_distance(self, monkeypatch):
+        monkeypatch.setenv("VECTOR_QUANTIZATION", "halfvec")
+        monkeypatch.setenv("VECTOR_PREFIX_INDEX_DIMS", "256")
+        monkeypatch.delenv("VECTOR_PREFIX_DIMS", raising=False)
+        engine = HybridSearchEngine(enable_caching=False, enable_reranking=False)
+        metric = get_vector_metric("cosine")
+        params = ANNSearchParams(prefix_dims=256)
+        prefix_order = (
+            "ORDER BY (CAST(subvector(e.vec, 1, 256) AS vector(256)) <=> "
+            "CAST(subvector(CAST(:query_vector AS vector), 1, 256) AS vector(256)))"
+        )
+
+        # The prefix takes precedence over the halfvec index
+        vector_sql = engine._vector_query_sql(
+            metric, "", candidate_order=candidate_distance_sql(metric, params)
+        )
+        fused_sql = str(
+            engine._build_server_fusion_query("", query_vector_param(3), ann_params=params)
+        )
+        for sql in (vector_sql, fused_sql):
+            rescored = sql.index(") rescored_candidates")
+            assert sql.index(prefix_order) < sql.index("LIMIT :rescore_candidates") < rescored
+            assert "halfvec" not in sql
+
+        exact_sql = str(
+            engine._build_server_fusion_query(
+                "", query_vector_param(3), exact_vector=True, ann_params=params
+            )
+        )
+        assert "subvector" not in exact_sql
+
+        # prefix_dims=0 turns a VECTOR_PREFIX_DIMS default off for one agent
+        monkeypatch.setenv("VECTOR_QUANTIZATION", "none")
+        monkeypatch.setenv("VECTOR_PREFIX_DIMS", "256")
+        assert candidate_distance_sql(metric) is not None
+        assert candidate_distance_sql(metric, ANNSearchParams(prefix_dims=0)) is None